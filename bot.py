@@ -31,6 +31,15 @@ from dotenv import load_dotenv
 # ──────────────────────────────────────────────────────────────
 from utils.supabase_client import supabase
 from utils.discord_utils import safe_send, safe_edit, safe_respond  # <-- fonctions safe pour Discord
+from utils.message_router import router, IGNORE, MENTION, GAME
+from utils.help_catalog import catalog
+from utils.config_service import config
+from utils.change_feed import feed
+from utils.resilience import resilience, CircuitOpenError
+from utils.schema import columns
+from utils.reiatsu_profiles import profiles
+from utils.leaderboard import leaderboard
+from utils.cooldowns import cooldowns
 
 # ──────────────────────────────────────────────────────────────
 # 🔧 Initialisation de l’environnement
@@ -61,9 +70,20 @@ intents.reactions = True
 
 bot = commands.Bot(command_prefix=get_prefix, intents=intents, help_command=None)
 bot.is_main_instance = False
+bot.lock_owner = None  # dernier propriétaire connu du verrou (utilisé si la base ne répond plus)
 bot.INSTANCE_ID = INSTANCE_ID
 bot.supabase = supabase
 
+# ──────────────────────────────────────────────────────────────
+# 🔄 Flux de changements → caches en mémoire (autres instances, éditions manuelles)
+# ──────────────────────────────────────────────────────────────
+
+feed.register("reiatsu_config", config.apply_change, columns=columns("reiatsu_config"))
+feed.register("bot_settings", config.apply_change, columns=("key", "value"))
+feed.register("reiatsu", profiles.apply_change, columns=("user_id",))
+feed.register("reiatsu", leaderboard.apply_change, columns=("user_id", "points"))
+feed.register("cooldowns", cooldowns.apply_change, columns=("id", "expires_at"))
+
 # ──────────────────────────────────────────────────────────────
 # 🔌 Chargement dynamique des commandes
 # ──────────────────────────────────────────────────────────────
@@ -88,6 +108,9 @@ async def load_commands():
     except Exception as e:
         print(f"❌ Failed to load tasks.heartbeat: {e}")
 
+    # Le catalogue d’aide sera reconstruit au prochain !help / !readme
+    catalog.invalidate()
+
 # ──────────────────────────────────────────────────────────────
 # 🔔 Événement on_ready : présence + verrouillage
 # ──────────────────────────────────────────────────────────────
@@ -95,8 +118,17 @@ async def load_commands():
 @bot.event
 async def on_ready():
     print(f"✅ Connecté en tant que {bot.user.name}")
+    router.set_bot_user(bot.user.id)
     await bot.change_presence(activity=discord.Activity(type=discord.ActivityType.watching, name="Bleach"))
 
+    # Configs serveurs + réglages du bot chargés en mémoire (relus à chaque reconnexion)
+    await asyncio.to_thread(config.load)
+    # Cooldowns de jeu en mémoire (après la config : la reprise des anciennes colonnes y note son passage)
+    await asyncio.to_thread(cooldowns.load)
+    cooldowns.start()
+    feed.start()
+    resilience.start()
+
     now = datetime.now(timezone.utc).isoformat()
 
     try:
@@ -125,31 +157,39 @@ async def on_ready():
         print("🔓 Aucune gestion de verrou — le bot démarre quand même.")
 
 # ──────────────────────────────────────────────────────────────
-# 📩 Événement on_message : gestion du verrou + commandes
+# 📩 Événement on_message : aiguillage central (commandes, mention, jeux) + verrou
 # ──────────────────────────────────────────────────────────────
 
 @bot.event
 async def on_message(message):
+    prefix = get_prefix(bot, message)
+
+    # 🧭 Décision en O(1) : les messages sans commande ni partie en cours s’arrêtent ici
+    route, handler = router.route(message, prefix)
+    if route == IGNORE:
+        return
+
     try:
         lock = supabase.table("bot_lock").select("instance_id").eq("id", "reiatsu_lock").execute()
-        if lock.data and lock.data[0]["instance_id"] != INSTANCE_ID:
-            return
+        bot.lock_owner = lock.data[0]["instance_id"] if lock.data else None
+    except CircuitOpenError:
+        pass  # base coupée : décision avec le dernier propriétaire connu, sans attendre
     except Exception as e:
         print(f"⚠️ Erreur lors de la vérification du verrou Supabase : {e}")
-        # On continue quand même
-
-    if message.author.bot:
+    if bot.lock_owner and bot.lock_owner != INSTANCE_ID:
         return
 
-    prefix = get_prefix(bot, message)
-
     # ✅ Répondre à la mention directe du bot
-    if message.content.strip() == f"<@{bot.user.id}>" or message.content.strip() == f"<@!{bot.user.id}>":
+    if route == MENTION:
         await safe_send(message.channel, f"👋 Salut {message.author.mention} ! Utilise `{prefix}help` pour voir mes commandes.")
         return
 
-
-    if not message.content.startswith(prefix):
+    # 🎮 Saisie d’un jeu en cours dans ce salon (ex. pendu)
+    if route == GAME:
+        try:
+            await handler(message)
+        except Exception as e:
+            print(f"[ERREUR routeur] {e}")
         return
 
     await bot.process_commands(message)
@@ -0,0 +1,91 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 cache_admin.py — Commande !caches
+# Objectif : Afficher l’efficacité des caches et du regroupement des lectures
+#            (requêtes évitées, taille moyenne des lots, config, cooldowns et index des membres)
+# Catégorie : Admin
+# Accès : Administrateur
+# Cooldown : 1 utilisation / 5 secondes / utilisateur
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import discord
+from discord.ext import commands
+from utils.discord_utils import safe_send
+from utils.dataloader import loader_stats
+from utils.config_service import config
+from utils.cooldowns import cooldowns
+from utils.member_index import members
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Cog principal
+# ────────────────────────────────────────────────────────────────────────────────
+class CacheAdmin(commands.Cog):
+    """
+    Commande !caches — Jauges des regroupeurs (utils/dataloader) et de la config (utils/config_service)
+    """
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.command(
+        name="caches",
+        help="(Admin) Affiche les lectures regroupées et l’état des caches en mémoire."
+    )
+    @commands.has_permissions(administrator=True)
+    @commands.cooldown(1, 5.0, commands.BucketType.user)
+    async def prefix_caches(self, ctx: commands.Context):
+        try:
+            embed = discord.Embed(title="🗃️ Caches et lectures regroupées", color=discord.Color.blurple())
+            for name, stats in sorted(loader_stats().items()):
+                embed.add_field(
+                    name=f"`{name}`",
+                    value=(
+                        f"Lectures : **{stats['requests']}** → requêtes : **{stats['queries']}**\n"
+                        f"Partagées : **{stats['hit_rate']:.0%}** • Lot moyen : **{stats['avg_batch']:.1f}** clé(s)\n"
+                        f"Erreurs : **{stats['errors']}**"
+                    ),
+                    inline=False
+                )
+            conf = config.stats()
+            embed.add_field(
+                name="`config`",
+                value=(
+                    f"Serveurs : **{conf['guilds']}** • Réglages : **{conf['settings']}**\n"
+                    f"Lectures en mémoire : **{conf['reads']}** • Écritures : **{conf['writes']}** • Chargements : **{conf['loads']}**"
+                ),
+                inline=False
+            )
+            cds = cooldowns.stats()
+            embed.add_field(
+                name="`cooldowns`",
+                value=(
+                    f"En cours : **{cds['active']}** • Vérifications : **{cds['checks']}** • Déclenchés : **{cds['triggers']}**\n"
+                    f"À sauvegarder : **{cds['pending']}** • Lots écrits : **{cds['flushes']}** • Erreurs : **{cds['errors']}**"
+                ),
+                inline=False
+            )
+            names = members.stats()
+            embed.add_field(
+                name="`membres`",
+                value=(
+                    f"Serveurs indexés : **{names['guilds']}** • Membres : **{names['members']}** • Clés : **{names['keys']}**\n"
+                    f"Trouvés par ID : **{names['id']}** • nom exact : **{names['exact']}** • début : **{names['prefix']}** • "
+                    f"approché : **{names['fuzzy']}** • introuvables : **{names['miss']}**"
+                ),
+                inline=False
+            )
+            await safe_send(ctx.channel, embed=embed)
+        except Exception as e:
+            print(f"[ERREUR !caches] {e}")
+            await safe_send(ctx.channel, "❌ Une erreur est survenue.")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔌 Setup du Cog
+# ────────────────────────────────────────────────────────────────────────────────
+async def setup(bot: commands.Bot):
+    cog = CacheAdmin(bot)
+    for command in cog.get_commands():
+        if not hasattr(command, "category"):
+            command.category = "Admin"
+    await bot.add_cog(cog)
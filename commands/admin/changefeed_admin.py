@@ -0,0 +1,68 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 changefeed_admin.py — Commande !changefeed
+# Objectif : Afficher l’état du flux de changements (mode, événements, retard par table)
+# Catégorie : Admin
+# Accès : Administrateur
+# Cooldown : 1 utilisation / 5 secondes / utilisateur
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import time
+import discord
+from discord.ext import commands
+from utils.discord_utils import safe_send
+from utils.change_feed import feed
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Cog principal
+# ────────────────────────────────────────────────────────────────────────────────
+class ChangeFeedAdmin(commands.Cog):
+    """
+    Commande !changefeed — Jauges du flux de changements (utils/change_feed)
+    """
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.command(
+        name="changefeed",
+        aliases=["feed"],
+        help="(Admin) Affiche le flux de changements de la base et son retard par table."
+    )
+    @commands.has_permissions(administrator=True)
+    @commands.cooldown(1, 5.0, commands.BucketType.user)
+    async def prefix_changefeed(self, ctx: commands.Context):
+        try:
+            stats = feed.stats()
+            modes = {"realtime": "🟢 Temps réel", "polling": "🟡 Interrogation périodique", "off": "🔴 Arrêté"}
+            embed = discord.Embed(
+                title="🔄 Flux de changements",
+                description=f"Mode : **{modes.get(stats['mode'], stats['mode'])}**",
+                color=discord.Color.blurple()
+            )
+            now = time.time()
+            for table, entry in sorted(stats["tables"].items()):
+                last = f"il y a {now - entry['last_event_at']:.0f}s" if entry["last_event_at"] else "jamais"
+                lines = [
+                    f"Événements : **{entry['events']}** • Erreurs : **{entry['errors']}**",
+                    f"Retard : dernier **{entry['last_lag']:.2f}s** • moyen **{entry['avg_lag']:.2f}s** • max **{entry['max_lag']:.2f}s**",
+                    f"Dernier événement : {last} • Caches abonnés : **{entry['handlers']}**",
+                ]
+                if stats["mode"] == "polling" and not entry["pollable"]:
+                    lines.append("⚠️ Interrogation impossible (colonne `updated_at` absente ?)")
+                embed.add_field(name=f"`{table}`", value="\n".join(lines), inline=False)
+            await safe_send(ctx.channel, embed=embed)
+        except Exception as e:
+            print(f"[ERREUR !changefeed] {e}")
+            await safe_send(ctx.channel, "❌ Une erreur est survenue.")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔌 Setup du Cog
+# ────────────────────────────────────────────────────────────────────────────────
+async def setup(bot: commands.Bot):
+    cog = ChangeFeedAdmin(bot)
+    for command in cog.get_commands():
+        if not hasattr(command, "category"):
+            command.category = "Admin"
+    await bot.add_cog(cog)
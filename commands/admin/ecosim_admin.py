@@ -0,0 +1,120 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 ecosim_admin.py — Commande !ecosim
+# Objectif : Lancer une petite simulation Monte-Carlo de l’économie Reiatsu
+#            (utils/economy_sim) dans un processus séparé et afficher la
+#            distribution des points et l’évolution du Gini
+# Catégorie : Admin
+# Accès : Administrateur
+# Cooldown : 1 utilisation / 30 secondes / utilisateur
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import io
+from functools import partial
+import discord
+from discord.ext import commands
+from utils.discord_utils import safe_send, safe_edit
+from utils.economy_sim import simulate, format_report, sparkline, np
+from utils.reiatsu_rules import SPAWN_SPEED_RANGES, DEFAULT_SPAWN_SPEED
+from utils.process_worker import ProcessWorker
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+MAX_PLAYERS = 5000
+MAX_DAYS = 90
+MAX_GUILDS = 20
+RUNS = 4                      # parties indépendantes (fourchette min–max du Gini)
+WORKER_TIMEOUT = 60.0
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Cog principal
+# ────────────────────────────────────────────────────────────────────────────────
+class EcoSimAdmin(commands.Cog):
+    """
+    Commande !ecosim — Simulation de l’économie Reiatsu avec les règles actuelles
+    """
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.command(
+        name="ecosim",
+        aliases=["simeco"],
+        help="(Admin) Simule l’économie Reiatsu. `!ecosim [joueurs] [jours] [vitesse] [salons]`"
+    )
+    @commands.has_permissions(administrator=True)
+    @commands.cooldown(1, 30.0, commands.BucketType.user)
+    async def prefix_ecosim(self, ctx: commands.Context, joueurs: int = 500, jours: int = 30,
+                            vitesse: str = DEFAULT_SPAWN_SPEED, salons: int = 1):
+        if np is None:
+            await safe_send(ctx.channel, "❌ NumPy n’est pas installé : simulation impossible.")
+            return
+        if vitesse not in SPAWN_SPEED_RANGES:
+            await safe_send(ctx.channel, f"❌ Vitesse inconnue. Possibles : {', '.join(SPAWN_SPEED_RANGES)}.")
+            return
+        joueurs = max(2, min(joueurs, MAX_PLAYERS))
+        jours = max(1, min(jours, MAX_DAYS))
+        salons = max(1, min(salons, MAX_GUILDS))
+        worker = ProcessWorker()      # simulation dans un processus à part, la boucle du bot reste libre
+        try:
+            message = await safe_send(ctx.channel, f"🎲 Simulation en cours ({joueurs} joueurs × {RUNS}, {jours} jours)...")
+            result = await worker.run(
+                partial(simulate, players=joueurs, days=jours, speed=vitesse, guilds=salons, runs=RUNS),
+                timeout=WORKER_TIMEOUT
+            )
+
+            gini = result["gini"]
+            checkpoints = sorted({1, min(7, jours), min(30, jours), jours})
+            embed = discord.Embed(
+                title="🎲 Simulation de l’économie Reiatsu",
+                description=(
+                    f"{joueurs} joueurs × {RUNS} parties • {jours} jours • vitesse **{vitesse}** sur {salons} salon(s)\n"
+                    f"Spawns : **{result['spawns']}** • vols réussis : **{result['steals_won']}**/{result['attempts']} • "
+                    f"calcul : {result['elapsed']:.2f}s"
+                ),
+                color=discord.Color.blurple()
+            )
+            embed.add_field(
+                name="📈 Gini",
+                value=f"`{sparkline(gini)}`\n" + " • ".join(f"J{day} : **{gini[day - 1]:.3f}**" for day in checkpoints),
+                inline=False
+            )
+            embed.add_field(
+                name="💠 Points en fin de simulation",
+                value=" • ".join(f"{name} : **{value:.0f}**" for name, value in result["percentiles"].items()) + f" • max : **{result['max']:.0f}**",
+                inline=False
+            )
+            embed.add_field(
+                name="🎭 Classes",
+                value="\n".join(
+                    f"{classe} : moyenne **{entry['mean']:.0f}** • {entry['wealth']:.0%} des points"
+                    for classe, entry in result["by_class"].items()
+                ),
+                inline=False
+            )
+            report = discord.File(io.BytesIO(format_report(result).encode("utf-8")), filename="ecosim.txt")
+            if message:
+                await safe_edit(message, content=None, embed=embed)
+                await safe_send(ctx.channel, file=report)
+            else:
+                await safe_send(ctx.channel, embed=embed, file=report)
+        except asyncio.TimeoutError:
+            await safe_send(ctx.channel, f"⏳ Simulation trop longue (plus de {WORKER_TIMEOUT:.0f}s), réduis les paramètres.")
+        except Exception as e:
+            print(f"[ERREUR !ecosim] {e}")
+            await safe_send(ctx.channel, "❌ Une erreur est survenue.")
+        finally:
+            worker.kill()
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔌 Setup du Cog
+# ────────────────────────────────────────────────────────────────────────────────
+async def setup(bot: commands.Bot):
+    cog = EcoSimAdmin(bot)
+    for command in cog.get_commands():
+        if not hasattr(command, "category"):
+            command.category = "Admin"
+    await bot.add_cog(cog)
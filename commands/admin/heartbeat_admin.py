@@ -12,6 +12,7 @@
 import discord
 from discord.ext import commands
 from utils.discord_utils import safe_send
+from utils.config_service import config
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
@@ -22,7 +23,6 @@ class HeartbeatAdmin(commands.Cog):
     """
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.supabase = bot.supabase
 
     # ────────────────────────────────────────────────────────────────────────────
     # 🔹 Commande PREFIX
@@ -45,22 +45,15 @@ class HeartbeatAdmin(commands.Cog):
             action = action.lower()
 
             if action in ["pause", "p"]:
-                self.supabase.table("bot_settings").upsert({
-                    "key": "heartbeat_paused",
-                    "value": "true"
-                }).execute()
+                config.set_setting("heartbeat_paused", "true")
                 await safe_send(ctx, "⏸️ Heartbeat mis en pause.")
 
             elif action in ["resume", "r"]:
-                self.supabase.table("bot_settings").upsert({
-                    "key": "heartbeat_paused",
-                    "value": "false"
-                }).execute()
+                config.set_setting("heartbeat_paused", "false")
                 await safe_send(ctx, "▶️ Heartbeat relancé.")
 
             elif action in ["status", "stat", "s"]:
-                res = self.supabase.table("bot_settings").select("value").eq("key", "heartbeat_paused").execute()
-                paused = res.data and res.data[0]["value"].lower() == "true"
+                paused = (config.setting("heartbeat_paused") or "").lower() == "true"
                 status_msg = "🔴 Le heartbeat est **en pause**." if paused else "🟢 Le heartbeat est **actif**."
                 await safe_send(ctx, status_msg)
 
@@ -68,23 +61,12 @@ class HeartbeatAdmin(commands.Cog):
                 if not channel:
                     await safe_send(ctx, "❌ Tu dois mentionner un salon. Exemple : `!heartbeat set #général`")
                     return
-                self.supabase.table("bot_settings").upsert({
-                    "key": "heartbeat_channel_id",
-                    "value": str(channel.id)
-                }).execute()
-                heartbeat_cog = self.bot.get_cog("HeartbeatTask")
-                if heartbeat_cog:
-                    heartbeat_cog.heartbeat_channel_id = channel.id
+                # Le HeartbeatTask est abonné au réglage : pas besoin de le modifier ici
+                config.set_setting("heartbeat_channel_id", str(channel.id))
                 await safe_send(ctx, f"✅ Salon heartbeat défini : {channel.mention}")
 
             elif action == "unset":
-                self.supabase.table("bot_settings").upsert({
-                    "key": "heartbeat_channel_id",
-                    "value": ""
-                }).execute()
-                heartbeat_cog = self.bot.get_cog("HeartbeatTask")
-                if heartbeat_cog:
-                    heartbeat_cog.heartbeat_channel_id = None
+                config.set_setting("heartbeat_channel_id", "")
                 await safe_send(ctx, "🗑️ Salon heartbeat supprimé.")
 
             else:
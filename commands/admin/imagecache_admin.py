@@ -0,0 +1,70 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 imagecache_admin.py — Commande !imagecache <set|unset|status>
+# Objectif : Choisir le salon caché où les images des messages paginés (Klub Outside)
+#            sont envoyées une seule fois, puis réutilisées par leur URL CDN
+# Catégorie : Admin
+# Accès : Administrateur
+# Cooldown : 1 utilisation / 5 secondes / utilisateur
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import discord
+from discord.ext import commands
+from utils.discord_utils import safe_send
+from utils.config_service import config
+from utils.image_assets import assets, CACHE_CHANNEL_SETTING
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Cog principal
+# ────────────────────────────────────────────────────────────────────────────────
+class ImageCacheAdmin(commands.Cog):
+    """
+    Commande !imagecache — Salon d’hébergement des images (utils/image_assets)
+    """
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.command(
+        name="imagecache",
+        help="(Admin) Salon caché qui héberge les images paginées : set <#salon>, unset, status."
+    )
+    @commands.has_permissions(administrator=True)
+    @commands.cooldown(1, 5.0, commands.BucketType.user)
+    async def prefix_imagecache(self, ctx: commands.Context, action: str = "status", channel: discord.TextChannel = None):
+        try:
+            action = action.lower()
+            if action == "set":
+                if not channel:
+                    await safe_send(ctx.channel, "❌ Tu dois mentionner un salon. Exemple : `!imagecache set #cache-images`")
+                    return
+                config.set_setting(CACHE_CHANNEL_SETTING, str(channel.id))
+                await safe_send(ctx.channel, f"✅ Images hébergées dans {channel.mention} (à garder caché, messages à ne pas supprimer).")
+            elif action == "unset":
+                config.set_setting(CACHE_CHANNEL_SETTING, "")
+                await safe_send(ctx.channel, "🗑️ Salon de cache supprimé : les images seront jointes à chaque page.")
+            elif action == "status":
+                channel_id = config.setting(CACHE_CHANNEL_SETTING)
+                stats = assets.stats()
+                where = f"<#{channel_id}>" if channel_id else "aucun (image jointe à chaque page)"
+                await safe_send(
+                    ctx.channel,
+                    f"🖼️ Salon de cache : {where}\n"
+                    f"URLs CDN connues : **{stats['cdn_urls']}** • envois : **{stats['uploads']}** • réutilisations : **{stats['reuses']}**"
+                )
+            else:
+                await safe_send(ctx.channel, "❌ Action inconnue. Utilise `set`, `unset` ou `status`.")
+        except Exception as e:
+            print(f"[ERREUR !imagecache] {e}")
+            await safe_send(ctx.channel, "❌ Une erreur est survenue.")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔌 Setup du Cog
+# ────────────────────────────────────────────────────────────────────────────────
+async def setup(bot: commands.Bot):
+    cog = ImageCacheAdmin(bot)
+    for command in cog.get_commands():
+        if not hasattr(command, "category"):
+            command.category = "Admin"
+    await bot.add_cog(cog)
@@ -0,0 +1,79 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 interactions_admin.py — Commande !interactions
+# Objectif : Afficher, par commande, la latence de première réponse aux interactions
+#            et la part des réponses différées automatiquement (budget d’acquittement)
+# Catégorie : Admin
+# Accès : Administrateur
+# Cooldown : 1 utilisation / 5 secondes / utilisateur
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import discord
+from discord.ext import commands
+from utils.discord_utils import safe_send
+from utils.interaction_router import interactions, ACK_WINDOW
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Cog principal
+# ────────────────────────────────────────────────────────────────────────────────
+class InteractionsAdmin(commands.Cog):
+    """
+    Commande !interactions — Jauges d’acquittement des interactions (utils/interaction_router)
+    """
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.command(
+        name="interactions",
+        aliases=["acks"],
+        help="(Admin) Latence de réponse des commandes slash et boutons, defer automatiques. `!interactions [reset]`"
+    )
+    @commands.has_permissions(administrator=True)
+    @commands.cooldown(1, 5.0, commands.BucketType.user)
+    async def prefix_interactions(self, ctx: commands.Context, arg: str = None):
+        try:
+            if arg and arg.lower() == "reset":
+                interactions.reset()
+                await safe_send(ctx.channel, "🧹 Jauges des interactions remises à zéro.")
+                return
+            stats = interactions.stats()
+            entries = stats["commands"]
+            if not entries:
+                await safe_send(ctx.channel, "ℹ️ Aucune interaction suivie pour l’instant.")
+                return
+            missed = sum(entry["missed"] for entry in entries.values())
+            embed = discord.Embed(
+                title="⏱️ Acquittement des interactions",
+                description=(
+                    f"Budget avant defer automatique : **{stats['budget']:.1f}s** (fenêtre Discord : {ACK_WINDOW:.0f}s)\n"
+                    f"En cours de suivi : **{stats['watching']}** • expirées : **{missed}**"
+                ),
+                color=discord.Color.red() if missed else discord.Color.blurple()
+            )
+            for name, entry in list(entries.items())[:20]:
+                rate = entry["auto_deferred"] / entry["acks"] * 100 if entry["acks"] else 0.0
+                late = f" • ⚠️ expirées : **{entry['missed']}**" if entry["missed"] else ""
+                embed.add_field(
+                    name=f"`{name}`",
+                    value=(
+                        f"Réponses : **{entry['acks']}** • moy. **{entry['avg_ack'] * 1000:.0f} ms** • max **{entry['max_ack'] * 1000:.0f} ms**\n"
+                        f"Defer auto : **{entry['auto_deferred']}** ({rate:.0f}%) • explicites : **{entry['deferred']}**{late}"
+                    ),
+                    inline=False
+                )
+            await safe_send(ctx.channel, embed=embed)
+        except Exception as e:
+            print(f"[ERREUR !interactions] {e}")
+            await safe_send(ctx.channel, "❌ Une erreur est survenue.")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔌 Setup du Cog
+# ────────────────────────────────────────────────────────────────────────────────
+async def setup(bot: commands.Bot):
+    cog = InteractionsAdmin(bot)
+    for command in cog.get_commands():
+        if not hasattr(command, "category"):
+            command.category = "Admin"
+    await bot.add_cog(cog)
@@ -0,0 +1,70 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 mastermind_bench.py — Commande !mmbench
+# Objectif : Mesurer le temps du solveur Mastermind pour chaque difficulté
+# Catégorie : Admin
+# Accès : Administrateur
+# Cooldown : 1 utilisation / 30 secondes / utilisateur
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import discord
+from discord.ext import commands
+from utils.discord_utils import safe_send, safe_edit
+from utils.mastermind_engine import benchmark, np
+from commands.jeux.mastermind import COLORS, DIFFICULTIES
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Cog principal
+# ────────────────────────────────────────────────────────────────────────────────
+class MastermindBench(commands.Cog):
+    """
+    Commande !mmbench — Fait jouer le solveur sur chaque difficulté et affiche ses temps
+    """
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.command(
+        name="mmbench",
+        help="(Admin) Mesure le temps du solveur Mastermind par difficulté. `!mmbench [parties]`"
+    )
+    @commands.has_permissions(administrator=True)
+    @commands.cooldown(1, 30.0, commands.BucketType.user)
+    async def prefix_mmbench(self, ctx: commands.Context, parties: int = 3):
+        parties = max(1, min(parties, 10))
+        try:
+            message = await safe_send(ctx.channel, "⏱️ Banc d'essai du solveur en cours...")
+            embed = discord.Embed(
+                title="🧠 Solveur Mastermind — banc d'essai",
+                description=f"{parties} partie(s) par difficulté • NumPy : {'oui' if np is not None else 'non'}",
+                color=discord.Color.blurple()
+            )
+            for diff in DIFFICULTIES:
+                result = await asyncio.to_thread(benchmark, diff["code_length"], len(COLORS), parties)
+                embed.add_field(
+                    name=f"{diff['label']} ({diff['code_length']} cases)",
+                    value=(
+                        f"Résolues : **{result['solved']}/{result['games']}** en {result['avg_turns']:.1f} coups\n"
+                        f"Temps/coup : **{result['avg_ms_per_turn']:.1f} ms** (max {result['max_ms']:.0f} ms)"
+                    ),
+                    inline=False
+                )
+            if message:
+                await safe_edit(message, content=None, embed=embed)
+            else:
+                await safe_send(ctx.channel, embed=embed)
+        except Exception as e:
+            print(f"[ERREUR !mmbench] {e}")
+            await safe_send(ctx.channel, "❌ Une erreur est survenue.")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔌 Setup du Cog
+# ────────────────────────────────────────────────────────────────────────────────
+async def setup(bot: commands.Bot):
+    cog = MastermindBench(bot)
+    for command in cog.get_commands():
+        if not hasattr(command, "category"):
+            command.category = "Admin"
+    await bot.add_cog(cog)
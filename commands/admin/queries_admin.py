@@ -0,0 +1,78 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 queries_admin.py — Commande !queries
+# Objectif : Rapport du profileur de requêtes (requêtes les plus coûteuses,
+#            lectures sans filtre, N+1) dans le salon + fichier joint
+# Catégorie : Admin
+# Accès : Administrateur
+# Cooldown : 1 utilisation / 10 secondes / utilisateur
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import discord
+from discord.ext import commands
+from utils.discord_utils import safe_send
+from utils.query_profiler import profiler
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Cog principal
+# ────────────────────────────────────────────────────────────────────────────────
+class QueriesAdmin(commands.Cog):
+    """
+    Commande !queries — Rapport du profileur de requêtes (utils/query_profiler)
+    """
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.command(
+        name="queries",
+        aliases=["requetes"],
+        help="(Admin) Requêtes les plus coûteuses, lectures sans filtre et N+1. `!queries [top]` ou `!queries reset`"
+    )
+    @commands.has_permissions(administrator=True)
+    @commands.cooldown(1, 10.0, commands.BucketType.user)
+    async def prefix_queries(self, ctx: commands.Context, arg: str = "10"):
+        try:
+            if arg.lower() == "reset":
+                profiler.reset()
+                await safe_send(ctx.channel, "🧹 Profil des requêtes remis à zéro.")
+                return
+            top = max(1, min(int(arg) if arg.isdigit() else 10, 25))
+            totals = profiler.totals()
+            embed = discord.Embed(
+                title="🔬 Profil des requêtes",
+                description=(
+                    f"**{totals['calls']}** appels • **{totals['time'] * 1000:.0f} ms** • **{totals['bytes'] / 1024:.1f} Ko**\n"
+                    f"Lectures sans filtre : **{totals['unfiltered']}** • N+1 : **{totals['n_plus_one']}**"
+                    + ("" if profiler.enabled else "\n⚠️ Profileur désactivé (QUERY_PROFILER=off)")
+                ),
+                color=discord.Color.orange() if totals["unfiltered"] or totals["n_plus_one"] else discord.Color.blurple()
+            )
+            for shape in profiler.ranked()[:top]:
+                flags = ("🔴 sans filtre " if shape.unfiltered else "") + (f"🔁 N+1 ×{shape.max_repeat}" if shape.n_plus_one else "")
+                embed.add_field(
+                    name=f"{shape.describe()[:240]}",
+                    value=(
+                        f"`{shape.caller[-80:]}`\n"
+                        f"{shape.calls}× • {shape.total_time * 1000:.1f} ms • {shape.rows / shape.calls:.1f} lignes • "
+                        f"{shape.bytes / shape.calls / 1024:.2f} Ko/appel {flags}"
+                    ),
+                    inline=False
+                )
+            path = await asyncio.to_thread(profiler.dump)
+            await safe_send(ctx.channel, embed=embed, file=discord.File(path, filename=path.name))
+        except Exception as e:
+            print(f"[ERREUR !queries] {e}")
+            await safe_send(ctx.channel, "❌ Une erreur est survenue.")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔌 Setup du Cog
+# ────────────────────────────────────────────────────────────────────────────────
+async def setup(bot: commands.Bot):
+    cog = QueriesAdmin(bot)
+    for command in cog.get_commands():
+        if not hasattr(command, "category"):
+            command.category = "Admin"
+    await bot.add_cog(cog)
@@ -13,6 +13,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from utils.discord_utils import safe_send, safe_respond
+from utils.game_sessions import sessions
 import aiohttp
 import os
 import asyncio
@@ -73,6 +74,9 @@ class RedemarrageCommand(commands.Cog):
             )
             await safe_send(channel, embed=embed)
 
+            # 💾 Sauvegarde les parties en cours pour les reprendre au redémarrage
+            await sessions.flush()
+
             # 2️⃣ Déclenche le redeploy via webhook
             if not self.render_webhook:
                 await safe_send(channel, "⚠️ Webhook Render non configuré.")
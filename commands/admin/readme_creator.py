@@ -14,6 +14,8 @@ from discord import app_commands
 from discord.ext import commands
 import io
 from utils.discord_utils import safe_send, safe_respond  
+from utils.help_catalog import catalog
+from bot import COMMAND_PREFIX
 
 class Commandes(commands.Cog):
     """
@@ -27,28 +29,8 @@ class Commandes(commands.Cog):
     # 🔹 Fonction interne pour générer le contenu Markdown
     # ────────────────────────────────────────────────────────────────────────────
     def build_markdown_content(self):
-        """Renvoie le contenu Markdown complet pour README.md avec format compact et lisible"""
-        content = "# Kisuke Urahara - Bot Discord\n\n"
-        content += "👍 Kisuke Urahara est un bot discord à la con et inutile en python. Il propose quelques commandes simples, peu de commandes amusantes et parfois inspirées du manga bleach, et un petit jeu de collecte de 'reiatsu' qui ne sert à rien. Les commandes fonctionnent avec le préfixe et certaines aussi en mode slash.\n\n---\n\n# Commandes\n\n"
-
-        # Regrouper les commandes par catégorie
-        categories = {}
-        for cmd in self.bot.commands:
-            cat = getattr(cmd, "category", "Autre")
-            desc = cmd.help if cmd.help else "Pas de description."
-            if cat not in categories:
-                categories[cat] = []
-            categories[cat].append((cmd.name, desc))
-
-        # Trier les catégories par ordre alphabétique
-        for cat in sorted(categories.keys(), key=lambda c: c.lower()):
-            content += f"### 📂 {cat}\n"
-            # Trier les commandes par ordre alphabétique
-            for name, desc in sorted(categories[cat], key=lambda x: x[0].lower()):
-                content += f"- **{name} :** {desc}\n"
-            content += "\n"
-
-        return content
+        """Renvoie le contenu Markdown complet pour README.md (rendu mis en cache par utils/help_catalog)"""
+        return catalog.ensure(self.bot, COMMAND_PREFIX).readme()
 
     # ────────────────────────────────────────────────────────────────────────────
     # 🔹 Commande SLASH (admin uniquement)
@@ -16,8 +16,9 @@ import json
 from datetime import datetime
 from discord.ext import commands
 from discord import ui
-from utils.supabase_client import supabase
+from utils.config_service import config
 from utils.discord_utils import safe_send, safe_reply, safe_edit, safe_delete
+from tasks.reiatsu_spawner import SPAWN_MODES, spawn_mode, set_spawn_mode
 
 # ──────────────────────────────────────────────────────────────
 # 🔧 Chargement config globale Reiatsu (JSON)
@@ -45,7 +46,7 @@ class ReiatsuAdmin(commands.Cog):
         name="reiatsuadmin",
         aliases=["rtsa"],
         invoke_without_command=True,
-        help="(Admin) Gère le Reiatsu : set, unset, change, spawn, speed."
+        help="(Admin) Gère le Reiatsu : set, unset, change, spawn, speed, mode."
     )
     @commands.has_permissions(administrator=True)
     @commands.cooldown(rate=1, per=5, type=commands.BucketType.user)
@@ -58,7 +59,8 @@ class ReiatsuAdmin(commands.Cog):
                 "`!!rtsa unset` — Supprime le salon configuré\n"
                 "`!!rtsa change @membre <points>` — Modifie les points d’un membre\n"
                 "`!!rtsa spawn` — Force le spawn immédiat d’un Reiatsu\n"
-                "`!!rtsa speed` — Gère la vitesse du spawn"
+                "`!!rtsa speed` — Gère la vitesse du spawn\n"
+                "`!!rtsa mode [reaction|bouton]` — Capture par réaction 💠 ou par bouton"
             ),
             color=discord.Color.blurple()
         )
@@ -80,28 +82,15 @@ class ReiatsuAdmin(commands.Cog):
             min_delay, max_delay = SPAWN_SPEED_RANGES.get(DEFAULT_SPAWN_SPEED, [1800, 3600])
             delay = random.randint(min_delay, max_delay)
 
-            data = supabase.table("reiatsu_config").select("*").eq("guild_id", guild_id).execute()
-            if data.data:
-                # Mise à jour existante
-                supabase.table("reiatsu_config").update({
-                    "channel_id": channel_id,
-                    "last_spawn_at": now_iso,
-                    "spawn_delay": delay,
-                    "spawn_speed": DEFAULT_SPAWN_SPEED,
-                    "en_attente": False,
-                    "spawn_message_id": None
-                }).eq("guild_id", guild_id).execute()
-            else:
-                # Nouveau serveur
-                supabase.table("reiatsu_config").insert({
-                    "guild_id": guild_id,
-                    "channel_id": channel_id,
-                    "last_spawn_at": now_iso,
-                    "spawn_delay": delay,
-                    "spawn_speed": DEFAULT_SPAWN_SPEED,
-                    "en_attente": False,
-                    "spawn_message_id": None
-                }).execute()
+            # Mise à jour existante ou nouveau serveur (write-through : le spawner est prévenu)
+            config.upsert_guild(guild_id, {
+                "channel_id": channel_id,
+                "last_spawn_at": now_iso,
+                "spawn_delay": delay,
+                "spawn_speed": DEFAULT_SPAWN_SPEED,
+                "en_attente": False,
+                "spawn_message_id": None
+            })
 
             await safe_send(ctx, f"✅ Le salon {ctx.channel.mention} est désormais configuré pour le spawn de Reiatsu avec vitesse par défaut **{DEFAULT_SPAWN_SPEED}**.")
         except Exception as e:
@@ -116,14 +105,13 @@ class ReiatsuAdmin(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def speed_reiatsu(self, ctx: commands.Context):
         guild_id = str(ctx.guild.id)
-        res = supabase.table("reiatsu_config").select("*").eq("guild_id", guild_id).execute()
+        guild_config = config.guild(guild_id)
 
-        if not res.data:
+        if not guild_config:
             await safe_send(ctx, "❌ Aucun salon Reiatsu configuré pour ce serveur.")
             return
 
-        config = res.data[0]
-        current_delay = config.get("spawn_delay", SPAWN_SPEED_RANGES[DEFAULT_SPAWN_SPEED][1])
+        current_delay = guild_config.get("spawn_delay", SPAWN_SPEED_RANGES[DEFAULT_SPAWN_SPEED][1])
 
         # Déterminer la vitesse actuelle
         current_speed_name = DEFAULT_SPAWN_SPEED
@@ -167,10 +155,10 @@ class ReiatsuAdmin(commands.Cog):
             new_speed_name = interaction.data["custom_id"].split("_", 1)[1]
             min_delay, max_delay = SPAWN_SPEED_RANGES[new_speed_name]
             new_delay = random.randint(min_delay, max_delay)
-            supabase.table("reiatsu_config").update({
+            config.update_guild(guild_id, {
                 "spawn_delay": new_delay,
                 "spawn_speed": new_speed_name
-            }).eq("guild_id", guild_id).execute()
+            })
             await interaction.response.edit_message(
                 embed=discord.Embed(
                     title="✅ Vitesse du spawn modifiée",
@@ -186,6 +174,27 @@ class ReiatsuAdmin(commands.Cog):
 
         self.bot.add_view(view)
 
+    # ──────────────────────────────────────────────────────────
+    # 🔹 Sous-commande : MODE
+    # ──────────────────────────────────────────────────────────
+    @reiatsuadmin.command(name="mode")
+    @commands.has_permissions(administrator=True)
+    async def mode_reiatsu(self, ctx: commands.Context, mode: str = None):
+        guild_id = str(ctx.guild.id)
+        current = spawn_mode(guild_id)
+        if mode is None:
+            await safe_send(ctx, f"ℹ️ Mode de capture actuel : **{current}** (possibles : {', '.join(SPAWN_MODES)}).")
+            return
+        mode = mode.lower()
+        if mode not in SPAWN_MODES:
+            await safe_send(ctx, f"❌ Mode inconnu. Possibles : {', '.join(SPAWN_MODES)}.")
+            return
+        try:
+            set_spawn_mode(guild_id, mode)
+            await safe_send(ctx, f"✅ Mode de capture : **{mode}** (appliqué au prochain spawn).")
+        except Exception as e:
+            await safe_send(ctx, f"❌ Une erreur est survenue : `{e}`")
+
 # ──────────────────────────────────────────────────────────
 # 🔌 Setup du Cog
 # ──────────────────────────────────────────────────────────
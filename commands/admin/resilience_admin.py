@@ -0,0 +1,75 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 resilience_admin.py — Commande !resilience
+# Objectif : Afficher l’état des disjoncteurs par table et la file du journal
+#            d’écritures (profondeur, ancienneté, rejeux, fsync)
+# Catégorie : Admin
+# Accès : Administrateur
+# Cooldown : 1 utilisation / 5 secondes / utilisateur
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import discord
+from discord.ext import commands
+from utils.discord_utils import safe_send
+from utils.resilience import resilience, CLOSED, OPEN
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Cog principal
+# ────────────────────────────────────────────────────────────────────────────────
+class ResilienceAdmin(commands.Cog):
+    """
+    Commande !resilience — Jauges des disjoncteurs et du journal (utils/resilience)
+    """
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.command(
+        name="resilience",
+        aliases=["circuits"],
+        help="(Admin) Affiche l’état des circuits de la base et des écritures en attente."
+    )
+    @commands.has_permissions(administrator=True)
+    @commands.cooldown(1, 5.0, commands.BucketType.user)
+    async def prefix_resilience(self, ctx: commands.Context):
+        try:
+            stats = resilience.stats()
+            if not stats["active"]:
+                await safe_send(ctx.channel, "ℹ️ Aucun stockage configuré : disjoncteurs et journal inactifs.")
+                return
+            journal = stats["journal"]
+            embed = discord.Embed(
+                title="🛡️ Résilience du stockage",
+                description=(
+                    f"Journal : **{journal['depth']}** écriture(s) en attente • "
+                    f"rejouées **{journal['replayed']}** • abandonnées **{journal['dropped']}**\n"
+                    f"fsync : **{journal['fsyncs']}** • non synchronisées : **{journal['unsynced']}**"
+                ),
+                color=discord.Color.red() if journal["depth"] else discord.Color.green()
+            )
+            states = {CLOSED: "🟢 Fermé", OPEN: "🔴 Ouvert"}
+            for table, entry in stats["tables"].items():
+                lines = [
+                    f"État : **{states.get(entry['state'], '🟡 Essai')}** • échecs : **{entry['failures']}**",
+                    f"Appels : **{entry['calls']}** • refusés : **{entry['rejected']}** • lents : **{entry['slow']}** • ouvertures : **{entry['trips']}**",
+                ]
+                if entry["state"] != CLOSED:
+                    lines.append(f"Ouvert depuis **{entry['open_for']:.0f}s**")
+                if entry["queued"]:
+                    lines.append(f"📓 En attente : **{entry['queued']}** (la plus ancienne : il y a {entry['oldest_age']:.0f}s)")
+                embed.add_field(name=f"`{table}`", value="\n".join(lines), inline=False)
+            await safe_send(ctx.channel, embed=embed)
+        except Exception as e:
+            print(f"[ERREUR !resilience] {e}")
+            await safe_send(ctx.channel, "❌ Une erreur est survenue.")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔌 Setup du Cog
+# ────────────────────────────────────────────────────────────────────────────────
+async def setup(bot: commands.Bot):
+    cog = ResilienceAdmin(bot)
+    for command in cog.get_commands():
+        if not hasattr(command, "category"):
+            command.category = "Admin"
+    await bot.add_cog(cog)
@@ -0,0 +1,71 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 router_bench.py — Commande !routerbench
+# Objectif : Mesurer le débit de l’aiguillage central des messages (messages/seconde)
+# Catégorie : Admin
+# Accès : Administrateur
+# Cooldown : 1 utilisation / 30 secondes / utilisateur
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import discord
+from discord.ext import commands
+from utils.discord_utils import safe_send
+from utils.message_router import benchmark, router
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Cog principal
+# ────────────────────────────────────────────────────────────────────────────────
+class RouterBench(commands.Cog):
+    """
+    Commande !routerbench — Banc d’essai du routeur de messages + compteurs en direct
+    """
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.command(
+        name="routerbench",
+        help="(Admin) Mesure le nombre de messages/seconde aiguillés par le routeur. `!routerbench [messages]`"
+    )
+    @commands.has_permissions(administrator=True)
+    @commands.cooldown(1, 30.0, commands.BucketType.user)
+    async def prefix_routerbench(self, ctx: commands.Context, messages: int = 200_000):
+        messages = max(10_000, min(messages, 2_000_000))
+        try:
+            result = await asyncio.to_thread(benchmark, messages)
+            live = router.stats()
+            embed = discord.Embed(
+                title="🧭 Routeur de messages — banc d'essai",
+                description=(
+                    f"**{result['per_second']:,.0f}** messages/seconde "
+                    f"({result['messages']:,} messages en {result['seconds'] * 1000:.0f} ms)"
+                ).replace(",", " "),
+                color=discord.Color.blurple()
+            )
+            embed.add_field(
+                name="Flux synthétique",
+                value="\n".join(f"• {name} : {count}" for name, count in result["routes"].items()),
+                inline=True
+            )
+            embed.add_field(
+                name="En direct",
+                value="\n".join(f"• {name} : {count}" for name, count in live["routes"].items())
+                      + f"\n• salons en partie : {live['bound_channels']}",
+                inline=True
+            )
+            await safe_send(ctx.channel, embed=embed)
+        except Exception as e:
+            print(f"[ERREUR !routerbench] {e}")
+            await safe_send(ctx.channel, "❌ Une erreur est survenue.")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔌 Setup du Cog
+# ────────────────────────────────────────────────────────────────────────────────
+async def setup(bot: commands.Bot):
+    cog = RouterBench(bot)
+    for command in cog.get_commands():
+        if not hasattr(command, "category"):
+            command.category = "Admin"
+    await bot.add_cog(cog)
@@ -14,6 +14,7 @@ import re
 from discord import app_commands
 from discord.ext import commands
 from utils.discord_utils import safe_send, safe_delete, safe_respond  
+from utils.member_index import members, parse_user_id
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
@@ -23,35 +24,21 @@ class SayAs(commands.Cog):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        members.install(bot)
 
     # ────────────────────────────────────────────────────────────────────────────
     # 🔹 Fonction utilitaire : résolution d’utilisateur
     # ────────────────────────────────────────────────────────────────────────────
     async def resolve_user(self, guild: discord.Guild, query: str):
-        """Résout un membre ou utilisateur à partir d’une mention, d’un ID ou d’un pseudo"""
-        member = None
-
-        # Mention <@123456789>
-        mention_match = re.match(r"<@!?(\d+)>", query)
-        if mention_match:
-            user_id = int(mention_match.group(1))
-            member = guild.get_member(user_id)
-
-        # ID numérique
-        elif query.isdigit():
-            member = guild.get_member(int(query))
-
-        # Pseudo
-        else:
-            member = discord.utils.find(
-                lambda m: m.name.lower() == query.lower() or m.display_name.lower() == query.lower(),
-                guild.members
-            )
+        """Résout un membre ou utilisateur à partir d’une mention, d’un ID ou d’un pseudo (exact, début, approché)"""
+        # Mention, ID ou pseudo : index des noms du serveur (utils/member_index), sans appel REST
+        member = members.resolve(guild, query)
 
-        # Fallback API
-        if member is None:
+        # Fallback API : seulement pour une mention ou un ID (utilisateur hors du serveur)
+        user_id = parse_user_id(query)
+        if member is None and user_id is not None:
             try:
-                member = await self.bot.fetch_user(int(query))
+                member = await self.bot.fetch_user(user_id)
             except Exception:
                 pass
 
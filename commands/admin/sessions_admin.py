@@ -0,0 +1,103 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 sessions_admin.py — Commandes !sessions et !views
+# Objectif : Afficher les jauges des parties en cours et des Views suivies (nombre, mémoire)
+# Catégorie : Admin
+# Accès : Administrateur
+# Cooldown : 1 utilisation / 5 secondes / utilisateur
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import discord
+from discord.ext import commands
+from utils.discord_utils import safe_send
+from utils.game_sessions import sessions
+from utils.view_registry import view_registry
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Cog principal
+# ────────────────────────────────────────────────────────────────────────────────
+class SessionsAdmin(commands.Cog):
+    """
+    Commandes !sessions et !views — Jauges des parties (utils/game_sessions)
+    et des Views (utils/view_registry)
+    """
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.command(
+        name="sessions",
+        help="(Admin) Affiche les parties en cours et la mémoire utilisée."
+    )
+    @commands.has_permissions(administrator=True)
+    @commands.cooldown(1, 5.0, commands.BucketType.user)
+    async def prefix_sessions(self, ctx: commands.Context):
+        try:
+            stats = sessions.stats()
+            embed = discord.Embed(
+                title="🎮 Parties en cours",
+                description=(
+                    f"En cours : **{stats['live']}** sur **{stats['guilds']}** serveur(s)\n"
+                    f"Max sur un serveur : **{stats['max_guild']}/{sessions.max_per_guild}**\n"
+                    f"Mémoire estimée : **{stats['approx_bytes'] / 1024:.1f} Ko**\n"
+                    f"Expirées : **{stats['expired']}** • Refusées (limite) : **{stats['rejected']}**\n"
+                    f"Instantanés en attente : **{stats['pending_flush']}**"
+                ),
+                color=discord.Color.blurple()
+            )
+            if stats["by_kind"]:
+                embed.add_field(
+                    name="Par jeu",
+                    value="\n".join(f"• {kind} : **{count}**" for kind, count in sorted(stats["by_kind"].items())),
+                    inline=False
+                )
+            if ctx.guild:
+                here = sum(1 for s in sessions.sessions.values() if s.guild_id == str(ctx.guild.id))
+                embed.set_footer(text=f"Sur ce serveur : {here}")
+            await safe_send(ctx.channel, embed=embed)
+        except Exception as e:
+            print(f"[ERREUR !sessions] {e}")
+            await safe_send(ctx.channel, "❌ Une erreur est survenue.")
+
+    @commands.command(
+        name="views",
+        help="(Admin) Affiche les Views suivies par classe et leur mémoire estimée."
+    )
+    @commands.has_permissions(administrator=True)
+    @commands.cooldown(1, 5.0, commands.BucketType.user)
+    async def prefix_views(self, ctx: commands.Context):
+        try:
+            stats = view_registry.stats()
+            embed = discord.Embed(
+                title="🎛️ Views suivies",
+                description=(
+                    f"Vivantes : **{stats['live']}/{view_registry.max_views}**\n"
+                    f"Expirées : **{stats['expired']}** • Évincées (plafond) : **{stats['evicted']}**\n"
+                    f"Reconstruites au clic : **{stats['rehydrated']}**"
+                ),
+                color=discord.Color.blurple()
+            )
+            if stats["by_class"]:
+                embed.add_field(
+                    name="Par classe",
+                    value="\n".join(
+                        f"• {name} : **{entry['count']}** (~{entry['bytes'] / 1024:.1f} Ko)"
+                        for name, entry in sorted(stats["by_class"].items(), key=lambda kv: -kv[1]["bytes"])
+                    ),
+                    inline=False
+                )
+            await safe_send(ctx.channel, embed=embed)
+        except Exception as e:
+            print(f"[ERREUR !views] {e}")
+            await safe_send(ctx.channel, "❌ Une erreur est survenue.")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔌 Setup du Cog
+# ────────────────────────────────────────────────────────────────────────────────
+async def setup(bot: commands.Bot):
+    cog = SessionsAdmin(bot)
+    for command in cog.get_commands():
+        if not hasattr(command, "category"):
+            command.category = "Admin"
+    await bot.add_cog(cog)
@@ -13,35 +13,30 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from discord.ui import View, Button
-import json
-import os
 
 from utils.discord_utils import safe_send, safe_edit, safe_respond, safe_delete
+from utils.game_sessions import sessions
+from utils.story_engine import library, encode_progress, decode_progress, OBJECTION
 
 # ────────────────────────────────────────────────────────────────────────────────
-# 📂 Chargement des histoires JSON
+# ⚙️ Paramètres
 # ────────────────────────────────────────────────────────────────────────────────
-STORIES_JSON_PATH = os.path.join("data", "ace_bleach_stories.json")
-
-def load_stories():
-    try:
-        with open(STORIES_JSON_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"[ERREUR JSON] Impossible de charger {STORIES_JSON_PATH} : {e}")
-        return {}
+PROGRESS_TTL = 24 * 3600   # progression conservée 24 h après le dernier coup (même si la vue expire)
+MAX_SAVED_PROGRESS = 500   # progressions gardées au plus (plafond propre, hors parties en cours)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🎛️ UI — Sélection d'histoire et gameplay
 # ────────────────────────────────────────────────────────────────────────────────
 class StorySelectionView(View):
-    def __init__(self, bot, stories):
+    def __init__(self, cog, stories, resume=None):
         super().__init__(timeout=120)
-        self.bot = bot
+        self.cog = cog
         self.stories = stories
         self.message = None
-        for title in stories.keys():
-            self.add_item(StoryButton(self, title))
+        if resume:
+            self.add_item(ResumeButton(self, *resume))
+        for story in stories.values():
+            self.add_item(StoryButton(self, story))
 
     async def on_timeout(self):
         for child in self.children:
@@ -50,66 +45,93 @@ class StorySelectionView(View):
             await safe_edit(self.message, view=self)
 
 class StoryButton(Button):
-    def __init__(self, parent_view: StorySelectionView, story_title):
-        super().__init__(label=story_title, style=discord.ButtonStyle.primary)
+    def __init__(self, parent_view: StorySelectionView, story):
+        super().__init__(label=story.title[:80], style=discord.ButtonStyle.primary)
         self.parent_view = parent_view
-        self.story_title = story_title
+        self.story = story
 
     async def callback(self, interaction: discord.Interaction):
-        story_data = self.parent_view.stories[self.story_title]
-        first_scene_id = story_data['scenes'][0]['id']
-        await self.parent_view.bot.get_cog('AceBleach')._start_scene(interaction.channel, story_data, first_scene_id)
-        await safe_edit(interaction.message, content=f"📚 Histoire choisie : **{self.story_title}**", embed=None, view=None)
+        await self.parent_view.cog._start_scene(interaction.channel, self.story, self.story.start_id, interaction.user.id)
+        await safe_edit(interaction.message, content=f"📚 Histoire choisie : **{self.story.title}**", embed=None, view=None)
+
+class ResumeButton(Button):
+    def __init__(self, parent_view: StorySelectionView, story, scene_id, objections):
+        super().__init__(label=f"▶️ Reprendre : {story.title}"[:80], style=discord.ButtonStyle.success)
+        self.parent_view = parent_view
+        self.story = story
+        self.scene_id = scene_id
+        self.objections = objections
+
+    async def callback(self, interaction: discord.Interaction):
+        await self.parent_view.cog._start_scene(interaction.channel, self.story, self.scene_id, interaction.user.id, self.objections)
+        await safe_edit(interaction.message, content=f"📚 Reprise de **{self.story.title}**", embed=None, view=None)
 
 # ────────────────────────────────────────────────────────────────────────────────
 class GameButtonView(View):
-    def __init__(self, bot, story_data, current_scene_id, evidence=[]):
+    def __init__(self, cog, story, scene_id, player_id, objections=0):
         super().__init__(timeout=300)
-        self.bot = bot
-        self.story_data = story_data
-        self.current_scene_id = current_scene_id
+        self.cog = cog
+        self.story = story
+        self.current_scene_id = scene_id
+        self.player_id = player_id
+        self.objections = objections
         self.message = None
-        self.evidence = evidence
         self.add_scene_buttons()
 
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.player_id:
+            await safe_respond(interaction, "❌ Ce n’est pas ta partie, lance la tienne avec !bleach_attorney.", ephemeral=True)
+            return False
+        return True
+
+    def build_embed(self) -> discord.Embed:
+        scene = self.story.scenes[self.current_scene_id]
+        embed = discord.Embed(
+            title=f"📖 {scene.character}",
+            description=scene.dialogue,
+            color=discord.Color.orange()
+        )
+        embed.set_footer(text=f"Expression: {scene.expression}")
+        return embed
+
     def add_scene_buttons(self):
         self.clear_items()
-        scene = self.story_data['scenes'][self.current_scene_id]
-        for choice in scene.get('choices', []):
-            self.add_item(SceneChoiceButton(self, choice))
-        for objection in scene.get('objections', []):
-            self.add_item(ObjectionButton(self, objection))
-        if self.evidence:
+        scene = self.story.scenes[self.current_scene_id]
+        for action in scene.actions:
+            self.add_item(SceneActionButton(self, action))
+        if self.story.evidence:
             self.add_item(ExamineEvidenceButton(self))
 
+    async def play(self, interaction: discord.Interaction, action):
+        """Transition : un accès au graphe compilé, sauvegarde compacte de la progression."""
+        await interaction.response.defer()
+        content = None
+        if action.kind == OBJECTION:
+            content = "✅ Objection réussie !" if action.valid else "❌ Objection échouée !"
+            self.objections += action.valid
+        self.current_scene_id = action.next_id
+        self.add_scene_buttons()
+        self.cog._save_progress(self.player_id, self.story, self.current_scene_id, self.objections)
+        await safe_edit(interaction.message, content=content, embed=self.build_embed(), view=self)
+
     async def on_timeout(self):
         for child in self.children:
             child.disabled = True
         if self.message:
-            await safe_edit(self.message, view=self)
-
-class SceneChoiceButton(Button):
-    def __init__(self, parent_view: GameButtonView, choice_data):
-        super().__init__(label=choice_data['text'], style=discord.ButtonStyle.primary)
-        self.parent_view = parent_view
-        self.choice_data = choice_data
-
-    async def callback(self, interaction: discord.Interaction):
-        self.parent_view.current_scene_id = self.choice_data['next_scene']
-        await self.parent_view.show_scene(interaction)
-
-class ObjectionButton(Button):
-    def __init__(self, parent_view: GameButtonView, objection_data):
-        super().__init__(label=f"Objection: {objection_data['text']}", style=discord.ButtonStyle.danger)
+            embed = self.build_embed()
+            if not self.story.scenes[self.current_scene_id].is_ending:
+                embed.set_footer(text="⏸️ Partie en pause — relance !bleach_attorney pour reprendre.")
+            await safe_edit(self.message, embed=embed, view=self)
+
+class SceneActionButton(Button):
+    def __init__(self, parent_view: GameButtonView, action):
+        style = discord.ButtonStyle.danger if action.kind == OBJECTION else discord.ButtonStyle.primary
+        super().__init__(label=action.label, style=style, custom_id=action.custom_id)
         self.parent_view = parent_view
-        self.objection_data = objection_data
+        self.action = action
 
     async def callback(self, interaction: discord.Interaction):
-        valid = self.objection_data.get('valid', False)
-        content = "✅ Objection réussie !" if valid else "❌ Objection échouée !"
-        next_scene_id = self.objection_data.get('next_scene', self.parent_view.current_scene_id)
-        self.parent_view.current_scene_id = next_scene_id
-        await safe_edit(interaction.message, content=content, embed=None, view=self.parent_view)
+        await self.parent_view.play(interaction, self.action)
 
 class ExamineEvidenceButton(Button):
     def __init__(self, parent_view: GameButtonView):
@@ -117,7 +139,7 @@ class ExamineEvidenceButton(Button):
         self.parent_view = parent_view
 
     async def callback(self, interaction: discord.Interaction):
-        evidences = self.parent_view.evidence
+        evidences = self.parent_view.story.evidence
         if not evidences:
             await safe_respond(interaction, "❌ Aucune preuve à examiner.", ephemeral=True)
             return
@@ -131,39 +153,44 @@ class AceBleach(commands.Cog):
     """Mini-jeu complet Ace Attorney avec dialogues, preuves, objections et scènes interactives."""
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-
-    async def _send_story_selection(self, channel: discord.abc.Messageable):
-        stories = load_stories()
+        library.load()   # compilation unique des histoires (validation au chargement)
+        sessions.register(bot, "attorney", restore=self._restore, limit=MAX_SAVED_PROGRESS)
+
+    # 🔹 Progression sauvegardée (utils/game_sessions) : survit à l’expiration des vues
+    async def _restore(self, session):
+        return decode_progress(library, session.state)
+
+    def _save_progress(self, player_id, story, scene_id, objections):
+        entry = sessions.get("attorney", player_id)
+        if story.scenes[scene_id].is_ending:
+            if entry:
+                sessions.close(entry)
+            return
+        state = encode_progress(story, scene_id, objections)
+        if entry:
+            entry.state = state
+            entry.handle = (story, scene_id, objections)
+            sessions.touch(entry, PROGRESS_TTL)
+        elif sessions.open("attorney", player_id, ttl=PROGRESS_TTL, state=state, handle=(story, scene_id, objections)) is None:
+            print(f"[ERREUR attorney] Progression de {player_id} non sauvegardée : {MAX_SAVED_PROGRESS} progressions déjà gardées")
+
+    def _saved_progress(self, player_id):
+        entry = sessions.get("attorney", player_id)
+        return decode_progress(library, entry.state) if entry else None
+
+    async def _send_story_selection(self, channel: discord.abc.Messageable, user=None):
+        stories = library.load()
         if not stories:
             await safe_send(channel, "❌ Aucune histoire disponible.")
             return
-        view = StorySelectionView(self.bot, stories)
+        resume = self._saved_progress(user.id) if user else None
+        view = StorySelectionView(self, stories, resume)
         view.message = await safe_send(channel, "📚 Choisis ton histoire Bleach :", view=view)
 
-    async def _start_scene(self, channel, story_data, scene_id):
-        scene = story_data['scenes'][scene_id]
-        embed = discord.Embed(
-            title=f"📖 {scene.get('character', '???')}",
-            description=scene.get('dialogue', ''),
-            color=discord.Color.orange()
-        )
-        embed.set_footer(text=f"Expression: {scene.get('expression', 'neutre')}")
-        evidence = story_data.get('evidence', [])
-        view = GameButtonView(self.bot, story_data, scene_id, evidence)
-        view.message = await safe_send(channel, embed=embed, view=view)
-
-        async def show_scene(interaction):
-            scene = story_data['scenes'][view.current_scene_id]
-            embed = discord.Embed(
-                title=f"📖 {scene.get('character', '???')}",
-                description=scene.get('dialogue', ''),
-                color=discord.Color.orange()
-            )
-            embed.set_footer(text=f"Expression: {scene.get('expression', 'neutre')}")
-            view.add_scene_buttons()
-            await safe_edit(interaction.message, embed=embed, view=view)
-
-        view.show_scene = show_scene
+    async def _start_scene(self, channel, story, scene_id, player_id, objections=0):
+        view = GameButtonView(self, story, scene_id, player_id, objections)
+        self._save_progress(player_id, story, scene_id, objections)
+        view.message = await safe_send(channel, embed=view.build_embed(), view=view)
 
     # ────────────────────────────────────────────────────────────────────────────
     @app_commands.command(name="bleach_attorney", description="Lance le mini-jeu Ace Attorney version Bleach.")
@@ -171,7 +198,7 @@ class AceBleach(commands.Cog):
     async def slash_ace_bleach(self, interaction: discord.Interaction):
         try:
             await interaction.response.defer()
-            await self._send_story_selection(interaction.channel)
+            await self._send_story_selection(interaction.channel, interaction.user)
             await interaction.delete_original_response()
         except app_commands.CommandOnCooldown as e:
             await safe_respond(interaction, f"⏳ Attends encore {e.retry_after:.1f}s.", ephemeral=True)
@@ -183,7 +210,7 @@ class AceBleach(commands.Cog):
     @commands.cooldown(1, 15.0, commands.BucketType.user)
     async def prefix_ace_bleach(self, ctx: commands.Context):
         try:
-            await self._send_story_selection(ctx.channel)
+            await self._send_story_selection(ctx.channel, ctx.author)
         except commands.CommandOnCooldown as e:
             await safe_send(ctx.channel, f"⏳ Attends encore {e.retry_after:.1f}s.")
         except Exception as e:
@@ -18,6 +18,7 @@ import random
 
 # Import des fonctions sécurisées pour éviter le rate-limit 429
 from utils.discord_utils import safe_send, safe_edit  # <-- Import des utils
+from utils.image_assets import assets
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 📂 Chargement des données JSON
@@ -123,8 +124,16 @@ class Division(commands.Cog):
                 description=f"Tu serais dans la **{best_division}** !",
                 color=discord.Color.green()
             )
-            embed_result.set_image(url=f"attachment://{os.path.basename(divisions[best_division]['image'])}")
-            await safe_send(ctx.channel, embed=embed_result)
+            # Image de la division (index + cache de utils/image_assets, image par défaut sinon)
+            namespace, key = assets.find(divisions[best_division]["image"])
+            file, image_url = assets.attachment(namespace, key)
+            if image_url:
+                embed_result.set_image(url=image_url)
+            if file:
+                message = await safe_send(ctx.channel, embed=embed_result, file=file)
+                assets.remember(namespace, key, message)
+            else:
+                await safe_send(ctx.channel, embed=embed_result)
 
         except Exception as e:
             print(f"[ERREUR division] {e}")
@@ -14,6 +14,7 @@ from discord import app_commands
 import json, os
 
 from utils.discord_utils import safe_send
+from utils.image_assets import assets
 
 # ───────────────────────────────────────────────
 # 📂 Données Kidō
@@ -116,16 +117,11 @@ class Kido(commands.Cog):
             incantation = sort.get("incantation")
             image = sort.get("image")
 
-            # Chemin image locale (ex: data/images/kido/1Sai.gif)
-            local_img = os.path.join("data", "images", "kido", f"{numero}{nom.replace(' ', '')}.gif")
-
-            files = None
-            if os.path.exists(local_img):
-                # Attache le fichier et l’associe à l’embed
-                file = discord.File(local_img, filename=os.path.basename(local_img))
-                files = [file]
-                image_url = f"attachment://{os.path.basename(local_img)}"
-            else:
+            # Image locale indexée (ex: data/images/kido/1Sai.gif), URL CDN réutilisée après le 1er envoi
+            image_key = f"{numero}{nom.replace(' ', '')}"
+            file, image_url = assets.attachment("kido", image_key)
+            files = [file] if file else None
+            if not image_url:
                 # Sinon utilise l’image définie dans kido.json (si présente)
                 image_url = image
 
@@ -146,8 +142,11 @@ class Kido(commands.Cog):
             # Envoi final
             if isinstance(target, discord.Interaction):
                 await target.response.send_message(embed=embed, files=files)
+                message = await target.original_response() if files else None
             else:
-                await safe_send(target.channel, embed=embed, files=files)
+                message = await safe_send(target.channel, embed=embed, files=files)
+            if files:
+                assets.remember("kido", image_key, message)
 
         except FileNotFoundError:
             err = "❌ Le fichier `kido.json` est introuvable."
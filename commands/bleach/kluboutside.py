@@ -13,17 +13,21 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from discord.ui import View
+import asyncio
 import json
 import os
 import random
 
-from utils.discord_utils import safe_send, safe_edit, safe_respond
+from utils.discord_utils import safe_send, safe_edit, safe_respond, safe_edit_response
+from utils.interaction_router import interactions
+from utils.image_assets import assets, CACHE_CHANNEL_SETTING
+from utils.config_service import config
 
 # ────────────────────────────────────────────────────────────────
 # 📂 Chargement des données JSON
 # ────────────────────────────────────────────────────────────────
 KO_DATA_PATH = os.path.join("data", "ko.json")
-KO_IMAGE_DIR = os.path.join("data", "images", "kluboutside")
+KO_IMAGE_NAMESPACE = "kluboutside"   # sous-dossier de data/images (voir utils/image_assets)
 
 def load_data():
     """Charge le fichier JSON contenant les questions Klub Outside."""
@@ -38,14 +42,16 @@ def load_data():
 # 🎛️ UI — Pagination interactive
 # ────────────────────────────────────────────────────────────────
 class KlubPaginator(View):
-    def __init__(self, user, data):
+    def __init__(self, user, data, cache_channel=None):
         super().__init__(timeout=60)
         self.user = user
         self.data = data
+        self.cache_channel = cache_channel
         self.keys = list(data.get("Questions", {}).keys())
         self.index = 0
 
-    async def send_embed(self, interaction: discord.Interaction):
+    async def build_embed(self):
+        """Embed de la question courante + (fichier à joindre ou None)."""
         key = self.keys[self.index]
         question = self.data["Questions"][key]
 
@@ -58,20 +64,23 @@ class KlubPaginator(View):
         embed.add_field(name="💬 Réponse", value=question.get("réponse", "?"), inline=False)
         embed.set_footer(text=f"{self.index+1} / {len(self.keys)}")
 
-        image_path = self._find_image_file(key)
-        if image_path:
-            file = discord.File(image_path, filename=os.path.basename(image_path))
-            embed.set_image(url=f"attachment://{os.path.basename(image_path)}")
-            await interaction.response.edit_message(embed=embed, view=self, attachments=[file])
-        else:
-            await interaction.response.edit_message(embed=embed, view=self, attachments=[])
+        # Chaque page tournée réédite le message et supprime ses pièces jointes : l’image est
+        # hébergée une seule fois dans le salon de cache (jamais réédité), puis servie par URL
+        image_url = None
+        if self.cache_channel is not None:
+            image_url = await assets.host(self.cache_channel, KO_IMAGE_NAMESPACE, f"ko{key}")
+        file = None
+        if image_url is None:
+            # Pas de salon de cache : image pré-redimensionnée jointe à chaque page
+            file, image_url = assets.attachment(KO_IMAGE_NAMESPACE, f"ko{key}", reuse=False)
+        if image_url:
+            embed.set_image(url=image_url)
+        return embed, file
 
-    def _find_image_file(self, key):
-        for ext in ["png", "jpg", "jpeg", "webp"]:
-            path = os.path.join(KO_IMAGE_DIR, f"ko{key}.{ext}")
-            if os.path.exists(path):
-                return path
-        return None
+    async def send_embed(self, interaction: discord.Interaction):
+        interactions.watch(interaction)   # premier envoi d’une image au salon de cache : defer si lent
+        embed, file = await self.build_embed()
+        await safe_edit_response(interaction, embed=embed, view=self, attachments=[file] if file else [])
 
     @discord.ui.button(label="◀️", style=discord.ButtonStyle.secondary)
     async def previous(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -106,6 +115,15 @@ class KlubOutside(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+    def _cache_channel(self):
+        """Salon caché où les images sont envoyées une fois (!imagecache set), sinon None."""
+        channel_id = config.setting(CACHE_CHANNEL_SETTING)
+        return self.bot.get_channel(int(channel_id)) if channel_id and channel_id.isdigit() else None
+
+    async def cog_load(self):
+        # Redimensionne les images en arrière-plan une seule fois (cache disque réutilisé ensuite)
+        asyncio.get_running_loop().run_in_executor(None, assets.warm, KO_IMAGE_NAMESPACE)
+
     # ──────────────────────────────────────────────────────────
     # 🔹 Fonction interne commune
     # ──────────────────────────────────────────────────────────
@@ -135,24 +153,10 @@ class KlubOutside(commands.Cog):
             await safe_send(channel, f"❌ Argument non reconnu : `{argument}`. Utilise un numéro ou `random`.")
             return
 
-        view = KlubPaginator(user or channel, data)
+        view = KlubPaginator(user or channel, data, self._cache_channel())
         view.index = start_index
-        key = view.keys[start_index]
-        question = data["Questions"][key]
-
-        embed = discord.Embed(
-            title=f"📓 Question Klub Outside n°{key}",
-            color=discord.Color.dark_green()
-        )
-        embed.add_field(name="📅 Date", value=question.get("date", "?"), inline=False)
-        embed.add_field(name="❓ Question", value=question.get("question", "?"), inline=False)
-        embed.add_field(name="💬 Réponse", value=question.get("réponse", "?"), inline=False)
-        embed.set_footer(text=f"{start_index+1} / {len(view.keys)}")
-
-        image_path = view._find_image_file(key)
-        if image_path:
-            embed.set_image(url=f"attachment://{os.path.basename(image_path)}")
-            file = discord.File(image_path, filename=os.path.basename(image_path))
+        embed, file = await view.build_embed()
+        if file:
             await safe_send(channel, embed=embed, view=view, file=file)
         else:
             await safe_send(channel, embed=embed, view=view)
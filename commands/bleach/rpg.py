@@ -11,6 +11,9 @@ from discord.ext import commands
 from discord.ui import View, Button
 import random
 from utils.supabase_client import supabase
+from utils.leaderboard import leaderboard
+from utils.reiatsu_profiles import profiles
+from utils.steam_keys import steam_inventory
 from utils.discord_utils import safe_send, safe_edit, safe_respond
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -23,14 +26,13 @@ WIN_CHANCE = 0.5  # 0.5 = 50% de chance de gagner
 # 🎛️ UI — View avec bouton miser + rafraîchir
 # ────────────────────────────────────────────────────────────────────────────────
 class SteamKeyView(View):
-    def __init__(self, author_id: int, keys_dispo: list):
+    def __init__(self, author_id: int, nb_keys: int):
         super().__init__(timeout=120)
         self.author_id = author_id
         self.value = None
         self.last_interaction = None
-        self.keys_dispo = keys_dispo
 
-        if len(keys_dispo) == 0:
+        if nb_keys == 0:
             self.bet_button.disabled = True
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
@@ -51,8 +53,8 @@ class SteamKeyView(View):
 
     @discord.ui.button(label="🔄 Rafraîchir", style=discord.ButtonStyle.blurple)
     async def refresh_button(self, interaction: discord.Interaction, button: Button):
-        keys_resp = supabase.table("steam_keys").select("game_name").eq("won", False).execute()
-        keys_dispo = keys_resp.data if keys_resp.data else []
+        nb_keys = steam_inventory.count()
+        games = steam_inventory.games()
 
         embed = discord.Embed(
             title="🎮 Jeu Steam Key",
@@ -60,12 +62,11 @@ class SteamKeyView(View):
             color=discord.Color.blurple()
         )
         embed.add_field(name="Probabilité de gagner", value=f"{int(WIN_CHANCE*100)}%", inline=False)
-        embed.add_field(name="Clés restantes", value=str(len(keys_dispo)), inline=False)
-        embed.add_field(name="Jeux dispo", value=", ".join({k['game_name'] for k in keys_dispo}) if keys_dispo else "Aucun", inline=True)
+        embed.add_field(name="Clés restantes", value=str(nb_keys), inline=False)
+        embed.add_field(name="Jeux dispo", value=", ".join(games) if games else "Aucun", inline=True)
         embed.set_footer(text="Vous avez 2 minutes pour miser.")
 
-        self.keys_dispo = keys_dispo
-        self.bet_button.disabled = len(keys_dispo) == 0
+        self.bet_button.disabled = nb_keys == 0
 
         await interaction.response.edit_message(embed=embed, view=self)
 
@@ -109,21 +110,13 @@ class SteamKey(commands.Cog):
 
     async def _update_reiatsu(self, user_id: str, new_points: int):
         supabase.table("reiatsu").update({"points": new_points}).eq("user_id", user_id).execute()
-
-    async def _get_one_steam_key(self):
-        resp = supabase.table("steam_keys").select("*").eq("won", False).limit(1).execute()
-        if resp.data and len(resp.data) > 0:
-            return resp.data[0]
-        return None
-
-    async def _mark_steam_key_won(self, key_id: int, winner: str):
-        supabase.table("steam_keys").update({"won": True, "winner": winner}).eq("id", key_id).execute()
+        profiles.apply(user_id, {"points": new_points})
+        leaderboard.update(user_id, new_points)
 
     # ─────────── Logique du jeu ───────────
     async def _try_win_key(self, interaction_or_ctx):
         # 🚫 Protection supplémentaire côté logique
-        key_check = await self._get_one_steam_key()
-        if not key_check:
+        if not steam_inventory.count():
             await self._send(interaction_or_ctx, discord.Embed(
                 title="⛔ Impossible de miser",
                 description="Aucune clé disponible pour le moment.",
@@ -145,24 +138,31 @@ class SteamKey(commands.Cog):
         await self._update_reiatsu(user_id, reiatsu_points - REIATSU_COST)
 
         if random.random() <= WIN_CHANCE:
-            key = key_check
+            key = await steam_inventory.reserve(user_id)
+            if not key:
+                await self._send(interaction_or_ctx, discord.Embed(
+                    title="🎮 Jeu Steam Key",
+                    description="🎉 Gagné ! Mais la dernière clé vient d'être prise 😢",
+                    color=discord.Color.gold()
+                ))
+                return
             embed = discord.Embed(title="🎉 Félicitations !", description="Tu as gagné une clé Steam !", color=discord.Color.green())
-            embed.add_field(name="Jeu", value=key["game_name"], inline=True)
-            embed.add_field(name="Lien Steam", value=f"[Voir sur Steam]({key['steam_url']})", inline=True)
+            embed.add_field(name="Jeu", value=key.game_name, inline=True)
+            embed.add_field(name="Lien Steam", value=f"[Voir sur Steam]({key.steam_url})", inline=True)
             embed.set_footer(text="Confirme si tu veux recevoir la clé en DM")
 
             view = ConfirmKeyView(interaction_or_ctx.user.id)
             msg = await self._send(interaction_or_ctx, embed, view)
             await view.wait()
 
-            if view.confirmed:
-                await self._mark_steam_key_won(key["id"], interaction_or_ctx.user.name)
+            if view.confirmed and await steam_inventory.confirm(key, interaction_or_ctx.user.name):
                 try:
-                    await interaction_or_ctx.user.send(f"🎁 **Clé Steam pour {key['game_name']}**\n`{key['steam_key']}`")
+                    await interaction_or_ctx.user.send(f"🎁 **Clé Steam pour {key.game_name}**\n`{key.steam_key}`")
                     await safe_edit(msg, embed=discord.Embed(title="✅ Clé envoyée en DM !", color=discord.Color.green()), view=None)
                 except discord.Forbidden:
                     await safe_edit(msg, embed=discord.Embed(title="⚠️ Impossible d'envoyer un DM. Active-les et réessaie.", color=discord.Color.orange()), view=None)
             else:
+                await steam_inventory.release(key)
                 await safe_edit(msg, embed=discord.Embed(title="🔄 Clé laissée dispo pour les autres joueurs.", color=discord.Color.blurple()), view=None)
 
         else:
@@ -212,10 +212,8 @@ class SteamKey(commands.Cog):
             await safe_send(ctx.channel, "❌ Une erreur est survenue.")
 
     async def _send_menu(self, channel, user_id: int):
-        keys_resp = supabase.table("steam_keys").select("game_name").eq("won", False).execute()
-        keys_dispo = keys_resp.data if keys_resp.data else []
-        nb_keys = len(keys_dispo)
-        games = {k["game_name"] for k in keys_dispo}
+        nb_keys = steam_inventory.count()
+        games = steam_inventory.games()
 
         embed = discord.Embed(
             title="🎮 Jeu Steam Key",
@@ -226,7 +224,7 @@ class SteamKey(commands.Cog):
         embed.add_field(name="Clés restantes", value=str(nb_keys), inline=False)
         embed.add_field(name="Jeux dispo", value=", ".join(games) if games else "Aucun", inline=True)
         embed.set_footer(text="Vous avez 2 minutes pour miser.")
-        view = SteamKeyView(user_id, keys_dispo)
+        view = SteamKeyView(user_id, nb_keys)
         await safe_send(channel, embed=embed, view=view)
         return view
 
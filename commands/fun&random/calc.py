@@ -13,9 +13,9 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from discord.ui import View, Button
-import math
 
 from utils.discord_utils import safe_send, safe_edit, safe_respond  
+from utils.safe_calc import calculator, CalcError
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🎛️ UI — Mini-clavier interactif
@@ -57,33 +57,14 @@ class CalcButton(Button):
 
         # 🔹 Calculer
         elif label == "=":
-            try:
-                # 🔹 Easter egg : si l'utilisateur tape exactement "1+1"
-                if view.expression.strip() == "1+1":
-                    view.result = 11
-                else:
-                    expr = (
-                        view.expression
-                        .replace("π", str(math.pi))
-                        .replace("e", str(math.e))
-                        .replace("^", "**")
-                    )
-                    funcs = {
-                        "sqrt": "math.sqrt",
-                        "log": "math.log10",
-                        "ln": "math.log",
-                        "sin": "math.sin(math.radians",
-                        "cos": "math.cos(math.radians",
-                        "tan": "math.tan(math.radians",
-                        "!": "math.factorial"
-                    }
-                    for k, v in funcs.items():
-                        expr = expr.replace(k+"(", v+"(")
-                    # Équilibrer les parenthèses
-                    expr += ")" * (expr.count("(") - expr.count(")"))
-                    view.result = eval(expr, {"math": math, "__builtins__": {}})
-            except Exception:
-                view.result = "Erreur"
+            # 🔹 Easter egg : si l'utilisateur tape exactement "1+1"
+            if view.expression.strip() == "1+1":
+                view.result = 11
+            else:
+                try:
+                    view.result = await calculator.compute(view.expression)
+                except CalcError:
+                    view.result = "Erreur"
 
         # 🔹 Ajouter chiffre ou opération (style Google Calculator)
         else:
@@ -124,6 +105,9 @@ class ScientificCalculator(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+    async def cog_unload(self):
+        calculator.shutdown()
+
     async def _send_calculator(self, channel: discord.abc.Messageable):
         view = CalculatorView()
         screen = (
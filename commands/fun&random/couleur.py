@@ -14,6 +14,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from utils.discord_utils import safe_send, safe_edit, safe_respond
+from utils.image_render import swatch_file
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🎛️ Vue interactive avec bouton "Nouvelle couleur"
@@ -25,21 +26,20 @@ class CouleurView(discord.ui.View):
         self.message = None
 
     def generer_embed(self):
-        """Génère un embed avec une couleur aléatoire et son aperçu visuel."""
+        """Génère un embed avec une couleur aléatoire et son aperçu (PNG rendu en mémoire)."""
         code_hex = random.randint(0, 0xFFFFFF)
         hex_str = f"#{code_hex:06X}"
         r = (code_hex >> 16) & 0xFF
         g = (code_hex >> 8) & 0xFF
         b = code_hex & 0xFF
         rgb_str = f"({r}, {g}, {b})"
-        image_url = f"https://dummyimage.com/700x200/{code_hex:06x}/{code_hex:06x}.png&text=+"
         embed = discord.Embed(
             title="🌈 Couleur aléatoire",
             description=f"🔹 **Code HEX** : `{hex_str}`\n🔸 **Code RGB** : `{rgb_str}`",
             color=code_hex
         )
-        embed.set_image(url=image_url)
-        return embed
+        embed.set_image(url="attachment://couleur.png")
+        return embed, swatch_file(code_hex)
 
     @discord.ui.button(label="🔁 Nouvelle couleur", style=discord.ButtonStyle.primary)
     async def regenerate(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -47,8 +47,8 @@ class CouleurView(discord.ui.View):
             await interaction.response.send_message("❌ Tu ne peux pas utiliser ce bouton.", ephemeral=True)
             return
         try:
-            new_embed = self.generer_embed()
-            await safe_edit(interaction.message, embed=new_embed, view=self)
+            new_embed, file = self.generer_embed()
+            await safe_edit(interaction.message, embed=new_embed, view=self, attachments=[file])
             await interaction.response.defer()
         except Exception as e:
             await safe_edit(interaction, content=f"❌ Erreur : {e}", view=None)
@@ -83,11 +83,10 @@ class CouleurCommand(commands.Cog):
     async def slash_couleur(self, interaction: discord.Interaction):
         try:
             view = CouleurView(interaction.user)
-            embed = view.generer_embed()
-        
+            embed, file = view.generer_embed()
 
             # Répond directement à l'interaction
-            await interaction.response.send_message(embed=embed, view=view)
+            await interaction.response.send_message(embed=embed, view=view, file=file)
             view.message = await interaction.original_response()
         except Exception as e:
             print(f"[ERREUR /couleur] {e}")
@@ -106,9 +105,9 @@ class CouleurCommand(commands.Cog):
     async def prefix_couleur(self, ctx: commands.Context):
         try:
             view = CouleurView(ctx.author)
-            embed = view.generer_embed()
- 
-            view.message = await safe_send(ctx, embed=embed, view=view)
+            embed, file = view.generer_embed()
+
+            view.message = await safe_send(ctx, embed=embed, view=view, file=file)
         except Exception as e:
             print(f"[ERREUR !couleur] {e}")
             await safe_send(ctx, "❌ Une erreur est survenue lors de la génération de la couleur.")
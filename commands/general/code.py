@@ -13,6 +13,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from utils.discord_utils import safe_send, safe_respond  
+from utils.interaction_router import auto_defer
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
@@ -49,6 +50,7 @@ class CodeCommand(commands.Cog):
         name="code",
         description="Affiche un lien cliquable vers le code source du bot."
     )
+    @auto_defer(ephemeral=True)
     @app_commands.checks.cooldown(1, 3.0, key=lambda i: (i.user.id))
     async def slash_code(self, interaction: discord.Interaction):
         try:
@@ -4,6 +4,7 @@
 # Catégorie : Général
 # Accès : Public
 # Cooldown : 1 utilisation / 5 sec / utilisateur
+# Vues : durée de vie bornée via utils/view_registry, reconstruites au clic si libérées
 # ────────────────────────────────────────────────────────────────────────────────
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -13,8 +14,12 @@ import discord
 from discord.ext import commands
 from discord.ui import View, Select, Button
 from bot import get_prefix
-import math
+import re
 from utils.discord_utils import safe_send, safe_edit, safe_respond
+from utils.view_registry import view_registry
+from utils.help_catalog import catalog
+
+PAGE_TITLE = re.compile(r"📂 (.+) — Page (\d+)/\d+")
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🎛️ UI — Sélecteur de catégorie
@@ -32,55 +37,45 @@ class HelpCategorySelect(Select):
         self.parent_view = parent_view
         options = [
             discord.SelectOption(label=cat, description=f"{len(cmds)} commande(s)")
-            for cat, cmds in sorted(self.parent_view.categories.items())
+            for cat, cmds in self.parent_view.categories.items()   # déjà triées par le catalogue
         ]
-        super().__init__(placeholder="Sélectionne une catégorie", options=options)
+        super().__init__(placeholder="Sélectionne une catégorie", options=options, custom_id="help:categorie")
 
     async def callback(self, interaction: discord.Interaction):
         await interaction.response.defer()
         selected_cat = self.values[0]
-        commands_in_cat = sorted(self.parent_view.categories[selected_cat], key=lambda c: c.name)
-        paginator = HelpPaginatorView(self.parent_view.bot, selected_cat, commands_in_cat, self.parent_view.prefix, self.parent_view)
+        paginator = HelpPaginatorView(self.parent_view.bot, selected_cat, catalog.pages(selected_cat), self.parent_view)
         await safe_edit(
             interaction.message,
             content=f"📂 Catégorie sélectionnée : **{selected_cat}**",
             embed=paginator.create_embed(),
             view=paginator
         )
+        view_registry.track(paginator, interaction.message)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🎛️ UI — Pagination des commandes
 # ────────────────────────────────────────────────────────────────────────────────
 class HelpPaginatorView(View):
-    def __init__(self, bot, category, commands_list, prefix, parent_view):
+    def __init__(self, bot, category, pages, parent_view):
         super().__init__(timeout=None)
         self.bot = bot
         self.category = category
-        self.commands = commands_list
-        self.prefix = prefix
+        self.pages = pages            # embeds pré-construits par utils/help_catalog
         self.parent_view = parent_view
         self.page = 0
-        self.per_page = 10
-        self.total_pages = max(1, math.ceil(len(self.commands) / self.per_page))
+        self.total_pages = max(1, len(self.pages))
         if self.total_pages > 1:
             self.add_item(PrevButton(self))
             self.add_item(NextButton(self))
         self.add_item(HelpCategorySelect(self.parent_view))
 
     def create_embed(self):
-        embed = discord.Embed(
-            title=f"📂 {self.category} — Page {self.page + 1}/{self.total_pages}",
-            color=discord.Color.blurple()
-        )
-        start, end = self.page * self.per_page, (self.page + 1) * self.per_page
-        for cmd in self.commands[start:end]:
-            embed.add_field(name=f"`{self.prefix}{cmd.name}`", value=cmd.help or "Pas de description.", inline=False)
-        embed.set_footer(text=f"Utilise {self.prefix}help <commande> pour plus de détails.")
-        return embed
+        return self.pages[self.page]
 
 class PrevButton(Button):
     def __init__(self, paginator):
-        super().__init__(label="◀️", style=discord.ButtonStyle.primary)
+        super().__init__(label="◀️", style=discord.ButtonStyle.primary, custom_id="help:prev")
         self.paginator = paginator
 
     async def callback(self, interaction: discord.Interaction):
@@ -91,7 +86,7 @@ class PrevButton(Button):
 
 class NextButton(Button):
     def __init__(self, paginator):
-        super().__init__(label="▶️", style=discord.ButtonStyle.primary)
+        super().__init__(label="▶️", style=discord.ButtonStyle.primary, custom_id="help:next")
         self.paginator = paginator
 
     async def callback(self, interaction: discord.Interaction):
@@ -108,35 +103,51 @@ class HelpCommand(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
+        view_registry.register_persistent(bot, "help:", self._rehydrate)
+
+    def _catalog(self, message):
+        """Catalogue construit une fois, reconstruit seulement si les extensions ont changé."""
+        return catalog.ensure(self.bot, get_prefix(self.bot, message))
+
+    # 🔹 Reconstruction d’un menu dont la View a été libérée (clic après expiration)
+    async def _rehydrate(self, interaction: discord.Interaction):
+        cat = self._catalog(interaction.message)
+        category_view = HelpCategoryView(self.bot, cat.categories, cat.prefix)
+        if interaction.data.get("custom_id") == "help:categorie":
+            return category_view
+        title = interaction.message.embeds[0].title if interaction.message.embeds else ""
+        match = PAGE_TITLE.match(title or "")
+        if not match or match.group(1) not in category_view.categories:
+            return None
+        category = match.group(1)
+        paginator = HelpPaginatorView(self.bot, category, cat.pages(category), category_view)
+        paginator.page = min(int(match.group(2)) - 1, paginator.total_pages - 1)
+        return paginator
 
     @commands.command(name="help", aliases=["h"], help="Affiche la liste des commandes ou une commande spécifique.")
     @commands.cooldown(1, 5, commands.BucketType.user)
     async def help_func(self, ctx: commands.Context, commande: str = None):
-        prefix = get_prefix(self.bot, ctx.message)
+        cat = self._catalog(ctx.message)
 
-        # 🔍 Aide pour commande spécifique
+        # 🔍 Aide pour commande spécifique (nom, alias, ou début de nom)
         if commande:
             cmd = self.bot.get_command(commande)
-            if not cmd:
-                return await safe_send(ctx.channel, f"❌ La commande `{commande}` n'existe pas.")
-
-            embed = discord.Embed(title=f"ℹ️ Aide pour `{prefix}{cmd.name}`", color=discord.Color.green())
-            embed.add_field(name="📄 Description", value=cmd.help or "Pas de description.", inline=False)
-            if cmd.aliases:
-                embed.add_field(name="🔁 Alias", value=", ".join(f"`{a}`" for a in cmd.aliases), inline=False)
-            embed.set_footer(text="📌 Syntaxe : <obligatoire> [optionnel]")
-            return await safe_send(ctx.channel, embed=embed)
+            embed = cat.command_embed(cmd.name if cmd else commande)
+            if embed:
+                return await safe_send(ctx.channel, embed=embed)
+
+            suggestions = cat.search(commande)
+            if len(suggestions) == 1:
+                return await safe_send(ctx.channel, embed=cat.command_embed(suggestions[0]))
+            if suggestions:
+                listing = ", ".join(f"`{cat.prefix}{name}`" for name in suggestions)
+                return await safe_send(ctx.channel, f"❓ La commande `{commande}` n'existe pas. Tu voulais dire : {listing} ?")
+            return await safe_send(ctx.channel, f"❌ La commande `{commande}` n'existe pas.")
 
         # 📜 Liste des commandes par catégorie
-        categories = {}
-        for cmd in self.bot.commands:
-            if cmd.hidden:
-                continue
-            cat = getattr(cmd, "category", "Autres")
-            categories.setdefault(cat, []).append(cmd)
-
-        view = HelpCategoryView(self.bot, categories, prefix)
-        await safe_send(ctx.channel, "📌 Sélectionne une catégorie pour voir ses commandes :", view=view)
+        view = HelpCategoryView(self.bot, cat.categories, cat.prefix)
+        message = await safe_send(ctx.channel, "📌 Sélectionne une catégorie pour voir ses commandes :", view=view)
+        view_registry.track(view, message)
 
     def cog_load(self):
         self.help_func.category = "Général"
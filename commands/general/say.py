@@ -11,6 +11,9 @@ from discord.ext import commands
 from discord.ui import View, Button
 import random
 from utils.supabase_client import supabase
+from utils.leaderboard import leaderboard
+from utils.reiatsu_profiles import profiles
+from utils.steam_keys import steam_inventory
 from utils.discord_utils import safe_send, safe_edit, safe_respond
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -90,15 +93,8 @@ class SteamKey(commands.Cog):
 
     async def _update_reiatsu(self, user_id: str, new_points: int):
         supabase.table("reiatsu").update({"points": new_points}).eq("user_id", user_id).execute()
-
-    async def _get_one_steam_key(self):
-        resp = supabase.table("steam_keys").select("*").eq("won", False).limit(1).execute()
-        if resp.data and len(resp.data) > 0:
-            return resp.data[0]
-        return None
-
-    async def _mark_steam_key_won(self, key_id: int, winner: str):
-        supabase.table("steam_keys").update({"won": True, "winner": winner}).eq("id", key_id).execute()
+        profiles.apply(user_id, {"points": new_points})
+        leaderboard.update(user_id, new_points)
 
     # ─────────── Logique du jeu ───────────
     async def _try_win_key(self, interaction_or_ctx):
@@ -116,36 +112,43 @@ class SteamKey(commands.Cog):
         await self._update_reiatsu(user_id, reiatsu_points - REIATSU_COST)
 
         if random.random() <= WIN_CHANCE:
-            key = await self._get_one_steam_key()
+            key = await steam_inventory.reserve(user_id)
             if not key:
                 embed = discord.Embed(title="🎮 Jeu Steam Key", description="🎉 Gagné ! Mais plus de clés 😢", color=discord.Color.gold())
                 await self._send(interaction_or_ctx, embed)
                 return
 
-            # Embed avec options (clé, refresh, refus)
-            embed = discord.Embed(title="🎉 Félicitations !", description="Tu as gagné une clé Steam !", color=discord.Color.green())
-            embed.add_field(name="Jeu", value=key["game_name"], inline=True)
-            embed.add_field(name="Lien Steam", value=f"[Voir sur Steam]({key['steam_url']})", inline=True)
-            embed.set_footer(text="Choisis si tu veux la clé ou tirer un autre jeu.")
-
-            view = ConfirmKeyView(interaction_or_ctx.user.id)
-            msg = await self._send(interaction_or_ctx, embed, view)
-            await view.wait()
-
-            if view.refresh:
-                # Relance un nouveau jeu sans consommer de Reiatsu
-                await safe_edit(msg, embed=discord.Embed(title="🔄 Nouveau jeu en cours...", color=discord.Color.blurple()), view=None)
-                await self._try_win_key(interaction_or_ctx)
-                return
-
-            if view.confirmed:
-                await self._mark_steam_key_won(key["id"], interaction_or_ctx.user.name)
+            msg = None
+            while True:
+                # Embed avec options (clé, refresh, refus)
+                embed = discord.Embed(title="🎉 Félicitations !", description="Tu as gagné une clé Steam !", color=discord.Color.green())
+                embed.add_field(name="Jeu", value=key.game_name, inline=True)
+                embed.add_field(name="Lien Steam", value=f"[Voir sur Steam]({key.steam_url})", inline=True)
+                embed.set_footer(text="Choisis si tu veux la clé ou tirer un autre jeu.")
+
+                view = ConfirmKeyView(interaction_or_ctx.user.id)
+                if msg:
+                    await safe_edit(msg, embed=embed, view=view)
+                else:
+                    msg = await self._send(interaction_or_ctx, embed, view)
+                await view.wait()
+
+                if not view.refresh:
+                    break
+                # Tire un autre jeu sans consommer de Reiatsu, la clé actuelle est rendue
+                autre = await steam_inventory.reserve(user_id, exclude_games={key.game_name})
+                if autre:
+                    await steam_inventory.release(key)
+                    key = autre
+
+            if view.confirmed and await steam_inventory.confirm(key, interaction_or_ctx.user.name):
                 try:
-                    await interaction_or_ctx.user.send(f"🎁 **Clé Steam pour {key['game_name']}**\n`{key['steam_key']}`")
+                    await interaction_or_ctx.user.send(f"🎁 **Clé Steam pour {key.game_name}**\n`{key.steam_key}`")
                     await safe_edit(msg, embed=discord.Embed(title="✅ Clé envoyée en DM !", color=discord.Color.green()), view=None)
                 except discord.Forbidden:
                     await safe_edit(msg, embed=discord.Embed(title="⚠️ Impossible d'envoyer un DM. Active-les et réessaie.", color=discord.Color.orange()), view=None)
             else:
+                await steam_inventory.release(key)
                 await safe_edit(msg, embed=discord.Embed(title="🔄 Clé laissée dispo pour les autres joueurs.", color=discord.Color.blurple()), view=None)
 
         else:
@@ -196,9 +199,8 @@ class SteamKey(commands.Cog):
             await safe_send(ctx.channel, "❌ Une erreur est survenue.")
 
     async def _send_menu(self, channel, user_id: int):
-        keys_resp = supabase.table("steam_keys").select("game_name").eq("won", False).execute()
-        nb_keys = len(keys_resp.data) if keys_resp.data else 0
-        games = set(k["game_name"] for k in keys_resp.data) if keys_resp.data else set()
+        nb_keys = steam_inventory.count()
+        games = steam_inventory.games()
 
         if nb_keys == 0:
             embed = discord.Embed(title="🎮 Jeu Steam Key", description="❌ Aucun jeu disponible pour le moment.", color=discord.Color.red())
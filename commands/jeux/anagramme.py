@@ -4,6 +4,7 @@
 # Catégorie : Jeux
 # Accès : Tous
 # Cooldown : 1 utilisation / 5 secondes / utilisateur
+# Sessions : expiration via utils/game_sessions (reprise après redémarrage)
 # ────────────────────────────────────────────────────────────────────────────────
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -16,6 +17,8 @@ from discord.ui import View, Modal, TextInput, Button
 import random, aiohttp, unicodedata
 from spellchecker import SpellChecker
 from utils.discord_utils import safe_send, safe_edit, safe_respond
+from utils.game_sessions import sessions
+from utils.view_registry import view_registry
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🌐 Initialisation du spellchecker français
@@ -69,28 +72,49 @@ class AnagrammeModal(Modal):
         await self.parent_view.process_guess(interaction, guess)
 
 # ────────────────────────────────────────────────────────────────────────────────
-# 🎛️ Vue principale avec boutons (Proposer + Indice)
+# 🎛️ Vue principale avec boutons (Proposer + Indice), persistante : custom_id fixes
 # ────────────────────────────────────────────────────────────────────────────────
 class AnagrammeView(View):
-    def __init__(self, target_word: str, max_attempts: int | None = None, author_id: int | None = None):
-        super().__init__(timeout=180)
+    TIMEOUT = 180             # secondes sans coup joué avant la fin de la partie
+
+    def __init__(self, target_word: str, max_attempts: int | None = None, author_id: int | None = None,
+                 display_word: str = None, attempts: list[dict] = None, hinted_indices: list[int] = None):
+        super().__init__(timeout=None)
         normalized = target_word.replace("Œ", "OE").replace("œ", "oe")
         self.target_word = normalized.upper()
-        self.display_word = ''.join(random.sample(self.target_word, len(self.target_word)))
+        self.display_word = display_word or ''.join(random.sample(self.target_word, len(self.target_word)))
         self.display_length = len([c for c in self.target_word if c.isalpha()])
         base_attempts = max(self.display_length, 5)
         self.max_attempts = max_attempts if max_attempts else base_attempts
-        self.attempts: list[dict] = []
+        self.attempts: list[dict] = attempts or []
         self.message = None
+        self.session = None
         self.finished = False
         self.author_id = author_id
-        self.hinted_indices: set[int] = set()
+        self.hinted_indices: set[int] = set(hinted_indices or ())
 
         # Boutons
         self.add_item(AnagrammeButton(self))
         self.hint_button = HintButtonAnagramme(self)
+        self.hint_button.disabled = bool(self.hinted_indices)   # un seul indice par partie
         self.add_item(self.hint_button)
 
+    # ───────────── Session (utils/game_sessions) ─────────────
+    def save(self):
+        """Coup joué : instantané mis à jour et échéance repoussée."""
+        if self.session:
+            sessions.save(self.session, attempts=self.attempts, hinted=sorted(self.hinted_indices))
+            sessions.touch(self.session, self.TIMEOUT)
+            view_registry.track(self, self.message, ttl=self.TIMEOUT + 5)
+
+    def end(self):
+        self.finished = True
+        for child in self.children:
+            child.disabled = True
+        if self.session:
+            sessions.close(self.session)
+        view_registry.release(self)
+
     # ───────────── Helper pour enlever accents ─────────────
     def remove_accents(self, text: str) -> str:
         return ''.join(
@@ -135,7 +159,7 @@ class AnagrammeView(View):
                 embed.color = discord.Color.red()
                 embed.set_footer(text=f"💀 Partie terminée. Le mot était {self.target_word}.")
         else:
-            embed.set_footer(text=f"⏳ Temps restant : 180 secondes")
+            embed.set_footer(text=f"⏳ Temps restant : {self.TIMEOUT} secondes")
 
         return embed
 
@@ -153,20 +177,19 @@ class AnagrammeView(View):
         self.attempts.append({'word': guess.upper(), 'hint': False})
 
         if self.remove_accents(filtered_guess) == self.remove_accents(self.target_word) or len(self.attempts) >= self.max_attempts:
-            self.finished = True
-            for child in self.children:
-                child.disabled = True
+            self.end()
+        else:
+            self.save()
 
         await safe_edit(self.message, embed=self.build_embed(), view=self)
         if not interaction.response.is_done():
             await interaction.response.defer(ephemeral=True)
 
-    async def on_timeout(self):
+    async def expire(self):
+        """Appelée par la roue de minuterie quand personne n’a joué depuis TIMEOUT secondes."""
         if self.finished:
             return
-        self.finished = True
-        for child in self.children:
-            child.disabled = True
+        self.end()
         embed = self.build_embed()
         embed.color = discord.Color.red()
         embed.set_footer(text=f"⏳ Temps écoulé ! Le mot était {self.target_word}.")
@@ -177,7 +200,7 @@ class AnagrammeView(View):
 # ────────────────────────────────────────────────────────────────────────────────
 class AnagrammeButton(Button):
     def __init__(self, parent_view: AnagrammeView):
-        super().__init__(label="Proposer un mot", style=discord.ButtonStyle.primary)
+        super().__init__(label="Proposer un mot", style=discord.ButtonStyle.primary, custom_id="anagramme:proposer")
         self.parent_view = parent_view
 
     async def callback(self, interaction: discord.Interaction):
@@ -187,7 +210,7 @@ class AnagrammeButton(Button):
 
 class HintButtonAnagramme(Button):
     def __init__(self, parent_view: AnagrammeView):
-        super().__init__(label="Indice", style=discord.ButtonStyle.secondary)
+        super().__init__(label="Indice", style=discord.ButtonStyle.secondary, custom_id="anagramme:indice")
         self.parent_view = parent_view
 
     async def callback(self, interaction: discord.Interaction):
@@ -206,9 +229,9 @@ class HintButtonAnagramme(Button):
         pv.hinted_indices.add(idx)
         self.disabled = True
         if len(pv.attempts) >= pv.max_attempts:
-            pv.finished = True
-            for child in pv.children:
-                child.disabled = True
+            pv.end()
+        else:
+            pv.save()
         await safe_edit(pv.message, embed=pv.build_embed(), view=pv)
         await interaction.response.send_message(f"🔎 Indice utilisé — lettre **{pv.target_word[idx]}** révélée.", ephemeral=True)
 
@@ -219,6 +242,39 @@ class Anagramme(commands.Cog):
     """Commande /anagramme et !anagramme — Lance une partie d'Anagramme"""
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        sessions.register(bot, "anagramme", on_expire=self._on_expire, restore=self._restore)
+        view_registry.register_persistent(bot, "anagramme:", self._rehydrate)
+
+    # 🔹 Expiration (roue de minuterie partagée)
+    async def _on_expire(self, session):
+        await session.handle.expire()
+
+    def _build_view(self, session, message) -> AnagrammeView:
+        state = session.state
+        view = AnagrammeView(state["target"], max_attempts=state["max_attempts"], author_id=state.get("author_id"),
+                             display_word=state["display"], attempts=state.get("attempts"), hinted_indices=state.get("hinted"))
+        view.message = message
+        view.session = session
+        session.handle = view
+        return view
+
+    # 🔹 Reprise après redémarrage
+    async def _restore(self, session):
+        channel = self.bot.get_channel(int(session.channel_id))
+        if channel is None:
+            return None
+        view = self._build_view(session, channel.get_partial_message(int(session.key)))
+        self.bot.add_view(view, message_id=int(session.key))
+        view_registry.track(view, view.message, ttl=session.remaining() + 5)
+        return view
+
+    # 🔹 Clic sur une partie dont la View a été libérée (plafond global atteint)
+    async def _rehydrate(self, interaction: discord.Interaction):
+        session = sessions.get("anagramme", interaction.message.id)
+        if session is None:
+            await safe_respond(interaction, "⚠️ La partie est terminée.", ephemeral=True)
+            return None
+        return self._build_view(session, interaction.message)
 
     async def _start_game(self, channel: discord.abc.Messageable, author_id: int, mode: str = "solo"):
         length = random.choice(range(5, 9))
@@ -227,6 +283,19 @@ class Anagramme(commands.Cog):
         view = AnagrammeView(target_word, max_attempts=None, author_id=author_filter)
         embed = view.build_embed()
         view.message = await safe_send(channel, embed=embed, view=view)
+        if view.message is None:
+            return
+        view.session = sessions.open(
+            "anagramme", view.message.id, ttl=view.TIMEOUT,
+            state={"target": view.target_word, "display": view.display_word, "max_attempts": view.max_attempts,
+                   "author_id": author_filter, "attempts": view.attempts, "hinted": []},
+            guild_id=getattr(getattr(channel, "guild", None), "id", None), channel_id=channel.id, handle=view
+        )
+        if view.session is None:
+            await safe_edit(view.message, content="❌ Trop de parties en cours sur ce serveur, réessaie plus tard.", embed=None, view=None)
+            view.stop()
+            return
+        view_registry.track(view, view.message, ttl=view.session.remaining() + 5)
 
     # 🔹 Commande SLASH
     @app_commands.command(name="anagramme", description="Lance une partie d'Anagramme (multi = tout le monde peut jouer)")
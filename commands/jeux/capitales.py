@@ -2,6 +2,7 @@
 # 📌 capitales.py — Commande interactive /capitales et !capitales
 # Objectif : Deviner la capitale d'un pays
 # Modes : Solo (1 joueur, 2 minutes) et Multi (plusieurs joueurs, 2 minutes)
+# Sessions : expiration via utils/game_sessions (reprise après redémarrage)
 # Réponses : via bouton "Répondre" et formulaire (Modal)
 # Catégorie : Jeux
 # Accès : Tous
@@ -15,221 +16,18 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from discord.ui import View, Modal, TextInput, Button
-import random, asyncio, unicodedata
+import random
 from utils.discord_utils import safe_send, safe_respond, safe_edit
-
-# ────────────────────────────────────────────────────────────────────────────────
-# 📂 Liste des pays et leurs capitales
-# ────────────────────────────────────────────────────────────────────────────────
-CAPITALS = {
-    "Afghanistan": "Kaboul",
-    "Afrique du Sud": "Pretoria",
-    "Albanie": "Tirana",
-    "Algérie": "Alger",
-    "Allemagne": "Berlin",
-    "Andorre": "Andorre-la-Vieille",
-    "Angola": "Luanda",
-    "Antigua-et-Barbuda": "Saint-Jean",
-    "Arabie saoudite": "Riyad",
-    "Argentine": "Buenos Aires",
-    "Arménie": "Erevan",
-    "Australie": "Canberra",
-    "Autriche": "Vienne",
-    "Azerbaïdjan": "Bakou",
-    "Bahamas": "Nassau",
-    "Bahreïn": "Manama",
-    "Bangladesh": "Dacca",
-    "Barbade": "Bridgetown",
-    "Belgique": "Bruxelles",
-    "Belize": "Belmopan",
-    "Bénin": "Porto-Novo",
-    "Bhoutan": "Thimphou",
-    "Biélorussie": "Minsk",
-    "Birmanie": "Naypyidaw",
-    "Bolivie": "Sucre",
-    "Bosnie-Herzégovine": "Sarajevo",
-    "Botswana": "Gaborone",
-    "Brésil": "Brasília",
-    "Brunei": "Bandar Seri Begawan",
-    "Bulgarie": "Sofia",
-    "Burkina Faso": "Ouagadougou",
-    "Burundi": "Gitega",
-    "Cambodge": "Phnom Penh",
-    "Cameroun": "Yaoundé",
-    "Canada": "Ottawa",
-    "Cap-Vert": "Praia",
-    "Chili": "Santiago",
-    "Chine": "Pékin",
-    "Chypre": "Nicosie",
-    "Colombie": "Bogotá",
-    "Comores": "Moroni",
-    "Congo": "Brazzaville",
-    "Corée du Nord": "Pyongyang",
-    "Corée du Sud": "Séoul",
-    "Costa Rica": "San José",
-    "Croatie": "Zagreb",
-    "Cuba": "La Havane",
-    "Danemark": "Copenhague",
-    "Djibouti": "Djibouti",
-    "Dominique": "Roseau",
-    "Égypte": "Le Caire",
-    "Émirats arabes unis": "Abou Dabi",
-    "Équateur": "Quito",
-    "Érythrée": "Asmara",
-    "Espagne": "Madrid",
-    "Estonie": "Tallinn",
-    "Eswatini": "Mbabane",
-    "États-Unis": "Washington, D.C.",
-    "Éthiopie": "Addis-Abeba",
-    "Fidji": "Suva",
-    "Finlande": "Helsinki",
-    "France": "Paris",
-    "Gabon": "Libreville",
-    "Gambie": "Banjul",
-    "Géorgie": "Tbilissi",
-    "Ghana": "Accra",
-    "Grèce": "Athènes",
-    "Grenade": "Saint-Georges",
-    "Guatemala": "Guatemala",
-    "Guinée": "Conakry",
-    "Guinée-Bissau": "Bissau",
-    "Guinée équatoriale": "Malabo",
-    "Guyana": "Georgetown",
-    "Haïti": "Port-au-Prince",
-    "Honduras": "Tegucigalpa",
-    "Hongrie": "Budapest",
-    "Îles Marshall": "Majuro",
-    "Îles Salomon": "Honiara",
-    "Inde": "New Delhi",
-    "Indonésie": "Jakarta",
-    "Iran": "Téhéran",
-    "Irak": "Bagdad",
-    "Irlande": "Dublin",
-    "Islande": "Reykjavik",
-    "Israël": "Jérusalem",
-    "Italie": "Rome",
-    "Jamaïque": "Kingston",
-    "Japon": "Tokyo",
-    "Jordanie": "Amman",
-    "Kazakhstan": "Noursoultan",
-    "Kenya": "Nairobi",
-    "Kirghizistan": "Bichkek",
-    "Kiribati": "Tarawa",
-    "Koweït": "Koweït",
-    "Laos": "Vientiane",
-    "Lesotho": "Maseru",
-    "Lettonie": "Riga",
-    "Liban": "Beyrouth",
-    "Liberia": "Monrovia",
-    "Libye": "Tripoli",
-    "Liechtenstein": "Vaduz",
-    "Lituanie": "Vilnius",
-    "Luxembourg": "Luxembourg",
-    "Madagascar": "Antananarivo",
-    "Malaisie": "Kuala Lumpur",
-    "Malawi": "Lilongwe",
-    "Maldives": "Malé",
-    "Mali": "Bamako",
-    "Malte": "La Valette",
-    "Maroc": "Rabat",
-    "Maurice": "Port-Louis",
-    "Mauritanie": "Nouakchott",
-    "Mexique": "Mexico",
-    "Micronésie": "Palikir",
-    "Moldavie": "Chișinău",
-    "Monaco": "Monaco",
-    "Mongolie": "Oulan-Bator",
-    "Monténégro": "Podgorica",
-    "Mozambique": "Maputo",
-    "Namibie": "Windhoek",
-    "Nauru": "Yaren",
-    "Népal": "Katmandou",
-    "Nicaragua": "Managua",
-    "Niger": "Niamey",
-    "Nigéria": "Abuja",
-    "Norvège": "Oslo",
-    "Nouvelle-Zélande": "Wellington",
-    "Oman": "Mascate",
-    "Ouganda": "Kampala",
-    "Ouzbékistan": "Tachkent",
-    "Pakistan": "Islamabad",
-    "Palaos": "Ngerulmud",
-    "Panama": "Panama",
-    "Papouasie-Nouvelle-Guinée": "Port-Moresby",
-    "Paraguay": "Asuncion",
-    "Pays-Bas": "Amsterdam",
-    "Pérou": "Lima",
-    "Philippines": "Manille",
-    "Pologne": "Varsovie",
-    "Portugal": "Lisbonne",
-    "Qatar": "Doha",
-    "République centrafricaine": "Bangui",
-    "République dominicaine": "Saint-Domingue",
-    "République tchèque": "Prague",
-    "Roumanie": "Bucarest",
-    "Royaume-Uni": "Londres",
-    "Russie": "Moscou",
-    "Rwanda": "Kigali",
-    "Saint-Christophe-et-Niévès": "Basseterre",
-    "Saint-Marin": "Saint-Marin",
-    "Saint-Vincent-et-les-Grenadines": "Kingstown",
-    "Salvador": "San Salvador",
-    "Samoa": "Apia",
-    "Sao Tomé-et-Principe": "São Tomé",
-    "Sénégal": "Dakar",
-    "Serbie": "Belgrade",
-    "Seychelles": "Victoria",
-    "Sierra Leone": "Freetown",
-    "Singapour": "Singapour",
-    "Slovaquie": "Bratislava",
-    "Slovénie": "Ljubljana",
-    "Somalie": "Mogadiscio",
-    "Soudan": "Khartoum",
-    "Soudan du Sud": "Djouba",
-    "Sri Lanka": "Sri Jayawardenepura Kotte",
-    "Suède": "Stockholm",
-    "Suisse": "Berne",
-    "Syrie": "Damas",
-    "Taïwan": "Taipei",
-    "Tadjikistan": "Douchanbé",
-    "Tanzanie": "Dodoma",
-    "Thaïlande": "Bangkok",
-    "Timor oriental": "Dili",
-    "Togo": "Lomé",
-    "Tonga": "Nukuʻalofa",
-    "Trinité-et-Tobago": "Port-d'Espagne",
-    "Tunisie": "Tunis",
-    "Turkménistan": "Achgabat",
-    "Turquie": "Ankara",
-    "Tuvalu": "Funafuti",
-    "Ukraine": "Kiev",
-    "Uruguay": "Montevideo",
-    "Vanuatu": "Port-Vila",
-    "Vatican": "Cité du Vatican",
-    "Venezuela": "Caracas",
-    "Viêt Nam": "Hanoï",
-    "Yémen": "Sanaa",
-    "Zambie": "Lusaka",
-    "Zimbabwe": "Harare"
-}
-
-def normalize_text(text: str) -> str:
-    return ''.join(
-        c for c in unicodedata.normalize('NFD', text.lower())
-        if unicodedata.category(c) != 'Mn'
-    ).strip()
+from utils.game_sessions import sessions
+from utils.view_registry import view_registry
+from utils.geographie import CAPITALS, CAPITAL_INDEX
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 📝 Modal (formulaire de réponse)
 # ────────────────────────────────────────────────────────────────────────────────
 class AnswerModal(Modal, title="🖊️ Devine la capitale"):
-    def __init__(self, country: str, winners: list, multi: bool, quiz_msg: discord.Message, view: View):
+    def __init__(self, view: "CapitalQuizView"):
         super().__init__(timeout=None)
-        self.country = country
-        self.capital = normalize_text(CAPITALS[country])
-        self.winners = winners
-        self.multi = multi
-        self.quiz_msg = quiz_msg
         self.view = view
         self.answer = TextInput(
             label="Entre la capitale",
@@ -240,42 +38,67 @@ class AnswerModal(Modal, title="🖊️ Devine la capitale"):
         self.add_item(self.answer)
 
     async def on_submit(self, interaction: discord.Interaction):
-        user_answer = normalize_text(self.answer.value)
-        if user_answer == self.capital:
-            if interaction.user not in self.winners:
-                self.winners.append(interaction.user)
+        if self.view.ended:
+            return await interaction.response.send_message("⚠️ Le quiz est terminé.", ephemeral=True)
+        if CAPITAL_INDEX.check(self.view.country, self.answer.value):
+            if interaction.user.id not in self.view.winners:
+                self.view.winners.append(interaction.user.id)
+                if self.view.session:
+                    sessions.save(self.view.session, winners=self.view.winners)
             await interaction.response.send_message("✅ Bonne réponse !", ephemeral=True)
 
-            if not self.multi and not getattr(self.view, "ended", False):
-                self.view.ended = True
-                for child in self.view.children:
-                    child.disabled = True
-                embed = self.quiz_msg.embeds[0]
-                embed.add_field(
-                    name="🎉 Résultat",
-                    value=f"✅ Réponse : **{self.capital}**\n🏆 Gagnant : {interaction.user.mention}",
-                    inline=False
-                )
-                await self.quiz_msg.edit(embed=embed, view=self.view)
-                self.view.stop()
+            if not self.view.multi:
+                await self.view.finish()
         else:
             await interaction.response.send_message("❌ Mauvaise réponse !", ephemeral=True)
 
 # ────────────────────────────────────────────────────────────────────────────────
-# 🎛️ Vue interactive
+# 🎛️ Vue interactive (persistante : custom_id fixe, reprise après redémarrage)
 # ────────────────────────────────────────────────────────────────────────────────
 class CapitalQuizView(View):
-    def __init__(self, country: str, winners: list, multi: bool, quiz_msg: discord.Message = None):
+    def __init__(self, country: str, multi: bool, winners: list = None, quiz_msg: discord.Message = None):
         super().__init__(timeout=None)
         self.country = country
-        self.winners = winners
+        self.winners = winners or []   # IDs des joueurs ayant trouvé
         self.multi = multi
         self.quiz_msg = quiz_msg
+        self.session = None
         self.ended = False
 
-    @discord.ui.button(label="Répondre", style=discord.ButtonStyle.primary, emoji="✍️")
+    def build_embed(self) -> discord.Embed:
+        title = "Devine la Capitale - Mode Multijoueur 🌍" if self.multi else "Devine la Capitale - Mode Solo 🧍‍♂️"
+        embed = discord.Embed(
+            title=title,
+            description=f"Quel est la capitale de **{self.country}** ?\nAppuie sur **Répondre** pour proposer ta réponse.",
+            color=discord.Color.blurple()
+        )
+        embed.set_footer(text=f"⏱️ Temps : {Capitales.MULTI_TIME if self.multi else Capitales.SOLO_TIME} secondes")
+        return embed
+
+    async def finish(self):
+        """Affiche le résultat, désactive le bouton et libère la session."""
+        if self.ended:
+            return
+        self.ended = True
+        if self.session:
+            sessions.close(self.session)
+        capital = CAPITALS[self.country]
+        embed = self.build_embed()
+        if self.winners and not self.multi:
+            value = f"✅ Réponse : **{capital}**\n🏆 Gagnant : <@{self.winners[0]}>"
+        elif self.winners:
+            value = f"✅ Réponse : **{capital}**\n🏆 Gagnants : {', '.join(f'<@{w}>' for w in self.winners)}"
+        else:
+            value = f"❌ Personne n'a trouvé. C'était **{capital}**."
+        embed.add_field(name="🎉 Résultat", value=value, inline=False)
+        for child in self.children:
+            child.disabled = True
+        await safe_edit(self.quiz_msg, embed=embed, view=self)
+        view_registry.release(self)
+
+    @discord.ui.button(label="Répondre", style=discord.ButtonStyle.primary, emoji="✍️", custom_id="capitales:repondre")
     async def answer_button(self, interaction: discord.Interaction, button: Button):
-        await interaction.response.send_modal(AnswerModal(self.country, self.winners, self.multi, self.quiz_msg, self))
+        await interaction.response.send_modal(AnswerModal(self))
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
@@ -287,52 +110,59 @@ class Capitales(commands.Cog):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        sessions.register(bot, "capitales", on_expire=self._on_expire, restore=self._restore)
+        view_registry.register_persistent(bot, "capitales:", self._rehydrate)
+
+    # 🔹 Expiration (roue de minuterie partagée)
+    async def _on_expire(self, session):
+        await session.handle.finish()
+
+    def _build_view(self, session, message) -> CapitalQuizView:
+        view = CapitalQuizView(session.state["country"], session.state["multi"], session.state.get("winners"))
+        view.quiz_msg = message
+        view.session = session
+        session.handle = view
+        return view
+
+    # 🔹 Reprise après redémarrage
+    async def _restore(self, session):
+        channel = self.bot.get_channel(int(session.channel_id))
+        if channel is None:
+            return None
+        view = self._build_view(session, channel.get_partial_message(int(session.key)))
+        self.bot.add_view(view, message_id=int(session.key))
+        view_registry.track(view, view.quiz_msg, ttl=session.remaining() + 5)
+        return view
+
+    # 🔹 Clic sur un quiz dont la View a été libérée (plafond global atteint)
+    async def _rehydrate(self, interaction: discord.Interaction):
+        session = sessions.get("capitales", interaction.message.id)
+        if session is None:
+            await safe_respond(interaction, "⚠️ Ce quiz est terminé.", ephemeral=True)
+            return None
+        return self._build_view(session, interaction.message)
 
     # 🔹 Fonction interne commune
     async def _send_quiz(self, channel, user=None, multi=False):
+        guild_id = getattr(getattr(channel, "guild", None), "id", None)
         country = random.choice(list(CAPITALS.keys()))
-        capital = CAPITALS[country]
-        winners = []
-
-        title = "Devine la Capitale - Mode Multijoueur 🌍" if multi else "Devine la Capitale - Mode Solo 🧍‍♂️"
-        footer_text = f"⏱️ Temps : {self.MULTI_TIME if multi else self.SOLO_TIME} secondes"
-
-        embed = discord.Embed(
-            title=title,
-            description=f"Quel est la capitale de **{country}** ?\nAppuie sur **Répondre** pour proposer ta réponse.",
-            color=discord.Color.blurple()
-        )
-        embed.set_footer(text=footer_text)
-
-        view = CapitalQuizView(country, winners, multi)
-        quiz_msg = await safe_send(channel, embed=embed, view=view)
-        view.quiz_msg = quiz_msg
-
-        try:
-            await asyncio.sleep(self.MULTI_TIME if multi else self.SOLO_TIME)
-        except asyncio.CancelledError:
+        view = CapitalQuizView(country, multi)
+        quiz_msg = await safe_send(channel, embed=view.build_embed(), view=view)
+        if quiz_msg is None:
             return
+        view.quiz_msg = quiz_msg
 
-        if view.ended:
+        view.session = sessions.open(
+            "capitales", quiz_msg.id,
+            ttl=self.MULTI_TIME if multi else self.SOLO_TIME,
+            state={"country": country, "multi": multi, "winners": view.winners},
+            guild_id=guild_id, channel_id=channel.id, handle=view
+        )
+        if view.session is None:
+            await safe_edit(quiz_msg, content="❌ Trop de parties en cours sur ce serveur, réessaie plus tard.", embed=None, view=None)
+            view.stop()
             return
-
-        embed = quiz_msg.embeds[0]
-        if winners:
-            embed.add_field(
-                name="🎉 Résultat",
-                value=f"✅ Réponse : **{capital}**\n🏆 Gagnants : {', '.join(w.mention for w in set(winners))}",
-                inline=False
-            )
-        else:
-            embed.add_field(
-                name="🎉 Résultat",
-                value=f"❌ Personne n'a trouvé. C'était **{capital}**.",
-                inline=False
-            )
-
-        for child in view.children:
-            child.disabled = True
-        await quiz_msg.edit(embed=embed, view=view)
+        view_registry.track(view, quiz_msg, ttl=view.session.remaining() + 5)
 
     # 🔹 Commande SLASH
     @app_commands.command(name="capitales", description="Devine la capitale d'un pays")
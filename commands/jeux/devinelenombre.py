@@ -5,6 +5,7 @@
 # Catégorie : Jeux
 # Accès : Tous
 # Cooldown : 1 utilisation / 5 secondes / utilisateur
+# Sessions : expiration via utils/game_sessions (reprise après redémarrage)
 # ────────────────────────────────────────────────────────────────────────────────
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -15,8 +16,9 @@ from discord import app_commands
 from discord.ext import commands
 from discord.ui import View, Button, TextInput, Modal
 import random
-import asyncio
 from utils.discord_utils import safe_send, safe_edit, safe_respond
+from utils.game_sessions import sessions
+from utils.view_registry import view_registry
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🎛️ Modal pour proposer un nombre
@@ -48,13 +50,14 @@ class DevinelenombreView(View):
     SOLO_TIME = 120
     MULTI_TIME = 120
 
-    def __init__(self, target: int, multi: bool = False, author_id: int | None = None):
+    def __init__(self, target: int, multi: bool = False, author_id: int | None = None, attempts: list[int] = None):
         super().__init__(timeout=None)
         self.target = target
         self.multi = multi
         self.max_attempts = 10
-        self.attempts: list[int] = []
+        self.attempts: list[int] = attempts or []
         self.message = None
+        self.session = None
         self.finished = False
         self.author_id = author_id
         self.add_item(ProposeNombreButton(self))
@@ -102,15 +105,17 @@ class DevinelenombreView(View):
             self.finished = True
             for child in self.children:
                 child.disabled = True
+            if self.session:
+                sessions.close(self.session)
+            view_registry.release(self)
+        elif self.session:
+            sessions.save(self.session, attempts=self.attempts)
         await safe_edit(self.message, embed=self.build_embed(), view=self)
         if not interaction.response.is_done():
             await interaction.response.defer(ephemeral=True)
 
-    async def start_timer(self):
-        try:
-            await asyncio.sleep(self.MULTI_TIME if self.multi else self.SOLO_TIME)
-        except asyncio.CancelledError:
-            return
+    async def expire(self):
+        """Appelée par la roue de minuterie quand le temps est écoulé."""
         if not self.finished:
             self.finished = True
             for child in self.children:
@@ -119,13 +124,14 @@ class DevinelenombreView(View):
             embed.color = discord.Color.red()
             embed.set_footer(text=f"⏳ Temps écoulé ! Le nombre était {self.target}.")
             await safe_edit(self.message, embed=embed, view=self)
+            view_registry.release(self)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🎛️ Bouton Proposer
 # ────────────────────────────────────────────────────────────────────────────────
 class ProposeNombreButton(Button):
     def __init__(self, parent_view: DevinelenombreView):
-        super().__init__(label="Proposer un nombre", style=discord.ButtonStyle.primary)
+        super().__init__(label="Proposer un nombre", style=discord.ButtonStyle.primary, custom_id="devinelenombre:proposer")
         self.parent_view = parent_view
 
     async def callback(self, interaction: discord.Interaction):
@@ -141,6 +147,38 @@ class Devinelenombre(commands.Cog):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        sessions.register(bot, "devinelenombre", on_expire=self._on_expire, restore=self._restore)
+        view_registry.register_persistent(bot, "devinelenombre:", self._rehydrate)
+
+    # 🔹 Expiration (roue de minuterie partagée)
+    async def _on_expire(self, session):
+        await session.handle.expire()
+
+    def _build_view(self, session, message) -> DevinelenombreView:
+        state = session.state
+        view = DevinelenombreView(state["target"], multi=state["multi"], author_id=state.get("author_id"), attempts=state.get("attempts"))
+        view.message = message
+        view.session = session
+        session.handle = view
+        return view
+
+    # 🔹 Reprise après redémarrage
+    async def _restore(self, session):
+        channel = self.bot.get_channel(int(session.channel_id))
+        if channel is None:
+            return None
+        view = self._build_view(session, channel.get_partial_message(int(session.key)))
+        self.bot.add_view(view, message_id=int(session.key))
+        view_registry.track(view, view.message, ttl=session.remaining() + 5)
+        return view
+
+    # 🔹 Clic sur une partie dont la View a été libérée (plafond global atteint)
+    async def _rehydrate(self, interaction: discord.Interaction):
+        session = sessions.get("devinelenombre", interaction.message.id)
+        if session is None:
+            await safe_respond(interaction, "⚠️ La partie est terminée.", ephemeral=True)
+            return None
+        return self._build_view(session, interaction.message)
 
     async def _start_game(self, channel: discord.abc.Messageable, user_id: int, multi: bool = False):
         target = random.randint(0, 100)
@@ -148,7 +186,19 @@ class Devinelenombre(commands.Cog):
         view = DevinelenombreView(target, multi=multi, author_id=author_filter)
         embed = view.build_embed()
         view.message = await safe_send(channel, embed=embed, view=view)
-        asyncio.create_task(view.start_timer())
+        if view.message is None:
+            return
+        view.session = sessions.open(
+            "devinelenombre", view.message.id,
+            ttl=view.MULTI_TIME if multi else view.SOLO_TIME,
+            state={"target": target, "multi": bool(multi), "author_id": author_filter, "attempts": view.attempts},
+            guild_id=getattr(getattr(channel, "guild", None), "id", None), channel_id=channel.id, handle=view
+        )
+        if view.session is None:
+            await safe_edit(view.message, content="❌ Trop de parties en cours sur ce serveur, réessaie plus tard.", embed=None, view=None)
+            view.stop()
+            return
+        view_registry.track(view, view.message, ttl=view.session.remaining() + 5)
 
     # 🔹 Commande SLASH
     @app_commands.command(name="devinelenombre", description="Devine un nombre entre 0 et 100")
@@ -2,6 +2,7 @@
 # 📌 drapeaux.py — Commande interactive /drapeaux et !drapeaux
 # Objectif : Deviner le pays à partir d'un drapeau aléatoire (tous les pays)
 # Modes : Solo (1 joueur, 2 minutes) et Multi (plusieurs joueurs, 2 minutes)
+# Sessions : expiration via utils/game_sessions (reprise après redémarrage)
 # Réponses : via bouton "Répondre" et formulaire (Modal)
 # Catégorie : Jeux
 # Accès : Tous
@@ -14,86 +15,21 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import random, asyncio, unicodedata
+import asyncio
+import random
 
-from utils.discord_utils import safe_send, safe_respond
-
-# ────────────────────────────────────────────────────────────────────────────────
-# 📂 Liste complète des pays et codes ISO (inchangée)
-# ────────────────────────────────────────────────────────────────────────────────
-COUNTRIES = {
-    "Afghanistan": "af", "Afrique du Sud": "za", "Albanie": "al", "Algérie": "dz",
-    "Allemagne": "de", "Andorre": "ad", "Angola": "ao", "Antigua-et-Barbuda": "ag",
-    "Arabie saoudite": "sa", "Argentine": "ar", "Arménie": "am", "Australie": "au",
-    "Autriche": "at", "Azerbaïdjan": "az", "Bahamas": "bs", "Bahreïn": "bh",
-    "Bangladesh": "bd", "Barbade": "bb", "Belgique": "be", "Belize": "bz",
-    "Bénin": "bj", "Bhoutan": "bt", "Biélorussie": "by", "Birmanie": "mm",
-    "Bolivie": "bo", "Bosnie-Herzégovine": "ba", "Botswana": "bw", "Brésil": "br",
-    "Brunei": "bn", "Bulgarie": "bg", "Burkina Faso": "bf", "Burundi": "bi",
-    "Cambodge": "kh", "Cameroun": "cm", "Canada": "ca", "Cap-Vert": "cv",
-    "Chili": "cl", "Chine": "cn", "Chypre": "cy", "Colombie": "co",
-    "Comores": "km", "Congo": "cg", "Corée du Nord": "kp", "Corée du Sud": "kr",
-    "Costa Rica": "cr", "Croatie": "hr", "Cuba": "cu", "Danemark": "dk",
-    "Djibouti": "dj", "Dominique": "dm", "Égypte": "eg", "Émirats arabes unis": "ae",
-    "Équateur": "ec", "Érythrée": "er", "Espagne": "es", "Estonie": "ee",
-    "Eswatini": "sz", "États-Unis": "us", "Éthiopie": "et", "Fidji": "fj",
-    "Finlande": "fi", "France": "fr", "Gabon": "ga", "Gambie": "gm",
-    "Géorgie": "ge", "Ghana": "gh", "Grèce": "gr", "Grenade": "gd",
-    "Guatemala": "gt", "Guinée": "gn", "Guinée-Bissau": "gw", "Guinée équatoriale": "gq",
-    "Guyana": "gy", "Haïti": "ht", "Honduras": "hn", "Hongrie": "hu",
-    "Îles Marshall": "mh", "Îles Salomon": "sb", "Inde": "in", "Indonésie": "id",
-    "Iran": "ir", "Irak": "iq", "Irlande": "ie", "Islande": "is",
-    "Israël": "il", "Italie": "it", "Jamaïque": "jm", "Japon": "jp",
-    "Jordanie": "jo", "Kazakhstan": "kz", "Kenya": "ke", "Kirghizistan": "kg",
-    "Kiribati": "ki", "Koweït": "kw", "Laos": "la", "Lesotho": "ls",
-    "Lettonie": "lv", "Liban": "lb", "Liberia": "lr", "Libye": "ly",
-    "Liechtenstein": "li", "Lituanie": "lt", "Luxembourg": "lu", "Madagascar": "mg",
-    "Malaisie": "my", "Malawi": "mw", "Maldives": "mv", "Mali": "ml",
-    "Malte": "mt", "Maroc": "ma", "Maurice": "mu", "Mauritanie": "mr",
-    "Mexique": "mx", "Micronésie": "fm", "Moldavie": "md", "Monaco": "mc",
-    "Mongolie": "mn", "Monténégro": "me", "Mozambique": "mz", "Namibie": "na",
-    "Nauru": "nr", "Népal": "np", "Nicaragua": "ni", "Niger": "ne",
-    "Nigéria": "ng", "Norvège": "no", "Nouvelle-Zélande": "nz", "Oman": "om",
-    "Ouganda": "ug", "Ouzbékistan": "uz", "Pakistan": "pk", "Palaos": "pw",
-    "Panama": "pa", "Papouasie-Nouvelle-Guinée": "pg", "Paraguay": "py", "Pays-Bas": "nl",
-    "Pérou": "pe", "Philippines": "ph", "Pologne": "pl", "Portugal": "pt",
-    "Qatar": "qa", "République centrafricaine": "cf", "République dominicaine": "do",
-    "République tchèque": "cz", "Roumanie": "ro", "Royaume-Uni": "gb", "Russie": "ru",
-    "Rwanda": "rw", "Saint-Christophe-et-Niévès": "kn", "Sainte-Lucie": "lc",
-    "Saint-Marin": "sm", "Saint-Vincent-et-les-Grenadines": "vc", "Salvador": "sv",
-    "Samoa": "ws", "Sao Tomé-et-Principe": "st", "Sénégal": "sn", "Serbie": "rs",
-    "Seychelles": "sc", "Sierra Leone": "sl", "Singapour": "sg", "Slovaquie": "sk",
-    "Slovénie": "si", "Somalie": "so", "Soudan": "sd", "Soudan du Sud": "ss",
-    "Sri Lanka": "lk", "Suède": "se", "Suisse": "ch", "Syrie": "sy",
-    "Taïwan": "tw", "Tadjikistan": "tj", "Tanzanie": "tz", "Thaïlande": "th",
-    "Timor oriental": "tl", "Togo": "tg", "Tonga": "to", "Trinité-et-Tobago": "tt",
-    "Tunisie": "tn", "Turkménistan": "tm", "Turquie": "tr", "Tuvalu": "tv",
-    "Ukraine": "ua", "Uruguay": "uy", "Vanuatu": "vu", "Vatican": "va",
-    "Venezuela": "ve", "Viêt Nam": "vn", "Yémen": "ye", "Zambie": "zm",
-    "Zimbabwe": "zw"
-}
-
-
-def get_flag_url(iso_code: str) -> str:
-    return f"https://flagcdn.com/w320/{iso_code}.png"
-
-def normalize_text(text: str) -> str:
-    return ''.join(
-        c for c in unicodedata.normalize('NFD', text.lower())
-        if unicodedata.category(c) != 'Mn'
-    ).strip()
+from utils.discord_utils import safe_send, safe_respond, safe_edit
+from utils.game_sessions import sessions
+from utils.view_registry import view_registry
+from utils.geographie import COUNTRIES, COUNTRY_INDEX
+from utils.image_render import flags
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 📝 Modal (formulaire de réponse)
 # ────────────────────────────────────────────────────────────────────────────────
 class AnswerModal(discord.ui.Modal, title="🖊️ Devine le pays"):
-    def __init__(self, country: str, winners: list, multi: bool, quiz_msg: discord.Message, view: discord.ui.View):
+    def __init__(self, view: "FlagQuizView"):
         super().__init__(timeout=None)
-        self.country = country
-        self.normalized_country = normalize_text(country)
-        self.winners = winners
-        self.multi = multi
-        self.quiz_msg = quiz_msg
         self.view = view
 
         self.answer = discord.ui.TextInput(
@@ -105,43 +41,69 @@ class AnswerModal(discord.ui.Modal, title="🖊️ Devine le pays"):
         self.add_item(self.answer)
 
     async def on_submit(self, interaction: discord.Interaction):
-        user_answer = normalize_text(self.answer.value)
-        if user_answer == self.normalized_country:
-            if interaction.user not in self.winners:
-                self.winners.append(interaction.user)
+        if self.view.ended:
+            return await interaction.response.send_message("⚠️ Le quiz est terminé.", ephemeral=True)
+        if COUNTRY_INDEX.check(self.view.country, self.answer.value):
+            if interaction.user.id not in self.view.winners:
+                self.view.winners.append(interaction.user.id)
+                if self.view.session:
+                    sessions.save(self.view.session, winners=self.view.winners)
             await interaction.response.send_message("✅ Bonne réponse !", ephemeral=True)
 
             # 💡 Si mode solo → fin immédiate du quiz
-            if not self.multi and not getattr(self.view, "ended", False):
-                self.view.ended = True  # ✅ On marque la partie comme terminée
-                for child in self.view.children:
-                    child.disabled = True
-                embed = self.quiz_msg.embeds[0]
-                embed.add_field(
-                    name="🎉 Résultat",
-                    value=f"✅ Réponse : **{self.country}**\n🏆 Gagnant : {interaction.user.mention}",
-                    inline=False
-                )
-                await self.quiz_msg.edit(embed=embed, view=self.view)
-                self.view.stop()
+            if not self.view.multi:
+                await self.view.finish()
         else:
             await interaction.response.send_message("❌ Mauvaise réponse !", ephemeral=True)
 
 # ────────────────────────────────────────────────────────────────────────────────
-# 🎛️ Vue interactive — bouton "Répondre"
+# 🎛️ Vue interactive — bouton "Répondre" (persistant : reprise après redémarrage)
 # ────────────────────────────────────────────────────────────────────────────────
 class FlagQuizView(discord.ui.View):
-    def __init__(self, country: str, winners: list, multi: bool, quiz_msg: discord.Message = None):
+    def __init__(self, country: str, multi: bool, winners: list = None, quiz_msg: discord.Message = None, image_url: str = None):
         super().__init__(timeout=None)
         self.country = country
-        self.winners = winners
+        self.image_url = image_url     # drapeau : pièce jointe puis URL CDN (utils/image_render)
+        self.winners = winners or []   # IDs des joueurs ayant trouvé
         self.multi = multi
         self.quiz_msg = quiz_msg
+        self.session = None
         self.ended = False  # ✅ Flag pour savoir si le quiz est terminé
 
-    @discord.ui.button(label="Répondre", style=discord.ButtonStyle.primary, emoji="✍️")
+    def build_embed(self) -> discord.Embed:
+        embed = discord.Embed(
+            title="🌍 Devine le pays !",
+            description="Appuie sur **Répondre** pour envoyer ta proposition."
+                        + ("\n⏳ **Mode Multi :** vous avez 2 minutes pour répondre." if self.multi else "\n⏳ **Mode Solo :** tu as 2 minutes pour répondre."),
+            color=discord.Color.blurple()
+        )
+        if self.image_url:
+            embed.set_image(url=self.image_url)
+        return embed
+
+    async def finish(self):
+        """Affiche le résultat, désactive le bouton et libère la session."""
+        if self.ended:
+            return
+        self.ended = True
+        if self.session:
+            sessions.close(self.session)
+        embed = self.build_embed()
+        if self.winners and not self.multi:
+            value = f"✅ Réponse : **{self.country}**\n🏆 Gagnant : <@{self.winners[0]}>"
+        elif self.winners:
+            value = f"✅ Réponse : **{self.country}**\n🏆 Gagnants : {', '.join(f'<@{w}>' for w in self.winners)}"
+        else:
+            value = f"❌ Personne n'a trouvé. C'était **{self.country}**."
+        embed.add_field(name="🎉 Résultat", value=value, inline=False)
+        for child in self.children:
+            child.disabled = True
+        await safe_edit(self.quiz_msg, embed=embed, view=self)
+        view_registry.release(self)
+
+    @discord.ui.button(label="Répondre", style=discord.ButtonStyle.primary, emoji="✍️", custom_id="drapeaux:repondre")
     async def answer_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.send_modal(AnswerModal(self.country, self.winners, self.multi, self.quiz_msg, self))
+        await interaction.response.send_modal(AnswerModal(self))
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
@@ -154,51 +116,71 @@ class Drapeaux(commands.Cog):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        sessions.register(bot, "drapeaux", on_expire=self._on_expire, restore=self._restore)
+        view_registry.register_persistent(bot, "drapeaux:", self._rehydrate)
+
+    async def cog_load(self):
+        # Met tous les drapeaux en cache disque une fois (plus d’appel externe par question)
+        asyncio.create_task(flags.prefetch(COUNTRIES.values()))
+
+    # 🔹 Expiration (roue de minuterie partagée)
+    async def _on_expire(self, session):
+        await session.handle.finish()
+
+    def _build_view(self, session, message) -> FlagQuizView:
+        view = FlagQuizView(session.state["country"], session.state["multi"], session.state.get("winners"), image_url=session.state.get("image_url"))
+        view.quiz_msg = message
+        view.session = session
+        session.handle = view
+        return view
+
+    # 🔹 Reprise après redémarrage
+    async def _restore(self, session):
+        channel = self.bot.get_channel(int(session.channel_id))
+        if channel is None:
+            return None
+        view = self._build_view(session, channel.get_partial_message(int(session.key)))
+        self.bot.add_view(view, message_id=int(session.key))
+        view_registry.track(view, view.quiz_msg, ttl=session.remaining() + 5)
+        return view
+
+    # 🔹 Clic sur un quiz dont la View a été libérée (plafond global atteint)
+    async def _rehydrate(self, interaction: discord.Interaction):
+        session = sessions.get("drapeaux", interaction.message.id)
+        if session is None:
+            await safe_respond(interaction, "⚠️ Ce quiz est terminé.", ephemeral=True)
+            return None
+        return self._build_view(session, interaction.message)
 
     async def _send_quiz(self, channel, user=None, multi=False):
-        country, iso_code = random.choice(list(COUNTRIES.items()))
-        flag_url = get_flag_url(iso_code)
-        winners = []
-
-        embed = discord.Embed(
-            title="🌍 Devine le pays !",
-            description="Appuie sur **Répondre** pour envoyer ta proposition."
-                        + ("\n⏳ **Mode Multi :** vous avez 2 minutes pour répondre." if multi else "\n⏳ **Mode Solo :** tu as 2 minutes pour répondre."),
-            color=discord.Color.blurple()
-        )
-        embed.set_image(url=flag_url)
-
-        view = FlagQuizView(country, winners, multi)
-        quiz_msg = await safe_send(channel, embed=embed, view=view)
-        view.quiz_msg = quiz_msg  # injection du message dans la vue
-
-        try:
-            await asyncio.sleep(self.MULTI_TIME if multi else self.SOLO_TIME)
-        except asyncio.CancelledError:
+        guild_id = getattr(getattr(channel, "guild", None), "id", None)
+        country = random.choice(list(COUNTRIES))
+        iso_code = COUNTRIES[country]
+        file, image_url = await flags.get(iso_code)
+        view = FlagQuizView(country, multi, image_url=image_url)
+        if file:
+            quiz_msg = await safe_send(channel, embed=view.build_embed(), view=view, file=file)
+        else:
+            quiz_msg = await safe_send(channel, embed=view.build_embed(), view=view)
+        if quiz_msg is None:
             return
-
-        # ✅ Si le quiz a déjà été terminé (solo), ne rien faire
-        if view.ended:
+        view.quiz_msg = quiz_msg  # injection du message dans la vue
+        if file:
+            flags.remember(iso_code, quiz_msg)
+            if quiz_msg.embeds and quiz_msg.embeds[0].image:
+                view.image_url = quiz_msg.embeds[0].image.url
+
+        view.session = sessions.open(
+            "drapeaux", quiz_msg.id,
+            ttl=self.MULTI_TIME if multi else self.SOLO_TIME,
+            state={"country": country, "multi": multi, "winners": view.winners, "image_url": view.image_url},
+            guild_id=guild_id, channel_id=channel.id, handle=view
+        )
+        if view.session is None:
+            await safe_edit(quiz_msg, content="❌ Trop de parties en cours sur ce serveur, réessaie plus tard.", embed=None, view=None)
+            view.stop()
             return
-
-        embed = quiz_msg.embeds[0]
-        if winners:
-            embed.add_field(
-                name="🎉 Résultat",
-                value=f"✅ Réponse : **{country}**\n🏆 Gagnants : {', '.join(w.mention for w in set(winners))}",
-                inline=False
-            )
-        else:
-            embed.add_field(
-                name="🎉 Résultat",
-                value=f"❌ Personne n'a trouvé. C'était **{country}**.",
-                inline=False
-            )
-
-        for child in view.children:
-            child.disabled = True
-
-        await quiz_msg.edit(embed=embed, view=view)
+        view_registry.track(view, quiz_msg, ttl=view.session.remaining() + 5)
 
     # ────────────────────────────────────────────────────────────────────────
     # 🔹 Commande SLASH
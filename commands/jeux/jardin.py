@@ -8,6 +8,7 @@
 # ────────────────────────────────────────────────────────────────────────────────
 # 📦 Imports nécessaires
 # ────────────────────────────────────────────────────────────────────────────────
+import asyncio
 import os
 import random
 import datetime
@@ -16,12 +17,17 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from utils.supabase_client import supabase
-from utils.discord_utils import safe_send, safe_respond
+from utils.schema import projection
+from utils.cooldowns import cooldowns, from_iso, to_iso
+from utils.discord_utils import safe_send, safe_respond, safe_edit_response
+from utils.interaction_router import interactions, auto_defer
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🔌 table name
 # ────────────────────────────────────────────────────────────────────────────────
 TABLE_NAME = "gardens"
+# Colonnes du jardin (les potions sont lues à part, seulement quand on les affiche)
+GARDEN = projection(TABLE_NAME, "user_id", "username", "garden_grid", "inventory", "argent", "armee")
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🌱 Chargement des constantes depuis un JSON
@@ -48,7 +54,8 @@ POTIONS = CONFIG["POTIONS"]
 # 🧠 Fonctions utilitaires
 # ────────────────────────────────────────────────────────────────────────────────
 async def get_or_create_garden(user_id: int, username: str):
-    res = supabase.table(TABLE_NAME).select("*").eq("user_id", user_id).execute()
+    # Hors de la boucle : la garde de l’interaction peut différer si la base tarde
+    res = await asyncio.to_thread(GARDEN.select(supabase).eq("user_id", user_id).execute)
     if res.data:
         return res.data[0]
 
@@ -58,10 +65,9 @@ async def get_or_create_garden(user_id: int, username: str):
         "garden_grid": DEFAULT_GRID.copy(),
         "inventory": DEFAULT_INVENTORY.copy(),
         "argent": 0,
-        "armee": "",
-        "last_fertilize": None
+        "armee": ""
     }
-    supabase.table(TABLE_NAME).insert(new_garden).execute()
+    await asyncio.to_thread(supabase.table(TABLE_NAME).insert(new_garden).execute)
     return new_garden
 
 
@@ -71,18 +77,11 @@ def build_garden_embed(garden: dict, viewer_id: int) -> discord.Embed:
     inv = " / ".join(f"{FLEUR_EMOJIS[f]}{inv_dict.get(f, 0)}" for f in FLEUR_EMOJIS)
 
     cd_str = "✅ Disponible"
-    if garden.get("last_fertilize"):
-        try:
-            last_dt = datetime.datetime.fromisoformat(garden["last_fertilize"])
-            now = datetime.datetime.now(datetime.timezone.utc)
-            remain = last_dt + FERTILIZE_COOLDOWN - now
-            if remain.total_seconds() > 0:
-                total_seconds = int(remain.total_seconds())
-                minutes, seconds = divmod(total_seconds, 60)
-                hours, minutes = divmod(minutes, 60)
-                cd_str = f"⏳ {hours}h {minutes}m {seconds}s"
-        except Exception as e:
-            print(f"[ERREUR parse last_fertilize] {e}")
+    total_seconds = int(cooldowns.remaining("engrais", garden["user_id"]))
+    if total_seconds:
+        minutes, seconds = divmod(total_seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        cd_str = f"⏳ {hours}h {minutes}m {seconds}s"
 
     embed = discord.Embed(
         title=f"🏡 Jardin de {garden['username']}",
@@ -288,64 +287,52 @@ class JardinView(discord.ui.View):
         self.user_id = user_id
 
     def update_buttons(self):
-        last = self.garden.get("last_fertilize")
-        disabled = False
-        if last:
-            try:
-                last_dt = datetime.datetime.fromisoformat(last)
-                now = datetime.datetime.now(datetime.timezone.utc)
-                if now < last_dt + FERTILIZE_COOLDOWN:
-                    disabled = True
-            except Exception:
-                pass
+        disabled = cooldowns.remaining("engrais", self.user_id) > 0
         for child in self.children:
             if isinstance(child, discord.ui.Button) and child.label == "Engrais":
                 child.disabled = disabled
 
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        interactions.watch(interaction, name="jardin:bouton")
+        return True
+
     async def update_garden_db(self):
-        supabase.table(TABLE_NAME).update({
+        await asyncio.to_thread(supabase.table(TABLE_NAME).update({
             "garden_grid": self.garden["garden_grid"],
             "inventory": self.garden["inventory"],
-            "last_fertilize": self.garden["last_fertilize"],
             "argent": self.garden["argent"],
             "armee": self.garden["armee"]
-        }).eq("user_id", self.user_id).execute()
+        }).eq("user_id", self.user_id).execute)
 
     @discord.ui.button(label="Engrais", emoji="💩", style=discord.ButtonStyle.green)
     async def engrais(self, interaction: discord.Interaction, button: discord.ui.Button):
         if interaction.user.id != self.user_id:
-            return await interaction.response.send_message("❌ Ce jardin n'est pas à toi !", ephemeral=True)
-
-        last = self.garden.get("last_fertilize")
-        if last:
-            try:
-                last_dt = datetime.datetime.fromisoformat(last)
-                now = datetime.datetime.now(datetime.timezone.utc)
-                if now < last_dt + FERTILIZE_COOLDOWN:
-                    remain = last_dt + FERTILIZE_COOLDOWN - now
-                    total_seconds = int(remain.total_seconds())
-                    minutes, seconds = divmod(total_seconds, 60)
-                    hours, minutes = divmod(minutes, 60)
-                    return await interaction.response.send_message(
-                        f"⏳ Tu dois attendre {hours}h {minutes}m {seconds}s avant d'utiliser de l'engrais !",
-                        ephemeral=True
-                    )
-            except Exception:
-                pass
+            return await safe_respond(interaction, "❌ Ce jardin n'est pas à toi !", ephemeral=True)
+
+        total_seconds = int(cooldowns.remaining("engrais", self.user_id))
+        if total_seconds:
+            minutes, seconds = divmod(total_seconds, 60)
+            hours, minutes = divmod(minutes, 60)
+            return await safe_respond(
+                interaction,
+                f"⏳ Tu dois attendre {hours}h {minutes}m {seconds}s avant d'utiliser de l'engrais !",
+                ephemeral=True
+            )
 
         self.garden["garden_grid"] = pousser_fleurs(self.garden["garden_grid"])
-        self.garden["last_fertilize"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
         await self.update_garden_db()
+        # Cooldown posé seulement une fois le jardin enregistré
+        cooldowns.trigger("engrais", self.user_id, FERTILIZE_COOLDOWN.total_seconds())
 
         view = JardinView(self.garden, self.user_id)
         view.update_buttons()
         embed = build_garden_embed(self.garden, self.user_id)
-        await interaction.response.edit_message(embed=embed, view=view)
+        await safe_edit_response(interaction, embed=embed, view=view)
 
     @discord.ui.button(label="Couper", emoji="✂️", style=discord.ButtonStyle.secondary)
     async def couper(self, interaction: discord.Interaction, button: discord.ui.Button):
         if interaction.user.id != self.user_id:
-            return await interaction.response.send_message("❌ Ce jardin n'est pas à toi !", ephemeral=True)
+            return await safe_respond(interaction, "❌ Ce jardin n'est pas à toi !", ephemeral=True)
 
         new_lines, self.garden = couper_fleurs(self.garden["garden_grid"], self.garden)
         self.garden["garden_grid"] = new_lines
@@ -354,31 +341,31 @@ class JardinView(discord.ui.View):
         view = JardinView(self.garden, self.user_id)
         view.update_buttons()
         embed = build_garden_embed(self.garden, self.user_id)
-        await interaction.response.edit_message(embed=embed, view=view)
+        await safe_edit_response(interaction, embed=embed, view=view)
 
     @discord.ui.button(label="Alchimie", emoji="⚗️", style=discord.ButtonStyle.blurple)
     async def alchimie(self, interaction: discord.Interaction, button: discord.ui.Button):
         if interaction.user.id != self.user_id:
-            return await interaction.response.send_message("❌ Ce jardin n'est pas à toi !", ephemeral=True)
+            return await safe_respond(interaction, "❌ Ce jardin n'est pas à toi !", ephemeral=True)
 
         view = AlchimieView(self.garden, self.user_id)
         embed = view.build_embed()
-        await interaction.response.send_message(embed=embed, view=view)
+        await safe_respond(interaction, embed=embed, view=view)
 
 
     @discord.ui.button(label="Potions", emoji="🧪", style=discord.ButtonStyle.green)
     async def potions(self, interaction: discord.Interaction, button: discord.ui.Button):
         if interaction.user.id != self.user_id:
-            return await interaction.response.send_message("❌ Ce jardin n'est pas à toi !", ephemeral=True)
+            return await safe_respond(interaction, "❌ Ce jardin n'est pas à toi !", ephemeral=True)
 
         # Récupérer les potions depuis Supabase
-        user_data = supabase.table(TABLE_NAME).select("potions").eq("user_id", self.user_id).execute()
+        user_data = await asyncio.to_thread(supabase.table(TABLE_NAME).select("potions").eq("user_id", self.user_id).execute)
         potions_data = {}
         if user_data.data and user_data.data[0].get("potions"):
             potions_data = user_data.data[0]["potions"]
 
         embed = build_potions_embed(potions_data)
-        await interaction.response.send_message(embed=embed, ephemeral=False)
+        await safe_respond(interaction, embed=embed, ephemeral=False)
 
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -389,6 +376,12 @@ class Jardin(commands.Cog):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # Reprise unique de l’ancien cooldown d’engrais (last_fertilize)
+        cooldowns.migrate(
+            "engrais", TABLE_NAME, ("user_id", "last_fertilize"),
+            lambda row: (row["user_id"], from_iso(row["last_fertilize"]) + FERTILIZE_COOLDOWN.total_seconds()),
+            store=lambda start, end: {"last_fertilize": to_iso(start)}
+        )
 
     async def _send_garden(self, target_user, viewer_id, respond_func):
         try:
@@ -401,11 +394,12 @@ class Jardin(commands.Cog):
             await respond_func(embed=embed, view=view)
         except Exception as e:
             print(f"[ERREUR jardin] {e}")
-            await respond_func("❌ Une erreur est survenue.", ephemeral=True)
+            await respond_func(content="❌ Une erreur est survenue.", ephemeral=True)
 
 
     # ───────── Commande Slash ─────────
     @app_commands.command(name="jardin", description="Affiche ton jardin ou celui d'un autre utilisateur 🌱")
+    @auto_defer()
     @app_commands.checks.cooldown(1, 5.0)
     async def slash_jardin(self, interaction:discord.Interaction, user:discord.User=None):
         target = user or interaction.user
@@ -16,6 +16,8 @@ import random
 import json
 
 from utils.supabase_client import supabase
+from utils.schema import projection
+from utils.cooldowns import cooldowns, from_iso, to_iso
 from utils.discord_utils import safe_send
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -29,13 +31,15 @@ FLEUR_EMOJIS = CONFIG["FLEUR_EMOJIS"]
 FERTILIZE_PROBABILITY = CONFIG["FERTILIZE_PROBABILITY"]
 FERTILIZE_COOLDOWN = datetime.timedelta(minutes=CONFIG["FERTILIZE_COOLDOWN_MINUTES"])
 TABLE_NAME = "gardens"
+# Colonnes du jardin (les potions sont lues à part, seulement quand on les affiche)
+GARDEN = projection(TABLE_NAME, "user_id", "username", "garden_grid", "inventory", "argent", "armee")
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🛠️ Fonctions utilitaires
 # ────────────────────────────────────────────────────────────────────────────────
 async def get_or_create_garden(user_id: int, username: str):
     """Récupère ou crée un jardin pour l’utilisateur"""
-    res = supabase.table(TABLE_NAME).select("*").eq("user_id", user_id).execute()
+    res = GARDEN.select(supabase).eq("user_id", user_id).execute()
     if res.data:
         return res.data[0]
 
@@ -45,8 +49,7 @@ async def get_or_create_garden(user_id: int, username: str):
         "garden_grid": DEFAULT_GRID.copy(),
         "inventory": {f: 0 for f in FLEUR_EMOJIS},
         "argent": 0,
-        "armee": "",
-        "last_fertilize": None
+        "armee": ""
     }
     supabase.table(TABLE_NAME).insert(new_garden).execute()
     return new_garden
@@ -154,17 +157,15 @@ class GlobalButton(discord.ui.Button):
             return await interaction.response.send_message("❌ Ce jardin n'est pas à toi !", ephemeral=True)
 
         if self.action == "engrais":
-            now = datetime.datetime.now(datetime.timezone.utc)
-            last = self.parent_view.garden.get("last_fertilize")
-            if last and now < datetime.datetime.fromisoformat(last) + FERTILIZE_COOLDOWN:
+            if cooldowns.remaining("engrais", self.parent_view.user_id):
                 return await interaction.response.send_message("⏳ Engrais en cooldown !", ephemeral=True)
 
             self.parent_view.garden["garden_grid"] = pousser_fleurs(self.parent_view.garden["garden_grid"])
-            self.parent_view.garden["last_fertilize"] = now.isoformat()
             supabase.table(TABLE_NAME).update({
-                "garden_grid": self.parent_view.garden["garden_grid"],
-                "last_fertilize": self.parent_view.garden["last_fertilize"]
+                "garden_grid": self.parent_view.garden["garden_grid"]
             }).eq("user_id", self.parent_view.user_id).execute()
+            # Cooldown posé seulement une fois le jardin enregistré
+            cooldowns.trigger("engrais", self.parent_view.user_id, FERTILIZE_COOLDOWN.total_seconds())
 
         # TODO : inventaire, alchimie, magasin
 
@@ -177,6 +178,12 @@ class GlobalButton(discord.ui.Button):
 class Jardin2Cog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # Reprise unique de l’ancien cooldown d’engrais (last_fertilize), partagée avec jardin.py
+        cooldowns.migrate(
+            "engrais", TABLE_NAME, ("user_id", "last_fertilize"),
+            lambda row: (row["user_id"], from_iso(row["last_fertilize"]) + FERTILIZE_COOLDOWN.total_seconds()),
+            store=lambda start, end: {"last_fertilize": to_iso(start)}
+        )
 
     @commands.command(name="jardin2")
     async def prefix_jardin2(self, ctx: commands.Context):
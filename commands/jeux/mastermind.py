@@ -4,6 +4,7 @@
 # Catégorie : Jeux
 # Accès : Public
 # Cooldown : 1 utilisation / 10 secondes / utilisateur
+# Sessions : expiration via utils/game_sessions (reprise après redémarrage)
 # ────────────────────────────────────────────────────────────────────────────────
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -14,7 +15,11 @@ from discord import app_commands
 from discord.ext import commands
 from discord.ui import View, Button
 import random
+import asyncio
 from utils.discord_utils import safe_send, safe_edit, safe_respond
+from utils.game_sessions import sessions
+from utils.view_registry import view_registry
+from utils.mastermind_engine import MastermindSolver, score, pegs_to_emojis, emojis_to_pegs
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🎨 Liste des couleurs utilisables
@@ -32,32 +37,70 @@ DIFFICULTIES = [
 ]
 
 # ────────────────────────────────────────────────────────────────────────────────
-# 🧩 Vue principale du jeu Mastermind
+# 🧩 Vue principale du jeu Mastermind (persistante : custom_id fixes)
 # ────────────────────────────────────────────────────────────────────────────────
 class MastermindView(View):
-    def __init__(self, author: discord.User | None, code_length: int, corruption: bool):
+    TIMEOUT = 180             # secondes sans coup joué avant la fin de la partie
+
+    def __init__(self, author_id: int | None, code_length: int, corruption: bool, code: list = None,
+                 attempts: list = None, current_guess: list = None, hint_used: bool = False):
         """
-        author = None → mode multi (tout le monde peut jouer)
-        author = discord.User → mode solo (seul le lanceur peut jouer)
+        author_id = None → mode multi (tout le monde peut jouer)
+        author_id = ID   → mode solo (seul le lanceur peut jouer)
         """
-        super().__init__(timeout=180)
-        self.author = author
+        super().__init__(timeout=None)
+        self.author_id = author_id
         self.code_length = code_length
         self.corruption = corruption
         self.max_attempts = code_length + 2
-        self.code = [random.choice(COLORS) for _ in range(code_length)]
-        self.attempts = []
-        self.current_guess = []
+        self.code = code or [random.choice(COLORS) for _ in range(code_length)]
+        self.attempts = [(list(guess), list(feedback)) for guess, feedback in attempts or []]
+        self.current_guess = list(current_guess or [])
         self.message = None
+        self.session = None
         self.result_shown = False
+        self.hint_used = hint_used
 
-        for color in COLORS:
-            self.add_item(ColorButton(color, self))
+        for index, color in enumerate(COLORS):
+            self.add_item(ColorButton(color, index, self))
         self.add_item(ValidateButton(self))
         self.add_item(ClearButton(self))
+        hint = HintButton(self)
+        hint.disabled = hint_used
+        self.add_item(hint)
+
+    def state(self) -> dict:
+        """Instantané JSON de la partie (utils/game_sessions)."""
+        return {
+            "author_id": self.author_id,
+            "code_length": self.code_length,
+            "corruption": self.corruption,
+            "code": self.code,
+            "attempts": self.attempts,
+            "current_guess": self.current_guess,
+            "hint_used": self.hint_used,
+        }
+
+    def save(self):
+        """Coup joué : instantané mis à jour et échéance repoussée."""
+        if self.session:
+            sessions.save(self.session, **self.state())
+            sessions.touch(self.session, self.TIMEOUT)
+            view_registry.track(self, self.message, ttl=self.TIMEOUT + 5)
+
+    def end(self):
+        self.result_shown = True
+        for item in self.children:
+            item.disabled = True
+        if self.session:
+            sessions.close(self.session)
+        view_registry.release(self)
+
+    def is_player(self, interaction: discord.Interaction) -> bool:
+        return self.author_id is None or interaction.user.id == self.author_id
 
     def build_embed(self) -> discord.Embed:
-        mode_text = "Multi" if self.author is None else "Solo"
+        mode_text = "Multi" if self.author_id is None else "Solo"
         embed = discord.Embed(
             title=f"🎯 Mastermind - mode {mode_text}",
             description=(
@@ -84,37 +127,21 @@ class MastermindView(View):
         return [f"{''.join(guess)}\n{''.join(feedback)}" for guess, feedback in self.attempts]
 
     def generate_feedback(self, guess):
-        feedback = []
-        code_copy = self.code[:]
-        matched_code = [False] * self.code_length
-        matched_guess = [False] * self.code_length
-
-        for i in range(self.code_length):
-            if guess[i] == code_copy[i]:
-                feedback.append("🔴")
-                matched_code[i] = True
-                matched_guess[i] = True
-            else:
-                feedback.append(None)
-
-        for i in range(self.code_length):
-            if feedback[i] is None:
-                for j in range(self.code_length):
-                    if not matched_code[j] and not matched_guess[i] and guess[i] == code_copy[j]:
-                        feedback[i] = "⚪"
-                        matched_code[j] = True
-                        matched_guess[i] = True
-                        break
-
-        for i in range(self.code_length):
-            if feedback[i] is None:
-                feedback[i] = "❌"
+        feedback = pegs_to_emojis(score(self.code, guess))
 
         if self.corruption:
             feedback = [f if random.random() > 0.20 else "💀" for f in feedback]
 
         return feedback
 
+    def compute_hint(self):
+        """Propose une combinaison compatible avec toutes les tentatives affichées."""
+        solver = MastermindSolver(self.code_length, len(COLORS))
+        for guess, feedback in self.attempts:
+            solver.add_feedback([COLORS.index(c) for c in guess], emojis_to_pegs(feedback))
+        suggestion = solver.suggest()
+        return [COLORS[d] for d in suggestion] if suggestion else None
+
     async def update_message(self):
         if self.message and not self.result_shown:
             await safe_edit(self.message, embed=self.build_embed(), view=self)
@@ -126,52 +153,61 @@ class MastermindView(View):
         self.current_guess.clear()
 
         if guess == self.code:
-            self.result_shown = True
             await self.show_result(interaction, win=True)
             return
         if len(self.attempts) >= self.max_attempts:
-            self.result_shown = True
             await self.show_result(interaction, win=False)
             return
 
+        self.save()
         await self.update_message()
         try:
             await interaction.response.defer()
         except discord.InteractionResponded:
             pass
 
-    async def show_result(self, interaction: discord.Interaction, win: bool):
-        self.stop()
-        for item in self.children:
-            item.disabled = True
+    def result_embed(self, title: str, color: discord.Color) -> discord.Embed:
         embed = self.build_embed()
         embed.add_field(
             name="🏁 Résultat",
-            value=f"**{'Gagné ! 🎉' if win else 'Perdu ! 💀'}**\n"
+            value=f"**{title}**\n"
                   f"La combinaison était : {' '.join(self.code)}",
             inline=False
         )
-        embed.color = discord.Color.green() if win else discord.Color.red()
+        embed.color = color
+        return embed
+
+    async def show_result(self, interaction: discord.Interaction, win: bool):
+        self.end()
+        embed = self.result_embed("Gagné ! 🎉" if win else "Perdu ! 💀", discord.Color.green() if win else discord.Color.red())
         try:
             await interaction.response.edit_message(embed=embed, view=self)
         except discord.InteractionResponded:
             await interaction.edit_original_response(embed=embed, view=self)
 
+    async def expire(self):
+        """Appelée par la roue de minuterie quand personne n’a joué depuis TIMEOUT secondes."""
+        if self.result_shown:
+            return
+        self.end()
+        await safe_edit(self.message, embed=self.result_embed("⏳ Temps écoulé !", discord.Color.red()), view=self)
+
 # ────────────────────────────────────────────────────────────────────────────────
 # 🔵 Boutons interactifs
 # ────────────────────────────────────────────────────────────────────────────────
 class ColorButton(Button):
-    def __init__(self, color: str, view_ref: MastermindView):
-        super().__init__(style=discord.ButtonStyle.secondary, emoji=color)
+    def __init__(self, color: str, index: int, view_ref: MastermindView):
+        super().__init__(style=discord.ButtonStyle.secondary, emoji=color, custom_id=f"mastermind:couleur:{index}")
         self.color = color
         self.view_ref = view_ref
 
     async def callback(self, interaction: discord.Interaction):
-        if self.view_ref.author and interaction.user != self.view_ref.author:
+        if not self.view_ref.is_player(interaction):
             return await safe_respond(interaction, "⛔ Ce jeu ne t'appartient pas.", ephemeral=True)
         if len(self.view_ref.current_guess) >= self.view_ref.code_length:
             return await safe_respond(interaction, "❗ Nombre de couleurs atteint.", ephemeral=True)
         self.view_ref.current_guess.append(self.color)
+        self.view_ref.save()
         await self.view_ref.update_message()
         try:
             await interaction.response.defer()
@@ -180,26 +216,49 @@ class ColorButton(Button):
 
 class ClearButton(Button):
     def __init__(self, view_ref: MastermindView):
-        super().__init__(emoji="🗑️", style=discord.ButtonStyle.danger)
+        super().__init__(emoji="🗑️", style=discord.ButtonStyle.danger, custom_id="mastermind:effacer")
         self.view_ref = view_ref
 
     async def callback(self, interaction: discord.Interaction):
-        if self.view_ref.author and interaction.user != self.view_ref.author:
+        if not self.view_ref.is_player(interaction):
             return await safe_respond(interaction, "⛔ Ce jeu ne t'appartient pas.", ephemeral=True)
         self.view_ref.current_guess.clear()
+        self.view_ref.save()
         await self.view_ref.update_message()
         try:
             await interaction.response.defer()
         except discord.InteractionResponded:
             pass
 
+class HintButton(Button):
+    def __init__(self, view_ref: MastermindView):
+        super().__init__(label="Indice", emoji="💡", style=discord.ButtonStyle.primary, custom_id="mastermind:indice")
+        self.view_ref = view_ref
+
+    async def callback(self, interaction: discord.Interaction):
+        if not self.view_ref.is_player(interaction):
+            return await safe_respond(interaction, "⛔ Ce jeu ne t'appartient pas.", ephemeral=True)
+        if self.view_ref.hint_used:
+            return await safe_respond(interaction, "💡 L'indice a déjà été utilisé pour cette partie.", ephemeral=True)
+        self.view_ref.hint_used = True
+        self.disabled = True
+        self.view_ref.save()
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        # Le solveur peut prendre ~1 s en Cauchemar → hors de la boucle d'événements
+        suggestion = await asyncio.to_thread(self.view_ref.compute_hint)
+        await self.view_ref.update_message()
+        if suggestion:
+            await interaction.followup.send(f"💡 Essaie : {''.join(suggestion)}", ephemeral=True)
+        else:
+            await interaction.followup.send("💡 Aucune combinaison compatible trouvée (trop de 💀 ?).", ephemeral=True)
+
 class ValidateButton(Button):
     def __init__(self, view_ref: MastermindView):
-        super().__init__(emoji="✅", style=discord.ButtonStyle.success)
+        super().__init__(emoji="✅", style=discord.ButtonStyle.success, custom_id="mastermind:valider")
         self.view_ref = view_ref
 
     async def callback(self, interaction: discord.Interaction):
-        if self.view_ref.author and interaction.user != self.view_ref.author:
+        if not self.view_ref.is_player(interaction):
             return await safe_respond(interaction, "⛔ Ce jeu ne t'appartient pas.", ephemeral=True)
         if len(self.view_ref.current_guess) != self.view_ref.code_length:
             return await safe_respond(interaction, "⚠️ Nombre de couleurs insuffisant.", ephemeral=True)
@@ -227,10 +286,21 @@ class DifficultyButton(Button):
         self.author = author
 
     async def callback(self, interaction: discord.Interaction):
-        view = MastermindView(self.author, self.code_length, self.corruption)
+        view = MastermindView(self.author.id if self.author else None, self.code_length, self.corruption)
+        view.session = sessions.open(
+            "mastermind", interaction.message.id, ttl=view.TIMEOUT, state=view.state(),
+            guild_id=interaction.guild_id, channel_id=interaction.channel_id, handle=view
+        )
+        if view.session is None:
+            self.view.stop()
+            return await interaction.response.edit_message(
+                content="❌ Trop de parties en cours sur ce serveur, réessaie plus tard.", embed=None, view=None
+            )
+        self.view.stop()
         embed = view.build_embed()
         await interaction.response.edit_message(embed=embed, view=view)
         view.message = interaction.message
+        view_registry.track(view, view.message, ttl=view.session.remaining() + 5)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
@@ -240,6 +310,43 @@ class Mastermind(commands.Cog):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        sessions.register(bot, "mastermind", on_expire=self._on_expire, restore=self._restore)
+        view_registry.register_persistent(bot, "mastermind:", self._rehydrate)
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔹 Sessions (utils/game_sessions)
+    # ────────────────────────────────────────────────────────────────────────────
+    async def _on_expire(self, session):
+        await session.handle.expire()
+
+    def _build_view(self, session, message) -> MastermindView:
+        state = session.state
+        view = MastermindView(
+            state.get("author_id"), state["code_length"], state["corruption"], code=state["code"],
+            attempts=state.get("attempts"), current_guess=state.get("current_guess"), hint_used=state.get("hint_used", False)
+        )
+        view.message = message
+        view.session = session
+        session.handle = view
+        return view
+
+    # 🔹 Reprise après redémarrage
+    async def _restore(self, session):
+        channel = self.bot.get_channel(int(session.channel_id))
+        if channel is None:
+            return None
+        view = self._build_view(session, channel.get_partial_message(int(session.key)))
+        self.bot.add_view(view, message_id=int(session.key))
+        view_registry.track(view, view.message, ttl=session.remaining() + 5)
+        return view
+
+    # 🔹 Clic sur une partie dont la View a été libérée (plafond global atteint)
+    async def _rehydrate(self, interaction: discord.Interaction):
+        session = sessions.get("mastermind", interaction.message.id)
+        if session is None:
+            await safe_respond(interaction, "⚠️ La partie est terminée.", ephemeral=True)
+            return None
+        return self._build_view(session, interaction.message)
 
     # ────────────────────────────────────────────────────────────────────────────
     # 🔹 Commande PREFIX
@@ -3,6 +3,7 @@
 # Objectif : Jeu du pendu interactif avec propositions par message
 # Catégorie : Jeux
 # Accès : Public
+# Sessions : une partie par salon via utils/game_sessions (expiration, reprise après redémarrage)
 # ────────────────────────────────────────────────────────────────────────────────
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -12,6 +13,8 @@ import discord
 from discord.ext import commands
 import aiohttp
 from utils.discord_utils import safe_send, safe_edit, safe_respond  # ✅ Utilisation safe_
+from utils.game_sessions import sessions
+from utils.message_router import router
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🎨 Constantes et ASCII
@@ -28,6 +31,7 @@ PENDU_ASCII = [
 ]
 
 MAX_ERREURS = 7
+SESSION_TTL = 15 * 60  # partie abandonnée après 15 minutes sans proposition
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧩 Classe PenduGame
@@ -94,6 +98,28 @@ class PenduSession:
         else:
             self.player_id = author_id  # solo : stocke juste le joueur qui a lancé la partie
 
+    def snapshot(self) -> dict:
+        """État minimal sauvegardé pour reprendre la partie après un redémarrage."""
+        return {
+            "mot": self.game.mot,
+            "trouve": sorted(self.game.trouve),
+            "rate": sorted(self.game.rate),
+            "mode": self.mode,
+            "message_id": self.message.id if self.message else None,
+            "players": sorted(self.players) if self.mode == "multi" else [self.player_id],
+        }
+
+    @classmethod
+    def from_snapshot(cls, state: dict, message) -> "PenduSession":
+        game = PenduGame(state["mot"], mode=state["mode"])
+        game.trouve = set(state["trouve"])
+        game.rate = set(state["rate"])
+        players = state.get("players") or [None]
+        session = cls(game, message, mode=state["mode"], author_id=players[0])
+        if session.mode == "multi":
+            session.players.update(players)
+        return session
+
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
 # ────────────────────────────────────────────────────────────────────────────────
@@ -104,8 +130,33 @@ class Pendu(commands.Cog):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.sessions = {}  # dict channel_id -> PenduSession
         self.http_session = aiohttp.ClientSession()
+        sessions.register(bot, "pendu", on_expire=self._on_expire, restore=self._restore)
+
+    # 🔹 Fin de partie : libère la session et le salon dans le routeur
+    def _end(self, entry):
+        sessions.close(entry)
+        router.unbind(int(entry.key), self.on_guess)
+
+    # 🔹 Expiration (roue de minuterie partagée)
+    async def _on_expire(self, session):
+        router.unbind(int(session.key), self.on_guess)
+        channel = self.bot.get_channel(int(session.channel_id))
+        if channel:
+            await safe_send(channel, f"⌛ Partie de pendu abandonnée. Le mot était `{session.handle.game.mot}`.")
+
+    # 🔹 Reprise après redémarrage
+    async def _restore(self, session):
+        channel = self.bot.get_channel(int(session.channel_id))
+        if channel is None or not session.state.get("message_id"):
+            return None
+        router.bind(channel.id, self.on_guess)
+        return PenduSession.from_snapshot(session.state, channel.get_partial_message(session.state["message_id"]))
+
+    def cog_unload(self):
+        for channel_id, handler in list(router.channels.items()):
+            if handler == self.on_guess:
+                router.unbind(channel_id)
 
     @commands.command(
         name="pendu",
@@ -118,7 +169,7 @@ class Pendu(commands.Cog):
             mode = "solo"
 
         channel_id = ctx.channel.id
-        if channel_id in self.sessions:
+        if sessions.get("pendu", channel_id):
             await safe_send(ctx.channel, "❌ Une partie est déjà en cours dans ce salon.")
             return
 
@@ -136,7 +187,14 @@ class Pendu(commands.Cog):
         else:
             session = PenduSession(game, message, mode="solo", author_id=ctx.author.id)
 
-        self.sessions[channel_id] = session
+        opened = sessions.open(
+            "pendu", channel_id, ttl=SESSION_TTL, state=session.snapshot(),
+            guild_id=ctx.guild.id if ctx.guild else None, channel_id=channel_id, handle=session
+        )
+        if opened is None:
+            await safe_edit(message, content="❌ Trop de parties en cours sur ce serveur, réessaie plus tard.", embed=None)
+            return
+        router.bind(channel_id, self.on_guess)
 
     async def _fetch_random_word(self) -> str | None:
         url = "https://trouve-mot.fr/api/random/1"
@@ -149,15 +207,17 @@ class Pendu(commands.Cog):
         except Exception:
             return None
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if message.author.bot or not message.guild:
+    # 🔹 Saisie d’une lettre (appelée par le routeur central, seulement pour les salons en partie)
+    async def on_guess(self, message: discord.Message):
+        if not message.guild:
             return
 
         channel_id = message.channel.id
-        session: PenduSession = self.sessions.get(channel_id)
-        if not session:
+        entry = sessions.get("pendu", channel_id)
+        if not entry:
+            router.unbind(channel_id, self.on_guess)
             return
+        session: PenduSession = entry.handle
 
         # Solo : uniquement le joueur qui a lancé la partie
         if session.mode == "solo" and message.author.id != session.player_id:
@@ -183,7 +243,7 @@ class Pendu(commands.Cog):
         try:
             await safe_edit(session.message, embed=embed)
         except discord.NotFound:
-            del self.sessions[channel_id]
+            self._end(entry)
             await safe_send(message.channel, "❌ Partie annulée car le message du jeu a été supprimé.")
             return
 
@@ -191,14 +251,17 @@ class Pendu(commands.Cog):
 
         if resultat == "gagne":
             await safe_send(message.channel, f"🎉 Bravo {message.author.mention}, le mot `{game.mot}` a été deviné !")
-            del self.sessions[channel_id]
+            self._end(entry)
             return
 
         if resultat == "perdu":
             await safe_send(message.channel, f"💀 Partie terminée ! Le mot était `{game.mot}`.")
-            del self.sessions[channel_id]
+            self._end(entry)
             return
 
+        entry.state = session.snapshot()
+        sessions.touch(entry, SESSION_TTL)
+
 # ────────────────────────────────────────────────────────────────────────────────
 # 🔌 Setup du Cog
 # ────────────────────────────────────────────────────────────────────────────────
@@ -16,6 +16,8 @@ from discord.ui import View
 import os
 import json
 from utils.supabase_client import supabase
+from utils.reiatsu_profiles import profiles
+from utils.reiatsu_rules import steal_cooldown_hours
 from utils.discord_utils import safe_send, safe_respond, safe_edit
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -41,11 +43,10 @@ class ClasseButton(discord.ui.Button):
             return
 
         try:
-            nouveau_cd = 19 if self.classe == "Voleur" else 24
-            supabase.table("reiatsu").update({
-                "classe": self.classe,
-                "steal_cd": nouveau_cd
-            }).eq("user_id", str(interaction.user.id)).execute()
+            nouveau_cd = steal_cooldown_hours(self.classe)
+            changes = {"classe": self.classe, "steal_cd": nouveau_cd}
+            supabase.table("reiatsu").update(changes).eq("user_id", str(interaction.user.id)).execute()
+            profiles.apply(interaction.user.id, changes)
 
             symbole = self.data.get("Symbole", "🌀")
             embed = discord.Embed(
@@ -0,0 +1,197 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 classement.py — Commande /classement et !classement
+# Objectif : Afficher le classement Reiatsu (serveur ou global) avec pagination
+# Catégorie : Reiatsu
+# Accès : Tous
+# Cooldown : 1 utilisation / 5 secondes / utilisateur
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import math
+import discord
+from discord import app_commands
+from discord.ext import commands
+from discord.ui import View, Button
+from utils.supabase_client import supabase
+from utils.leaderboard import leaderboard
+from utils.discord_utils import safe_send, safe_respond, safe_edit
+
+PER_PAGE = 10
+MEDALS = {1: "🥇", 2: "🥈", 3: "🥉"}
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🎛️ UI — Pagination du classement
+# ────────────────────────────────────────────────────────────────────────────────
+class ClassementView(View):
+    def __init__(self, bot, author_id: int, guild_id=None):
+        super().__init__(timeout=120)
+        self.bot = bot
+        self.author_id = author_id
+        self.guild_id = guild_id
+        self.page = 0
+        self.total_pages = max(1, math.ceil(leaderboard.size(guild_id) / PER_PAGE))
+        if self.total_pages > 1:
+            self.add_item(ClassementPrevButton(self))
+            self.add_item(ClassementNextButton(self))
+
+    def _name(self, user_id: str) -> str:
+        user = self.bot.get_user(int(user_id))
+        return user.display_name if user else f"<{user_id}>"
+
+    def create_embed(self):
+        scope = "du serveur" if self.guild_id else "global"
+        embed = discord.Embed(
+            title=f"🏆 Classement Reiatsu {scope} — Page {self.page + 1}/{self.total_pages}",
+            color=discord.Color.purple()
+        )
+        rows = leaderboard.top(PER_PAGE, guild_id=self.guild_id, offset=self.page * PER_PAGE)
+        lines = [
+            f"{MEDALS.get(rank, f'`#{rank}`')} **{self._name(user_id)}** — {points} 💠"
+            for rank, user_id, points in rows
+        ]
+        embed.description = "\n".join(lines) or "Aucun joueur classé pour le moment."
+
+        around = leaderboard.neighbours(self.author_id, radius=1, guild_id=self.guild_id)
+        if around:
+            embed.add_field(
+                name="📍 Ta position",
+                value="\n".join(
+                    f"`#{rank}` {'➡️ ' if user_id == str(self.author_id) else ''}{self._name(user_id)} — {points} 💠"
+                    for rank, user_id, points in around
+                ),
+                inline=False
+            )
+        embed.set_footer(text=f"{leaderboard.size(self.guild_id)} joueur(s) classé(s)")
+        return embed
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.author_id
+
+class ClassementPrevButton(Button):
+    def __init__(self, paginator):
+        super().__init__(label="◀️", style=discord.ButtonStyle.primary)
+        self.paginator = paginator
+
+    async def callback(self, interaction: discord.Interaction):
+        await interaction.response.defer()
+        if self.paginator.page > 0:
+            self.paginator.page -= 1
+            await safe_edit(interaction.message, embed=self.paginator.create_embed(), view=self.paginator)
+
+class ClassementNextButton(Button):
+    def __init__(self, paginator):
+        super().__init__(label="▶️", style=discord.ButtonStyle.primary)
+        self.paginator = paginator
+
+    async def callback(self, interaction: discord.Interaction):
+        await interaction.response.defer()
+        if self.paginator.page < self.paginator.total_pages - 1:
+            self.paginator.page += 1
+            await safe_edit(interaction.message, embed=self.paginator.create_embed(), view=self.paginator)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Cog principal
+# ────────────────────────────────────────────────────────────────────────────────
+class Classement(commands.Cog):
+    """
+    Commande /classement et !classement — Classement Reiatsu du serveur ou global
+    """
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.bot.loop.create_task(self._seed_leaderboard())
+
+    async def _seed_leaderboard(self):
+        """Charge une seule fois les points depuis Supabase, puis les membres des serveurs."""
+        await self.bot.wait_until_ready()
+        if not leaderboard.ready:
+            try:
+                res = supabase.table("reiatsu").select("user_id", "points").execute()
+                leaderboard.seed(res.data or [])
+                print(f"[CLASSEMENT] {len(leaderboard.points)} joueurs chargés.")
+            except Exception as e:
+                print(f"[ERREUR CLASSEMENT] Chargement impossible : {e}")
+                return
+        for guild in self.bot.guilds:
+            leaderboard.set_guild_members(guild.id, (m.id for m in guild.members if not m.bot))
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔹 Suivi des membres (vues par serveur)
+    # ────────────────────────────────────────────────────────────────────────────
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        if not member.bot:
+            leaderboard.add_member(member.guild.id, member.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        leaderboard.remove_member(member.guild.id, member.id)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        leaderboard.set_guild_members(guild.id, (m.id for m in guild.members if not m.bot))
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        leaderboard.drop_guild(guild.id)
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔹 Fonction interne commune
+    # ────────────────────────────────────────────────────────────────────────────
+    def _build(self, author_id: int, guild, scope: str):
+        guild_id = None if scope == "global" or guild is None else guild.id
+        view = ClassementView(self.bot, author_id, guild_id)
+        return view.create_embed(), view
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔹 Commande SLASH
+    # ────────────────────────────────────────────────────────────────────────────
+    @app_commands.command(
+        name="classement",
+        description="Affiche le classement Reiatsu du serveur (ou global)."
+    )
+    @app_commands.describe(portee="serveur ou global")
+    @app_commands.checks.cooldown(1, 5.0, key=lambda i: (i.user.id))
+    async def slash_classement(self, interaction: discord.Interaction, portee: str = "serveur"):
+        try:
+            if not leaderboard.ready:
+                await safe_respond(interaction, "⏳ Le classement est en cours de chargement.", ephemeral=True)
+                return
+            embed, view = self._build(interaction.user.id, interaction.guild, portee)
+            await safe_respond(interaction, embed=embed, view=view)
+        except app_commands.CommandOnCooldown as e:
+            await safe_respond(interaction, f"⏳ Attends encore {e.retry_after:.1f}s.", ephemeral=True)
+        except Exception as e:
+            print(f"[ERREUR /classement] {e}")
+            await safe_respond(interaction, "❌ Une erreur est survenue.", ephemeral=True)
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔹 Commande PREFIX
+    # ────────────────────────────────────────────────────────────────────────────
+    @commands.command(
+        name="classement",
+        aliases=["top", "lb"],
+        help="Affiche le classement Reiatsu du serveur. `!classement global` pour tous les serveurs."
+    )
+    @commands.cooldown(1, 5.0, commands.BucketType.user)
+    async def prefix_classement(self, ctx: commands.Context, portee: str = "serveur"):
+        try:
+            if not leaderboard.ready:
+                await safe_send(ctx.channel, "⏳ Le classement est en cours de chargement.")
+                return
+            embed, view = self._build(ctx.author.id, ctx.guild, portee)
+            await safe_send(ctx.channel, embed=embed, view=view)
+        except Exception as e:
+            print(f"[ERREUR !classement] {e}")
+            await safe_send(ctx.channel, "❌ Une erreur est survenue.")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔌 Setup du Cog
+# ────────────────────────────────────────────────────────────────────────────────
+async def setup(bot: commands.Bot):
+    cog = Classement(bot)
+    for command in cog.get_commands():
+        if not hasattr(command, "category"):
+            command.category = "Reiatsu"
+    await bot.add_cog(cog)
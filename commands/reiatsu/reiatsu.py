@@ -6,7 +6,7 @@
 
 import discord
 from discord.ext import commands
-from utils.supabase_client import supabase
+from utils.reiatsu_profiles import profiles
 from utils.discord_utils import safe_send
 
 class Reiatsu(commands.Cog):
@@ -19,14 +19,13 @@ class Reiatsu(commands.Cog):
     async def reiatsu_cmd(self, ctx):
         """Affiche les points Reiatsu de l'utilisateur."""
         try:
-            data = supabase.table("reiatsu").select("*").eq("user_id", ctx.author.id).execute()
-            if not data.data:
+            user = await profiles.aget(ctx.author.id)
+            if not user:
                 await safe_send(ctx.channel, f"⚠️ {ctx.author.mention}, tu n’as pas encore de Reiatsu !")
                 return
 
-            user = data.data[0]
-            points = user["points"]
-            classe = user["classe"]
+            points = user.points
+            classe = user.classe
             await safe_send(ctx.channel, f"💠 **{ctx.author.display_name}** — Classe : {classe} | Reiatsu : **{points}**")
         except Exception as e:
             print(f"[ERREUR REIATSU] {e}")
@@ -3,7 +3,7 @@
 # Objectif : Permet de voler 10% du Reiatsu d’un autre joueur avec probabilité de réussite
 # Catégorie : Reiatsu
 # Accès : Public
-# Cooldown : 1 utilisation / 24h / utilisateur (persistant via Supabase)
+# Cooldown : 1 utilisation / 24h / utilisateur (persistant via utils/cooldowns)
 # ────────────────────────────────────────────────────────────────────────────────
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -12,10 +12,13 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-from datetime import datetime, timedelta
 from utils.supabase_client import supabase
-from utils.discord_utils import safe_send, safe_respond  
-import random
+from utils.cooldowns import cooldowns, from_iso, to_iso
+from utils.leaderboard import leaderboard
+from utils.reiatsu_profiles import profiles
+from utils.reiatsu_rules import roll_steal, illusion_dodges, DEFAULT_STEAL_COOLDOWN_HOURS
+from utils.discord_utils import safe_send, safe_respond
+from utils.interaction_router import interactions
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
@@ -26,6 +29,12 @@ class ReiatsuVol(commands.Cog):
     """
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # Reprise unique de l’ancien cooldown (last_steal_attempt + steal_cd heures)
+        cooldowns.migrate(
+            "vol", "reiatsu", ("user_id", "last_steal_attempt", "steal_cd"),
+            lambda row: (row["user_id"], from_iso(row["last_steal_attempt"]) + (row.get("steal_cd") or 24) * 3600),
+            store=lambda start, end: {"last_steal_attempt": to_iso(start)}
+        )
 
     # ────────────────────────────────────────────────────────────────────────────
     # 🔹 Fonction interne commune
@@ -34,38 +43,31 @@ class ReiatsuVol(commands.Cog):
         voleur_id = str(voleur.id)
         cible_id = str(cible.id)
 
-        # 📥 Récupération des données voleur
-        voleur_data = supabase.table("reiatsu").select("*").eq("user_id", voleur_id).execute()
-        if not voleur_data.data:
+        # 📥 Récupération des données voleur et cible (une seule requête, partagée si concurrente)
+        joueurs = await profiles.aget_many([voleur_id, cible_id])
+        voleur_data = joueurs.get(voleur_id)
+        if not voleur_data:
             await safe_send(channel, "⚠️ Données introuvables pour toi.")
             return
-        voleur_data = voleur_data.data[0]
-
-        voleur_classe = voleur_data.get("classe")
-        voleur_cd = voleur_data.get("steal_cd", 24)
-        now = datetime.utcnow()
-        dernier_vol_str = voleur_data.get("last_steal_attempt")
-
-        if dernier_vol_str:
-            dernier_vol = datetime.fromisoformat(dernier_vol_str)
-            prochain_vol = dernier_vol + timedelta(hours=voleur_cd)
-            if now < prochain_vol:
-                restant = prochain_vol - now
-                j = restant.days
-                h, m = divmod(restant.seconds // 60, 60)
-                await safe_send(channel, f"⏳ Tu dois encore attendre **{j}j {h}h{m}m** avant de retenter.")
-                return
 
-        # 📥 Récupération des données cible
-        cible_data = supabase.table("reiatsu").select("*").eq("user_id", cible_id).execute()
-        if not cible_data.data:
+        voleur_classe = voleur_data.classe
+        voleur_cd = voleur_data.steal_cd
+
+        restant = int(cooldowns.remaining("vol", voleur_id))
+        if restant:
+            j, reste = divmod(restant, 86400)
+            h, m = divmod(reste // 60, 60)
+            await safe_send(channel, f"⏳ Tu dois encore attendre **{j}j {h}h{m}m** avant de retenter.")
+            return
+
+        cible_data = joueurs.get(cible_id)
+        if not cible_data:
             await safe_send(channel, "⚠️ Données introuvables pour la cible.")
             return
-        cible_data = cible_data.data[0]
 
-        voleur_points = voleur_data.get("points", 0)
-        cible_points = cible_data.get("points", 0)
-        cible_classe = cible_data.get("classe")
+        voleur_points = voleur_data.points
+        cible_points = cible_data.points
+        cible_classe = cible_data.classe
 
         if cible_points == 0:
             await safe_send(channel, f"⚠️ {cible.mention} n’a pas de Reiatsu à voler.")
@@ -74,41 +76,35 @@ class ReiatsuVol(commands.Cog):
             await safe_send(channel, "⚠️ Tu dois avoir au moins **1 point** de Reiatsu pour tenter un vol.")
             return
 
-        # 🎲 Calcul du vol
-        montant = max(1, cible_points // 10)  # 10%
-
+        # 🎲 Calcul du vol (10% des points de la cible ; règles : utils/reiatsu_rules)
         # 🔹 Si voleur a activé son skill → vol garanti
-        skill_actif = voleur_data.get("vol_garanti", False)
+        skill_actif = voleur_data.vol_garanti
+        succes, montant = roll_steal(voleur_classe, cible_points, garanti=skill_actif)
 
         if skill_actif:
-            succes = True
             # On désactive le skill après utilisation
             supabase.table("reiatsu").update({"vol_garanti": False}).eq("user_id", voleur_id).execute()
-        else:
-            # Voleur normal
-            if voleur_classe == "Voleur":
-                succes = random.random() < 0.67
-                if random.random() < 0.15:  # 15% de chance de doubler le gain
-                    montant *= 2
-            else:
-                succes = random.random() < 0.25
+            profiles.apply(voleur_id, {"vol_garanti": False})
 
-        # Préparation du payload voleur
-        payload_voleur = {"last_steal_attempt": now.isoformat()}
+        # Tentative comptée : cooldown du voleur (heures selon sa classe)
+        cooldowns.trigger("vol", voleur_id, (voleur_cd or DEFAULT_STEAL_COOLDOWN_HOURS) * 3600)
 
         if succes:
-            payload_voleur["points"] = voleur_points + montant
+            payload_voleur = {"points": voleur_points + montant}
             supabase.table("reiatsu").update(payload_voleur).eq("user_id", voleur_id).execute()
+            profiles.apply(voleur_id, payload_voleur)
+            leaderboard.update(voleur_id, payload_voleur["points"])
 
-            if cible_classe == "Illusionniste" and random.random() < 0.5:
+            if illusion_dodges(cible_classe):
                 await safe_send(channel, f"🩸 {voleur.mention} a volé **{montant}** points à {cible.mention}... mais c'était une illusion, {cible.mention} n'a rien perdu !")
             else:
                 supabase.table("reiatsu").update({
                     "points": max(0, cible_points - montant)
                 }).eq("user_id", cible_id).execute()
+                profiles.apply(cible_id, {"points": max(0, cible_points - montant)})
+                leaderboard.update(cible_id, max(0, cible_points - montant))
                 await safe_send(channel, f"🩸 {voleur.mention} a réussi à voler **{montant}** points de Reiatsu à {cible.mention} !")
         else:
-            supabase.table("reiatsu").update(payload_voleur).eq("user_id", voleur_id).execute()
             await safe_send(channel, f"😵 {voleur.mention} a tenté de voler {cible.mention}... mais a échoué !")
 
     # ────────────────────────────────────────────────────────────────────────────
@@ -121,10 +117,10 @@ class ReiatsuVol(commands.Cog):
     async def slash_volreiatsu(self, interaction: discord.Interaction, cible: discord.Member):
         """Commande slash pour voler du Reiatsu."""
         try:
-            await interaction.response.defer()
             if interaction.user.id == cible.id:
                 await safe_respond(interaction, "❌ Tu ne peux pas te voler toi-même.", ephemeral=True)
                 return
+            await interactions.defer(interaction)
             await self._volreiatsu_logic(interaction.user, cible, interaction.channel)
             await interaction.delete_original_response()
         except Exception as e:
@@ -15,6 +15,9 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from utils.supabase_client import supabase
+from utils.leaderboard import leaderboard
+from utils.reiatsu_profiles import profiles
+from utils.cooldowns import cooldowns, from_iso, to_iso
 from utils.discord_utils import safe_send, safe_followup
 
 # Cooldowns par classe (en secondes)
@@ -35,32 +38,33 @@ class Skill(commands.Cog):
     """
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # Reprise unique de l’ancien cooldown (last_skill + skill_cd secondes)
+        cooldowns.migrate(
+            "skill", "reiatsu", ("user_id", "last_skill", "skill_cd"),
+            lambda row: (row["user_id"], from_iso(row["last_skill"]) + (row.get("skill_cd") or 0)),
+            store=lambda start, end: {"last_skill": to_iso(start), "skill_cd": round(end - start)}
+        )
         print("[COG LOAD] Skill cog chargé ✅")
 
     # 🔹 Fonction interne commune
     async def _execute_skill(self, user_id: str, ctx_or_interaction=None):
         try:
-            response = supabase.table("reiatsu").select("*").eq("user_id", user_id).single().execute()
-            data = getattr(response, "data", None)
+            profile = await profiles.aget(user_id)
         except Exception as e:
             print(f"[ERREUR SUPABASE] {e}")
             return "❌ Impossible de récupérer les données."
 
-        if not data:
+        if not profile:
             return "❌ Tu n'as pas encore commencé l'aventure. Utilise `!start`."
 
-        classe = data.get("classe", "Travailleur")
-        reiatsu = data.get("points", 0)
-        last_skill = data.get("last_skill")
-        skill_cd = data.get("skill_cd", 0)
+        classe = profile.classe
+        reiatsu = profile.points
         now = datetime.now(timezone.utc)
 
-        # ⏳ Cooldown
-        if last_skill:
-            elapsed = (now - datetime.fromisoformat(last_skill)).total_seconds()
-            if elapsed < skill_cd:
-                remaining = timedelta(seconds=int(skill_cd - elapsed))
-                return f"⏳ Compétence encore en recharge ! Temps restant : **{remaining}**"
+        # ⏳ Cooldown (en mémoire, utils/cooldowns)
+        remaining = int(cooldowns.remaining("skill", user_id))
+        if remaining:
+            return f"⏳ Compétence encore en recharge ! Temps restant : **{timedelta(seconds=remaining)}**"
 
         updated_fields = {}
         result_message = ""
@@ -118,18 +122,22 @@ class Skill(commands.Cog):
             updated_fields["points"] = new_points
             new_cd = CLASS_CD["Parieur"]
 
+        # 🔹 Update sécurisé Supabase (rien à écrire pour le Travailleur)
+        if updated_fields:
+            try:
+                response = supabase.table("reiatsu").update(updated_fields).eq("user_id", user_id).execute()
+                if getattr(response, "status_code", 200) >= 400:
+                    return "❌ Impossible de mettre à jour les données (Supabase a renvoyé une erreur)."
+            except Exception as e:
+                print(f"[ERREUR SUPABASE UPDATE] {e}")
+                return "❌ Impossible de mettre à jour les données."
+            profiles.apply(user_id, updated_fields)
+
         # Ajout cooldown
-        updated_fields["last_skill"] = now.isoformat()
-        updated_fields["skill_cd"] = new_cd
+        cooldowns.trigger("skill", user_id, new_cd)
 
-        # 🔹 Update sécurisé Supabase
-        try:
-            response = supabase.table("reiatsu").upsert({**data, **updated_fields}, on_conflict="user_id").execute()
-            if getattr(response, "status_code", 200) >= 400:
-                return "❌ Impossible de mettre à jour les données (Supabase a renvoyé une erreur)."
-        except Exception as e:
-            print(f"[ERREUR SUPABASE UPDATE] {e}")
-            return "❌ Impossible de mettre à jour les données."
+        if "points" in updated_fields:
+            leaderboard.update(user_id, updated_fields["points"])
 
         return result_message
 
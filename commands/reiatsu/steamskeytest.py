@@ -15,6 +15,9 @@ from discord.ext import commands
 from discord.ui import View, Button
 import random
 from utils.supabase_client import supabase
+from utils.leaderboard import leaderboard
+from utils.reiatsu_profiles import profiles
+from utils.steam_keys import steam_inventory
 from utils.discord_utils import safe_send, safe_edit, safe_respond
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -61,11 +64,11 @@ class SteamKeyView(View):
 # 🎛️ UI — Confirmation + choix de jeu
 # ────────────────────────────────────────────────────────────────────────────────
 class ConfirmKeyView(View):
-    def __init__(self, author_id: int, keys_dispo: list, message: discord.Message, current_index: int = 0):
+    def __init__(self, author_id: int, reservation, message: discord.Message):
         super().__init__(timeout=120)
         self.author_id = author_id
-        self.keys_dispo = keys_dispo
-        self.index = current_index
+        self.reservation = reservation
+        self.seen_games = {reservation.game_name}
         self.message = message
         self.choice = None
         self.switch_count = 0
@@ -74,18 +77,14 @@ class ConfirmKeyView(View):
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         return interaction.user.id == self.author_id
 
-    @property
-    def current_key(self):
-        return self.keys_dispo[self.index]
-
     def build_embed(self):
         embed = discord.Embed(
             title="🎉 Tu as gagné une clé Steam !",
             description="Choisis la clé qui te convient le mieux.\n⚠️ Tu peux cliquer sur **Autre jeu** jusqu’à 3 fois.",
             color=discord.Color.green()
         )
-        embed.add_field(name="🎮 Jeu", value=self.current_key["game_name"], inline=False)
-        embed.add_field(name="🔗 Lien Steam", value=f"[Voir sur Steam]({self.current_key['steam_url']})", inline=False)
+        embed.add_field(name="🎮 Jeu", value=self.reservation.game_name, inline=False)
+        embed.add_field(name="🔗 Lien Steam", value=f"[Voir sur Steam]({self.reservation.steam_url})", inline=False)
         embed.set_footer(text=f"✅ : Prendre | 🎲 : Autre jeu ({self.switch_count}/{self.max_switches}) | ❌ : Refuser")
         return embed
 
@@ -104,7 +103,15 @@ class ConfirmKeyView(View):
         self.switch_count += 1
         if self.switch_count >= self.max_switches:
             button.disabled = True
-        self.index = (self.index + 1) % len(self.keys_dispo)
+        # 🔁 On réserve d’abord le suivant, puis on rend la clé actuelle
+        autre = await steam_inventory.reserve(self.author_id, exclude_games=self.seen_games)
+        if not autre and len(self.seen_games) > 1:
+            self.seen_games = {self.reservation.game_name}
+            autre = await steam_inventory.reserve(self.author_id, exclude_games=self.seen_games)
+        if autre:
+            await steam_inventory.release(self.reservation)
+            self.reservation = autre
+            self.seen_games.add(autre.game_name)
         await self.refresh_embed(interaction)
 
     @discord.ui.button(label="❌ Refuser", style=discord.ButtonStyle.red)
@@ -132,26 +139,13 @@ class SteamKey(commands.Cog):
     async def _update_reiatsu(self, user_id: str, new_points: int):
         try:
             supabase.table("reiatsu").update({"points": new_points}).eq("user_id", user_id).execute()
+            profiles.apply(user_id, {"points": new_points})
+            leaderboard.update(user_id, new_points)
         except Exception as e:
             print(f"[ERREUR Supabase _update_reiatsu] {e}")
 
-    async def _get_all_steam_keys(self):
-        try:
-            resp = supabase.table("steam_keys").select("*").eq("won", False).execute()
-            return resp.data or []
-        except Exception as e:
-            print(f"[ERREUR Supabase _get_all_steam_keys] {e}")
-            return []
-
-    async def _mark_steam_key_won(self, key_id: int, winner: str):
-        try:
-            supabase.table("steam_keys").update({"won": True, "winner": winner}).eq("id", key_id).execute()
-        except Exception as e:
-            print(f"[ERREUR Supabase _mark_steam_key_won] {e}")
-
     async def _try_win_key(self, interaction_or_ctx):
-        keys_dispo = await self._get_all_steam_keys()
-        if not keys_dispo:
+        if not steam_inventory.count():
             return await self._send(interaction_or_ctx, discord.Embed(
                 title="⛔ Pas de clé dispo",
                 description="Aucune clé n'est disponible pour le moment.",
@@ -170,25 +164,32 @@ class SteamKey(commands.Cog):
         await self._update_reiatsu(user_id, reiatsu_points - REIATSU_COST)
 
         if random.random() <= WIN_CHANCE:
+            reservation = await steam_inventory.reserve(interaction_or_ctx.user.id)
+            if not reservation:
+                return await self._send(interaction_or_ctx, discord.Embed(
+                    title="🎉 Gagné ! Mais plus de clés 😢",
+                    description="Une autre personne vient de remporter la dernière clé.",
+                    color=discord.Color.gold()
+                ))
             msg = await self._send(interaction_or_ctx, discord.Embed(
                 title="🎁 Recherche d'une clé en cours...", color=discord.Color.blurple()
             ))
-            view = ConfirmKeyView(interaction_or_ctx.user.id, keys_dispo, msg, 0)
+            view = ConfirmKeyView(interaction_or_ctx.user.id, reservation, msg)
             await safe_edit(msg, embed=view.build_embed(), view=view)
             await view.wait()
 
-            if view.choice == "accept":
-                chosen = view.current_key
-                await self._mark_steam_key_won(chosen["id"], interaction_or_ctx.user.name)
+            chosen = view.reservation
+            if view.choice == "accept" and await steam_inventory.confirm(chosen, interaction_or_ctx.user.name):
                 try:
                     await interaction_or_ctx.user.send(
-                        f"🎁 **Clé Steam pour {chosen['game_name']}**\n`{chosen['steam_key']}`"
+                        f"🎁 **Clé Steam pour {chosen.game_name}**\n`{chosen.steam_key}`"
                     )
                     await safe_edit(msg, embed=discord.Embed(title="✅ Clé envoyée en DM !", color=discord.Color.green()), view=None)
                 except discord.Forbidden:
                     await safe_edit(msg, embed=discord.Embed(title="⚠️ Impossible d'envoyer un DM.", color=discord.Color.orange()), view=None)
 
-            elif view.choice == "reject":
+            else:
+                await steam_inventory.release(chosen)
                 await safe_edit(msg, embed=discord.Embed(title="🔄 Clé remise en jeu pour les autres joueurs.", color=discord.Color.blurple()), view=None)
 
         else:
@@ -205,10 +206,10 @@ class SteamKey(commands.Cog):
 
     async def _send_menu(self, channel, user, user_id: int):
         reiatsu_points = await self._get_reiatsu(user_id)
-        keys_dispo = await self._get_all_steam_keys()
+        games = steam_inventory.games()
 
-        jeux = ", ".join([k["game_name"] for k in keys_dispo[:5]]) or "Aucun"
-        if len(keys_dispo) > 5:
+        jeux = ", ".join(games[:5]) or "Aucun"
+        if len(games) > 5:
             jeux += "…"
 
         embed = discord.Embed(
@@ -219,7 +220,7 @@ class SteamKey(commands.Cog):
         embed.add_field(name="💠 Reiatsu possédé", value=f"**{reiatsu_points}**", inline=False)
         embed.add_field(name="💸 Prix d'une tentative", value=f"**{REIATSU_COST}**", inline=False)
         embed.add_field(name="🎰 Chance de gagner une clé", value=f"**{int(WIN_CHANCE * 100)}%**", inline=False)
-        embed.add_field(name="🔑 Nombre de clés à gagner", value=f"**{len(keys_dispo)}**", inline=False)
+        embed.add_field(name="🔑 Nombre de clés à gagner", value=f"**{steam_inventory.count()}**", inline=False)
         embed.add_field(name="🎮 Jeux gagnables", value=jeux, inline=False)
 
         view = SteamKeyView(user_id)
@@ -12,6 +12,7 @@ import discord
 from discord.ext import commands, tasks
 from datetime import datetime, timezone
 from utils.discord_utils import safe_send  # <-- Import safe_send
+from utils.config_service import config, SETTINGS_TABLE
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
@@ -23,23 +24,25 @@ class HeartbeatTask(commands.Cog):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.supabase = bot.supabase
         self.heartbeat_channel_id = None
+        config.subscribe(SETTINGS_TABLE, self._on_setting_change)
         self.heartbeat_task.start()
 
     def cog_unload(self):
         self.heartbeat_task.cancel()
+        config.unsubscribe(SETTINGS_TABLE, self._on_setting_change)
+
+    def _on_setting_change(self, key: str, value):
+        """Salon mis à jour dès que !heartbeat set/unset écrit le réglage."""
+        if key == "heartbeat_channel_id":
+            self.heartbeat_channel_id = int(value) if value and value.isdigit() else None
 
     @tasks.loop(minutes=5)
     async def heartbeat_task(self):
-        # 🔒 Vérifie si le heartbeat est en pause
-        try:
-            pause_res = self.supabase.table("bot_settings").select("value").eq("key", "heartbeat_paused").execute()
-            if pause_res.data and pause_res.data[0]["value"].lower() == "true":
-                print("[Heartbeat] Pausé — aucune action envoyée.")
-                return
-        except Exception as e:
-            print(f"[Heartbeat] Erreur lecture du flag heartbeat_paused : {e}")
+        # 🔒 Vérifie si le heartbeat est en pause (réglage en mémoire)
+        if (config.setting("heartbeat_paused") or "").lower() == "true":
+            print("[Heartbeat] Pausé — aucune action envoyée.")
+            return
 
         if not self.heartbeat_channel_id:
             await self.load_heartbeat_channel()
@@ -61,19 +64,14 @@ class HeartbeatTask(commands.Cog):
         await self.load_heartbeat_channel()
 
     async def load_heartbeat_channel(self):
-        try:
-            resp = self.supabase.table("bot_settings").select("value").eq("key", "heartbeat_channel_id").execute()
-            if resp.data and len(resp.data) > 0:
-                val = resp.data[0]["value"]
-                if val.isdigit():
-                    self.heartbeat_channel_id = int(val)
-                    print(f"[Heartbeat] Salon heartbeat chargé depuis Supabase : {self.heartbeat_channel_id}")
-                else:
-                    print("[Heartbeat] Valeur heartbeat_channel_id invalide en base.")
-            else:
-                print("[Heartbeat] Pas de salon heartbeat configuré en base.")
-        except Exception as e:
-            print(f"[Heartbeat] Erreur lecture Supabase : {e}")
+        val = config.setting("heartbeat_channel_id")
+        if val and val.isdigit():
+            self.heartbeat_channel_id = int(val)
+            print(f"[Heartbeat] Salon heartbeat chargé depuis la config : {self.heartbeat_channel_id}")
+        elif val:
+            print("[Heartbeat] Valeur heartbeat_channel_id invalide en base.")
+        else:
+            print("[Heartbeat] Pas de salon heartbeat configuré en base.")
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🔌 Setup du Cog
@@ -13,6 +13,7 @@ import discord
 import random
 import time
 import asyncio
+import secrets
 from datetime import datetime
 from dateutil import parser
 import json
@@ -20,7 +21,15 @@ from pathlib import Path
 
 from discord.ext import commands, tasks
 from utils.supabase_client import supabase
-from utils.discord_utils import safe_send, safe_delete  # 🔒 utils protégés
+from utils.config_service import config, GUILD_TABLE
+from utils.dataloader import SingleFlight
+from utils.leaderboard import leaderboard
+from utils.reiatsu_profiles import profiles
+from utils.schema import projection
+from utils.reiatsu_rules import roll_spawn, DEFAULT_CLASSE
+from utils.discord_utils import safe_send, safe_delete, safe_respond, safe_edit_response  # 🔒 utils protégés
+from utils.interaction_router import interactions
+from utils.query_profiler import profiler
 
 # ────────────────────────────────────────────────────────────────────────────────
 # ⚙️ Paramètres globaux (facilement modifiables)
@@ -30,12 +39,38 @@ with CONFIG_PATH.open("r", encoding="utf-8") as f:
     CONFIG = json.load(f)
 
 SPAWN_LOOP_INTERVAL = CONFIG["SPAWN_LOOP_INTERVAL"]
-SUPER_REIATSU_CHANCE = CONFIG["SUPER_REIATSU_CHANCE"]
-SUPER_REIATSU_GAIN = CONFIG["SUPER_REIATSU_GAIN"]
-NORMAL_REIATSU_GAIN = CONFIG["NORMAL_REIATSU_GAIN"]
 SPAWN_SPEED_RANGES = CONFIG["SPAWN_SPEED_RANGES"]
 DEFAULT_SPAWN_SPEED = CONFIG["DEFAULT_SPAWN_SPEED"]
 
+# Mode de capture par serveur : réaction 💠 (historique) ou bouton persistant (1 appel REST par capture)
+SPAWN_MODES = ("reaction", "bouton")
+DEFAULT_SPAWN_MODE = CONFIG.get("DEFAULT_SPAWN_MODE", "reaction")
+SPAWN_MODE_SETTING = "spawn_mode:{guild_id}"
+CAPTURE_PREFIX = "reiatsu:capture:"   # custom_id du bouton : préfixe + "spawn"/"faux" + jeton du spawn
+
+# Parcours de la table `reiatsu` (recherche des faux Reiatsu) partagé entre serveurs concurrents
+player_scan = SingleFlight("reiatsu:scan")
+
+# Colonnes lues par le spawner (schéma : utils/schema)
+FAUX_SCAN = projection("reiatsu", "user_id", "active_skill")
+GAIN_INPUTS = projection("reiatsu", "classe", "points", "bonus5")
+
+def spawn_mode(guild_id) -> str:
+    mode = config.setting(SPAWN_MODE_SETTING.format(guild_id=guild_id))
+    return mode if mode in SPAWN_MODES else DEFAULT_SPAWN_MODE
+
+def set_spawn_mode(guild_id, mode: str):
+    config.set_setting(SPAWN_MODE_SETTING.format(guild_id=guild_id), mode)
+
+def capture_view(kind: str) -> discord.ui.View:
+    """Bouton de capture ; le clic est traité par on_interaction (aucune View gardée en mémoire)."""
+    view = discord.ui.View(timeout=None)
+    view.add_item(discord.ui.Button(
+        label="Absorber", emoji="💠", style=discord.ButtonStyle.primary,
+        custom_id=f"{CAPTURE_PREFIX}{kind}:{secrets.token_hex(6)}"
+    ))
+    return view
+
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog : ReiatsuSpawner
 # ────────────────────────────────────────────────────────────────────────────────
@@ -47,18 +82,30 @@ class ReiatsuSpawner(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.locks = {}  # 🔒 locks par serveur pour éviter les races
+        self.spawn_channels = {}  # guild_id → salon de spawn (tenu à jour par le service de config)
+        config.subscribe(GUILD_TABLE, self._on_config_change)
+        for conf in config.guilds():
+            self._on_config_change(str(conf["guild_id"]), conf)
         self.spawn_loop.start()
         self.bot.loop.create_task(self._check_on_startup())
 
     def cog_unload(self):
         """Arrêt de la loop au déchargement du cog."""
         self.spawn_loop.cancel()
+        config.unsubscribe(GUILD_TABLE, self._on_config_change)
+
+    def _on_config_change(self, guild_id: str, conf):
+        """Appelé par le service de config à chaque changement (admin, spawn, capture)."""
+        channel_id = conf.get("channel_id") if conf else None
+        if channel_id:
+            self.spawn_channels[guild_id] = channel_id
+        else:
+            self.spawn_channels.pop(guild_id, None)
 
     async def _check_on_startup(self):
         """Vérifie que les messages spawn encore marqués existent vraiment."""
         await self.bot.wait_until_ready()
-        configs = supabase.table("reiatsu_config").select("*").execute()
-        for conf in configs.data:
+        for conf in config.guilds():
             if not conf.get("en_attente") or not conf.get("spawn_message_id"):
                 continue
             guild = self.bot.get_guild(int(conf["guild_id"]))
@@ -70,11 +117,11 @@ class ReiatsuSpawner(commands.Cog):
             try:
                 await channel.fetch_message(int(conf["spawn_message_id"]))
             except Exception:
-                supabase.table("reiatsu_config").update({
+                config.update_guild(conf["guild_id"], {
                     "en_attente": False,
                     "spawn_message_id": None,
                     "faux_en_attente": False
-                }).eq("guild_id", conf["guild_id"]).execute()
+                })
                 print(f"[RESET] Reiatsu fantôme nettoyé pour guild {conf['guild_id']}")
 
     @tasks.loop(seconds=SPAWN_LOOP_INTERVAL)
@@ -83,17 +130,18 @@ class ReiatsuSpawner(commands.Cog):
         if not getattr(self.bot, "is_main_instance", True):
             return
         try:
-            await self._spawn_tick()
+            with profiler.handler("spawn_loop"):   # N+1 évalués à chaque tour, la tâche ne se termine jamais
+                await self._spawn_tick()
         except Exception as e:
             print(f"[ERREUR spawn_loop] {e}")
 
     async def _spawn_tick(self):
-        """Vérifie chaque config serveur pour savoir si un spawn doit apparaître."""
+        """Vérifie chaque serveur configuré (config en mémoire) pour savoir si un spawn doit apparaître."""
         now = int(time.time())
-        configs = supabase.table("reiatsu_config").select("*").execute()
-        for conf in configs.data:
-            guild_id = conf["guild_id"]
-            channel_id = conf.get("channel_id")
+        for guild_id, channel_id in list(self.spawn_channels.items()):
+            conf = config.guild(guild_id)
+            if conf is None:
+                continue
             en_attente = conf.get("en_attente", False)
             faux_en_attente = conf.get("faux_en_attente", False)
             spawn_speed = conf.get("spawn_speed") or DEFAULT_SPAWN_SPEED
@@ -114,59 +162,76 @@ class ReiatsuSpawner(commands.Cog):
                     await self._spawn_faux_reiatsu(guild_id, channel)
 
     async def _spawn_message(self, channel, guild_id):
+        button = spawn_mode(guild_id) == "bouton"
         embed = discord.Embed(
             title="💠 Un Reiatsu sauvage apparaît !",
-            description="Cliquez sur la réaction 💠 pour l'absorber.",
+            description="Cliquez sur le bouton 💠 pour l'absorber." if button else "Cliquez sur la réaction 💠 pour l'absorber.",
             color=discord.Color.purple()
         )
-        message = await safe_send(channel, embed=embed)
+        view = capture_view("spawn") if button else None
+        message = await safe_send(channel, embed=embed, view=view)
         if not message:
             return
-        try:
-            await message.add_reaction("💠")
-        except discord.HTTPException:
-            pass
-        supabase.table("reiatsu_config").update({
+        await self._arm_capture(message, view)
+        config.update_guild(guild_id, {
             "en_attente": True,
             "last_spawn_at": datetime.utcnow().isoformat(timespec="seconds"),
             "spawn_message_id": str(message.id)
-        }).eq("guild_id", guild_id).execute()
+        })
+
+    async def _scan_players(self) -> list:
+        """Joueurs ayant une compétence active (user_id, active_skill), lus hors de la boucle ; les appels simultanés partagent la requête."""
+        return await player_scan.do(
+            "active_skill",
+            lambda: FAUX_SCAN.rows(FAUX_SCAN.select(supabase).not_.is_("active_skill", "null").execute().data)
+        )
 
     async def _spawn_faux_reiatsu(self, guild_id: str, channel: discord.TextChannel):
         """Spawn un faux Reiatsu si aucun faux n’est actif sur le serveur."""
-        players = supabase.table("reiatsu").select("*").execute()
-        for player in players.data:
-            skill = player.get("active_skill")
+        for player in await self._scan_players():
+            skill = player.active_skill
             if skill and skill.get("type") == "faux" and skill.get("spawn_id") is None:
                 embed = discord.Embed(
                     title="🎭 Un faux Reiatsu apparaît !",
                     description="Cliquez sur 💠 pour l'absorber… si vous osez !",
                     color=discord.Color.gold()
                 )
-                message = await safe_send(channel, embed=embed)
+                view = capture_view("faux") if spawn_mode(guild_id) == "bouton" else None
+                message = await safe_send(channel, embed=embed, view=view)
                 if not message:
                     return
-                try:
-                    await message.add_reaction("💠")
-                except discord.HTTPException:
-                    pass
+                await self._arm_capture(message, view)
                 skill["spawn_id"] = str(message.id)
-                supabase.table("reiatsu").update({"active_skill": skill}).eq("user_id", player["user_id"]).execute()
-                supabase.table("reiatsu_config").update({"faux_en_attente": True}).eq("guild_id", guild_id).execute()
+                supabase.table("reiatsu").update({"active_skill": skill}).eq("user_id", player.user_id).execute()
+                profiles.apply(player.user_id, {"active_skill": skill})
+                config.update_guild(guild_id, {"faux_en_attente": True})
                 return
 
+    async def _arm_capture(self, message, view):
+        """Mode bouton : rien de plus à faire (la View n’est pas suivie) ; mode réaction : ajoute 💠."""
+        if view is not None:
+            view.stop()
+            return
+        try:
+            await message.add_reaction("💠")
+        except discord.HTTPException:
+            pass
+
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
         if str(payload.emoji) != "💠" or payload.user_id == self.bot.user.id:
             return
         guild_id = str(payload.guild_id)
+        # 🔹 Filtre en mémoire : ni spawn en attente sur ce message, ni faux Reiatsu actif
+        conf = config.guild(guild_id)
+        if not conf or (str(payload.message_id) != conf.get("spawn_message_id") and not conf.get("faux_en_attente")):
+            return
         if guild_id not in self.locks:
             self.locks[guild_id] = asyncio.Lock()
         async with self.locks[guild_id]:
-            conf_data = supabase.table("reiatsu_config").select("*").eq("guild_id", guild_id).execute()
-            if not conf_data.data:
+            conf = config.guild(guild_id)
+            if not conf:
                 return
-            conf = conf_data.data[0]
             guild = self.bot.get_guild(payload.guild_id)
             channel = guild.get_channel(payload.channel_id)
             user = guild.get_member(payload.user_id)
@@ -174,22 +239,12 @@ class ReiatsuSpawner(commands.Cog):
                 return
 
             # 🔹 Vérification des faux Reiatsu
-            user_list = supabase.table("reiatsu").select("*").execute()
-            for u in user_list.data:
-                skill = u.get("active_skill")
-                if skill and skill.get("type") == "faux" and str(payload.message_id) == skill.get("spawn_id"):
-                    owner_id = skill.get("owner_id")
-                    owner = guild.get_member(int(owner_id))
-                    if owner:
-                        owner_data = supabase.table("reiatsu").select("points").eq("user_id", owner_id).single().execute()
-                        if owner_data.data:
-                            new_points = owner_data.data["points"] + 10
-                            supabase.table("reiatsu").update({"points": new_points}).eq("user_id", owner_id).execute()
-                        await safe_send(channel, f"🎭 Le faux Reiatsu a été absorbé par {user.mention}... {owner.mention} gagne **+10** points !")
-                    supabase.table("reiatsu").update({"active_skill": None}).eq("user_id", u["user_id"]).execute()
-                    supabase.table("reiatsu_config").update({"faux_en_attente": False}).eq("guild_id", guild_id).execute()
-                    await safe_delete(await channel.fetch_message(payload.message_id))
-                    return
+            text = await self._absorb_faux(guild, user, str(payload.message_id), guild_id)
+            if text is not None:
+                if text:
+                    await safe_send(channel, text)
+                await safe_delete(await channel.fetch_message(payload.message_id))
+                return
 
             # 🔹 Reiatsu normal
             if not conf.get("en_attente") or str(payload.message_id) != conf.get("spawn_message_id"):
@@ -198,15 +253,7 @@ class ReiatsuSpawner(commands.Cog):
             gain, is_super, bonus5, classe, new_total = self._calculate_gain(user.id)
             self._update_player(user, gain, bonus5, new_total, classe)
             await self._send_feedback(channel, user, gain, is_super, classe)
-
-            spawn_speed = conf.get("spawn_speed") or DEFAULT_SPAWN_SPEED
-            min_delay, max_delay = SPAWN_SPEED_RANGES.get(spawn_speed, SPAWN_SPEED_RANGES[DEFAULT_SPAWN_SPEED])
-            new_delay = random.randint(min_delay, max_delay)
-            supabase.table("reiatsu_config").update({
-                "en_attente": False,
-                "spawn_message_id": None,
-                "spawn_delay": new_delay
-            }).eq("guild_id", guild_id).execute()
+            self._close_spawn(guild_id, conf)
 
             spawn_message_id = conf.get("spawn_message_id")
             if spawn_message_id:
@@ -216,31 +263,101 @@ class ReiatsuSpawner(commands.Cog):
                 except Exception:
                     pass
 
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Capture par bouton : le message du spawn devient le résultat
+    # ────────────────────────────────────────────────────────────────────────
+    @commands.Cog.listener()
+    async def on_interaction(self, interaction: discord.Interaction):
+        if interaction.type != discord.InteractionType.component or interaction.guild is None:
+            return
+        custom_id = (interaction.data or {}).get("custom_id", "")
+        if not custom_id.startswith(CAPTURE_PREFIX):
+            return
+        interactions.watch(interaction, name="reiatsu:capture")
+        guild_id = str(interaction.guild_id)
+        message_id = str(interaction.message.id)
+        if guild_id not in self.locks:
+            self.locks[guild_id] = asyncio.Lock()
+        try:
+            async with self.locks[guild_id]:
+                conf = config.guild(guild_id)
+                embed = None
+                if custom_id.startswith(f"{CAPTURE_PREFIX}faux:"):
+                    text = await self._absorb_faux(interaction.guild, interaction.user, message_id, guild_id)
+                    if text is not None:
+                        embed = discord.Embed(
+                            title="🎭 Faux Reiatsu absorbé",
+                            description=text or f"🎭 {interaction.user.mention} a absorbé un faux Reiatsu… qui se dissipe.",
+                            color=discord.Color.gold()
+                        )
+                elif conf and conf.get("en_attente") and message_id == conf.get("spawn_message_id"):
+                    user = interaction.user
+                    gain, is_super, bonus5, classe, new_total = await asyncio.to_thread(self._calculate_gain, user.id)
+                    self._update_player(user, gain, bonus5, new_total, classe)
+                    self._close_spawn(guild_id, conf)
+                    embed = discord.Embed(
+                        title="🌟 Super Reiatsu absorbé" if is_super else "💠 Reiatsu absorbé",
+                        description=self._feedback_text(user, gain, is_super, classe),
+                        color=discord.Color.purple()
+                    )
+            if embed is None:
+                await safe_respond(interaction, "⏳ Ce Reiatsu a déjà été absorbé.", ephemeral=True)
+                return
+            await safe_edit_response(interaction, embed=embed, view=None)
+        except Exception as e:
+            print(f"[ERREUR capture reiatsu] {e}")
+            await safe_respond(interaction, "❌ Une erreur est survenue.", ephemeral=True)
+
+    async def _absorb_faux(self, guild, user, message_id: str, guild_id: str):
+        """
+        Absorbe le faux Reiatsu posté dans `message_id` (+10 pour son propriétaire).
+        Renvoie None si ce n’est pas un faux actif, sinon le texte du résultat
+        ("" si le propriétaire a quitté le serveur).
+        """
+        for u in await self._scan_players():
+            skill = u.active_skill
+            if skill and skill.get("type") == "faux" and message_id == skill.get("spawn_id"):
+                text = ""
+                owner_id = skill.get("owner_id")
+                owner = guild.get_member(int(owner_id))
+                if owner:
+                    owner_data = supabase.table("reiatsu").select("points").eq("user_id", owner_id).single().execute()
+                    if owner_data.data:
+                        new_points = owner_data.data["points"] + 10
+                        supabase.table("reiatsu").update({"points": new_points}).eq("user_id", owner_id).execute()
+                        profiles.apply(owner_id, {"points": new_points})
+                        leaderboard.update(owner_id, new_points)
+                    text = f"🎭 Le faux Reiatsu a été absorbé par {user.mention}... {owner.mention} gagne **+10** points !"
+                supabase.table("reiatsu").update({"active_skill": None}).eq("user_id", u.user_id).execute()
+                profiles.apply(u.user_id, {"active_skill": None})
+                config.update_guild(guild_id, {"faux_en_attente": False})
+                return text
+        return None
+
+    def _close_spawn(self, guild_id: str, conf: dict):
+        """Libère le spawn capturé et tire le délai du prochain."""
+        spawn_speed = conf.get("spawn_speed") or DEFAULT_SPAWN_SPEED
+        min_delay, max_delay = SPAWN_SPEED_RANGES.get(spawn_speed, SPAWN_SPEED_RANGES[DEFAULT_SPAWN_SPEED])
+        new_delay = random.randint(min_delay, max_delay)
+        config.update_guild(guild_id, {
+            "en_attente": False,
+            "spawn_message_id": None,
+            "spawn_delay": new_delay
+        })
+
     def _calculate_gain(self, user_id):
-        is_super = random.randint(1, 100) <= SUPER_REIATSU_CHANCE
-        gain = SUPER_REIATSU_GAIN if is_super else NORMAL_REIATSU_GAIN
-        user_data = supabase.table("reiatsu").select("classe", "points", "bonus5").eq("user_id", str(user_id)).execute()
-        if user_data.data:
-            classe = user_data.data[0].get("classe")
-            current_points = user_data.data[0]["points"]
-            bonus5 = user_data.data[0].get("bonus5", 0) or 0
+        player = GAIN_INPUTS.row(GAIN_INPUTS.select(supabase).eq("user_id", str(user_id)).execute().data)
+        if player:
+            classe = player.classe
+            current_points = player.points
+            bonus5 = player.bonus5
         else:
-            classe = "Travailleur"
+            classe = DEFAULT_CLASSE
             current_points = 0
             bonus5 = 0
 
-        if not is_super:
-            if classe == "Absorbeur":
-                gain += 5
-            elif classe == "Parieur":
-                gain = 0 if random.random() < 0.5 else random.randint(5, 12)
-            if classe == "Travailleur":
-                bonus5 += 1
-                if bonus5 >= 5:
-                    gain = 6
-                    bonus5 = 0
-        else:
-            bonus5 = 0
+        # Passifs de classe : utils/reiatsu_rules (mêmes règles que le simulateur d’économie)
+        gain, is_super, bonus5 = roll_spawn(classe, bonus5)
         return gain, is_super, bonus5, classe, current_points + gain
 
     def _update_player(self, user, gain, bonus5, new_total, classe):
@@ -248,6 +365,8 @@ class ReiatsuSpawner(commands.Cog):
         user_data = supabase.table("reiatsu").select("user_id").eq("user_id", user_id).execute()
         if user_data.data:
             supabase.table("reiatsu").update({"points": new_total, "bonus5": bonus5}).eq("user_id", user_id).execute()
+            profiles.apply(user_id, {"points": new_total, "bonus5": bonus5})
+            leaderboard.update(user_id, new_total)
         else:
             supabase.table("reiatsu").insert({
                 "user_id": user_id,
@@ -256,15 +375,19 @@ class ReiatsuSpawner(commands.Cog):
                 "classe": classe,
                 "bonus5": 1
             }).execute()
+            profiles.invalidate(user_id)
+            leaderboard.update(user_id, gain)
 
-    async def _send_feedback(self, channel, user, gain, is_super, classe):
+    @staticmethod
+    def _feedback_text(user, gain, is_super, classe) -> str:
         if is_super:
-            await safe_send(channel, f"🌟 {user.mention} a absorbé un **Super Reiatsu** et gagné **+{gain}** reiatsu !")
-        else:
-            if classe == "Parieur" and gain == 0:
-                await safe_send(channel, f"🎲 {user.mention} a tenté d’absorber un reiatsu mais a raté (passif Parieur) !")
-            else:
-                await safe_send(channel, f"💠 {user.mention} a absorbé le Reiatsu et gagné **+{gain}** reiatsu !")
+            return f"🌟 {user.mention} a absorbé un **Super Reiatsu** et gagné **+{gain}** reiatsu !"
+        if classe == "Parieur" and gain == 0:
+            return f"🎲 {user.mention} a tenté d’absorber un reiatsu mais a raté (passif Parieur) !"
+        return f"💠 {user.mention} a absorbé le Reiatsu et gagné **+{gain}** reiatsu !"
+
+    async def _send_feedback(self, channel, user, gain, is_super, classe):
+        await safe_send(channel, self._feedback_text(user, gain, is_super, classe))
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🔌 Setup du Cog
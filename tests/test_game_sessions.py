@@ -0,0 +1,63 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 test_game_sessions.py — Roue de minuterie de utils/game_sessions
+# Objectif : Vérifier qu’une partie expire au plus un tour après son échéance,
+#            même avec une durée fractionnaire et des tours qui dérivent
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+from unittest import mock
+from utils.game_sessions import SessionManager
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔧 Outils
+# ────────────────────────────────────────────────────────────────────────────────
+def open_at(manager: SessionManager, now: float, key: str, ttl: float):
+    with mock.patch("utils.game_sessions.time.time", return_value=now):
+        return manager.open("test", key, ttl=ttl)
+
+def run_ticks(manager: SessionManager, ticks) -> dict:
+    """id → instant du tour qui a rendu la partie échue."""
+    fired = {}
+    for now in ticks:
+        for session in manager.due(now):
+            fired[session.id] = now
+            manager.close(session)
+    return fired
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧪 Tests
+# ────────────────────────────────────────────────────────────────────────────────
+def test_fractional_ttl_with_drifting_tick():
+    manager = SessionManager(store=object())
+    ttls = [10.7, 10.2, 3.99, 0.5, 42.01]
+    for i, ttl in enumerate(ttls):
+        open_at(manager, 1000.0, str(i), ttl)
+    ticks = [1000.3 + n * 1.013 for n in range(60)]   # chaque tour prend un peu de retard
+    fired = run_ticks(manager, ticks)
+    for i, ttl in enumerate(ttls):
+        expires_at = 1000.0 + ttl
+        assert fired[f"test:{i}"] >= expires_at
+        assert fired[f"test:{i}"] - expires_at <= 1.013
+
+def test_catch_up_sweeps_every_skipped_slot():
+    manager = SessionManager(store=object())
+    manager.due(10.9)
+    open_at(manager, 10.95, "late", 0.55)             # échéance 11.5, case 11
+    fired = run_ticks(manager, [12.05])               # tour en retard : de 10.9 à 12.05
+    assert fired == {"test:late": 12.05}
+
+def test_overdue_session_is_swept_on_next_tick():
+    manager = SessionManager(store=object())
+    manager.due(20.2)
+    open_at(manager, 20.5, "past", -5.0)             # échéance déjà dépassée
+    assert run_ticks(manager, [21.2]) == {"test:past": 21.2}
+
+def test_long_stall_checks_each_slot_once():
+    manager = SessionManager(store=object(), wheel_size=8)
+    manager.due(0.5)
+    for i in range(5):
+        open_at(manager, 0.5, str(i), 1.0 + i)
+    fired = run_ticks(manager, [100.0])               # plus d’un tour de roue sans balayage
+    assert len(fired) == 5
@@ -0,0 +1,255 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 change_feed.py — Flux de changements des tables (cohérence des caches)
+# Objectif : Écouter les modifications faites par une autre instance ou à la main
+#            dans la base et prévenir les caches en mémoire (config, profils,
+#            classement) pour qu’ils restent justes en déploiement multi-instance
+# Version : Supabase Realtime si disponible, sinon interrogation périodique sur
+#           un filigrane `updated_at` ; retard (lag) mesuré par table
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from utils.supabase_client import supabase, BACKEND, SUPABASE_URL, SUPABASE_KEY
+from utils.resilience import is_transient
+from utils.query_profiler import profiler
+
+try:
+    from realtime import AsyncRealtimeClient
+except ImportError:  # paquet realtime absent → interrogation périodique uniquement
+    AsyncRealtimeClient = None
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+CHANNEL_NAME = "kisuke-changes"
+POLL_INTERVAL = 5.0           # secondes entre deux interrogations (mode polling)
+POLL_BATCH = 200              # lignes max lues par table et par interrogation
+POLL_MAX_FAILURES = 3         # échecs consécutifs avant d’abandonner le polling d’une table
+LAG_SMOOTHING = 0.2           # poids du dernier événement dans la moyenne glissante
+INSERT, UPDATE, DELETE = "INSERT", "UPDATE", "DELETE"
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧾 Événement et métriques
+# ────────────────────────────────────────────────────────────────────────────────
+@dataclass(frozen=True, slots=True)
+class ChangeEvent:
+    table: str
+    type: str                 # INSERT, UPDATE ou DELETE (le polling ne voit pas les DELETE)
+    record: dict              # nouvelle ligne (vide pour DELETE)
+    old: dict                 # ancienne ligne / clé primaire (Realtime seulement)
+    committed_at: float       # epoch du commit (Realtime) ou de `updated_at` (polling)
+    source: str               # "realtime" ou "polling"
+
+    @property
+    def row(self) -> dict:
+        return self.record or self.old
+
+@dataclass(slots=True)
+class TableFeed:
+    handlers: list = field(default_factory=list)
+    watermark_column: str = "updated_at"
+    columns: list = field(default_factory=list)   # colonnes demandées par les handlers (polling)
+    full_rows: bool = False   # un handler veut la ligne entière → select("*")
+    watermark: str = None     # dernière valeur de `updated_at` vue (polling)
+    pollable: bool = True
+    failures: int = 0         # échecs consécutifs du polling
+    events: int = 0
+    errors: int = 0
+    last_lag: float = 0.0
+    avg_lag: float = 0.0
+    max_lag: float = 0.0
+    last_event_at: float = 0.0
+
+def _parse_timestamp(value) -> float:
+    if not value:
+        return time.time()
+    try:
+        moment = datetime.fromisoformat(str(value))
+    except ValueError:
+        return time.time()
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔄 Consommateur du flux
+# ────────────────────────────────────────────────────────────────────────────────
+class ChangeFeed:
+    """
+    - register(table, handler, columns=...) : handler(ChangeEvent) appelé à chaque changement ;
+      `columns` limite ce que le polling relit (toute la ligne si omis)
+    - start() : Realtime si possible, sinon polling ; idempotent
+    - stats() : mode, événements et retard par table
+    Les handlers doivent être rapides (mise à jour/invalidation d’un cache).
+    """
+    def __init__(self, client=None):
+        self.client = client
+        self.tables = {}          # nom → TableFeed
+        self.mode = "off"
+        self._task = None
+        self._realtime = None
+
+    @property
+    def db(self):
+        return self.client or supabase
+
+    def register(self, table: str, handler, watermark_column: str = "updated_at", columns=None):
+        feed = self.tables.setdefault(table, TableFeed(watermark_column=watermark_column))
+        if handler not in feed.handlers:
+            feed.handlers.append(handler)
+        if columns is None:
+            feed.full_rows = True
+        else:
+            feed.columns.extend(c for c in columns if c not in feed.columns)
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Distribution
+    # ────────────────────────────────────────────────────────────────────────
+    def dispatch(self, event: ChangeEvent):
+        feed = self.tables.get(event.table)
+        if feed is None:
+            return
+        now = time.time()
+        lag = max(0.0, now - event.committed_at)
+        feed.events += 1
+        feed.last_lag = lag
+        feed.max_lag = max(feed.max_lag, lag)
+        feed.avg_lag = lag if feed.events == 1 else feed.avg_lag + LAG_SMOOTHING * (lag - feed.avg_lag)
+        feed.last_event_at = now
+        for handler in list(feed.handlers):
+            try:
+                handler(event)
+            except Exception as e:
+                feed.errors += 1
+                print(f"[ERREUR flux] {event.table} : {e}")
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Démarrage
+    # ────────────────────────────────────────────────────────────────────────
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._realtime is not None:
+            try:
+                await self._realtime.close()
+            except Exception:
+                pass
+            self._realtime = None
+        self.mode = "off"
+
+    async def _run(self):
+        if not self.tables:
+            return
+        if await self._start_realtime():
+            return
+        if self.db is None:
+            print("[FLUX] Pas de base configurée : flux de changements désactivé.")
+            return
+        self.mode = "polling"
+        print(f"[FLUX] Interrogation toutes les {POLL_INTERVAL:.0f}s : {', '.join(self.tables)}")
+        start = datetime.now(timezone.utc).isoformat()
+        for feed in self.tables.values():
+            feed.watermark = feed.watermark or start
+        while True:
+            await asyncio.sleep(POLL_INTERVAL)
+            with profiler.handler("change_feed"):
+                for table, feed in self.tables.items():
+                    if feed.pollable:
+                        await self._poll(table, feed)
+
+    async def _start_realtime(self) -> bool:
+        if AsyncRealtimeClient is None or self.client is not None or BACKEND != "supabase":
+            return False
+        try:
+            self._realtime = AsyncRealtimeClient(f"{SUPABASE_URL.rstrip('/')}/realtime/v1", SUPABASE_KEY)
+            channel = self._realtime.channel(CHANNEL_NAME)
+            for table in self.tables:
+                channel.on_postgres_changes("*", table=table, callback=self._on_realtime)
+            await channel.subscribe()
+        except Exception as e:
+            print(f"[FLUX] Realtime indisponible ({e}) → interrogation périodique.")
+            self._realtime = None
+            return False
+        self.mode = "realtime"
+        print(f"[FLUX] Abonné en temps réel : {', '.join(self.tables)}")
+        return True
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Sources
+    # ────────────────────────────────────────────────────────────────────────
+    def _on_realtime(self, payload: dict):
+        data = payload.get("data", {})
+        self.dispatch(ChangeEvent(
+            table=data.get("table"),
+            type=str(data.get("type", UPDATE)).rsplit(".", 1)[-1].upper(),
+            record=data.get("record") or {},
+            old=data.get("old_record") or {},
+            committed_at=_parse_timestamp(data.get("commit_timestamp")),
+            source="realtime",
+        ))
+
+    async def _poll(self, table: str, feed: TableFeed):
+        column = feed.watermark_column
+        selected = ["*"] if feed.full_rows else [*feed.columns, column]
+        try:
+            rows = await asyncio.to_thread(
+                lambda: self.db.table(table).select(*selected).gt(column, feed.watermark).order(column).limit(POLL_BATCH).execute().data or []
+            )
+        except Exception as e:
+            feed.errors += 1
+            if is_transient(e):
+                return          # base indisponible : on réessaiera au prochain tour
+            # Échecs répétés (typiquement : colonne `updated_at` absente) → table ignorée
+            feed.failures += 1
+            if feed.failures >= POLL_MAX_FAILURES:
+                feed.pollable = False
+                print(f"[FLUX] Interrogation de {table} désactivée : {e}")
+            return
+        feed.failures = 0
+        for row in rows:
+            stamp = row.get(column)
+            feed.watermark = max(feed.watermark, str(stamp or feed.watermark))
+            if not feed.full_rows and column not in feed.columns:
+                row = {k: v for k, v in row.items() if k != column}
+            self.dispatch(ChangeEvent(
+                table=table,
+                type=UPDATE,
+                record=row,
+                old={},
+                committed_at=_parse_timestamp(stamp),
+                source="polling",
+            ))
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "tables": {
+                table: {
+                    "handlers": len(feed.handlers),
+                    "columns": None if feed.full_rows else list(feed.columns),
+                    "events": feed.events,
+                    "errors": feed.errors,
+                    "last_lag": feed.last_lag,
+                    "avg_lag": feed.avg_lag,
+                    "max_lag": feed.max_lag,
+                    "last_event_at": feed.last_event_at,
+                    "pollable": feed.pollable,
+                    "watermark": feed.watermark,
+                }
+                for table, feed in self.tables.items()
+            },
+        }
+
+
+# Instance unique
+feed = ChangeFeed()
@@ -0,0 +1,181 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 config_service.py — Configuration des serveurs et réglages du bot en mémoire
+# Objectif : Charger une fois `reiatsu_config` (par serveur) et `bot_settings`
+#            (clé → valeur), écrire en write-through depuis les commandes admin
+#            et prévenir les abonnés (spawner, heartbeat) à chaque changement
+# Version : lectures = accès dict, écritures = une requête puis mise à jour locale
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+from utils.supabase_client import supabase
+from utils.schema import columns
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+GUILD_TABLE = "reiatsu_config"
+SETTINGS_TABLE = "bot_settings"
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🗂️ Service de configuration
+# ────────────────────────────────────────────────────────────────────────────────
+class ConfigService:
+    """
+    - load() : lecture complète des deux tables (démarrage / reconnexion)
+    - guild(guild_id) / guilds() : configs Reiatsu (dicts partagés : ne pas les modifier)
+    - update_guild / upsert_guild : écriture Supabase puis cache, abonnés prévenus
+    - setting(key) / set_setting(key, value) : idem pour `bot_settings`
+    - subscribe(table, callback) : callback(key, row_ou_valeur) après chaque changement
+      (row_ou_valeur vaut None si la ligne a disparu)
+    """
+    def __init__(self, client=None):
+        self.client = client
+        self._guilds = {}          # guild_id → ligne reiatsu_config
+        self._settings = {}        # key → value (texte)
+        self._subscribers = {GUILD_TABLE: [], SETTINGS_TABLE: []}
+        self.loaded = False
+        self.loads = 0
+        self.reads = 0
+        self.writes = 0
+
+    @property
+    def db(self):
+        return self.client or supabase
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Chargement
+    # ────────────────────────────────────────────────────────────────────────
+    def load(self):
+        """Relit les deux tables ; en cas d’échec, le cache précédent est conservé."""
+        if self.db is None:
+            self.loaded = True
+            return
+        try:
+            guilds = self.db.table(GUILD_TABLE).select(*columns(GUILD_TABLE)).execute().data or []
+            settings = self.db.table(SETTINGS_TABLE).select("key", "value").execute().data or []
+        except Exception as e:
+            print(f"[ERREUR config] Chargement impossible : {e}")
+            return
+        old_guilds, old_settings = self._guilds, self._settings
+        self._guilds = {str(row["guild_id"]): row for row in guilds}
+        self._settings = {row["key"]: row.get("value") for row in settings}
+        self.loaded = True
+        self.loads += 1
+        # Les abonnés ne voient que ce qui a réellement changé depuis le cache précédent
+        for guild_id in old_guilds.keys() | self._guilds.keys():
+            if old_guilds.get(guild_id) != self._guilds.get(guild_id):
+                self._notify(GUILD_TABLE, guild_id, self._guilds.get(guild_id))
+        for key in old_settings.keys() | self._settings.keys():
+            if old_settings.get(key) != self._settings.get(key):
+                self._notify(SETTINGS_TABLE, key, self._settings.get(key))
+
+    def ensure_loaded(self):
+        if not self.loaded:
+            self.load()
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Abonnements
+    # ────────────────────────────────────────────────────────────────────────
+    def subscribe(self, table: str, callback):
+        if callback not in self._subscribers[table]:
+            self._subscribers[table].append(callback)
+
+    def unsubscribe(self, table: str, callback):
+        if callback in self._subscribers[table]:
+            self._subscribers[table].remove(callback)
+
+    def _notify(self, table: str, key: str, value):
+        for callback in list(self._subscribers[table]):
+            try:
+                callback(key, value)
+            except Exception as e:
+                print(f"[ERREUR config] Abonné {table} : {e}")
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 reiatsu_config
+    # ────────────────────────────────────────────────────────────────────────
+    def guild(self, guild_id):
+        self.ensure_loaded()
+        self.reads += 1
+        return self._guilds.get(str(guild_id))
+
+    def guilds(self) -> list:
+        self.ensure_loaded()
+        self.reads += 1
+        return list(self._guilds.values())
+
+    def update_guild(self, guild_id, changes: dict):
+        """UPDATE … WHERE guild_id ; le cache n’est modifié qu’après succès de l’écriture."""
+        guild_id = str(guild_id)
+        self.db.table(GUILD_TABLE).update(changes).eq("guild_id", guild_id).execute()
+        self.writes += 1
+        current = self._guilds.get(guild_id)
+        if current is not None:
+            self._guilds[guild_id] = {**current, **changes}
+            self._notify(GUILD_TABLE, guild_id, self._guilds[guild_id])
+
+    def upsert_guild(self, guild_id, values: dict):
+        """Met à jour la config du serveur, ou l’insère si elle n’existe pas encore."""
+        guild_id = str(guild_id)
+        self.ensure_loaded()
+        if guild_id in self._guilds:
+            self.update_guild(guild_id, values)
+            return
+        row = {"guild_id": guild_id, **values}
+        self.db.table(GUILD_TABLE).insert(row).execute()
+        self.writes += 1
+        self._guilds[guild_id] = row
+        self._notify(GUILD_TABLE, guild_id, row)
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 bot_settings
+    # ────────────────────────────────────────────────────────────────────────
+    def setting(self, key: str, default=None):
+        self.ensure_loaded()
+        self.reads += 1
+        return self._settings.get(key, default)
+
+    def set_setting(self, key: str, value: str):
+        self.db.table(SETTINGS_TABLE).upsert({"key": key, "value": value}).execute()
+        self.writes += 1
+        if self._settings.get(key) != value:
+            self._settings[key] = value
+            self._notify(SETTINGS_TABLE, key, value)
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Changements venus d’ailleurs (utils/change_feed)
+    # ────────────────────────────────────────────────────────────────────────
+    def apply_change(self, event):
+        """Reporte un changement fait par une autre instance (ou à la main), sans réécrire la base."""
+        row = event.row
+        if event.table == GUILD_TABLE:
+            key, cache = str(row.get("guild_id")), self._guilds
+            value = None if event.type == "DELETE" else {**cache.get(key, {}), **event.record}
+        elif event.table == SETTINGS_TABLE:
+            key, cache = row.get("key"), self._settings
+            value = None if event.type == "DELETE" else event.record.get("value")
+        else:
+            return
+        if cache.get(key) == value:
+            return                  # écho de notre propre écriture
+        if value is None:
+            cache.pop(key, None)
+        else:
+            cache[key] = value
+        self._notify(event.table, key, value)
+
+    def stats(self) -> dict:
+        return {
+            "guilds": len(self._guilds),
+            "settings": len(self._settings),
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+            "loads": self.loads,
+            "reads": self.reads,
+            "writes": self.writes,
+        }
+
+
+# Instance unique
+config = ConfigService()
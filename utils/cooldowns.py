@@ -0,0 +1,307 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 cooldowns.py — Service unique des cooldowns de jeu (persistants)
+# Objectif : Une seule représentation (scope, clé) → fin du cooldown en epoch,
+#            gardée en mémoire : « temps restant » en O(1), sans lecture en base
+#            ni analyse de date ISO à chaque commande
+# Version : tas d’expiration pour purger la mémoire, sauvegarde par lots dans
+#           la table `cooldowns`, partagée entre instances via le flux de changements ;
+#           table absente (DDL : README) → repli sur les anciennes colonnes
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import heapq
+import time
+from datetime import datetime, timezone
+from utils.supabase_client import supabase
+from utils.config_service import config
+from utils.query_profiler import profiler
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+TABLE = "cooldowns"
+FLUSH_INTERVAL = 5.0          # sauvegarde des cooldowns modifiés toutes les N secondes
+PURGE_INTERVAL = 3600.0       # suppression en base des cooldowns expirés (et nouvel essai de la table en repli)
+FLUSH_BATCH = 200             # lignes max par upsert
+MIGRATION_SETTING = "cooldowns_migrated:{scope}"
+
+def to_iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+def from_iso(value) -> float:
+    """Horodatage ISO (avec ou sans fuseau, sans fuseau = UTC) → epoch ; None si illisible."""
+    if not value:
+        return None
+    try:
+        moment = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⏳ Service
+# ────────────────────────────────────────────────────────────────────────────────
+class CooldownService:
+    """
+    - remaining(scope, key) : secondes restantes (0.0 si disponible), en mémoire
+    - trigger(scope, key, seconds) : démarre un cooldown (sauvegardé au prochain lot)
+    - clear(scope, key) : lève un cooldown
+    - migrate(scope, table, columns, expiry, store) : reprise unique des anciennes colonnes
+      (expiry(row) → (clé, fin en epoch) ou None) ; tant que la table `cooldowns` est
+      absente, elles restent la référence : relues au chargement, écrites au lot
+      suivant (store(début, fin) → colonnes à mettre à jour, ligne columns[0] = clé)
+    - load() au démarrage, start() pour la tâche de sauvegarde
+    """
+    def __init__(self, client=None, clock=time.time):
+        self.client = client
+        self.clock = clock
+        self._expiry = {}         # "scope:clé" → fin du cooldown (epoch)
+        self._heap = []           # (fin, "scope:clé") ; entrées périmées ignorées au dépilement
+        self._dirty = {}          # "scope:clé" → fin, ou None pour une suppression
+        self._starts = {}         # "scope:clé" → début du cooldown (écriture des anciennes colonnes)
+        self._migrations = []
+        self._task = None
+        self.loaded = False
+        self.available = None     # table `cooldowns` présente ? (None : pas encore chargée)
+        self.checks = 0
+        self.triggers = 0
+        self.flushes = 0
+        self.written = 0
+        self.errors = 0
+
+    @property
+    def db(self):
+        return self.client or supabase
+
+    @staticmethod
+    def _id(scope: str, key) -> str:
+        return f"{scope}:{key}"
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Lecture / écriture en mémoire
+    # ────────────────────────────────────────────────────────────────────────
+    def remaining(self, scope: str, key) -> float:
+        self.checks += 1
+        end = self._expiry.get(self._id(scope, key))
+        if end is None:
+            return 0.0
+        left = end - self.clock()
+        return left if left > 0 else 0.0
+
+    def expires_at(self, scope: str, key) -> float:
+        end = self._expiry.get(self._id(scope, key))
+        return end if end and end > self.clock() else None
+
+    def trigger(self, scope: str, key, seconds: float):
+        if seconds <= 0:
+            self.clear(scope, key)
+            return
+        self.triggers += 1
+        entry_id, now = self._id(scope, key), self.clock()
+        self._starts[entry_id] = now
+        self._set(entry_id, now + seconds, dirty=True)
+
+    def clear(self, scope: str, key):
+        entry_id = self._id(scope, key)
+        if self._expiry.pop(entry_id, None) is not None:
+            self._dirty[entry_id] = None
+
+    def _set(self, entry_id: str, end: float, dirty: bool = False):
+        self._expiry[entry_id] = end
+        heapq.heappush(self._heap, (end, entry_id))
+        if dirty:
+            self._dirty[entry_id] = end
+
+    def sweep(self) -> int:
+        """Retire de la mémoire les cooldowns terminés (en base, ils sont purgés par lots)."""
+        now, removed = self.clock(), 0
+        while self._heap and self._heap[0][0] <= now:
+            end, entry_id = heapq.heappop(self._heap)
+            if self._expiry.get(entry_id) == end:
+                del self._expiry[entry_id]
+                removed += 1
+        return removed
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Persistance
+    # ────────────────────────────────────────────────────────────────────────
+    def load(self):
+        """Relit les cooldowns en cours (les valeurs locales pas encore sauvegardées l’emportent)."""
+        if self.db is None:
+            self.loaded = True
+            return
+        try:
+            rows = self.db.table(TABLE).select("id", "expires_at").gt("expires_at", self.clock()).execute().data or []
+        except Exception as e:
+            if self.available is not False:
+                print(f"[ERREUR cooldowns] Table `{TABLE}` illisible ({e}) : repli sur les anciennes colonnes (DDL : README)")
+            self.available = False
+            self._run_migrations(fallback=True)
+            self.loaded = True
+            return
+        if self.available is False:
+            # Sortie du repli : ce qui n’existe qu’en mémoire part dans la table au prochain lot
+            for entry_id, end in self._expiry.items():
+                self._dirty.setdefault(entry_id, end)
+        self.available = True
+        for row in rows:
+            if row["id"] not in self._dirty:
+                self._set(row["id"], float(row["expires_at"]))
+        self.loaded = True
+        self._run_migrations()
+        self.flush()
+
+    def flush(self):
+        if not self._dirty or self.db is None:
+            return
+        if self.available is False:
+            self._flush_legacy()
+            return
+        batch, self._dirty = self._dirty, {}
+        self._starts = {}
+        upserts = [
+            {"id": entry_id, "scope": entry_id.split(":", 1)[0], "key": entry_id.split(":", 1)[1], "expires_at": end}
+            for entry_id, end in batch.items() if end is not None
+        ]
+        deletes = [entry_id for entry_id, end in batch.items() if end is None]
+        try:
+            for start in range(0, len(upserts), FLUSH_BATCH):
+                self.db.table(TABLE).upsert(upserts[start:start + FLUSH_BATCH], on_conflict="id").execute()
+            if deletes:
+                self.db.table(TABLE).delete().in_("id", deletes).execute()
+        except Exception as e:
+            self.errors += 1
+            print(f"[ERREUR cooldowns] Sauvegarde reportée : {e}")
+            for entry_id, end in batch.items():
+                self._dirty.setdefault(entry_id, end)   # une valeur plus récente l’emporte
+            return
+        self.flushes += 1
+        self.written += len(batch)
+
+    def _flush_legacy(self):
+        """Repli sans table `cooldowns` : chaque cooldown posé est écrit dans ses anciennes colonnes."""
+        batch, starts = self._dirty, self._starts
+        self._dirty, self._starts = {}, {}
+        stores = {scope: (table, columns[0], store) for scope, table, columns, _, store in self._migrations if store}
+        failed = {}
+        for entry_id, end in batch.items():
+            scope, key = entry_id.split(":", 1)
+            start = starts.get(entry_id)
+            if end is None or start is None or scope not in stores:
+                continue          # levée ou cooldown sans ancienne colonne : rien à écrire
+            table, key_column, store = stores[scope]
+            try:
+                self.db.table(table).update(store(start, end)).eq(key_column, key).execute()
+            except Exception as e:
+                self.errors += 1
+                print(f"[ERREUR cooldowns] Sauvegarde {entry_id} reportée : {e}")
+                failed[entry_id] = end
+                continue
+            self.written += 1
+        for entry_id, end in failed.items():
+            if entry_id not in self._dirty:
+                self._dirty[entry_id] = end
+                self._starts[entry_id] = starts[entry_id]
+        self.flushes += 1
+
+    def purge(self):
+        if self.db is None or not self.available:
+            return
+        try:
+            self.db.table(TABLE).delete().lt("expires_at", self.clock()).execute()
+        except Exception as e:
+            print(f"[ERREUR cooldowns] Purge impossible : {e}")
+
+    def apply_change(self, event):
+        """Cooldown posé ou levé par une autre instance (utils/change_feed)."""
+        entry_id = event.row.get("id")
+        if not entry_id or entry_id in self._dirty:
+            return
+        if event.type == "DELETE":
+            self._expiry.pop(entry_id, None)
+        elif event.record.get("expires_at") is not None:
+            end = float(event.record["expires_at"])
+            if end > self.clock() and self._expiry.get(entry_id) != end:
+                self._set(entry_id, end)
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Reprise des anciennes colonnes (une seule fois par scope)
+    # ────────────────────────────────────────────────────────────────────────
+    def migrate(self, scope: str, table: str, columns: tuple, expiry, store=None):
+        if all(m[0] != scope for m in self._migrations):
+            self._migrations.append((scope, table, columns, expiry, store))
+
+    def _run_migrations(self, fallback: bool = False):
+        """Reprise unique ; en repli (`fallback`), simple relecture à chaque chargement, sans rien noter."""
+        for scope, table, columns, expiry, _ in self._migrations:
+            setting = MIGRATION_SETTING.format(scope=scope)
+            if not fallback and config.setting(setting):
+                continue
+            try:
+                rows = self.db.table(table).select(*columns).not_.is_(columns[1], "null").execute().data or []
+            except Exception as e:
+                print(f"[ERREUR cooldowns] Reprise {scope} reportée : {e}")
+                continue
+            now, seeded = self.clock(), 0
+            for row in rows:
+                try:
+                    result = expiry(row)
+                except Exception:
+                    continue
+                if result and result[1] and result[1] > now and self._id(scope, result[0]) not in self._expiry:
+                    self._set(self._id(scope, result[0]), result[1], dirty=not fallback)
+                    seeded += 1
+            if fallback:
+                continue
+            config.set_setting(setting, "1")
+            print(f"[COOLDOWNS] Reprise {scope} : {seeded} cooldown(s) en cours sur {len(rows)} ligne(s).")
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Tâche de fond
+    # ────────────────────────────────────────────────────────────────────────
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        last_purge = self.clock()
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            try:
+                with profiler.handler("cooldowns"):
+                    self.sweep()
+                    await asyncio.to_thread(self.flush)
+                    if self.clock() - last_purge >= PURGE_INTERVAL:
+                        last_purge = self.clock()
+                        # En repli : la table a peut-être été créée depuis
+                        await asyncio.to_thread(self.purge if self.available else self.load)
+            except Exception as e:
+                print(f"[ERREUR cooldowns] {e}")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        await asyncio.to_thread(self.flush)
+
+    def stats(self) -> dict:
+        return {
+            "table": {True: "ok", False: "absente (repli)"}.get(self.available, "?"),
+            "active": len(self._expiry),
+            "heap": len(self._heap),
+            "pending": len(self._dirty),
+            "checks": self.checks,
+            "triggers": self.triggers,
+            "flushes": self.flushes,
+            "written": self.written,
+            "errors": self.errors,
+        }
+
+
+# Instance unique
+cooldowns = CooldownService()
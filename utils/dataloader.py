@@ -0,0 +1,147 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 dataloader.py — Regroupement des lectures concurrentes (single-flight)
+# Objectif : Une rafale de lectures identiques = une seule requête ; des lectures
+#            de clés différentes lancées dans le même tour de boucle = une seule
+#            requête `in_` ; compteurs pour mesurer le taux de regroupement
+# Version : requêtes exécutées hors de la boucle (asyncio.to_thread)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+MAX_BATCH = 100               # clés max par requête `in_`
+
+# Tous les regroupeurs créés (pour !caches)
+registry = {}
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📊 Compteurs communs
+# ────────────────────────────────────────────────────────────────────────────────
+class _Counters:
+    def __init__(self, name: str):
+        self.name = name
+        self.requests = 0         # appels load()/do()
+        self.coalesced = 0        # appels servis par une requête déjà prévue ou en cours
+        self.queries = 0          # requêtes réellement envoyées
+        self.keys = 0             # clés envoyées au total (lots)
+        self.errors = 0
+        registry[name] = self
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "queries": self.queries,
+            "hit_rate": self.coalesced / self.requests if self.requests else 0.0,
+            "avg_batch": self.keys / self.queries if self.queries else 0.0,
+            "errors": self.errors,
+        }
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔑 Lectures par clé (DataLoader)
+# ────────────────────────────────────────────────────────────────────────────────
+class DataLoader(_Counters):
+    """
+    batch_fn(keys) → {clé: valeur} : fonction synchrone (une requête `in_`),
+    exécutée dans un thread. Les clés absentes du résultat valent None.
+    - load(key) : valeur de la clé, en partageant la requête en cours si elle existe
+    - load_many(keys) : {clé: valeur} pour les clés trouvées
+    """
+    def __init__(self, name: str, batch_fn, max_batch: int = MAX_BATCH):
+        super().__init__(name)
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self._pending = {}        # clé → Future (pas encore envoyée)
+        self._inflight = {}       # clé → Future (requête en cours)
+        self._scheduled = False
+
+    async def load(self, key):
+        self.requests += 1
+        future = self._pending.get(key) or self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+            if not self._scheduled:
+                # Envoi à la fin du tour de boucle : les autres load() du même tour rejoignent le lot
+                self._scheduled = True
+                loop.call_soon(self._dispatch)
+        # shield : un appelant annulé n’annule pas la requête partagée
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys) -> dict:
+        keys = list(dict.fromkeys(keys))
+        values = await asyncio.gather(*(self.load(key) for key in keys))
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    def _dispatch(self):
+        self._scheduled = False
+        batch, self._pending = self._pending, {}
+        self._inflight.update(batch)
+        keys = list(batch)
+        for start in range(0, len(keys), self.max_batch):
+            chunk = keys[start:start + self.max_batch]
+            asyncio.create_task(self._run(chunk, {key: batch[key] for key in chunk}))
+
+    async def _run(self, keys: list, futures: dict):
+        self.queries += 1
+        self.keys += len(keys)
+        try:
+            found = await asyncio.to_thread(self.batch_fn, keys)
+        except Exception as e:
+            self.errors += 1
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for key, future in futures.items():
+                if not future.done():
+                    future.set_result(found.get(key))
+        finally:
+            for key, future in futures.items():
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+
+    def forget(self, key=None):
+        """Après une écriture : la prochaine lecture de la clé repart en base (pas de résultat partagé périmé)."""
+        if key is None:
+            self._inflight.clear()
+        else:
+            self._inflight.pop(key, None)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ✈️ Requêtes identiques (single-flight)
+# ────────────────────────────────────────────────────────────────────────────────
+class SingleFlight(_Counters):
+    """do(key, fn, *args) : fn exécutée une seule fois pour tous les appels concurrents de même clé."""
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._calls = {}          # clé → Task
+
+    async def do(self, key, fn, *args):
+        self.requests += 1
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.queries += 1
+            self.keys += 1
+            task = asyncio.create_task(asyncio.to_thread(fn, *args))
+            self._calls[key] = task
+            task.add_done_callback(lambda t, k=key: self._calls.pop(k, None) if self._calls.get(k) is t else None)
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            self.errors += 1
+            raise
+
+
+def loader_stats() -> dict:
+    return {name: loader.stats() for name, loader in registry.items()}
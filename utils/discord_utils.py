@@ -10,6 +10,7 @@
 import asyncio
 import discord
 from discord.errors import HTTPException
+from utils.interaction_router import interactions
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🛡️ Gestion centralisée des appels Discord avec backoff 429
@@ -50,10 +51,29 @@ async def safe_edit(message: discord.Message, content=None, **kwargs):
     return await _discord_action(message.edit, content=content, **kwargs)
 
 async def safe_respond(interaction: discord.Interaction, content=None, **kwargs):
+    """Première réponse, ou followup si l’interaction est déjà acquittée (defer, réponse précédente)."""
+    await interactions.settle(interaction)
+    if interaction.response.is_done():
+        return await safe_followup(interaction, content, **kwargs)
+    interactions.acknowledged(interaction)   # annule la garde avant l’envoi
     return await _discord_action(interaction.response.send_message, content=content, **kwargs)
 
 async def safe_followup(interaction: discord.Interaction, content=None, **kwargs):
-    return await _discord_action(interaction.followup.send, content=content, **kwargs)
+    delete_after = kwargs.pop("delete_after", None)   # inconnu des webhooks : suppression à la main
+    if delete_after is not None:
+        kwargs["wait"] = True
+    message = await _discord_action(interaction.followup.send, content=content, **kwargs)
+    if message is not None and delete_after is not None:
+        await message.delete(delay=delete_after)
+    return message
+
+async def safe_edit_response(interaction: discord.Interaction, **kwargs):
+    """Modifie le message du composant, ou la réponse d’origine si l’interaction est déjà acquittée."""
+    await interactions.settle(interaction)
+    if interaction.response.is_done():
+        return await _discord_action(interaction.edit_original_response, **kwargs)
+    interactions.acknowledged(interaction)   # annule la garde avant l’envoi
+    return await _discord_action(interaction.response.edit_message, **kwargs)
 
 async def safe_reply(ctx_or_message, content=None, **kwargs):
     return await _discord_action(ctx_or_message.reply, content=content, **kwargs)
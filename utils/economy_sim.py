@@ -0,0 +1,209 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 economy_sim.py — Simulateur Monte-Carlo de l’économie Reiatsu
+# Objectif : Mesurer hors production l’effet des réglages (SUPER_REIATSU_CHANCE,
+#            SPAWN_SPEED_RANGES, passifs de classe, chances de vol) sur la
+#            répartition des points : distribution finale et Gini jour par jour
+# Version : vectorisé NumPy (toutes les parties simulées d’un coup), mêmes règles
+#           que le spawner et !reiatsuvol (utils/reiatsu_rules)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import time
+from utils.reiatsu_rules import (
+    CLASSES, SUPER_REIATSU_CHANCE, SUPER_REIATSU_GAIN, NORMAL_REIATSU_GAIN,
+    SPAWN_SPEED_RANGES, DEFAULT_SPAWN_SPEED, ABSORBEUR_BONUS, PARIEUR_MISS, PARIEUR_RANGE,
+    TRAVAILLEUR_EVERY, TRAVAILLEUR_GAIN, STEAL_DIVISOR, STEAL_SUCCESS, VOLEUR_SUCCESS,
+    VOLEUR_DOUBLE, ILLUSION_DODGE, steal_cooldown_hours,
+)
+
+try:
+    import numpy as np
+except ImportError:  # NumPy absent → simulateur indisponible
+    np = None
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+STEP_SECONDS = 3600           # pas de temps : une heure
+DEFAULT_STEAL_RATE = 0.05     # chance par heure qu’un joueur sans cooldown tente un vol
+DEFAULT_ACTIVITY_SIGMA = 1.0  # dispersion (log-normale) de l’assiduité aux spawns
+PERCENTILES = (10, 50, 90, 99)
+TRAVAILLEUR, VOLEUR, ABSORBEUR, ILLUSIONNISTE, PARIEUR = (CLASSES.index(c) for c in (
+    "Travailleur", "Voleur", "Absorbeur", "Illusionniste", "Parieur"))
+
+def gini(points):
+    """Coefficient de Gini le long du dernier axe (0 = égalité, →1 = tout chez un seul)."""
+    values = np.sort(np.asarray(points, dtype=np.float64), axis=-1)
+    n = values.shape[-1]
+    total = values.sum(axis=-1)
+    weighted = (values * np.arange(1, n + 1)).sum(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        result = 2 * weighted / (n * total) - (n + 1) / n
+    return np.where(total > 0, result, 0.0)
+
+def _group_rank(ids):
+    """Rang de chaque occurrence parmi celles du même joueur (ids triés) : 0, 1, 2…"""
+    starts = np.r_[True, ids[1:] != ids[:-1]]
+    positions = np.arange(len(ids))
+    return positions - np.maximum.accumulate(np.where(starts, positions, 0))
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🎲 Simulation
+# ────────────────────────────────────────────────────────────────────────────────
+def simulate(players: int = 1000, days: int = 30, speed: str = DEFAULT_SPAWN_SPEED, guilds: int = 1,
+             mix: dict = None, steal_rate: float = DEFAULT_STEAL_RATE,
+             activity_sigma: float = DEFAULT_ACTIVITY_SIGMA, runs: int = 1, seed: int = None) -> dict:
+    """
+    Simule `runs` économies indépendantes de `players` joueurs pendant `days` jours.
+    - spawns : `guilds` salons, délai tiré dans SPAWN_SPEED_RANGES[speed], capture immédiate
+      par un joueur tiré selon son assiduité (log-normale, `activity_sigma`)
+    - vols : chaque heure, un joueur sans cooldown tente un vol avec la chance `steal_rate`,
+      sur une cible au hasard ; les vols d’une même heure lisent les points du début de l’heure
+    - mix : part de chaque classe ({"Voleur": 0.3, …}), uniforme par défaut
+    Non modélisés : compétences actives (vol garanti, faux Reiatsu…) et arrivées de joueurs.
+    Fonction de module (picklable) : peut tourner dans un processus de travail.
+    """
+    if np is None:
+        raise RuntimeError("NumPy est nécessaire pour le simulateur d’économie.")
+    if players < 2 or days < 1 or runs < 1:
+        raise ValueError("Il faut au moins 2 joueurs, 1 jour et 1 partie.")
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    total = runs * players
+
+    # 🔹 Population : classe et assiduité de chaque joueur (une ligne par partie, aplatie)
+    weights = np.array([(mix or {}).get(c, 0.0 if mix else 1.0) for c in CLASSES], dtype=np.float64)
+    if weights.sum() <= 0:
+        raise ValueError("Mélange de classes vide.")
+    classes = rng.choice(len(CLASSES), size=total, p=weights / weights.sum()).astype(np.int8)
+    activity = rng.lognormal(0.0, activity_sigma, size=(runs, players)) if activity_sigma > 0 else np.ones((runs, players))
+    cumulative = np.cumsum(activity / activity.sum(axis=1, keepdims=True), axis=1)
+    cumulative += np.arange(runs)[:, None]          # lignes mises bout à bout : une seule recherche triée
+    cumulative = cumulative.ravel()
+    steal_cd = np.array([steal_cooldown_hours(c) * 3600 for c in CLASSES], dtype=np.int64)[classes]
+
+    points = np.zeros(total, dtype=np.int64)
+    bonus5 = np.zeros(total, dtype=np.int64)
+    cooldown_end = np.zeros(total, dtype=np.int64)
+    min_delay, max_delay = SPAWN_SPEED_RANGES.get(speed, SPAWN_SPEED_RANGES[DEFAULT_SPAWN_SPEED])
+    spawns_per_step = guilds * STEP_SECONDS / ((min_delay + max_delay) / 2)
+    counts = dict.fromkeys(("spawns", "supers", "minted", "attempts", "steals_won", "stolen", "dodged"), 0)
+    gini_by_day = []
+
+    for step in range(days * 24):
+        now = step * STEP_SECONDS
+
+        # 🔹 Spawns : tirage des capteurs, traités par vagues de joueurs distincts (bonus5 séquentiel)
+        spawned = rng.poisson(spawns_per_step, size=runs)
+        if spawned.sum():
+            run_of = np.repeat(np.arange(runs), spawned)
+            catchers = np.searchsorted(cumulative, rng.random(len(run_of)) + run_of)
+            catchers = np.sort(np.minimum(catchers, (run_of + 1) * players - 1))
+            rank = _group_rank(catchers)
+            for wave in range(int(rank.max()) + 1):
+                who = catchers[rank == wave]
+                size = len(who)
+                cls, bonus = classes[who], bonus5[who]
+                is_super = rng.integers(1, 101, size=size) <= SUPER_REIATSU_CHANCE
+                normal = ~is_super
+                gain = np.where(is_super, SUPER_REIATSU_GAIN, NORMAL_REIATSU_GAIN)
+                gain = np.where(normal & (cls == ABSORBEUR), gain + ABSORBEUR_BONUS, gain)
+                gambler = normal & (cls == PARIEUR)
+                gamble = np.where(rng.random(size) < PARIEUR_MISS, 0, rng.integers(PARIEUR_RANGE[0], PARIEUR_RANGE[1] + 1, size=size))
+                gain = np.where(gambler, gamble, gain)
+                worker = normal & (cls == TRAVAILLEUR)
+                bonus = np.where(worker, bonus + 1, bonus)
+                payday = worker & (bonus >= TRAVAILLEUR_EVERY)
+                gain = np.where(payday, TRAVAILLEUR_GAIN, gain)
+                bonus5[who] = np.where(payday | is_super, 0, bonus)
+                points[who] += gain
+                counts["spawns"] += size
+                counts["supers"] += int(is_super.sum())
+                counts["minted"] += int(gain.sum())
+
+        # 🔹 Vols : joueurs disponibles qui tentent leur chance ce tour-ci
+        ready = np.flatnonzero(cooldown_end <= now)
+        thieves = ready[rng.random(len(ready)) < steal_rate]
+        if len(thieves):
+            run_start = thieves - thieves % players
+            targets = run_start + (thieves - run_start + rng.integers(1, players, size=len(thieves))) % players
+            valid = (points[thieves] > 0) & (points[targets] > 0)    # sinon refus sans cooldown
+            thieves, targets = thieves[valid], targets[valid]
+            size = len(thieves)
+            amount = np.maximum(1, points[targets] // STEAL_DIVISOR)
+            is_thief = classes[thieves] == VOLEUR
+            success = rng.random(size) < np.where(is_thief, VOLEUR_SUCCESS, STEAL_SUCCESS)
+            amount = np.where(is_thief & (rng.random(size) < VOLEUR_DOUBLE), amount * 2, amount)
+            cooldown_end[thieves] = now + steal_cd[thieves]
+            dodged = success & (classes[targets] == ILLUSIONNISTE) & (rng.random(size) < ILLUSION_DODGE)
+            lost = success & ~dodged
+            np.add.at(points, thieves[success], amount[success])
+            np.subtract.at(points, targets[lost], amount[lost])
+            np.maximum(points, 0, out=points)
+            counts["attempts"] += size
+            counts["steals_won"] += int(success.sum())
+            counts["stolen"] += int(amount[lost].sum())
+            counts["dodged"] += int(dodged.sum())
+
+        if (step + 1) % 24 == 0:
+            gini_by_day.append(gini(points.reshape(runs, players)))
+
+    by_day = np.array(gini_by_day)                    # (jours, parties)
+    final = points.reshape(runs, players)
+    by_class = {}
+    for index, classe in enumerate(CLASSES):
+        members = classes == index
+        if members.any():
+            by_class[classe] = {
+                "share": float(members.mean()),
+                "mean": float(points[members].mean()),
+                "wealth": float(points[members].sum() / max(1, points.sum())),
+            }
+    return {
+        "players": players, "days": days, "runs": runs, "speed": speed, "guilds": guilds,
+        "steal_rate": steal_rate, "activity_sigma": activity_sigma,
+        **counts,
+        "gini": by_day.mean(axis=1).tolist(),
+        "gini_low": by_day.min(axis=1).tolist(),
+        "gini_high": by_day.max(axis=1).tolist(),
+        "percentiles": {f"p{p}": float(np.percentile(final, p, axis=1).mean()) for p in PERCENTILES},
+        "max": float(final.max(axis=1).mean()),
+        "mean": float(final.mean()),
+        "by_class": by_class,
+        "elapsed": time.perf_counter() - started,
+    }
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧾 Rapport texte
+# ────────────────────────────────────────────────────────────────────────────────
+SPARKS = "▁▂▃▄▅▆▇█"
+
+def sparkline(values) -> str:
+    if not values:
+        return ""
+    low, high = min(values), max(values)
+    span = (high - low) or 1.0
+    return "".join(SPARKS[min(len(SPARKS) - 1, int((v - low) / span * len(SPARKS)))] for v in values)
+
+def format_report(result: dict) -> str:
+    lines = [
+        f"Simulation Reiatsu — {result['players']} joueurs × {result['runs']} partie(s), {result['days']} jours",
+        f"Vitesse {result['speed']} sur {result['guilds']} salon(s) • vols {result['steal_rate']:.0%}/h • assiduité σ={result['activity_sigma']}",
+        f"Calcul : {result['elapsed']:.2f}s",
+        "",
+        f"Spawns : {result['spawns']} (dont {result['supers']} super) • points créés : {result['minted']}",
+        f"Vols : {result['attempts']} tentés • {result['steals_won']} réussis • {result['stolen']} points déplacés • {result['dodged']} illusions",
+        "",
+        "== Points en fin de simulation ==",
+        "  ".join(f"{name} : {value:.0f}" for name, value in result["percentiles"].items()) + f"  max : {result['max']:.0f}  moyenne : {result['mean']:.1f}",
+        "",
+        "== Classes ==",
+    ]
+    for classe, entry in result["by_class"].items():
+        lines.append(f"{classe:<14} {entry['share']:>5.0%} des joueurs • moyenne {entry['mean']:>9.1f} • {entry['wealth']:>5.1%} des points")
+    lines += ["", "== Gini par jour (moyenne [min–max] des parties) =="]
+    for day, (mean, low, high) in enumerate(zip(result["gini"], result["gini_low"], result["gini_high"]), 1):
+        lines.append(f"J{day:<4} {mean:.3f} [{low:.3f}–{high:.3f}]")
+    return "\n".join(lines)
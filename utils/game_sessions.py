@@ -0,0 +1,383 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 game_sessions.py — Gestionnaire unique des parties en cours
+# Objectif : Expiration, limites par serveur et reprise des parties après un redeploy
+# Version : une seule roue de minuterie (au lieu d’un asyncio.sleep par partie),
+#           instantanés compacts sauvegardés par lots (Supabase, sinon fichier local)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from utils.supabase_client import supabase
+from utils.schema import columns
+from utils.query_profiler import profiler
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+TICK = 1.0                    # résolution de la roue (secondes)
+WHEEL_SIZE = 512              # nombre de cases de la roue
+FLUSH_INTERVAL = 5.0          # sauvegarde des instantanés modifiés toutes les N secondes
+MAX_SESSIONS_PER_GUILD = 20   # parties simultanées max par serveur
+MAX_SESSIONS = 2000           # garde-fou global
+LOCAL_SNAPSHOT_PATH = Path("data/game_sessions.json")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧾 Session
+# ────────────────────────────────────────────────────────────────────────────────
+@dataclass(slots=True)
+class GameSession:
+    kind: str                 # "pendu", "motus", "capitales", ...
+    key: str                  # salon (jeux par message) ou message (jeux à boutons)
+    guild_id: str = None
+    channel_id: str = None
+    expires_at: float = 0.0
+    state: dict = field(default_factory=dict)   # données JSON minimales pour reprendre la partie
+    handle: object = None     # objet vivant (View, PenduSession…) — jamais sauvegardé
+    slot: int = -1
+
+    @property
+    def id(self) -> str:
+        return f"{self.kind}:{self.key}"
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.time())
+
+    def snapshot(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "payload": {
+                "key": self.key,
+                "guild_id": self.guild_id,
+                "channel_id": self.channel_id,
+                "state": self.state,
+            },
+            "expires_at": self.expires_at,
+        }
+
+    @classmethod
+    def from_snapshot(cls, row: dict) -> "GameSession":
+        payload = row["payload"] if isinstance(row["payload"], dict) else json.loads(row["payload"])
+        return cls(
+            kind=row["kind"],
+            key=payload["key"],
+            guild_id=payload.get("guild_id"),
+            channel_id=payload.get("channel_id"),
+            expires_at=float(row["expires_at"]),
+            state=payload.get("state") or {},
+        )
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🗄️ Stockage des instantanés
+# ────────────────────────────────────────────────────────────────────────────────
+class SupabaseSessionStore:
+    """Table `game_sessions` (id text PK, kind text, payload jsonb, expires_at float8)."""
+    def load(self):
+        return supabase.table("game_sessions").select(*columns("game_sessions")).gt("expires_at", time.time()).execute().data or []
+
+    def save(self, rows):
+        if rows:
+            supabase.table("game_sessions").upsert(rows, on_conflict="id").execute()
+
+    def delete(self, ids):
+        if ids:
+            supabase.table("game_sessions").delete().in_("id", list(ids)).execute()
+
+class FileSessionStore:
+    """Repli local (développement, Supabase indisponible) : un seul fichier JSON."""
+    def __init__(self, path: Path = LOCAL_SNAPSHOT_PATH):
+        self.path = path
+
+    def _read(self) -> dict:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def load(self):
+        now = time.time()
+        return [row for row in self._read().values() if row["expires_at"] > now]
+
+    def save(self, rows):
+        data = self._read()
+        data.update({row["id"]: row for row in rows})
+        self.path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+    def delete(self, ids):
+        data = self._read()
+        for session_id in ids:
+            data.pop(session_id, None)
+        self.path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🎮 Gestionnaire
+# ────────────────────────────────────────────────────────────────────────────────
+class SessionManager:
+    """
+    - open()/get()/touch()/save()/close() : cycle de vie d’une partie
+    - register(kind, on_expire, restore) : callbacks fournis par chaque cog
+    - une tâche unique fait tourner la roue, expire les parties et sauvegarde les instantanés
+    """
+    def __init__(self, store=None, tick: float = TICK, wheel_size: int = WHEEL_SIZE,
+                 max_per_guild: int = MAX_SESSIONS_PER_GUILD, max_total: int = MAX_SESSIONS):
+        self.store = store
+        self.tick = tick
+        self.wheel = [set() for _ in range(wheel_size)]
+        self.max_per_guild = max_per_guild
+        self.max_total = max_total
+        self.sessions = {}        # id → GameSession
+        self.per_guild = {}       # guild_id → nombre de parties
+        self.per_kind = {}        # kind → nombre de parties
+        self.limits = {}          # kind → plafond propre (hors limites globale et par serveur)
+        self.handlers = {}        # kind → {"on_expire", "restore"}
+        self.pending = {}         # kind → [GameSession] restaurées mais pas encore reprises
+        self.dirty = set()
+        self.deleted = set()
+        self.expired_count = 0
+        self.rejected_count = 0
+        self._task = None
+        self._bot = None
+        self._restored = False
+        self._swept = None        # dernière case (index absolu) entièrement balayée
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Démarrage / enregistrement des jeux
+    # ────────────────────────────────────────────────────────────────────────
+    def _get_store(self):
+        if self.store is None:
+            self.store = SupabaseSessionStore() if supabase else FileSessionStore()
+        return self.store
+
+    def start(self, bot):
+        """Lance la roue (une seule fois, même si plusieurs cogs l’appellent)."""
+        self._bot = bot
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def register(self, bot, kind: str, on_expire=None, restore=None, limit: int = None):
+        """
+        on_expire(session) : coroutine appelée quand la partie arrive à échéance
+        restore(session)   : coroutine qui recrée l’objet vivant après un redémarrage
+                             (renvoie l’objet, ou None pour abandonner la partie)
+        limit              : plafond propre à ce type ; ses entrées (longues, sans serveur,
+                             ex. progression sauvegardée) ne comptent plus dans MAX_SESSIONS
+        """
+        self.handlers[kind] = {"on_expire": on_expire, "restore": restore}
+        if limit is not None:
+            self.limits[kind] = limit
+        self.start(bot)
+        if self._restored and self.pending.get(kind):
+            asyncio.create_task(self._resume(kind))
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Cycle de vie
+    # ────────────────────────────────────────────────────────────────────────
+    def open(self, kind: str, key, ttl: float, state: dict = None, guild_id=None, channel_id=None, handle=None):
+        """Crée une partie ; renvoie None si la limite du type, du serveur ou globale est atteinte."""
+        guild_id = str(guild_id) if guild_id else None
+        if kind in self.limits:
+            full = self.per_kind.get(kind, 0) >= self.limits[kind]
+        else:
+            shared = len(self.sessions) - sum(self.per_kind.get(k, 0) for k in self.limits)
+            full = shared >= self.max_total or (guild_id and self.per_guild.get(guild_id, 0) >= self.max_per_guild)
+        if full:
+            self.rejected_count += 1
+            return None
+        session = GameSession(
+            kind=kind,
+            key=str(key),
+            guild_id=guild_id,
+            channel_id=str(channel_id) if channel_id else None,
+            expires_at=time.time() + ttl,
+            state=state or {},
+            handle=handle,
+        )
+        self._add(session)
+        self.save(session)
+        return session
+
+    def get(self, kind: str, key):
+        return self.sessions.get(f"{kind}:{key}")
+
+    def touch(self, session: GameSession, ttl: float):
+        """Repousse l’échéance (ex. à chaque coup joué)."""
+        self._unschedule(session)
+        session.expires_at = time.time() + ttl
+        self._schedule(session)
+        self.save(session)
+
+    def save(self, session: GameSession, **state):
+        """Met à jour l’état et programme la sauvegarde de l’instantané."""
+        if state:
+            session.state.update(state)
+        if session.id in self.sessions:
+            self.dirty.add(session.id)
+            self.deleted.discard(session.id)
+
+    def close(self, session_or_kind, key=None):
+        session = self.get(session_or_kind, key) if key is not None else session_or_kind
+        if not session or session.id not in self.sessions:
+            return
+        self._unschedule(session)
+        del self.sessions[session.id]
+        self.per_kind[session.kind] -= 1
+        if session.guild_id:
+            self.per_guild[session.guild_id] -= 1
+            if self.per_guild[session.guild_id] <= 0:
+                del self.per_guild[session.guild_id]
+        self.dirty.discard(session.id)
+        self.deleted.add(session.id)
+
+    def _add(self, session: GameSession):
+        self.sessions[session.id] = session
+        self.per_kind[session.kind] = self.per_kind.get(session.kind, 0) + 1
+        if session.guild_id:
+            self.per_guild[session.guild_id] = self.per_guild.get(session.guild_id, 0) + 1
+        self._schedule(session)
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Roue de minuterie
+    # ────────────────────────────────────────────────────────────────────────
+    def _schedule(self, session: GameSession):
+        index = int(session.expires_at // self.tick)
+        if self._swept is not None:
+            index = max(index, self._swept + 1)   # échéance déjà dépassée : case balayée au prochain tour
+        session.slot = index % len(self.wheel)
+        self.wheel[session.slot].add(session.id)
+
+    def _unschedule(self, session: GameSession):
+        if session.slot >= 0:
+            self.wheel[session.slot].discard(session.id)
+            session.slot = -1
+
+    def due(self, now: float):
+        """
+        Renvoie les parties échues, en balayant toutes les cases depuis le dernier
+        appel jusqu’à la case courante incluse. La case courante n’est jamais marquée
+        comme balayée : ses parties pas encore échues sont revues au tour suivant.
+        """
+        current = int(now // self.tick)
+        # Premier tour, ou retard d’un tour complet : chaque case une seule fois
+        start = current - len(self.wheel) + 1
+        if self._swept is not None:
+            start = max(start, self._swept + 1)
+        expired = []
+        for index in range(start, current + 1):
+            slot = index % len(self.wheel)
+            for session_id in list(self.wheel[slot]):
+                session = self.sessions.get(session_id)
+                if session is None:
+                    self.wheel[slot].discard(session_id)
+                elif session.expires_at <= now:
+                    expired.append(session)
+        self._swept = current - 1
+        return expired
+
+    async def _expire(self, session: GameSession):
+        self.close(session)
+        self.expired_count += 1
+        handler = self.handlers.get(session.kind, {}).get("on_expire")
+        if handler and session.handle is not None:
+            try:
+                await handler(session)
+            except Exception as e:
+                print(f"[ERREUR sessions] expiration {session.id} : {e}")
+
+    async def _run(self):
+        await self._bot.wait_until_ready()
+        await self._restore_all()
+        last_flush = time.time()
+        while True:
+            await asyncio.sleep(self.tick)
+            now = time.time()
+            with profiler.handler("game_sessions"):
+                for session in self.due(now):
+                    await self._expire(session)
+                if now - last_flush >= FLUSH_INTERVAL:
+                    await self.flush()
+                    last_flush = now
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Instantanés
+    # ────────────────────────────────────────────────────────────────────────
+    async def flush(self):
+        """Écrit les instantanés modifiés et supprime ceux des parties terminées."""
+        if not self.dirty and not self.deleted:
+            return
+        rows = [self.sessions[i].snapshot() for i in self.dirty if i in self.sessions]
+        deleted = set(self.deleted)
+        self.dirty.clear()
+        self.deleted.clear()
+        try:
+            store = self._get_store()
+            await asyncio.to_thread(store.save, rows)
+            await asyncio.to_thread(store.delete, deleted)
+        except Exception as e:
+            print(f"[ERREUR sessions] sauvegarde : {e}")
+            self.dirty.update(row["id"] for row in rows)
+            self.deleted.update(deleted)
+
+    async def _restore_all(self):
+        try:
+            rows = await asyncio.to_thread(self._get_store().load)
+        except Exception as e:
+            print(f"[ERREUR sessions] chargement : {e}")
+            rows = []
+        for row in rows:
+            session = GameSession.from_snapshot(row)
+            self.pending.setdefault(session.kind, []).append(session)
+        self._restored = True
+        for kind in list(self.pending):
+            if kind in self.handlers:
+                await self._resume(kind)
+        if rows:
+            print(f"[SESSIONS] {len(rows)} partie(s) sauvegardée(s) trouvée(s).")
+
+    async def _resume(self, kind: str):
+        restore = self.handlers.get(kind, {}).get("restore")
+        for session in self.pending.pop(kind, []):
+            if session.id in self.sessions or session.expires_at <= time.time():
+                continue
+            handle = None
+            if restore:
+                try:
+                    handle = await restore(session)
+                except Exception as e:
+                    print(f"[ERREUR sessions] reprise {session.id} : {e}")
+            if handle is None:
+                self.deleted.add(session.id)
+                continue
+            session.handle = handle
+            self._add(session)
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Jauges
+    # ────────────────────────────────────────────────────────────────────────
+    def stats(self) -> dict:
+        by_kind = {kind: count for kind, count in self.per_kind.items() if count}
+        memory = 0
+        for session in self.sessions.values():
+            memory += sys.getsizeof(session) + len(json.dumps(session.state, ensure_ascii=False))
+        return {
+            "live": len(self.sessions),
+            "by_kind": by_kind,
+            "guilds": len(self.per_guild),
+            "max_guild": max(self.per_guild.values(), default=0),
+            "approx_bytes": memory,
+            "expired": self.expired_count,
+            "rejected": self.rejected_count,
+            "pending_flush": len(self.dirty) + len(self.deleted),
+        }
+
+
+# Instance unique partagée par les cogs
+sessions = SessionManager()
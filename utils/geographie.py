@@ -0,0 +1,91 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 geographie.py — Données pays/capitales/drapeaux partagées par les quiz
+# Objectif : Une seule source (data/pays.json) + index de réponses normalisées
+# Version : alias pré-normalisés au chargement, correspondance approximative bornée
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import json
+from pathlib import Path
+from utils.text import normalize_text, bounded_levenshtein
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📂 Chargement des données
+# ────────────────────────────────────────────────────────────────────────────────
+DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "pays.json"   # indépendant du dossier courant
+with DATA_PATH.open("r", encoding="utf-8") as f:
+    PAYS = json.load(f)
+
+COUNTRIES = {nom: infos["iso"] for nom, infos in PAYS.items()}           # pays → code ISO
+CAPITALS = {nom: infos["capitale"] for nom, infos in PAYS.items()}       # pays → capitale
+
+ARTICLES = ("le ", "la ", "les ", "l ")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 Normalisation
+# ────────────────────────────────────────────────────────────────────────────────
+def _variants(name: str):
+    """Formes acceptées pour un nom : normalisée, sans espaces, sans article initial."""
+    base = normalize_text(name)
+    forms = {base, base.replace(" ", "")}
+    for article in ARTICLES:
+        if base.startswith(article):
+            forms.add(base[len(article):])
+    return forms
+
+def max_distance(length: int) -> int:
+    """Nombre de fautes tolérées selon la longueur de la réponse attendue."""
+    if length <= 4:
+        return 0
+    if length <= 8:
+        return 1
+    return 2
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🗂️ Index de réponses
+# ────────────────────────────────────────────────────────────────────────────────
+class AnswerIndex:
+    """
+    Associe chaque pays à l’ensemble figé de ses réponses acceptées (déjà normalisées).
+    Vérifier une proposition = normaliser la proposition (en cache) + un test d’appartenance ;
+    la tolérance aux fautes n’est tentée qu’en dernier recours, sur ces seuls alias.
+    """
+    def __init__(self, answers: dict):
+        self.answers = {}     # clé (pays) → frozenset d’alias normalisés
+        self.lookup = {}      # alias normalisé → clé
+        for key, names in answers.items():
+            forms = set()
+            for name in names:
+                forms |= _variants(name)
+            self.answers[key] = frozenset(forms)
+            for form in forms:
+                self.lookup.setdefault(form, key)
+
+    def accepted(self, key) -> frozenset:
+        return self.answers[key]
+
+    def check(self, key, guess: str, fuzzy: bool = True) -> bool:
+        """La proposition `guess` est-elle une bonne réponse pour `key` ?"""
+        normalized = normalize_text(guess)
+        accepted = self.answers[key]
+        if normalized in accepted or normalized.replace(" ", "") in accepted:
+            return True
+        # Une autre réponse valide (ex. « Mali » pour « Malte ») n’est jamais une faute de frappe
+        if not fuzzy or self.find(guess) not in (None, key):
+            return False
+        return any(
+            bounded_levenshtein(normalized, form, max_distance(len(form))) <= max_distance(len(form))
+            for form in accepted
+        )
+
+    def find(self, guess: str):
+        """Renvoie la clé correspondant exactement à la proposition, ou None."""
+        normalized = normalize_text(guess)
+        return self.lookup.get(normalized) or self.lookup.get(normalized.replace(" ", ""))
+
+
+# Index prêts à l’emploi (construits une seule fois au chargement du module)
+COUNTRY_INDEX = AnswerIndex({nom: [nom, *infos.get("alias", [])] for nom, infos in PAYS.items()})
+CAPITAL_INDEX = AnswerIndex({nom: [infos["capitale"], *infos.get("alias_capitale", [])] for nom, infos in PAYS.items()})
@@ -0,0 +1,188 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 help_catalog.py — Catalogue des commandes (aide, README, recherche)
+# Objectif : Construire une seule fois (après chargement des extensions) les pages
+#            d’aide par catégorie, les embeds par commande, le README et l’index
+#            de recherche ; reconstruit seulement si l’arbre de commandes change
+# Version : empreinte = nombre de commandes + modules d’extensions chargés
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import bisect
+import math
+from dataclasses import dataclass
+import discord
+from utils.text import normalize_text, bounded_levenshtein
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+PER_PAGE = 10
+MAX_SUGGESTIONS = 5
+README_HEADER = (
+    "# Kisuke Urahara - Bot Discord\n\n"
+    "👍 Kisuke Urahara est un bot discord à la con et inutile en python. Il propose quelques commandes simples, "
+    "peu de commandes amusantes et parfois inspirées du manga bleach, et un petit jeu de collecte de 'reiatsu' "
+    "qui ne sert à rien. Les commandes fonctionnent avec le préfixe et certaines aussi en mode slash.\n\n"
+    "---\n\n# Commandes\n\n"
+)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧾 Entrée du catalogue
+# ────────────────────────────────────────────────────────────────────────────────
+@dataclass(frozen=True, slots=True)
+class CommandEntry:
+    name: str
+    aliases: tuple
+    category: str          # None si la commande n’a pas de catégorie
+    help: str
+    hidden: bool
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📚 Catalogue
+# ────────────────────────────────────────────────────────────────────────────────
+class HelpCatalog:
+    """
+    - ensure(bot, prefix) : (re)construit si l’arbre de commandes a changé
+    - categories / pages(cat) / command_embed(nom) : aide prête à l’envoi
+      (les embeds sont partagés : ne pas les modifier, utiliser .copy())
+    - search(texte) : suggestions par préfixe puis par faute de frappe
+    - readme() : contenu Markdown de !readme
+    """
+    def __init__(self):
+        self.fingerprint = None
+        self.prefix = None
+        self.entries = {}          # nom → CommandEntry (toutes, y compris cachées)
+        self.categories = {}       # catégorie → [CommandEntry] triées (sans les cachées)
+        self._pages = {}           # catégorie → [Embed]
+        self._embeds = {}          # nom → Embed
+        self._keys = []            # clés de recherche triées (noms + alias normalisés)
+        self._key_to_name = {}
+        self._readme = None
+        self.builds = 0
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Construction
+    # ────────────────────────────────────────────────────────────────────────
+    @staticmethod
+    def _fingerprint(bot):
+        return len(bot.all_commands), tuple(id(module) for module in bot.extensions.values())
+
+    def invalidate(self):
+        self.fingerprint = None
+
+    def ensure(self, bot, prefix: str):
+        fingerprint = self._fingerprint(bot)
+        if fingerprint != self.fingerprint or prefix != self.prefix:
+            self._build(bot, prefix)
+            self.fingerprint = fingerprint
+        return self
+
+    def _build(self, bot, prefix: str):
+        self.prefix = prefix
+        self.entries = {
+            cmd.name: CommandEntry(
+                name=cmd.name,
+                aliases=tuple(cmd.aliases),
+                category=getattr(cmd, "category", None),
+                help=cmd.help or "Pas de description.",
+                hidden=cmd.hidden,
+            )
+            for cmd in bot.commands
+        }
+
+        categories = {}
+        for entry in self.entries.values():
+            if not entry.hidden:
+                categories.setdefault(entry.category or "Autres", []).append(entry)
+        self.categories = {cat: sorted(cmds, key=lambda e: e.name) for cat, cmds in sorted(categories.items())}
+
+        self._pages = {cat: self._build_pages(cat, cmds) for cat, cmds in self.categories.items()}
+        self._embeds = {name: self._build_command_embed(entry) for name, entry in self.entries.items()}
+
+        self._key_to_name = {}
+        for entry in self.entries.values():
+            if entry.hidden:
+                continue
+            for key in (entry.name, *entry.aliases):
+                self._key_to_name.setdefault(normalize_text(key), entry.name)
+        self._keys = sorted(self._key_to_name)
+        self._readme = None
+        self.builds += 1
+
+    def _build_pages(self, category: str, cmds: list):
+        total = max(1, math.ceil(len(cmds) / PER_PAGE))
+        pages = []
+        for page in range(total):
+            embed = discord.Embed(title=f"📂 {category} — Page {page + 1}/{total}", color=discord.Color.blurple())
+            for entry in cmds[page * PER_PAGE:(page + 1) * PER_PAGE]:
+                embed.add_field(name=f"`{self.prefix}{entry.name}`", value=entry.help, inline=False)
+            embed.set_footer(text=f"Utilise {self.prefix}help <commande> pour plus de détails.")
+            pages.append(embed)
+        return pages
+
+    def _build_command_embed(self, entry: CommandEntry):
+        embed = discord.Embed(title=f"ℹ️ Aide pour `{self.prefix}{entry.name}`", color=discord.Color.green())
+        embed.add_field(name="📄 Description", value=entry.help, inline=False)
+        if entry.aliases:
+            embed.add_field(name="🔁 Alias", value=", ".join(f"`{a}`" for a in entry.aliases), inline=False)
+        embed.set_footer(text="📌 Syntaxe : <obligatoire> [optionnel]")
+        return embed
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Accès
+    # ────────────────────────────────────────────────────────────────────────
+    def pages(self, category: str):
+        return self._pages.get(category, [])
+
+    def command_embed(self, name: str):
+        """Embed d’une commande par nom ou alias exact (insensible à la casse/aux accents)."""
+        real = self._key_to_name.get(normalize_text(name), name)
+        return self._embeds.get(real)
+
+    def search(self, text: str, limit: int = MAX_SUGGESTIONS):
+        """Noms de commandes commençant par `text`, sinon les plus proches (fautes de frappe)."""
+        query = normalize_text(text)
+        if not query:
+            return []
+        found = []
+        start = bisect.bisect_left(self._keys, query)
+        for key in self._keys[start:]:
+            if not key.startswith(query):
+                break
+            name = self._key_to_name[key]
+            if name not in found:
+                found.append(name)
+            if len(found) >= limit:
+                return found
+        if found:
+            return found
+        bound = 1 if len(query) <= 4 else 2
+        scored = sorted(
+            (distance, key) for key in self._keys
+            if (distance := bounded_levenshtein(query, key, bound)) <= bound
+        )
+        for _, key in scored:
+            name = self._key_to_name[key]
+            if name not in found:
+                found.append(name)
+        return found[:limit]
+
+    def readme(self) -> str:
+        if self._readme is None:
+            categories = {}
+            for entry in self.entries.values():
+                categories.setdefault(entry.category or "Autre", []).append(entry)
+            content = README_HEADER
+            for cat in sorted(categories, key=lambda c: c.lower()):
+                content += f"### 📂 {cat}\n"
+                for entry in sorted(categories[cat], key=lambda e: e.name.lower()):
+                    content += f"- **{entry.name} :** {entry.help}\n"
+                content += "\n"
+            self._readme = content
+        return self._readme
+
+
+# Instance unique
+catalog = HelpCatalog()
@@ -0,0 +1,229 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 image_assets.py — Pipeline des images locales (data/images)
+# Objectif : Index clé → fichier construit au démarrage, images redimensionnées une
+#            seule fois dans un cache disque, URLs CDN Discord réutilisées après envoi
+# Version : Pillow optionnel (sans lui, les fichiers d’origine sont servis tels quels)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import json
+import os
+import time
+import unicodedata
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+import discord
+from utils.discord_utils import safe_send
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow absent → pas de redimensionnement, fichiers d’origine
+    Image = None
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+IMAGES_DIR = Path("data/images")
+CACHE_DIR = Path(".cache/images")
+URLS_PATH = CACHE_DIR / "cdn_urls.json"
+EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".gif")
+MAX_SIDE = 1024             # plus grand côté après redimensionnement (px)
+JPEG_QUALITY = 85
+URL_MARGIN = 3600           # une URL CDN est abandonnée 1 h avant son expiration
+DEFAULT_KEY = ("", "image_par_defaut")
+CACHE_CHANNEL_SETTING = "image_cache_channel_id"   # bot_settings : salon caché où héberger les images (!imagecache)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 Clés
+# ────────────────────────────────────────────────────────────────────────────────
+def normalize_key(name: str) -> str:
+    """Nom de fichier sans extension, sans accents ni espaces, en minuscules."""
+    name = unicodedata.normalize("NFD", Path(name).stem.lower())
+    return "".join(c for c in name if unicodedata.category(c) != "Mn" and not c.isspace())
+
+def _url_expiry(url: str) -> float:
+    """Les URLs d’attachement Discord sont signées : `ex` = expiration (hex, epoch)."""
+    try:
+        return float(int(parse_qs(urlparse(url).query)["ex"][0], 16))
+    except (KeyError, ValueError, IndexError):
+        return time.time() + 24 * 3600
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🖼️ Pipeline
+# ────────────────────────────────────────────────────────────────────────────────
+class ImageAssets:
+    """
+    - path(namespace, key) : fichier d’origine, en O(1) (index construit au chargement)
+    - prepared(namespace, key) : version redimensionnée/réencodée (cache disque)
+    - attachment(namespace, key, reuse) : (discord.File | None, url pour l’embed)
+    - remember(namespace, key, message) : retient l’URL CDN après le premier envoi ;
+      seulement pour un message jamais réédité (une édition supprime la pièce jointe)
+    - host(channel, namespace, key) : URL CDN d’une image envoyée une seule fois dans un
+      salon de cache (message jamais réédité) ; pour les messages paginés
+    `namespace` = sous-dossier de data/images ("" pour la racine).
+    """
+    def __init__(self, root: Path = IMAGES_DIR, cache_dir: Path = CACHE_DIR):
+        self.root = root
+        self.cache_dir = cache_dir
+        self.index = {}     # (namespace, key) → Path d’origine
+        self.urls = {}      # "namespace/key" → {"url", "expires"}
+        self.uploads = 0
+        self.reuses = 0
+        self._hosting = {}  # "namespace/key" → tâche d’envoi en cours (un seul envoi par image)
+        self.build_index()
+        self._load_urls()
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Index
+    # ────────────────────────────────────────────────────────────────────────
+    def build_index(self):
+        self.index.clear()
+        if not self.root.exists():
+            return
+        for dirpath, _, files in os.walk(self.root):
+            namespace = os.path.relpath(dirpath, self.root).replace(os.sep, "/")
+            namespace = "" if namespace == "." else namespace
+            for file in files:
+                if file.lower().endswith(EXTENSIONS):
+                    self.index.setdefault((namespace, normalize_key(file)), Path(dirpath) / file)
+
+    def path(self, namespace: str, key: str):
+        return self.index.get((namespace, normalize_key(key)))
+
+    def find(self, relative_path: str):
+        """Retrouve (namespace, key) depuis un chemin de JSON (ex. data/images/x.jpeg), sinon l’image par défaut."""
+        relative = Path(relative_path)
+        try:
+            relative = relative.relative_to(self.root)
+        except ValueError:
+            pass
+        namespace = "/".join(relative.parts[:-1])
+        ref = (namespace, normalize_key(relative.name))
+        return ref if ref in self.index else DEFAULT_KEY
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Cache disque (redimensionnement unique)
+    # ────────────────────────────────────────────────────────────────────────
+    def prepared(self, namespace: str, key: str):
+        source = self.path(namespace, key)
+        if source is None:
+            return None
+        # GIF (souvent animés) et absence de Pillow : fichier d’origine
+        if Image is None or source.suffix.lower() == ".gif":
+            return source
+        stat = source.stat()
+        stem = f"{normalize_key(key)}-{int(stat.st_mtime)}-{stat.st_size}"
+        target_dir = self.cache_dir / (namespace or "_")
+        for ext in (".jpg", ".png"):
+            cached = target_dir / f"{stem}{ext}"
+            if cached.exists():
+                return cached
+        try:
+            target_dir.mkdir(parents=True, exist_ok=True)
+            with Image.open(source) as img:
+                img.thumbnail((MAX_SIDE, MAX_SIDE))
+                if img.mode in ("RGBA", "LA", "P"):
+                    cached = target_dir / f"{stem}.png"
+                    img.save(cached, "PNG", optimize=True)
+                else:
+                    cached = target_dir / f"{stem}.jpg"
+                    img.convert("RGB").save(cached, "JPEG", quality=JPEG_QUALITY, optimize=True)
+            # Le cache ne doit jamais être plus lourd que l’original
+            if cached.stat().st_size >= stat.st_size:
+                cached.unlink()
+                return source
+            return cached
+        except Exception as e:
+            print(f"[ERREUR images] {source} : {e}")
+            return source
+
+    def warm(self, namespace: str = None) -> int:
+        """Prépare d’avance toutes les images (d’un dossier) ; à lancer dans un thread."""
+        count = 0
+        for ns, key in list(self.index):
+            if namespace is None or ns == namespace:
+                self.prepared(ns, key)
+                count += 1
+        return count
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 URLs CDN
+    # ────────────────────────────────────────────────────────────────────────
+    def _load_urls(self):
+        try:
+            self.urls = json.loads(URLS_PATH.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.urls = {}
+
+    def _save_urls(self):
+        try:
+            URLS_PATH.parent.mkdir(parents=True, exist_ok=True)
+            URLS_PATH.write_text(json.dumps(self.urls), encoding="utf-8")
+        except OSError as e:
+            print(f"[ERREUR images] sauvegarde des URLs : {e}")
+
+    def cached_url(self, namespace: str, key: str):
+        entry = self.urls.get(f"{namespace}/{normalize_key(key)}")
+        if entry and entry["expires"] - URL_MARGIN > time.time():
+            return entry["url"]
+        return None
+
+    def attachment(self, namespace: str, key: str, reuse: bool = True):
+        """
+        Renvoie (fichier, url) : si une URL CDN valide est connue → (None, url_cdn) ;
+        sinon → (discord.File du fichier préparé, "attachment://…") ; (None, None) si inconnue.
+        `reuse=False` : toujours un fichier (message réédité ensuite, ex. pagination).
+        """
+        url = self.cached_url(namespace, key) if reuse else None
+        if url:
+            self.reuses += 1
+            return None, url
+        path = self.prepared(namespace, key)
+        if path is None:
+            return None, None
+        self.uploads += 1
+        return discord.File(path, filename=path.name), f"attachment://{path.name}"
+
+    def remember(self, namespace: str, key: str, message):
+        """Lit l’URL CDN de l’image de l’embed (ou de la pièce jointe) d’un message envoyé."""
+        if message is None:
+            return
+        url = None
+        if message.embeds and message.embeds[0].image and message.embeds[0].image.url:
+            url = message.embeds[0].image.url
+        elif message.attachments:
+            url = message.attachments[0].url
+        if url and not url.startswith("attachment://"):
+            self.urls[f"{namespace}/{normalize_key(key)}"] = {"url": url, "expires": _url_expiry(url)}
+            self._save_urls()
+
+    async def host(self, channel, namespace: str, key: str):
+        """URL CDN durable de l’image (envoyée dans `channel` au premier appel), None en cas d’échec."""
+        url = self.cached_url(namespace, key)
+        if url:
+            self.reuses += 1
+            return url
+        name = f"{namespace}/{normalize_key(key)}"
+        task = self._hosting.get(name)
+        if task is None:
+            task = self._hosting[name] = asyncio.create_task(self._upload(channel, namespace, key))
+            task.add_done_callback(lambda _: self._hosting.pop(name, None))
+        return await asyncio.shield(task)
+
+    async def _upload(self, channel, namespace: str, key: str):
+        file, _ = self.attachment(namespace, key, reuse=False)
+        if file is None:
+            return None
+        message = await safe_send(channel, content=f"{namespace}/{normalize_key(key)}", file=file)
+        self.remember(namespace, key, message)
+        return self.cached_url(namespace, key)
+
+    def stats(self) -> dict:
+        return {"indexed": len(self.index), "cdn_urls": len(self.urls), "uploads": self.uploads, "reuses": self.reuses}
+
+
+# Instance unique (index construit une seule fois au chargement)
+assets = ImageAssets()
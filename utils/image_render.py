@@ -0,0 +1,152 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 image_render.py — Images générées ou mises en cache localement
+# Objectif : Pastilles de couleur rendues en mémoire (sans service tiers) et
+#            drapeaux servis depuis un atlas local / cache disque au lieu de flagcdn
+# Version : PNG 1 bit encodé à la main (zlib), drapeaux pré-téléchargés une fois,
+#           URLs CDN Discord réutilisées via utils/image_assets
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import io
+import json
+import struct
+import zlib
+from functools import lru_cache
+from pathlib import Path
+import aiohttp
+import discord
+from utils.image_assets import assets, Image
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+SWATCH_SIZE = (700, 200)
+FLAG_CACHE_DIR = Path(".cache/flags")
+FLAG_ATLAS_PATH = Path("data/images/drapeaux/atlas.png")         # optionnel (sprite de tous les drapeaux)
+FLAG_ATLAS_INDEX = Path("data/images/drapeaux/atlas.json")       # {"fr": [x, y, largeur, hauteur], ...}
+FLAG_SOURCE_URL = "https://flagcdn.com/w320/{iso}.png"           # utilisé une seule fois par drapeau
+PREFETCH_CONCURRENCY = 8
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🎨 Pastilles de couleur
+# ────────────────────────────────────────────────────────────────────────────────
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+@lru_cache(maxsize=256)
+def swatch_png(color: int, width: int = SWATCH_SIZE[0], height: int = SWATCH_SIZE[1]) -> bytes:
+    """PNG uni de la couleur 0xRRGGBB : palette d’une entrée, 1 bit/pixel (quelques centaines d’octets)."""
+    rgb = bytes(((color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF))
+    header = struct.pack(">IIBBBBB", width, height, 1, 3, 0, 0, 0)
+    row = b"\x00" * (1 + (width + 7) // 8)      # filtre 0 + pixels à l’index 0
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _png_chunk(b"IHDR", header)
+        + _png_chunk(b"PLTE", rgb)
+        + _png_chunk(b"IDAT", zlib.compress(row * height, 9))
+        + _png_chunk(b"IEND", b"")
+    )
+
+def swatch_file(color: int, filename: str = "couleur.png") -> discord.File:
+    return discord.File(io.BytesIO(swatch_png(color)), filename=filename)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🏳️ Drapeaux
+# ────────────────────────────────────────────────────────────────────────────────
+class FlagCache:
+    """
+    Ordre de recherche pour un code ISO :
+    1. URL CDN Discord déjà connue (aucun envoi de fichier)
+    2. fichier du cache disque (.cache/flags/<iso>.png)
+    3. découpe de l’atlas local (Pillow), écrite dans le cache au premier usage
+    4. téléchargement unique depuis flagcdn, écrit dans le cache
+    """
+    def __init__(self, cache_dir: Path = FLAG_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._atlas = None
+        self._atlas_index = None
+        self._prefetched = False
+        self._lock = asyncio.Lock()
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Sources locales
+    # ────────────────────────────────────────────────────────────────────────
+    def _cached_path(self, iso: str) -> Path:
+        return self.cache_dir / f"{iso}.png"
+
+    def _slice_atlas(self, iso: str):
+        if Image is None or not FLAG_ATLAS_PATH.exists() or not FLAG_ATLAS_INDEX.exists():
+            return None
+        if self._atlas_index is None:
+            self._atlas_index = json.loads(FLAG_ATLAS_INDEX.read_text(encoding="utf-8"))
+            self._atlas = Image.open(FLAG_ATLAS_PATH)
+            self._atlas.load()
+        box = self._atlas_index.get(iso)
+        if not box:
+            return None
+        x, y, w, h = box
+        path = self._cached_path(iso)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._atlas.crop((x, y, x + w, y + h)).save(path, "PNG", optimize=True)
+        return path
+
+    def local(self, iso: str):
+        path = self._cached_path(iso)
+        return path if path.exists() else self._slice_atlas(iso)
+
+    async def _download(self, session: aiohttp.ClientSession, iso: str):
+        try:
+            async with session.get(FLAG_SOURCE_URL.format(iso=iso)) as resp:
+                if resp.status != 200:
+                    return None
+                data = await resp.read()
+            path = self._cached_path(iso)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+            return path
+        except Exception as e:
+            print(f"[ERREUR drapeaux] {iso} : {e}")
+            return None
+
+    async def prefetch(self, isos):
+        """Télécharge une fois tous les drapeaux absents du cache (au chargement du cog)."""
+        async with self._lock:
+            if self._prefetched:
+                return
+            self._prefetched = True
+        missing = [iso for iso in set(isos) if self.local(iso) is None]
+        if not missing:
+            return
+        semaphore = asyncio.Semaphore(PREFETCH_CONCURRENCY)
+        async with aiohttp.ClientSession() as session:
+            async def fetch(iso):
+                async with semaphore:
+                    await self._download(session, iso)
+            await asyncio.gather(*(fetch(iso) for iso in missing))
+        print(f"[DRAPEAUX] {len(missing)} drapeau(x) mis en cache.")
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Accès
+    # ────────────────────────────────────────────────────────────────────────
+    async def get(self, iso: str):
+        """Renvoie (discord.File | None, url pour l’embed)."""
+        url = assets.cached_url("flags", iso)
+        if url:
+            return None, url
+        path = self.local(iso)
+        if path is None:
+            async with aiohttp.ClientSession() as session:
+                path = await self._download(session, iso)
+        if path is None:
+            return None, FLAG_SOURCE_URL.format(iso=iso)   # dernier recours
+        return discord.File(path, filename=f"{iso}.png"), f"attachment://{iso}.png"
+
+    def remember(self, iso: str, message):
+        assets.remember("flags", iso, message)
+
+
+# Instance unique (cache disque partagé par drapeaux/dirigeant)
+flags = FlagCache()
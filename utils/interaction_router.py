@@ -0,0 +1,191 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 interaction_router.py — Acquittement automatique des interactions
+# Objectif : Mesurer le temps écoulé depuis la création d’une interaction et la
+#            différer (defer) avant la fenêtre de 3 s de Discord quand le handler
+#            tarde (requêtes de stockage lentes) ; les réponses suivantes passent
+#            alors par followup / edit_original_response (voir utils/discord_utils)
+# Version : une tâche de garde par interaction suivie, jauges par commande
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import os
+import discord
+from discord import app_commands
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+ACK_WINDOW = 3.0              # délai imposé par Discord pour la première réponse
+DEFER_BUDGET = float(os.getenv("INTERACTION_DEFER_BUDGET", "2.0"))   # defer automatique passé ce délai
+
+def elapsed(interaction: discord.Interaction) -> float:
+    """Secondes écoulées depuis la création de l’interaction (horloge Discord)."""
+    return max(0.0, (discord.utils.utcnow() - interaction.created_at).total_seconds())
+
+def interaction_name(interaction: discord.Interaction) -> str:
+    command = getattr(interaction, "command", None)
+    if command is not None:
+        return f"/{command.qualified_name}"
+    return "composant" if interaction.type == discord.InteractionType.component else "interaction"
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧾 Jauges par commande
+# ────────────────────────────────────────────────────────────────────────────────
+class AckStats:
+    __slots__ = ("watched", "acks", "auto_deferred", "deferred", "missed", "total_ack", "max_ack")
+
+    def __init__(self):
+        self.watched = 0          # interactions suivies par une tâche de garde
+        self.acks = 0             # premières réponses (réponse directe ou defer)
+        self.auto_deferred = 0    # defer déclenchés par le budget
+        self.deferred = 0         # defer demandés par le handler
+        self.missed = 0           # fenêtre de 3 s dépassée (interaction expirée)
+        self.total_ack = 0.0
+        self.max_ack = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "watched": self.watched,
+            "acks": self.acks,
+            "auto_deferred": self.auto_deferred,
+            "deferred": self.deferred,
+            "missed": self.missed,
+            "avg_ack": self.total_ack / self.acks if self.acks else 0.0,
+            "max_ack": self.max_ack,
+        }
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧭 Routeur
+# ────────────────────────────────────────────────────────────────────────────────
+class InteractionRouter:
+    """
+    - watch(interaction, ephemeral, name) : defer automatique si rien n’est répondu
+      avant `budget` secondes (thinking pour une commande, mise à jour pour un bouton)
+    - defer(interaction, ephemeral) : defer explicite, compté dans les jauges
+    - settle(interaction) puis acknowledged(interaction) : appelés par safe_respond /
+      safe_edit_response avant la première réponse ; annule la garde et note la latence
+    La garde ne peut agir que si la boucle est libre : un handler doit faire ses
+    appels bloquants via asyncio.to_thread pour en profiter.
+    """
+    def __init__(self, budget: float = DEFER_BUDGET):
+        self.budget = budget
+        self.commands = {}        # nom → AckStats
+        self._watched = {}        # interaction.id → (nom, tâche de garde)
+        self._deferring = {}      # interaction.id → tâche de garde en plein defer
+
+    def _stats(self, name: str) -> AckStats:
+        entry = self.commands.get(name)
+        if entry is None:
+            entry = self.commands[name] = AckStats()
+        return entry
+
+    def _name(self, interaction: discord.Interaction) -> str:
+        entry = self._watched.get(interaction.id)
+        return entry[0] if entry else interaction_name(interaction)
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Garde
+    # ────────────────────────────────────────────────────────────────────────
+    def watch(self, interaction: discord.Interaction, ephemeral: bool = False, name: str = None):
+        if interaction.response.is_done() or interaction.id in self._watched:
+            return
+        name = name or interaction_name(interaction)
+        self._stats(name).watched += 1
+        task = asyncio.create_task(self._guard(interaction, ephemeral))
+        self._watched[interaction.id] = (name, task)
+        task.add_done_callback(lambda _: self._forget(interaction.id, task))
+
+    def _forget(self, interaction_id: int, task):
+        entry = self._watched.get(interaction_id)
+        if entry and entry[1] is task:
+            del self._watched[interaction_id]
+
+    async def _guard(self, interaction: discord.Interaction, ephemeral: bool):
+        await asyncio.sleep(max(0.0, self.budget - elapsed(interaction)))
+        if interaction.response.is_done():
+            return
+        self._deferring[interaction.id] = asyncio.current_task()
+        try:
+            await self._defer(interaction, ephemeral, auto=True)
+        finally:
+            self._deferring.pop(interaction.id, None)
+
+    async def settle(self, interaction: discord.Interaction):
+        """Attend la fin d’un defer automatique en cours (sinon la réponse partirait en double)."""
+        task = self._deferring.get(interaction.id)
+        if task is not None and task is not asyncio.current_task():
+            await asyncio.wait({task})
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Acquittement
+    # ────────────────────────────────────────────────────────────────────────
+    async def defer(self, interaction: discord.Interaction, ephemeral: bool = False) -> bool:
+        if interaction.response.is_done():
+            return False
+        return await self._defer(interaction, ephemeral, auto=False)
+
+    async def _defer(self, interaction: discord.Interaction, ephemeral: bool, auto: bool) -> bool:
+        name = self._name(interaction)
+        try:
+            if interaction.type == discord.InteractionType.component:
+                await interaction.response.defer()        # mise à jour : le message reste modifiable
+            else:
+                await interaction.response.defer(thinking=True, ephemeral=ephemeral)
+        except discord.InteractionResponded:
+            return False
+        except discord.NotFound:
+            self._stats(name).missed += 1
+            print(f"[ERREUR interactions] {name} : interaction expirée après {elapsed(interaction):.2f}s")
+            return False
+        stats = self._stats(name)
+        if auto:
+            stats.auto_deferred += 1
+        else:
+            stats.deferred += 1
+        self.acknowledged(interaction)
+        return True
+
+    def acknowledged(self, interaction: discord.Interaction):
+        name = self._name(interaction)
+        entry = self._watched.pop(interaction.id, None)
+        if entry and entry[1] is not asyncio.current_task():
+            entry[1].cancel()
+        latency = elapsed(interaction)
+        stats = self._stats(name)
+        stats.acks += 1
+        stats.total_ack += latency
+        stats.max_ack = max(stats.max_ack, latency)
+        if latency > ACK_WINDOW:
+            stats.missed += 1
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Jauges
+    # ────────────────────────────────────────────────────────────────────────
+    def stats(self) -> dict:
+        """{"budget", "watching", "commands": {nom: AckStats.to_dict()}} (plus souvent différées d’abord)"""
+        ranked = sorted(self.commands.items(), key=lambda item: (item[1].auto_deferred, item[1].acks), reverse=True)
+        return {
+            "budget": self.budget,
+            "watching": len(self._watched),
+            "commands": {name: entry.to_dict() for name, entry in ranked},
+        }
+
+    def reset(self):
+        self.commands.clear()
+
+
+# Instance unique
+interactions = InteractionRouter()
+
+def auto_defer(ephemeral: bool = False):
+    """
+    Check de commande slash qui lance la garde de l’interaction. À placer juste sous
+    @app_commands.command (dernier check évalué : rien n’est suivi si un cooldown refuse).
+    """
+    def predicate(interaction: discord.Interaction) -> bool:
+        interactions.watch(interaction, ephemeral=ephemeral)
+        return True
+    return app_commands.check(predicate)
@@ -0,0 +1,191 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 leaderboard.py — Classement Reiatsu maintenu en mémoire
+# Objectif : Classement global et par serveur mis à jour à chaque gain/perte de points
+# Version : Structure ordonnée (SortedList) → top N, rang et voisins en O(log n)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+from sortedcontainers import SortedList
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📊 Vue de classement (une par serveur + une globale)
+# ────────────────────────────────────────────────────────────────────────────────
+class RankingView:
+    """
+    Ensemble ordonné de (−points, user_id) : le meilleur joueur est en tête.
+    Les égalités sont départagées par user_id pour garder un ordre stable.
+    """
+    __slots__ = ("_entries",)
+
+    def __init__(self):
+        self._entries = SortedList()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, user_id: str, points: int):
+        self._entries.add((-points, user_id))
+
+    def discard(self, user_id: str, points: int):
+        self._entries.discard((-points, user_id))
+
+    def rank(self, user_id: str, points: int):
+        """Rang (1 = premier) d’un joueur présent dans la vue, sinon None."""
+        key = (-points, user_id)
+        index = self._entries.bisect_left(key)
+        if index < len(self._entries) and self._entries[index] == key:
+            return index + 1
+        return None
+
+    def page(self, start: int, count: int):
+        """Renvoie [(rang, user_id, points)] à partir de l’index `start`."""
+        return [
+            (start + i + 1, user_id, -neg_points)
+            for i, (neg_points, user_id) in enumerate(self._entries.islice(start, start + count))
+        ]
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🏆 Service de classement
+# ────────────────────────────────────────────────────────────────────────────────
+class Leaderboard:
+    """
+    Classement Reiatsu incrémental.
+    - seed() : chargement unique depuis la table `reiatsu`
+    - update() : appelé après chaque capture, vol, skill ou pari
+    - vues par serveur alimentées par les membres (join/remove)
+    """
+    def __init__(self):
+        self.points = {}          # user_id → points
+        self.user_guilds = {}     # user_id → {guild_id}
+        self.global_view = RankingView()
+        self.guild_views = {}     # guild_id → RankingView
+        self.ready = False
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Chargement initial
+    # ────────────────────────────────────────────────────────────────────────
+    def seed(self, rows):
+        """Initialise le classement à partir de lignes {user_id, points}."""
+        self.points.clear()
+        self.global_view = RankingView()
+        for view in self.guild_views.values():
+            view._entries.clear()
+        for row in rows:
+            self.update(row["user_id"], row.get("points") or 0)
+        self.ready = True
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Mises à jour
+    # ────────────────────────────────────────────────────────────────────────
+    def update(self, user_id, points: int):
+        """Enregistre le nouveau total d’un joueur dans toutes ses vues."""
+        user_id = str(user_id)
+        old = self.points.get(user_id)
+        if old == points:
+            return
+        views = [self.global_view] + [self.guild_views[g] for g in self.user_guilds.get(user_id, ()) if g in self.guild_views]
+        for view in views:
+            if old is not None:
+                view.discard(user_id, old)
+            view.add(user_id, points)
+        self.points[user_id] = points
+
+    def add_points(self, user_id, delta: int):
+        """Ajoute `delta` au total connu d’un joueur (utile quand seul le gain est connu)."""
+        user_id = str(user_id)
+        self.update(user_id, max(0, self.points.get(user_id, 0) + delta))
+
+    def remove(self, user_id):
+        user_id = str(user_id)
+        old = self.points.pop(user_id, None)
+        if old is None:
+            return
+        self.global_view.discard(user_id, old)
+        for guild_id in self.user_guilds.get(user_id, ()):
+            view = self.guild_views.get(guild_id)
+            if view:
+                view.discard(user_id, old)
+
+    def apply_change(self, event):
+        """Changement de la table `reiatsu` venu d’une autre instance (utils/change_feed)."""
+        user_id = event.row.get("user_id")
+        if user_id is None:
+            return
+        if event.type == "DELETE":
+            self.remove(user_id)
+        elif "points" in event.record:
+            self.update(user_id, event.record["points"] or 0)
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Appartenance aux serveurs
+    # ────────────────────────────────────────────────────────────────────────
+    def set_guild_members(self, guild_id, member_ids):
+        """(Re)construit la vue d’un serveur à partir de la liste de ses membres."""
+        guild_id = str(guild_id)
+        view = RankingView()
+        self.guild_views[guild_id] = view
+        for member_id in member_ids:
+            member_id = str(member_id)
+            self.user_guilds.setdefault(member_id, set()).add(guild_id)
+            if member_id in self.points:
+                view.add(member_id, self.points[member_id])
+
+    def add_member(self, guild_id, user_id):
+        guild_id, user_id = str(guild_id), str(user_id)
+        guilds = self.user_guilds.setdefault(user_id, set())
+        if guild_id in guilds:
+            return
+        guilds.add(guild_id)
+        view = self.guild_views.setdefault(guild_id, RankingView())
+        if user_id in self.points:
+            view.add(user_id, self.points[user_id])
+
+    def remove_member(self, guild_id, user_id):
+        guild_id, user_id = str(guild_id), str(user_id)
+        guilds = self.user_guilds.get(user_id)
+        if not guilds or guild_id not in guilds:
+            return
+        guilds.discard(guild_id)
+        view = self.guild_views.get(guild_id)
+        if view and user_id in self.points:
+            view.discard(user_id, self.points[user_id])
+
+    def drop_guild(self, guild_id):
+        guild_id = str(guild_id)
+        self.guild_views.pop(guild_id, None)
+        for guilds in self.user_guilds.values():
+            guilds.discard(guild_id)
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Lectures
+    # ────────────────────────────────────────────────────────────────────────
+    def view(self, guild_id=None) -> RankingView:
+        if guild_id is None:
+            return self.global_view
+        return self.guild_views.get(str(guild_id)) or RankingView()
+
+    def top(self, n: int = 10, guild_id=None, offset: int = 0):
+        return self.view(guild_id).page(offset, n)
+
+    def rank(self, user_id, guild_id=None):
+        user_id = str(user_id)
+        if user_id not in self.points:
+            return None
+        return self.view(guild_id).rank(user_id, self.points[user_id])
+
+    def neighbours(self, user_id, radius: int = 2, guild_id=None):
+        """Renvoie les joueurs autour de `user_id` (lui compris), ou [] s’il n’est pas classé."""
+        position = self.rank(user_id, guild_id)
+        if position is None:
+            return []
+        start = max(0, position - 1 - radius)
+        return self.view(guild_id).page(start, 2 * radius + 1)
+
+    def size(self, guild_id=None) -> int:
+        return len(self.view(guild_id))
+
+
+# Instance unique partagée par les cogs (comme `supabase`)
+leaderboard = Leaderboard()
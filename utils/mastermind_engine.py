@@ -0,0 +1,249 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 mastermind_engine.py — Moteur Mastermind (score, solveur, indices)
+# Objectif : Calculer le retour 🔴/⚪/❌ en O(n) et proposer un coup cohérent
+# Version : codes encodés en entiers, filtrage vectorisé (NumPy si disponible)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import random
+import time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy absent → solveur en Python pur (plus lent, même résultat)
+    np = None
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+BLACK, WHITE, MISS, UNKNOWN = 2, 1, 0, -1
+PEG_EMOJIS = {BLACK: "🔴", WHITE: "⚪", MISS: "❌", UNKNOWN: "💀"}
+EMOJI_PEGS = {emoji: peg for peg, emoji in PEG_EMOJIS.items()}
+
+MAX_ENUMERATION = 6 ** 7    # au-delà, on échantillonne les candidats au lieu de tout énumérer
+SAMPLE_SIZE = 50_000        # taille d’un lot de candidats tirés au hasard
+MINIMAX_CANDIDATES = 300    # coups évalués pour le choix façon Knuth
+MINIMAX_SAMPLE = 1_000      # candidats utilisés pour estimer les partitions
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🎯 Score (retour positionnel)
+# ────────────────────────────────────────────────────────────────────────────────
+def score(code, guess):
+    """
+    Retour positionnel d’une proposition : BLACK/WHITE/MISS pour chaque case.
+    Les ⚪ sont attribués dans l’ordre des cases, sans jamais dépasser le nombre
+    d’occurrences restantes de la couleur dans le code. O(n) via des compteurs.
+    """
+    feedback = [MISS] * len(guess)
+    remaining = {}
+    for i, (c, g) in enumerate(zip(code, guess)):
+        if c == g:
+            feedback[i] = BLACK
+        else:
+            remaining[c] = remaining.get(c, 0) + 1
+    for i, g in enumerate(guess):
+        if feedback[i] != BLACK and remaining.get(g, 0) > 0:
+            feedback[i] = WHITE
+            remaining[g] -= 1
+    return feedback
+
+def pegs_to_emojis(feedback):
+    return [PEG_EMOJIS[p] for p in feedback]
+
+def emojis_to_pegs(emojis):
+    return [EMOJI_PEGS.get(e, UNKNOWN) for e in emojis]
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔢 Encodage entier des codes
+# ────────────────────────────────────────────────────────────────────────────────
+def encode(digits, n_colors: int) -> int:
+    value = 0
+    for d in reversed(digits):
+        value = value * n_colors + d
+    return value
+
+def decode(value: int, length: int, n_colors: int):
+    digits = []
+    for _ in range(length):
+        value, d = divmod(value, n_colors)
+        digits.append(d)
+    return digits
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Solveur
+# ────────────────────────────────────────────────────────────────────────────────
+class MastermindSolver:
+    """
+    Garde l’ensemble des codes compatibles avec les retours déjà reçus.
+    - petit espace (≤ MAX_ENUMERATION) : énumération complète en entiers
+    - grand espace (Cauchemar) : candidats tirés dans les domaines par case
+      (une 🔴 fixe la couleur, un ⚪/❌ l’exclut de la case)
+    Les retours 💀 (corruption) sont traités comme inconnus.
+    """
+    def __init__(self, length: int, n_colors: int, rng=None):
+        self.length = length
+        self.n_colors = n_colors
+        self.rng = rng or random.Random()
+        self.history = []   # [(guess digits, pegs)]
+        self.domains = [set(range(n_colors)) for _ in range(length)]
+        self.exhaustive = n_colors ** length <= MAX_ENUMERATION
+        self._candidates = None
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Retours
+    # ────────────────────────────────────────────────────────────────────────
+    def add_feedback(self, guess, pegs):
+        guess, pegs = list(guess), list(pegs)
+        self.history.append((guess, pegs))
+        for i, (g, p) in enumerate(zip(guess, pegs)):
+            if p == BLACK:
+                self.domains[i] = {g}
+            elif p in (WHITE, MISS):
+                self.domains[i].discard(g)
+        if self._candidates is not None:
+            self._candidates = self._filter(self._candidates, [(guess, pegs)])
+
+    def is_consistent(self, code) -> bool:
+        return all(
+            all(o == UNKNOWN or o == f for o, f in zip(pegs, score(code, guess)))
+            for guess, pegs in self.history
+        )
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Candidats
+    # ────────────────────────────────────────────────────────────────────────
+    def candidates(self, limit: int = None, time_budget: float = 1.0):
+        """Renvoie des codes (listes de chiffres) compatibles avec l’historique."""
+        if self.exhaustive:
+            if self._candidates is None:
+                self._candidates = self._filter(self._enumerate(), self.history)
+            return self._as_lists(self._candidates, limit)
+
+        found = {}
+        deadline = time.perf_counter() + time_budget
+        wanted = limit or MINIMAX_SAMPLE
+        while len(found) < wanted and time.perf_counter() < deadline:
+            batch = self._filter(self._sample(SAMPLE_SIZE if np is not None else 2_000), self.history)
+            for code in self._as_lists(batch, None):
+                found.setdefault(encode(code, self.n_colors), code)
+            if not self.history:
+                break
+        return list(found.values())[:wanted]
+
+    def _enumerate(self):
+        total = self.n_colors ** self.length
+        if np is not None:
+            return self._digits_matrix(np.arange(total, dtype=np.int64))
+        return [decode(v, self.length, self.n_colors) for v in range(total)]
+
+    def _digits_matrix(self, values):
+        powers = self.n_colors ** np.arange(self.length, dtype=np.int64)
+        return ((values[:, None] // powers) % self.n_colors).astype(np.int8)
+
+    def _sample(self, size: int):
+        domains = [sorted(d) or list(range(self.n_colors)) for d in self.domains]
+        if np is not None:
+            gen = np.random.default_rng(self.rng.getrandbits(32))
+            return np.stack([np.asarray(d, dtype=np.int8)[gen.integers(0, len(d), size)] for d in domains], axis=1)
+        return [[self.rng.choice(d) for d in domains] for _ in range(size)]
+
+    def _as_lists(self, codes, limit):
+        if np is not None and isinstance(codes, np.ndarray):
+            codes = codes[:limit] if limit else codes
+            return codes.tolist()
+        return codes[:limit] if limit else list(codes)
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Filtrage (vectorisé)
+    # ────────────────────────────────────────────────────────────────────────
+    def _filter(self, codes, history):
+        if np is not None and isinstance(codes, np.ndarray):
+            mask = np.ones(len(codes), dtype=bool)
+            for guess, pegs in history:
+                feedback = score_matrix(codes, guess, self.n_colors)
+                observed = np.asarray(pegs, dtype=np.int8)
+                known = observed != UNKNOWN
+                mask &= (feedback[:, known] == observed[known]).all(axis=1)
+            return codes[mask]
+        return [
+            code for code in codes
+            if all(all(o == UNKNOWN or o == f for o, f in zip(pegs, score(code, guess))) for guess, pegs in history)
+        ]
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Choix du coup
+    # ────────────────────────────────────────────────────────────────────────
+    def suggest(self, time_budget: float = 1.0):
+        """
+        Propose un coup compatible. Avec NumPy, choisit parmi un échantillon
+        celui qui minimise la plus grande partition restante (critère de Knuth).
+        """
+        pool = self.candidates(limit=MINIMAX_SAMPLE, time_budget=time_budget)
+        if not pool:
+            return None
+        if np is None or len(pool) <= 2:
+            return pool[0]
+        sample = np.asarray(pool, dtype=np.int8)
+        options = pool if len(pool) <= MINIMAX_CANDIDATES else self.rng.sample(pool, MINIMAX_CANDIDATES)
+        best, best_worst = options[0], None
+        weights = 3 ** np.arange(self.length, dtype=np.int64)
+        for option in options:
+            keys = score_matrix(sample, option, self.n_colors).astype(np.int64) @ weights
+            worst = np.bincount(keys).max()
+            if best_worst is None or worst < best_worst:
+                best, best_worst = option, worst
+        return best
+
+def score_matrix(codes, guess, n_colors: int):
+    """
+    Version vectorisée de score() : `codes` est une matrice (N, n) de chiffres,
+    renvoie la matrice (N, n) des retours BLACK/WHITE/MISS pour `guess`.
+    """
+    guess = np.asarray(guess, dtype=np.int8)
+    black = codes == guess
+    # Occurrences restantes par couleur dans le code (hors cases déjà 🔴)
+    available = np.stack([((codes == c) & ~black).sum(axis=1) for c in range(n_colors)], axis=1)
+    feedback = np.where(black, BLACK, MISS).astype(np.int8)
+    seen = {}
+    for i, g in enumerate(guess.tolist()):
+        rank = seen.get(g, 0)
+        white = ~black[:, i] & (rank < available[:, g])
+        feedback[white, i] = WHITE
+        # Le rang ne progresse que sur les cases non 🔴 de la proposition
+        seen[g] = rank + (~black[:, i]).astype(np.int64)
+    return feedback
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⏱️ Banc d’essai
+# ────────────────────────────────────────────────────────────────────────────────
+def benchmark(length: int, n_colors: int, games: int = 3, max_turns: int = 20, seed: int = None):
+    """
+    Joue `games` parties où le solveur devine un code aléatoire.
+    Renvoie {"games", "solved", "avg_turns", "avg_ms_per_turn", "max_ms"}.
+    """
+    rng = random.Random(seed)
+    turns_total, solved, timings = 0, 0, []
+    for _ in range(games):
+        secret = [rng.randrange(n_colors) for _ in range(length)]
+        solver = MastermindSolver(length, n_colors, rng=random.Random(rng.getrandbits(32)))
+        for turn in range(1, max_turns + 1):
+            start = time.perf_counter()
+            guess = solver.suggest()
+            timings.append((time.perf_counter() - start) * 1000)
+            if guess is None:
+                break
+            pegs = score(secret, guess)
+            solver.add_feedback(guess, pegs)
+            if all(p == BLACK for p in pegs):
+                solved += 1
+                break
+        turns_total += turn
+    return {
+        "games": games,
+        "solved": solved,
+        "avg_turns": turns_total / games if games else 0,
+        "avg_ms_per_turn": sum(timings) / len(timings) if timings else 0,
+        "max_ms": max(timings) if timings else 0,
+    }
@@ -0,0 +1,215 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 member_index.py — Index des noms de membres par serveur
+# Objectif : Retrouver un membre par pseudo, nom affiché ou début de nom sans
+#            parcourir guild.members à chaque commande (serveurs de dizaines de
+#            milliers de membres), avec repli sur les fautes de frappe
+# Version : clés triées (SortedList) par serveur, tenues à jour par les événements
+#           join / update / remove ; construction paresseuse au premier usage
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import re
+from sortedcontainers import SortedList
+from utils.text import normalize_text, bounded_levenshtein
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+PREFIX_SCAN = 200             # clés examinées au plus pour une recherche par début de nom
+FUZZY_SCAN = 5000             # clés examinées au plus pour la recherche approchée
+USERNAME, GLOBAL_NAME, NICK = 0, 1, 2   # priorité quand plusieurs membres ont la même clé
+MENTION = re.compile(r"<@!?(\d+)>$")
+
+def parse_user_id(query: str):
+    """ID Discord d’une mention <@123> / <@!123> ou d’un nombre ; None sinon."""
+    query = query.strip()
+    match = MENTION.match(query)
+    if match:
+        return int(match.group(1))
+    return int(query) if query.isdigit() else None
+
+def member_keys(member) -> set:
+    """(clé, priorité) d’un membre : minuscules brutes + forme normalisée (sans accents ni ponctuation)."""
+    keys = set()
+    for rank, name in ((USERNAME, member.name), (GLOBAL_NAME, getattr(member, "global_name", None)),
+                       (NICK, getattr(member, "nick", None))):
+        if not name:
+            continue
+        for key in {name.lower(), normalize_text(name)}:
+            if key:
+                keys.add((key, rank))
+    return keys
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🗂️ Index d’un serveur
+# ────────────────────────────────────────────────────────────────────────────────
+class GuildNameIndex:
+    """(clé, priorité, member_id) triés : égalité et début de nom par bisection."""
+    __slots__ = ("entries", "keys_of", "complete")
+
+    def __init__(self):
+        self.entries = SortedList()
+        self.keys_of = {}         # member_id → {(clé, priorité)}
+        self.complete = False     # construit à partir d’une liste de membres complète (chunk)
+
+    def __len__(self):
+        return len(self.keys_of)
+
+    def put(self, member):
+        self.remove(member.id)
+        keys = member_keys(member)
+        self.keys_of[member.id] = keys
+        self.entries.update((key, rank, member.id) for key, rank in keys)
+
+    def remove(self, member_id: int):
+        for key, rank in self.keys_of.pop(member_id, ()):
+            self.entries.discard((key, rank, member_id))
+
+    def exact(self, key: str):
+        index = self.entries.bisect_left((key,))
+        if index < len(self.entries) and self.entries[index][0] == key:
+            return self.entries[index][2]
+        return None
+
+    def prefix(self, key: str):
+        """Membre dont un nom commence par `key` : le nom le plus court l’emporte."""
+        best = None
+        for count, (candidate, rank, member_id) in enumerate(self.entries.irange(minimum=(key,))):
+            if not candidate.startswith(key) or count >= PREFIX_SCAN:
+                break
+            score = (len(candidate), rank)
+            if best is None or score < best[0]:
+                best = (score, member_id)
+        return best[1] if best else None
+
+    def fuzzy(self, key: str):
+        """Nom le plus proche (1 faute jusqu’à 4 lettres, 2 au-delà), parmi les noms de même initiale."""
+        bound = 1 if len(key) <= 4 else 2
+        upper = chr(ord(key[0]) + 1)
+        best = None
+        for count, (candidate, rank, member_id) in enumerate(
+            self.entries.irange(minimum=(key[0],), maximum=(upper,), inclusive=(True, False))
+        ):
+            if count >= FUZZY_SCAN:
+                break
+            distance = bounded_levenshtein(key, candidate, bound)
+            if distance <= bound:
+                score = (distance, rank, len(candidate))
+                if best is None or score < best[0]:
+                    best = (score, member_id)
+        return best[1] if best else None
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔎 Service
+# ────────────────────────────────────────────────────────────────────────────────
+class MemberIndex:
+    """
+    - install(bot) : branche les événements de membres (une seule fois)
+    - resolve(guild, texte) : mention / ID (cache local), puis nom exact, début de nom,
+      faute de frappe ; aucun appel REST (voir parse_user_id pour le repli fetch_user)
+    """
+    def __init__(self):
+        self.guilds = {}          # guild_id → GuildNameIndex
+        self._bot = None
+        self.builds = 0
+        self.hits = {"id": 0, "exact": 0, "prefix": 0, "fuzzy": 0, "miss": 0}
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Installation et construction
+    # ────────────────────────────────────────────────────────────────────────
+    def install(self, bot):
+        if self._bot is not None:
+            return
+        self._bot = bot
+        bot.add_listener(self._on_member_join, "on_member_join")
+        bot.add_listener(self._on_member_update, "on_member_update")
+        bot.add_listener(self._on_user_update, "on_user_update")
+        bot.add_listener(self._on_member_remove, "on_member_remove")
+        bot.add_listener(self._on_guild_remove, "on_guild_remove")
+
+    def index_for(self, guild) -> GuildNameIndex:
+        """Index du serveur, (re)construit si absent ou bâti avant la fin du chargement des membres."""
+        index = self.guilds.get(guild.id)
+        if index is None or (not index.complete and getattr(guild, "chunked", False)):
+            index = GuildNameIndex()
+            for member in guild.members:
+                index.put(member)
+            index.complete = getattr(guild, "chunked", False)
+            self.guilds[guild.id] = index
+            self.builds += 1
+        return index
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Événements (index déjà construits seulement)
+    # ────────────────────────────────────────────────────────────────────────
+    async def _on_member_join(self, member):
+        index = self.guilds.get(member.guild.id)
+        if index is not None:
+            index.put(member)
+
+    async def _on_member_update(self, before, after):
+        index = self.guilds.get(after.guild.id)
+        if index is not None and (before.nick, before.name, before.global_name) != (after.nick, after.name, after.global_name):
+            index.put(after)
+
+    async def _on_user_update(self, before, after):
+        """Pseudo ou nom global changé : mis à jour dans chaque serveur commun."""
+        if (before.name, before.global_name) == (after.name, after.global_name):
+            return
+        for guild_id, index in self.guilds.items():
+            if after.id in index.keys_of:
+                guild = self._bot.get_guild(guild_id) if self._bot else None
+                member = guild.get_member(after.id) if guild else None
+                if member is not None:
+                    index.put(member)
+
+    async def _on_member_remove(self, member):
+        index = self.guilds.get(member.guild.id)
+        if index is not None:
+            index.remove(member.id)
+
+    async def _on_guild_remove(self, guild):
+        self.guilds.pop(guild.id, None)
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Résolution
+    # ────────────────────────────────────────────────────────────────────────
+    def resolve(self, guild, query: str):
+        """Membre du serveur correspondant à `query`, sinon None."""
+        query = (query or "").strip()
+        if not query or guild is None:
+            return None
+        user_id = parse_user_id(query)
+        if user_id is not None:
+            member = guild.get_member(user_id)
+            self.hits["id" if member else "miss"] += 1
+            return member
+        index = self.index_for(guild)
+        for kind, key, lookup in (
+            ("exact", query.lower(), index.exact),
+            ("exact", normalize_text(query), index.exact),
+            ("prefix", normalize_text(query), index.prefix),
+            ("fuzzy", normalize_text(query), index.fuzzy),
+        ):
+            member_id = lookup(key) if key else None
+            member = guild.get_member(member_id) if member_id is not None else None
+            if member is not None:
+                self.hits[kind] += 1
+                return member
+        self.hits["miss"] += 1
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "guilds": len(self.guilds),
+            "members": sum(len(index) for index in self.guilds.values()),
+            "keys": sum(len(index.entries) for index in self.guilds.values()),
+            "builds": self.builds,
+            **self.hits,
+        }
+
+
+# Instance unique
+members = MemberIndex()
@@ -0,0 +1,117 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 message_router.py — Aiguillage central des messages
+# Objectif : Un seul point d’entrée pour on_message : préfixe, mention du bot et
+#            saisies de jeux (salon → handler) décidés en O(1)
+# Version : table de dispatch par salon, rejet immédiat des messages sans intérêt
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import time
+from types import SimpleNamespace
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Routes possibles
+# ────────────────────────────────────────────────────────────────────────────────
+IGNORE = "ignore"
+COMMAND = "command"
+MENTION = "mention"
+GAME = "game"
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧭 Routeur
+# ────────────────────────────────────────────────────────────────────────────────
+class MessageRouter:
+    """
+    - bind(channel_id, handler) : un jeu reçoit les messages de ce salon
+    - unbind(channel_id) : libère le salon (fin de partie)
+    - route(message, prefix) : renvoie (route, handler) sans appel réseau
+    Priorité : commande > mention du bot > saisie de jeu > rien.
+    """
+    def __init__(self):
+        self.channels = {}      # channel_id → coroutine(message)
+        self.mentions = frozenset()
+        self.counts = {IGNORE: 0, COMMAND: 0, MENTION: 0, GAME: 0}
+
+    def set_bot_user(self, user_id: int):
+        self.mentions = frozenset({f"<@{user_id}>", f"<@!{user_id}>"})
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Table de dispatch des jeux
+    # ────────────────────────────────────────────────────────────────────────
+    def bind(self, channel_id: int, handler):
+        self.channels[channel_id] = handler
+
+    def unbind(self, channel_id: int, handler=None):
+        """Libère le salon (seulement s’il pointe encore vers `handler`, si fourni)."""
+        if handler is None or self.channels.get(channel_id) == handler:
+            self.channels.pop(channel_id, None)
+
+    def handler_for(self, channel_id: int):
+        return self.channels.get(channel_id)
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Aiguillage
+    # ────────────────────────────────────────────────────────────────────────
+    def route(self, message, prefix: str):
+        if message.author.bot:
+            route, handler = IGNORE, None
+        elif message.content.startswith(prefix):
+            route, handler = COMMAND, None
+        elif message.content.strip() in self.mentions:
+            route, handler = MENTION, None
+        else:
+            handler = self.channels.get(message.channel.id)
+            route = GAME if handler else IGNORE
+        self.counts[route] += 1
+        return route, handler
+
+    def stats(self) -> dict:
+        return {"routes": dict(self.counts), "bound_channels": len(self.channels)}
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⏱️ Banc d’essai
+# ────────────────────────────────────────────────────────────────────────────────
+def benchmark(messages: int = 200_000, channels: int = 1_000, games: int = 50, prefix: str = "!") -> dict:
+    """
+    Mesure le débit de route() sur un flux synthétique (majorité de bavardage,
+    quelques commandes, mentions et saisies de jeu). Renvoie {"messages", "per_second", ...}.
+    """
+    router = MessageRouter()
+    router.set_bot_user(1234)
+
+    async def _noop(message):
+        return None
+
+    for channel_id in range(games):
+        router.bind(channel_id, _noop)
+    human, bot_author = SimpleNamespace(bot=False), SimpleNamespace(bot=True)
+    samples = []
+    for i in range(1_000):
+        channel = SimpleNamespace(id=i % channels)
+        if i % 50 == 0:
+            content = f"{prefix}help"
+        elif i % 97 == 0:
+            content = "<@1234>"
+        elif i % 10 == 0:
+            content = "a"
+        else:
+            content = "salut tout le monde, ça va ?"
+        samples.append(SimpleNamespace(author=bot_author if i % 31 == 0 else human, channel=channel, content=content))
+
+    route = router.route
+    start = time.perf_counter()
+    for i in range(messages):
+        route(samples[i % len(samples)], prefix)
+    elapsed = time.perf_counter() - start
+    return {
+        "messages": messages,
+        "seconds": elapsed,
+        "per_second": messages / elapsed if elapsed else 0.0,
+        "routes": dict(router.counts),
+    }
+
+
+# Instance unique partagée par bot.py et les cogs
+router = MessageRouter()
@@ -0,0 +1,59 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 process_worker.py — Calculs lourds dans un processus séparé
+# Objectif : Exécuter une fonction CPU (calculatrice, simulation d’économie) hors
+#            de la boucle d’événements, avec un délai maximal au-delà duquel le
+#            processus est tué (un thread, lui, ne peut pas être interrompu)
+# Version : multiprocessing.Pool d’un seul processus (fork si disponible),
+#           recréé au prochain appel après un arrêt forcé
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import multiprocessing
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧵 Processus de travail
+# ────────────────────────────────────────────────────────────────────────────────
+class ProcessWorker:
+    """
+    - run(func, *args, timeout=...) : résultat de func(*args) calculé dans le processus ;
+      lève asyncio.TimeoutError (processus tué) ou l’exception levée par func
+    - kill() : termine le processus ; le suivant est lancé au prochain run()
+    `func` et ses arguments doivent être sérialisables (fonction de module, partial).
+    """
+    def __init__(self):
+        # fork : le processus n’a pas à réimporter bot.py
+        methods = multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = self._context.Pool(processes=1)
+        return self._pool
+
+    async def run(self, func, *args, timeout: float):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def settle(setter, value):
+            # Rappels exécutés dans un thread du Pool : retour sur la boucle
+            loop.call_soon_threadsafe(lambda: future.done() or setter(value))
+
+        self._get_pool().apply_async(
+            func, args,
+            callback=lambda value: settle(future.set_result, value),
+            error_callback=lambda error: settle(future.set_exception, error),
+        )
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except BaseException:
+            self.kill()       # délai dépassé, annulation ou erreur : processus dans un état inconnu
+            raise
+
+    def kill(self):
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.terminate()
@@ -0,0 +1,287 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 query_profiler.py — Profilage des requêtes de stockage
+# Objectif : Pour chaque appel `supabase.table(...)...execute()`, noter la table,
+#            les filtres, les colonnes, le nombre de lignes, la taille de la
+#            réponse, la durée et la fonction appelante ; repérer les lectures
+#            sans filtre (parcours complet) et les N+1 (même requête répétée
+#            pendant un seul handler)
+# Version : agrégation par « forme » de requête (valeurs des filtres ignorées),
+#           rapport classé pour !queries et fichier texte
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+PROFILER_ENABLED = os.getenv("QUERY_PROFILER", "on").lower() != "off"
+REPORT_PATH = Path("data/query_report.txt")
+N_PLUS_ONE = 3                # même forme de requête ≥ N fois dans un handler → N+1
+MAX_SHAPES = 500              # formes de requêtes gardées en mémoire
+MAX_FRAMES = 30               # profondeur max de la recherche de l’appelant
+INVOCATION_MAX_AGE = 60.0     # tâche sans handler explicite : comptes rapportés puis remis à zéro passé ce délai
+FILTERS = {
+    "eq": "=", "neq": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<=",
+    "like": "like", "ilike": "ilike", "in_": "in", "is_": "is", "match": "=",
+}
+BOUNDS = ("limit", "range", "single", "maybe_single")
+# Modules traversés par tous les appels : l’appelant est la première frame hors de ceux-ci
+_INTERNAL = ("utils.resilience", "utils.query_profiler", "utils.sqlite_store", "asyncio", "threading", "concurrent")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧾 Statistiques par forme de requête
+# ────────────────────────────────────────────────────────────────────────────────
+class QueryShape:
+    __slots__ = ("caller", "table", "action", "filters", "columns", "calls", "errors", "rows",
+                 "bytes", "total_time", "max_time", "unfiltered", "n_plus_one", "max_repeat", "handler")
+
+    def __init__(self, caller: str, table: str, action: str, filters: str, columns: str):
+        self.caller = caller
+        self.table = table
+        self.action = action
+        self.filters = filters
+        self.columns = columns
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.bytes = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.unfiltered = False   # select sans filtre ni limite : toute la table
+        self.n_plus_one = 0       # handlers où la requête s’est répétée ≥ N_PLUS_ONE fois
+        self.max_repeat = 0
+        self.handler = None       # dernier handler concerné par un N+1
+
+    def describe(self) -> str:
+        where = f" WHERE {self.filters}" if self.filters else ""
+        target = f"({self.columns})" if self.action == "select" else ""
+        return f"{self.action}{target} {self.table}{where}"
+
+def describe_steps(steps) -> tuple:
+    """(action, filtres, colonnes, bornée ?) à partir de la chaîne enregistrée (valeurs ignorées)."""
+    action = steps[0][0] if steps else "?"
+    columns, filters, bounded, negate = "", [], False, False
+    for name, args, kwargs in steps:
+        if name == "select":
+            names = [c.strip() for part in args for c in str(part).split(",") if c.strip()]
+            columns = ", ".join(names) if names and "*" not in names else "*"
+        elif name == "not_":
+            negate = True
+            continue
+        elif name == "match":
+            filters.extend(f"{column} = ?" for column in (args[0] if args else {}))
+        elif name in FILTERS:
+            filters.append(f"{'not ' if negate else ''}{args[0] if args else '?'} {FILTERS[name]} ?")
+        elif name in BOUNDS:
+            bounded = True
+        negate = False
+    return action, " AND ".join(filters), columns or "*", bounded
+
+def _caller() -> str:
+    frame = sys._getframe(2)
+    for _ in range(MAX_FRAMES):
+        if frame is None:
+            break
+        module = frame.f_globals.get("__name__", "")
+        if not module.startswith(_INTERNAL):
+            return f"{module}.{frame.f_code.co_qualname}"
+        frame = frame.f_back
+    return "?"
+
+def _payload(data) -> tuple:
+    """(lignes, octets JSON) d’une réponse."""
+    if data is None:
+        return 0, 0
+    rows = len(data) if isinstance(data, list) else 1
+    try:
+        return rows, len(json.dumps(data, ensure_ascii=False, default=str).encode())
+    except (TypeError, ValueError):
+        return rows, 0
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧭 Invocation de handler en cours (suivie à travers await et asyncio.to_thread)
+# ────────────────────────────────────────────────────────────────────────────────
+class Invocation:
+    __slots__ = ("name", "counts", "started", "implicit")
+
+    def __init__(self, name: str, implicit: bool = False):
+        self.name = name
+        self.counts = Counter()   # clé de forme → appels pendant cette invocation
+        self.started = time.monotonic()
+        self.implicit = implicit  # ouverte d’office pour une tâche, pas par profiler.handler()
+
+_current = ContextVar("query_invocation", default=None)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔬 Profileur
+# ────────────────────────────────────────────────────────────────────────────────
+class QueryProfiler:
+    """
+    - record(table, steps, data, elapsed, error) : appelé par la passerelle de stockage (utils/resilience)
+    - report(top) : texte classé (temps total), lectures sans filtre et N+1 à part
+    - dump(path) : même rapport dans un fichier
+    - handler(nom) : délimite une invocation (tour de tasks.loop, boucle de fond) ;
+      ses comptes N+1 sont évalués puis remis à zéro à la sortie
+    Sans handler explicite, l’invocation est la tâche asyncio (commande, événement,
+    callback de bouton : une tâche par dispatch), rapportée à sa fin ou au plus tard
+    toutes les INVOCATION_MAX_AGE secondes. Les requêtes passées par to_thread comptent
+    pour l’invocation qui les a lancées.
+    """
+    def __init__(self, enabled: bool = PROFILER_ENABLED):
+        self.enabled = enabled
+        self.shapes = {}          # clé → QueryShape
+        self.started_at = time.time()
+        self.dropped = 0          # formes ignorées (MAX_SHAPES atteint)
+        self._lock = threading.Lock()
+
+    def record(self, table: str, steps, data, elapsed: float, error: Exception = None):
+        if not self.enabled:
+            return
+        action, filters, columns, bounded = describe_steps(steps)
+        caller = _caller()
+        rows, size = _payload(data)
+        key = (caller, table, action, filters, columns)
+        with self._lock:
+            shape = self.shapes.get(key)
+            if shape is None:
+                if len(self.shapes) >= MAX_SHAPES:
+                    self.dropped += 1
+                    return
+                shape = self.shapes[key] = QueryShape(caller, table, action, filters, columns)
+                shape.unfiltered = action == "select" and not filters and not bounded
+            shape.calls += 1
+            shape.errors += error is not None
+            shape.rows += rows
+            shape.bytes += size
+            shape.total_time += elapsed
+            shape.max_time = max(shape.max_time, elapsed)
+        self._track(key)
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 N+1 : requêtes répétées pendant une même invocation
+    # ────────────────────────────────────────────────────────────────────────
+    @contextmanager
+    def handler(self, name: str):
+        """`with profiler.handler("spawn_loop"):` autour d’un tour de boucle ou d’un dispatch."""
+        invocation = Invocation(name)
+        token = _current.set(invocation)
+        try:
+            yield invocation
+        finally:
+            _current.reset(token)
+            self._close(invocation)
+
+    def _invocation(self):
+        """Invocation en cours ; à défaut, une invocation ouverte pour la tâche courante."""
+        invocation = _current.get()
+        if invocation is not None:
+            return invocation
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            return None           # thread de travail lancé hors de toute invocation
+        if task is None:
+            return None
+        invocation = Invocation(task.get_name(), implicit=True)
+        _current.set(invocation)  # contexte propre à la tâche
+        task.add_done_callback(lambda _: self._close(invocation))
+        return invocation
+
+    def _track(self, key: tuple):
+        invocation = self._invocation()
+        if invocation is None:
+            return
+        with self._lock:
+            invocation.counts[key] += 1
+        if invocation.implicit and time.monotonic() - invocation.started >= INVOCATION_MAX_AGE:
+            self._close(invocation)   # tâche de longue durée : rapport périodique
+
+    def _close(self, invocation: Invocation):
+        """Évalue les comptes de l’invocation puis les remet à zéro."""
+        with self._lock:
+            for key, repeat in invocation.counts.items():
+                shape = self.shapes.get(key)
+                if shape is not None and repeat >= N_PLUS_ONE:
+                    shape.n_plus_one += 1
+                    shape.max_repeat = max(shape.max_repeat, repeat)
+                    shape.handler = invocation.name
+            invocation.counts.clear()
+            invocation.started = time.monotonic()
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Rapport
+    # ────────────────────────────────────────────────────────────────────────
+    def ranked(self) -> list:
+        with self._lock:
+            return sorted(self.shapes.values(), key=lambda s: s.total_time, reverse=True)
+
+    def totals(self) -> dict:
+        shapes = self.ranked()
+        return {
+            "calls": sum(s.calls for s in shapes),
+            "time": sum(s.total_time for s in shapes),
+            "bytes": sum(s.bytes for s in shapes),
+            "shapes": len(shapes),
+            "unfiltered": sum(1 for s in shapes if s.unfiltered),
+            "n_plus_one": sum(1 for s in shapes if s.n_plus_one),
+            "since": self.started_at,
+        }
+
+    def report(self, top: int = 20) -> str:
+        shapes = self.ranked()
+        totals = self.totals()
+        lines = [
+            f"Profil des requêtes — depuis {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.started_at))}",
+            f"{totals['calls']} appels • {totals['time'] * 1000:.0f} ms • {totals['bytes'] / 1024:.1f} Ko • {totals['shapes']} formes",
+            "",
+            f"== Top {top} (temps total) ==",
+        ]
+        for rank, shape in enumerate(shapes[:top], 1):
+            flags = []
+            if shape.unfiltered:
+                flags.append("SANS FILTRE")
+            if shape.n_plus_one:
+                flags.append(f"N+1 ×{shape.max_repeat}")
+            lines.append(
+                f"{rank:>2}. {shape.describe()}{'  [' + ', '.join(flags) + ']' if flags else ''}\n"
+                f"    {shape.caller}\n"
+                f"    {shape.calls} appels • total {shape.total_time * 1000:.1f} ms • max {shape.max_time * 1000:.1f} ms"
+                f" • {shape.rows / shape.calls:.1f} lignes/appel • {shape.bytes / shape.calls / 1024:.2f} Ko/appel"
+                f"{f' • {shape.errors} erreur(s)' if shape.errors else ''}"
+            )
+        unfiltered = [s for s in shapes if s.unfiltered]
+        lines += ["", "== Lectures sans filtre (table entière) =="]
+        lines += [f"- {s.describe()} ← {s.caller} ({s.calls}×, {s.bytes / s.calls / 1024:.2f} Ko/appel)" for s in unfiltered] or ["(aucune)"]
+        repeated = sorted((s for s in shapes if s.n_plus_one), key=lambda s: s.n_plus_one * s.max_repeat, reverse=True)
+        lines += ["", f"== N+1 (même requête ≥ {N_PLUS_ONE}× dans un handler) =="]
+        lines += [f"- {s.describe()} ← {s.caller} : {s.n_plus_one} handler(s), jusqu’à {s.max_repeat}× ({s.handler})" for s in repeated] or ["(aucun)"]
+        if self.dropped:
+            lines += ["", f"⚠️ {self.dropped} appel(s) non classés (plus de {MAX_SHAPES} formes)"]
+        return "\n".join(lines)
+
+    def dump(self, path: Path = REPORT_PATH, top: int = 100) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.report(top), encoding="utf-8")
+        return path
+
+    def reset(self):
+        with self._lock:
+            self.shapes.clear()
+            self.dropped = 0
+            self.started_at = time.time()
+
+
+# Instance unique (alimentée par utils/resilience)
+profiler = QueryProfiler()
@@ -0,0 +1,181 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 reiatsu_profiles.py — Profils Reiatsu typés et mis en cache
+# Objectif : Charger un ou plusieurs joueurs en une seule requête `in_`
+# Version : Enregistrements légers (dataclass slots) + cache court partagé
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import time
+from dataclasses import dataclass, fields, asdict
+from utils.supabase_client import supabase
+from utils.dataloader import DataLoader
+from utils.schema import projection
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+PROFILE_TTL = 30          # secondes pendant lesquelles un profil reste en cache
+PROFILE_CACHE_SIZE = 512  # nombre max de profils gardés en mémoire
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧾 Enregistrement joueur
+# ────────────────────────────────────────────────────────────────────────────────
+@dataclass(slots=True)
+class PlayerProfile:
+    user_id: str
+    username: str = None
+    points: int = 0
+    classe: str = "Travailleur"
+    bonus5: int = 0
+    steal_cd: int = 24
+    last_steal_attempt: str = None
+    vol_garanti: bool = False
+    last_skill: str = None
+    skill_cd: int = 0
+    prochain_reiatsu: int = None
+    active_skill: dict = None
+    faux_block_user: str = None
+
+    @classmethod
+    def from_row(cls, row: dict) -> "PlayerProfile":
+        """Construit un profil à partir d’une ligne `reiatsu` (colonnes inconnues ignorées)."""
+        values = {k: row[k] for k in _FIELD_NAMES if k in row and row[k] is not None}
+        values["user_id"] = str(row["user_id"])
+        return cls(**values)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def apply(self, changes: dict):
+        """Reporte dans le profil les colonnes qui viennent d’être écrites."""
+        for key, value in changes.items():
+            if key in _FIELD_NAMES:
+                setattr(self, key, value)
+
+_FIELD_NAMES = frozenset(f.name for f in fields(PlayerProfile))
+
+# Colonnes lues pour un profil : celles du dataclass (pas de select("*"))
+PROFILE = projection("reiatsu", *(f.name for f in fields(PlayerProfile)))
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🗂️ Service de profils
+# ────────────────────────────────────────────────────────────────────────────────
+class ProfileService:
+    """
+    Accès aux profils de la table `reiatsu` :
+    - get()/get_many() servent depuis le cache puis complètent en une requête `in_`
+    - aget()/aget_many() : idem hors de la boucle ; les lectures concurrentes d’un
+      même joueur partagent une requête, celles du même tour sont regroupées en `in_`
+    - apply() garde le cache cohérent après une écriture faite par un cog
+    - invalidate() force la relecture au prochain appel
+    """
+    def __init__(self, client=None, ttl: float = PROFILE_TTL, max_size: int = PROFILE_CACHE_SIZE, clock=time.monotonic):
+        self.client = client
+        self.ttl = ttl
+        self.max_size = max_size
+        self.clock = clock
+        self._cache = {}   # user_id → (expires_at, PlayerProfile)
+        self.loader = DataLoader("reiatsu", self._fetch)
+        self._versions = {}  # user_id → compteur d’écritures (évite de remettre en cache une lecture dépassée)
+        self._epoch = 0      # incrémenté par invalidate() global
+
+    @property
+    def table(self):
+        return (self.client or supabase).table("reiatsu")
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Lectures
+    # ────────────────────────────────────────────────────────────────────────
+    def _cached(self, user_ids):
+        """Sépare les joueurs servis par le cache de ceux à relire : (found, missing)."""
+        ids = list(dict.fromkeys(str(u) for u in user_ids))
+        now = self.clock()
+        found, missing = {}, []
+        for user_id in ids:
+            entry = self._cache.get(user_id)
+            if entry and entry[0] > now:
+                found[user_id] = entry[1]
+            else:
+                missing.append(user_id)
+        return found, missing
+
+    def _fetch(self, user_ids: list) -> dict:
+        """Une seule requête (`eq` ou `in_`) → {user_id: PlayerProfile}."""
+        query = self.table.select(*PROFILE.columns)
+        query = query.eq("user_id", user_ids[0]) if len(user_ids) == 1 else query.in_("user_id", user_ids)
+        profiles = (PlayerProfile.from_row(row) for row in query.execute().data or [])
+        return {profile.user_id: profile for profile in profiles}
+
+    def get_many(self, user_ids) -> dict:
+        """Renvoie {user_id: PlayerProfile} pour les joueurs existants."""
+        found, missing = self._cached(user_ids)
+        if missing:
+            now = self.clock()
+            for profile in self._fetch(missing).values():
+                self._store(profile, now)
+                found[profile.user_id] = profile
+        return found
+
+    async def aget_many(self, user_ids) -> dict:
+        """Comme get_many(), sans bloquer la boucle et en regroupant les lectures concurrentes."""
+        found, missing = self._cached(user_ids)
+        if missing:
+            epoch, versions = self._epoch, {user_id: self._versions.get(user_id, 0) for user_id in missing}
+            loaded = await self.loader.load_many(missing)
+            now = self.clock()
+            for user_id, profile in loaded.items():
+                if self._epoch == epoch and self._versions.get(user_id, 0) == versions[user_id]:
+                    self._store(profile, now)
+                found[user_id] = profile
+        return found
+
+    async def aget(self, user_id):
+        return (await self.aget_many([user_id])).get(str(user_id))
+
+    def get(self, user_id):
+        """Renvoie le PlayerProfile d’un joueur, ou None s’il n’existe pas."""
+        return self.get_many([user_id]).get(str(user_id))
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Cohérence du cache
+    # ────────────────────────────────────────────────────────────────────────
+    def apply(self, user_id, changes: dict):
+        """À appeler après un update Supabase pour refléter les nouvelles valeurs."""
+        self._bump(str(user_id))
+        entry = self._cache.get(str(user_id))
+        if entry:
+            entry[1].apply(changes)
+
+    def put(self, profile: PlayerProfile):
+        self._store(profile, self.clock())
+
+    def invalidate(self, user_id=None):
+        if user_id is None:
+            self._cache.clear()
+            self._epoch += 1
+            self.loader.forget()
+        else:
+            self._cache.pop(str(user_id), None)
+            self._bump(str(user_id))
+
+    def _bump(self, user_id: str):
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+        self.loader.forget(user_id)
+
+    def apply_change(self, event):
+        """Changement de la table `reiatsu` venu d’une autre instance : relecture au prochain get()."""
+        user_id = event.row.get("user_id")
+        if user_id is not None:
+            self.invalidate(user_id)
+
+    def _store(self, profile: PlayerProfile, now: float):
+        self._cache.pop(profile.user_id, None)
+        self._cache[profile.user_id] = (now + self.ttl, profile)
+        while len(self._cache) > self.max_size:
+            self._cache.pop(next(iter(self._cache)))
+
+
+# Instance unique partagée par les cogs
+profiles = ProfileService()
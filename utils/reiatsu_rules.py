@@ -0,0 +1,85 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 reiatsu_rules.py — Règles de gain et de vol du Reiatsu
+# Objectif : Un seul endroit pour les probabilités et les passifs de classe,
+#            partagé par le spawner, !reiatsuvol, !classe et le simulateur
+#            d’économie (utils/economy_sim)
+# Version : fonctions pures, tirage aléatoire injectable
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import json
+import random
+from pathlib import Path
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres (data/reiatsu_config.json + passifs de classe)
+# ────────────────────────────────────────────────────────────────────────────────
+with Path("data/reiatsu_config.json").open("r", encoding="utf-8") as f:
+    CONFIG = json.load(f)
+
+SUPER_REIATSU_CHANCE = CONFIG["SUPER_REIATSU_CHANCE"]     # en %
+SUPER_REIATSU_GAIN = CONFIG["SUPER_REIATSU_GAIN"]
+NORMAL_REIATSU_GAIN = CONFIG["NORMAL_REIATSU_GAIN"]
+SPAWN_SPEED_RANGES = CONFIG["SPAWN_SPEED_RANGES"]
+DEFAULT_SPAWN_SPEED = CONFIG["DEFAULT_SPAWN_SPEED"]
+
+CLASSES = ("Travailleur", "Voleur", "Absorbeur", "Illusionniste", "Parieur")
+DEFAULT_CLASSE = "Travailleur"
+
+ABSORBEUR_BONUS = 5           # Absorbeur : +5 sur un Reiatsu normal
+PARIEUR_MISS = 0.5            # Parieur : une chance sur deux de ne rien gagner…
+PARIEUR_RANGE = (5, 12)       # … sinon un gain tiré dans cet intervalle (bornes incluses)
+TRAVAILLEUR_EVERY = 5         # Travailleur : un Reiatsu normal sur 5…
+TRAVAILLEUR_GAIN = 6          # … rapporte 6 au lieu de 1
+
+STEAL_DIVISOR = 10            # montant volé : points de la cible // 10 (au moins 1)
+STEAL_SUCCESS = 0.25
+VOLEUR_SUCCESS = 0.67
+VOLEUR_DOUBLE = 0.15          # Voleur : chance de doubler le montant
+ILLUSION_DODGE = 0.5          # Illusionniste : chance que le vol ne lui coûte rien
+STEAL_COOLDOWN_HOURS = {"Voleur": 19}
+DEFAULT_STEAL_COOLDOWN_HOURS = 24
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 💠 Capture d’un Reiatsu
+# ────────────────────────────────────────────────────────────────────────────────
+def roll_spawn(classe: str, bonus5: int, rng=random) -> tuple:
+    """(gain, super ?, nouveau bonus5) pour un joueur de cette classe."""
+    is_super = rng.randint(1, 100) <= SUPER_REIATSU_CHANCE
+    gain = SUPER_REIATSU_GAIN if is_super else NORMAL_REIATSU_GAIN
+    if is_super:
+        return gain, True, 0
+    if classe == "Absorbeur":
+        gain += ABSORBEUR_BONUS
+    elif classe == "Parieur":
+        gain = 0 if rng.random() < PARIEUR_MISS else rng.randint(*PARIEUR_RANGE)
+    if classe == "Travailleur":
+        bonus5 += 1
+        if bonus5 >= TRAVAILLEUR_EVERY:
+            gain = TRAVAILLEUR_GAIN
+            bonus5 = 0
+    return gain, False, bonus5
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🩸 Vol de Reiatsu
+# ────────────────────────────────────────────────────────────────────────────────
+def steal_cooldown_hours(classe: str) -> int:
+    return STEAL_COOLDOWN_HOURS.get(classe, DEFAULT_STEAL_COOLDOWN_HOURS)
+
+def roll_steal(voleur_classe: str, cible_points: int, garanti: bool = False, rng=random) -> tuple:
+    """(réussi ?, montant) d’une tentative ; `garanti` = compétence de vol garanti active."""
+    montant = max(1, cible_points // STEAL_DIVISOR)
+    if garanti:
+        return True, montant
+    if voleur_classe == "Voleur":
+        succes = rng.random() < VOLEUR_SUCCESS
+        if rng.random() < VOLEUR_DOUBLE:
+            montant *= 2
+        return succes, montant
+    return rng.random() < STEAL_SUCCESS, montant
+
+def illusion_dodges(cible_classe: str, rng=random) -> bool:
+    """Vol réussi sur un Illusionniste : True si la cible ne perd rien."""
+    return cible_classe == "Illusionniste" and rng.random() < ILLUSION_DODGE
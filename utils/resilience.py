@@ -0,0 +1,463 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 resilience.py — Disjoncteurs par table et journal d’écritures (pannes Supabase)
+# Objectif : Quand Supabase est lent ou tombé, échouer tout de suite au lieu de
+#            bloquer chaque handler ; les écritures de points et de jardins sont
+#            journalisées sur disque puis rejouées dans l’ordre au retour de la base
+# Version : journal append-only (JSON lines), fsync par lots ; accusés de rejeu
+#           écrits dans le même fichier pour ne jamais rejouer deux fois
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from utils.sqlite_store import StorageError, StorageResponse
+from utils.query_profiler import profiler
+
+try:
+    from postgrest.exceptions import APIError
+except ImportError:  # client Supabase absent (SQLite seul)
+    APIError = None
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+FAILURE_THRESHOLD = 3         # échecs consécutifs avant d’ouvrir le circuit d’une table
+OPEN_SECONDS = 15.0           # durée d’ouverture avant un appel d’essai (semi-ouvert)
+SLOW_CALL = 3.0               # un appel plus lent compte comme un échec (réponse tout de même renvoyée)
+JOURNALED_TABLES = ("reiatsu", "gardens")      # points et jardins : journalisés pendant une panne
+WRITE_ACTIONS = ("insert", "upsert", "update", "delete")
+JOURNAL_PATH = Path("data/write_journal.jsonl")
+FSYNC_BATCH = 32              # fsync dès que N écritures attendent…
+FSYNC_INTERVAL = 1.0          # …ou au plus tard toutes les N secondes
+RETRY_INTERVAL = 5.0          # tentative de rejeu du journal en l’absence de trafic
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚠️ Erreurs
+# ────────────────────────────────────────────────────────────────────────────────
+class CircuitOpenError(Exception):
+    """Table momentanément coupée : l’appel échoue sans attendre la base."""
+    def __init__(self, table: str):
+        super().__init__(f"{table} : base indisponible (circuit ouvert)")
+        self.table = table
+
+def is_transient(error: Exception) -> bool:
+    """Panne (réseau, délai, 5xx, connexion PostgREST) ou erreur de la requête elle-même ?"""
+    if isinstance(error, CircuitOpenError):
+        return True
+    if APIError is not None and isinstance(error, APIError):
+        code = str(getattr(error, "code", "") or "")
+        return code.startswith("5") or code in ("PGRST000", "PGRST001", "PGRST002", "PGRST003")
+    return not isinstance(error, (StorageError, ValueError, TypeError, KeyError))
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔌 Disjoncteur
+# ────────────────────────────────────────────────────────────────────────────────
+class CircuitBreaker:
+    """fermé → (FAILURE_THRESHOLD échecs) → ouvert → (OPEN_SECONDS) → un appel d’essai → fermé ou rouvert."""
+    def __init__(self, table: str, clock=time.monotonic):
+        self.table = table
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0         # échecs consécutifs
+        self.opened_at = 0.0
+        self.probing = False
+        self.calls = 0
+        self.rejected = 0         # appels refusés sans toucher la base
+        self.trips = 0            # nombre d’ouvertures
+        self.slow = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self.clock() - self.opened_at >= OPEN_SECONDS:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def record_success(self, elapsed: float):
+        if elapsed > SLOW_CALL:
+            self.slow += 1
+            self.record_failure()
+            return
+        with self._lock:
+            self.calls += 1
+            self.failures = 0
+            self.state = CLOSED
+            self.probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.calls += 1
+            self.failures += 1
+            self.probing = False
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= FAILURE_THRESHOLD):
+                if self.state == CLOSED:
+                    print(f"[RÉSILIENCE] Circuit ouvert pour {self.table} ({self.failures} échecs).")
+                self.state = OPEN
+                self.opened_at = self.clock()
+                self.trips += 1
+
+    def release(self):
+        """Rend l’appel d’essai sans conclure (rien n’a été tenté)."""
+        with self._lock:
+            self.probing = False
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "trips": self.trips,
+            "slow": self.slow,
+            "open_for": self.clock() - self.opened_at if self.state != CLOSED else 0.0,
+        }
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📓 Journal d’écritures
+# ────────────────────────────────────────────────────────────────────────────────
+class WriteJournal:
+    """
+    Une ligne JSON par écriture différée : {"seq", "table", "steps", "at"} ;
+    une ligne {"ack": seq} quand elle a été rejouée (ou abandonnée).
+    Le fichier est vidé dès que plus rien n’est en attente.
+    """
+    def __init__(self, path: Path = JOURNAL_PATH):
+        self.path = path
+        self._pending = {}        # table → deque d’entrées, dans l’ordre
+        self._lock = threading.RLock()
+        self._file = None
+        self._unsynced = 0
+        self.seq = 0
+        self.appended = 0
+        self.replayed = 0
+        self.dropped = 0
+        self.fsyncs = 0
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        entries, acked = {}, set()
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue      # dernière ligne tronquée par un arrêt brutal
+                    if "ack" in record:
+                        acked.add(record["ack"])
+                    else:
+                        entries[record["seq"]] = record
+        except OSError as e:
+            print(f"[ERREUR journal] Lecture impossible : {e}")
+            return
+        for seq in sorted(entries):
+            self.seq = max(self.seq, seq)
+            if seq not in acked:
+                self._pending.setdefault(entries[seq]["table"], deque()).append(entries[seq])
+        if self.depth():
+            print(f"[RÉSILIENCE] {self.depth()} écriture(s) en attente de rejeu.")
+
+    def _write(self, record: dict):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self._unsynced += 1
+        if self._unsynced >= FSYNC_BATCH:
+            self._sync()
+
+    def _sync(self):
+        if self._file is None or not self._unsynced:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self.fsyncs += 1
+
+    def append(self, table: str, steps: list) -> dict:
+        with self._lock:
+            self.seq += 1
+            entry = {"seq": self.seq, "table": table, "steps": steps, "at": time.time()}
+            self._write(entry)
+            self._pending.setdefault(table, deque()).append(entry)
+            self.appended += 1
+            return entry
+
+    def peek(self, table: str):
+        with self._lock:
+            queue = self._pending.get(table)
+            return queue[0] if queue else None
+
+    def ack(self, entry: dict, dropped: bool = False):
+        with self._lock:
+            queue = self._pending.get(entry["table"])
+            if queue and queue[0] is entry:
+                queue.popleft()
+            if dropped:
+                self.dropped += 1
+            else:
+                self.replayed += 1
+            if self.depth():
+                self._write({"ack": entry["seq"]})
+            else:
+                self._truncate()
+
+    def _truncate(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._unsynced = 0
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError as e:
+            print(f"[ERREUR journal] Nettoyage impossible : {e}")
+
+    def flush(self):
+        with self._lock:
+            self._sync()
+
+    def depth(self, table: str = None) -> int:
+        if table is not None:
+            return len(self._pending.get(table, ()))
+        return sum(len(queue) for queue in self._pending.values())
+
+    def tables(self) -> list:
+        return [table for table, queue in self._pending.items() if queue]
+
+    def oldest(self, table: str) -> float:
+        entry = self.peek(table)
+        return entry["at"] if entry else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "depth": self.depth(),
+            "appended": self.appended,
+            "replayed": self.replayed,
+            "dropped": self.dropped,
+            "fsyncs": self.fsyncs,
+            "unsynced": self._unsynced,
+        }
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔎 Requête enregistrée (même enchaînement que postgrest)
+# ────────────────────────────────────────────────────────────────────────────────
+class GuardedQuery:
+    """
+    Enregistre la chaîne table(...).select(...).eq(...) puis la joue sur le vrai client
+    à execute(). Chaque étape renvoie une nouvelle requête : un `supabase.table(x)`
+    gardé dans un attribut reste réutilisable.
+    """
+    __slots__ = ("_gateway", "table_name", "steps")
+
+    def __init__(self, gateway: "ResilientClient", table: str, steps: tuple = ()):
+        self._gateway = gateway
+        self.table_name = table
+        self.steps = steps
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if name == "not_":
+            return GuardedQuery(self._gateway, self.table_name, self.steps + ((name, None, None),))
+        def step(*args, **kwargs):
+            return GuardedQuery(self._gateway, self.table_name, self.steps + ((name, list(args), kwargs),))
+        return step
+
+    @property
+    def action(self) -> str:
+        return self.steps[0][0] if self.steps else None
+
+    def build(self, client):
+        query = client.table(self.table_name)
+        for name, args, kwargs in self.steps:
+            query = getattr(query, name) if args is None else getattr(query, name)(*args, **kwargs)
+        return query
+
+    def execute(self):
+        return self._gateway.run(self)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🛡️ Client protégé
+# ────────────────────────────────────────────────────────────────────────────────
+class ResilientClient:
+    """
+    Enveloppe le client de stockage (Supabase ou SQLite) : `supabase.table(...)` s’utilise comme avant.
+    - circuit ouvert → lecture : CircuitOpenError immédiate ; écriture points/jardins : journalisée
+    - tant qu’une table a des écritures journalisées, elles sont rejouées (dans l’ordre)
+      avant tout nouvel appel sur cette table
+    """
+    def __init__(self, journal: WriteJournal = None):
+        self.client = None
+        self.journal = journal
+        self.breakers = {}        # table → CircuitBreaker
+        self._replaying = {}      # table → threading.Lock
+        self._task = None
+
+    def wrap(self, client):
+        self.client = client
+        if self.journal is None:
+            self.journal = WriteJournal()
+        return self
+
+    @property
+    def active(self) -> bool:
+        return self.client is not None
+
+    def table(self, name: str) -> GuardedQuery:
+        return GuardedQuery(self, name)
+
+    def __getattr__(self, name: str):
+        # Le reste de l’API du client (rpc, auth…) passe tel quel
+        if name.startswith("__") or self.client is None:
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    def breaker(self, table: str) -> CircuitBreaker:
+        if table not in self.breakers:
+            self.breakers[table] = CircuitBreaker(table)
+            self._replaying[table] = threading.Lock()
+        return self.breakers[table]
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Exécution
+    # ────────────────────────────────────────────────────────────────────────
+    def run(self, query: GuardedQuery):
+        started = time.perf_counter()
+        response = error = None
+        try:
+            response = self._execute(query)
+            return response
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            profiler.record(query.table_name, query.steps, getattr(response, "data", None), time.perf_counter() - started, error)
+
+    def _execute(self, query: GuardedQuery):
+        table = query.table_name
+        breaker = self.breaker(table)
+        if not breaker.allow():
+            return self._degraded(query, breaker)
+        if self.journal.depth(table) and not self._replay(table, breaker):
+            return self._degraded(query, breaker)
+        started = time.monotonic()
+        try:
+            response = query.build(self.client).execute()
+        except Exception as e:
+            if not is_transient(e):
+                breaker.record_success(time.monotonic() - started)   # la base a répondu
+                raise
+            breaker.record_failure()
+            if self._journaled(query):
+                return self._defer(query)
+            raise
+        breaker.record_success(time.monotonic() - started)
+        return response
+
+    def _journaled(self, query: GuardedQuery) -> bool:
+        return query.table_name in JOURNALED_TABLES and query.action in WRITE_ACTIONS
+
+    def _degraded(self, query: GuardedQuery, breaker: CircuitBreaker):
+        if self._journaled(query):
+            return self._defer(query)
+        breaker.rejected += 1
+        raise CircuitOpenError(query.table_name)
+
+    def _defer(self, query: GuardedQuery):
+        """Écriture journalisée : la réponse imite celle de postgrest (lignes envoyées)."""
+        self.journal.append(query.table_name, [list(step) for step in query.steps])
+        name, args, _ = query.steps[0]
+        values = args[0] if args else None
+        data = [] if name == "delete" else (values if isinstance(values, list) else [values])
+        return StorageResponse(data)
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Rejeu du journal
+    # ────────────────────────────────────────────────────────────────────────
+    def _replay(self, table: str, breaker: CircuitBreaker) -> bool:
+        """Rejoue les écritures en attente de la table ; False si la base retombe (ou rejeu déjà en cours)."""
+        lock = self._replaying[table]
+        if not lock.acquire(blocking=False):
+            breaker.release()
+            return False
+        try:
+            while (entry := self.journal.peek(table)) is not None:
+                steps = tuple((name, args, kwargs) for name, args, kwargs in entry["steps"])
+                started = time.monotonic()
+                try:
+                    GuardedQuery(self, table, steps).build(self.client).execute()
+                except Exception as e:
+                    if is_transient(e):
+                        breaker.record_failure()
+                        return False
+                    print(f"[ERREUR journal] Écriture {entry['seq']} sur {table} abandonnée : {e}")
+                    self.journal.ack(entry, dropped=True)
+                    continue
+                breaker.record_success(time.monotonic() - started)
+                self.journal.ack(entry)
+            self.journal.flush()
+            print(f"[RÉSILIENCE] Journal de {table} rejoué.")
+            return True
+        finally:
+            lock.release()
+
+    def replay_pending(self):
+        """Tentative de rejeu pour chaque table en attente dont le circuit accepte un appel."""
+        for table in self.journal.tables():
+            breaker = self.breaker(table)
+            if breaker.allow():
+                if self._replay(table, breaker):
+                    breaker.record_success(0.0)
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Tâche de fond : fsync par lots + rejeu sans trafic
+    # ────────────────────────────────────────────────────────────────────────
+    def start(self):
+        if self.active and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        last_retry = time.monotonic()
+        while True:
+            await asyncio.sleep(FSYNC_INTERVAL)
+            try:
+                await asyncio.to_thread(self.journal.flush)
+                if self.journal.depth() and time.monotonic() - last_retry >= RETRY_INTERVAL:
+                    last_retry = time.monotonic()
+                    await asyncio.to_thread(self.replay_pending)
+            except Exception as e:
+                print(f"[ERREUR résilience] {e}")
+
+    def stats(self) -> dict:
+        now = time.time()
+        tables = {}
+        for table in sorted(set(self.breakers) | set(self.journal.tables() if self.journal else ())):
+            entry = self.breaker(table).stats()
+            entry["queued"] = self.journal.depth(table)
+            oldest = self.journal.oldest(table)
+            entry["oldest_age"] = now - oldest if oldest else 0.0
+            tables[table] = entry
+        return {
+            "active": self.active,
+            "tables": tables,
+            "journal": self.journal.stats() if self.journal else {},
+        }
+
+
+# Instance unique (branchée sur le client Supabase par utils/supabase_client)
+resilience = ResilientClient()
@@ -0,0 +1,400 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 safe_calc.py — Évaluateur d’expressions sûr pour la calculatrice
+# Objectif : Remplacer eval() par un tokenizer + parseur de Pratt vers un AST,
+#            évalué avec une liste blanche d’opérateurs/fonctions et des budgets
+#            (taille des nombres, temps), résultats mémoïsés, calculs lourds
+#            déportés dans un processus séparé avec délai maximal
+# Version : budget serré sur la boucle d’événements, budget large dans le worker
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import math
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import lru_cache
+from utils.process_worker import ProcessWorker
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+MAX_LENGTH = 200                # caractères par expression
+MAX_DEPTH = 40                  # imbrication (parenthèses, opérateurs unaires)
+INLINE_BITS = 512               # taille max d’un entier calculé sur la boucle (~150 chiffres)
+INLINE_TIME = 0.01              # secondes
+WORKER_BITS = 64_000            # taille max dans le worker (~19 000 chiffres)
+WORKER_TIME = 1.5               # secondes (budget interne du worker)
+WORKER_TIMEOUT = 2.0            # secondes (attente côté bot, processus tué au-delà)
+USE_WORKER = True
+MEMO_SIZE = 512
+DISPLAY_DIGITS = 15             # au-delà : notation scientifique
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚠️ Erreurs
+# ────────────────────────────────────────────────────────────────────────────────
+class CalcError(Exception):
+    """Expression invalide ou non calculable (message affichable)."""
+
+class BudgetExceeded(CalcError):
+    """Le calcul dépasse le budget courant (taille ou temps)."""
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 Tokenizer
+# ────────────────────────────────────────────────────────────────────────────────
+TOKEN_RE = re.compile(r"\s*(?:(\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+)|([a-zA-Zπ]+)|(.))")
+
+NUM, NAME, OP, END = "num", "name", "op", "end"
+OPERATORS = set("+-*/^!()")
+CONSTANTS = {"π": math.pi, "pi": math.pi, "e": math.e}
+
+def tokenize(expression: str) -> list:
+    if len(expression) > MAX_LENGTH:
+        raise CalcError("expression trop longue")
+    tokens = []
+    for number, name, op in TOKEN_RE.findall(expression.strip()):
+        if number:
+            value = float(number) if any(c in number for c in ".eE") else int(number)
+            tokens.append((NUM, value))
+        elif name:
+            tokens.append((NAME, name.lower() if name != "π" else name))
+        elif op in OPERATORS:
+            tokens.append((OP, op))
+        elif op.strip():
+            raise CalcError(f"caractère inattendu : {op}")
+    tokens.append((END, None))
+    return tokens
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🌳 AST
+# ────────────────────────────────────────────────────────────────────────────────
+@dataclass(frozen=True, slots=True)
+class Num:
+    value: object
+
+@dataclass(frozen=True, slots=True)
+class Unary:
+    op: str                 # "-" ou "+"
+    operand: object
+
+@dataclass(frozen=True, slots=True)
+class Binary:
+    op: str                 # "+", "-", "*", "/", "^"
+    left: object
+    right: object
+
+@dataclass(frozen=True, slots=True)
+class Call:
+    func: str               # clé de FUNCTIONS
+    arg: object
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧮 Parseur de Pratt
+# ────────────────────────────────────────────────────────────────────────────────
+BINARY_POWER = {"+": 10, "-": 10, "*": 20, "/": 20, "^": 40}
+RIGHT_ASSOC = {"^"}
+UNARY_POWER = 30            # -2^2 = -(2^2)
+POSTFIX_POWER = 50          # 3! ; 2^3! = 2^(3!)
+IMPLICIT_POWER = 20         # 2π, 2(3), 2sqrt(4) = multiplication
+
+class _Parser:
+    def __init__(self, tokens: list):
+        self.tokens = tokens
+        self.pos = 0
+        self.depth = 0
+
+    def peek(self):
+        return self.tokens[self.pos]
+
+    def advance(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def parse(self):
+        node = self.expression(0)
+        kind, value = self.peek()
+        if kind != END:
+            raise CalcError(f"symbole inattendu : {value}")
+        return node
+
+    def expression(self, min_power: int):
+        self.depth += 1
+        if self.depth > MAX_DEPTH:
+            raise CalcError("expression trop imbriquée")
+        left = self.prefix()
+        while True:
+            kind, value = self.peek()
+            if kind == OP and value == "!":
+                if POSTFIX_POWER < min_power:
+                    break
+                self.advance()
+                left = Call("!", left)
+            elif kind == OP and value in BINARY_POWER:
+                power = BINARY_POWER[value]
+                if power <= min_power and not (value in RIGHT_ASSOC and power == min_power):
+                    break
+                self.advance()
+                left = Binary(value, left, self.expression(power))
+            elif kind in (NUM, NAME) or (kind == OP and value == "("):
+                # Multiplication implicite : 2π, 2(3+1), (1+1)(2)
+                if IMPLICIT_POWER <= min_power:
+                    break
+                left = Binary("*", left, self.expression(IMPLICIT_POWER))
+            else:
+                break
+        self.depth -= 1
+        return left
+
+    def prefix(self):
+        kind, value = self.advance()
+        if kind == NUM:
+            return Num(value)
+        if kind == OP and value in "+-":
+            return Unary(value, self.expression(UNARY_POWER))
+        if kind == OP and value == "(":
+            return self.group()
+        if kind == OP and value == "!":
+            # Clavier : « !( » = factorielle de l’expression entre parenthèses
+            return Call("!", self.call_argument())
+        if kind == NAME:
+            if value in CONSTANTS:
+                return Num(CONSTANTS[value])
+            if value in FUNCTIONS:
+                return Call(value, self.call_argument())
+            raise CalcError(f"fonction inconnue : {value}")
+        if kind == END:
+            raise CalcError("expression incomplète")
+        raise CalcError(f"symbole inattendu : {value}")
+
+    def call_argument(self):
+        kind, value = self.advance()
+        if kind != OP or value != "(":
+            raise CalcError("parenthèse attendue après la fonction")
+        return self.group()
+
+    def group(self):
+        node = self.expression(0)
+        kind, value = self.peek()
+        if kind == OP and value == ")":
+            self.advance()
+        elif kind != END:       # parenthèses non fermées en fin d’expression : tolérées
+            raise CalcError(f"symbole inattendu : {value}")
+        return node
+
+@lru_cache(maxsize=MEMO_SIZE)
+def parse(expression: str):
+    return _Parser(tokenize(expression)).parse()
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚖️ Opérations bornées
+# ────────────────────────────────────────────────────────────────────────────────
+def _check_float(value):
+    if isinstance(value, float) and not math.isfinite(value):
+        raise CalcError("résultat trop grand")
+    return value
+
+def _as_float(value) -> float:
+    try:
+        return float(value)
+    except OverflowError:
+        raise CalcError("nombre trop grand") from None
+
+def _factorial(value, max_bits: int):
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise CalcError("factorielle d’un nombre non entier")
+        value = int(value)
+    if value < 0:
+        raise CalcError("factorielle d’un nombre négatif")
+    if value > 1 and math.lgamma(value + 1) / math.log(2) > max_bits:
+        raise BudgetExceeded("factorielle trop grande")
+    return math.factorial(value)
+
+def _power(base, exponent, max_bits: int):
+    if isinstance(base, int) and isinstance(exponent, int) and exponent >= 0:
+        if abs(base) > 1 and exponent * base.bit_length() > max_bits + base.bit_length():
+            raise BudgetExceeded("puissance trop grande")
+        return base ** exponent
+    try:
+        return _check_float(math.pow(_as_float(base), _as_float(exponent)))
+    except OverflowError:
+        raise CalcError("résultat trop grand") from None
+    except ValueError:
+        raise CalcError("puissance non définie") from None
+
+def _add(left, right):
+    """Somme exacte entre entiers ; en flottant dès qu’un opérande l’est (entier trop grand → CalcError)."""
+    if isinstance(left, int) and isinstance(right, int):
+        return left + right
+    return _check_float(_as_float(left) + _as_float(right))
+
+def _multiply(left, right, max_bits: int):
+    if isinstance(left, int) and isinstance(right, int):
+        if left.bit_length() + right.bit_length() > max_bits:
+            raise BudgetExceeded("produit trop grand")
+        return left * right
+    return _check_float(_as_float(left) * _as_float(right))
+
+def _divide(left, right):
+    if right == 0:
+        raise CalcError("division par zéro")
+    try:
+        return _check_float(left / right)
+    except OverflowError:
+        raise CalcError("résultat trop grand") from None
+
+def _unary_math(func):
+    def apply(value):
+        try:
+            return _check_float(func(_as_float(value)))
+        except ValueError:
+            raise CalcError("valeur hors du domaine") from None
+    return apply
+
+def _tangent(degrees: float) -> float:
+    if math.isclose(math.fmod(abs(degrees), 180.0), 90.0):
+        raise CalcError("tangente non définie")
+    return math.tan(math.radians(degrees))
+
+# Liste blanche (trigonométrie en degrés, comme le clavier)
+FUNCTIONS = {
+    "sqrt": _unary_math(math.sqrt),
+    "log": _unary_math(math.log10),
+    "ln": _unary_math(math.log),
+    "sin": _unary_math(lambda x: math.sin(math.radians(x))),
+    "cos": _unary_math(lambda x: math.cos(math.radians(x))),
+    "tan": _unary_math(_tangent),
+}
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ▶️ Évaluation
+# ────────────────────────────────────────────────────────────────────────────────
+def evaluate(expression: str, max_bits: int = INLINE_BITS, time_budget: float = INLINE_TIME):
+    """Évalue l’expression ; lève BudgetExceeded si elle dépasse les budgets donnés."""
+    node = parse(expression)
+    deadline = time.perf_counter() + time_budget
+
+    def visit(node):
+        if time.perf_counter() > deadline:
+            raise BudgetExceeded("calcul trop long")
+        if isinstance(node, Num):
+            return node.value
+        if isinstance(node, Unary):
+            value = visit(node.operand)
+            return -value if node.op == "-" else value
+        if isinstance(node, Binary):
+            left, right = visit(node.left), visit(node.right)
+            if node.op == "+":
+                return _add(left, right)
+            if node.op == "-":
+                return _add(left, -right)
+            if node.op == "*":
+                return _multiply(left, right, max_bits)
+            if node.op == "/":
+                return _divide(left, right)
+            return _power(left, right, max_bits)
+        if node.func == "!":
+            return _factorial(visit(node.arg), max_bits)
+        return FUNCTIONS[node.func](visit(node.arg))
+
+    return visit(node)
+
+def format_result(value) -> str:
+    """Entiers exacts jusqu’à DISPLAY_DIGITS chiffres, sinon notation scientifique ; flottants à 12 chiffres."""
+    if isinstance(value, int):
+        if abs(value) < 10 ** DISPLAY_DIGITS:
+            return str(value)
+        return f"{Decimal(value):.6e}"
+    text = f"{value:.12g}"
+    return "0" if text == "-0" else text
+
+def _evaluate_in_worker(expression: str):
+    """Point d’entrée du processus séparé : renvoie (True, texte) ou (False, message)."""
+    try:
+        return True, format_result(evaluate(expression, WORKER_BITS, WORKER_TIME))
+    except CalcError as e:
+        return False, str(e)
+    except RecursionError:
+        return False, "expression trop imbriquée"
+    except OverflowError:
+        return False, "nombre trop grand"
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Calculatrice (mémo + worker)
+# ────────────────────────────────────────────────────────────────────────────────
+class Calculator:
+    """
+    - compute(expression) : texte du résultat, lève CalcError (message affichable)
+    - petits calculs évalués directement sur la boucle (budget serré)
+    - dépassement du budget serré → worker séparé (budget large, délai WORKER_TIMEOUT)
+    - résultats (et erreurs) mémoïsés par expression
+    """
+    def __init__(self):
+        self._memo = OrderedDict()      # expression (espaces compactés) → (ok, texte)
+        self._worker = ProcessWorker()
+        self.hits = 0
+        self.inline = 0
+        self.offloaded = 0
+        self.timeouts = 0
+
+    def _remember(self, key: str, result: tuple):
+        self._memo[key] = result
+        self._memo.move_to_end(key)
+        if len(self._memo) > MEMO_SIZE:
+            self._memo.popitem(last=False)
+
+    async def _offload(self, expression: str) -> tuple:
+        self.offloaded += 1
+        try:
+            return await self._worker.run(_evaluate_in_worker, expression, timeout=WORKER_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            return False, "calcul trop long"
+        except Exception as e:
+            print(f"[ERREUR calc worker] {e}")
+            return False, "calcul impossible"
+
+    async def compute(self, expression: str) -> str:
+        key = " ".join(expression.split())     # espaces compactés, pas supprimés : « 2 3 » ≠ « 23 »
+        result = self._memo.get(key)
+        if result is not None:
+            self.hits += 1
+            self._memo.move_to_end(key)
+        else:
+            try:
+                result = (True, format_result(evaluate(key)))
+                self.inline += 1
+            except BudgetExceeded as e:
+                result = await self._offload(key) if USE_WORKER else (False, str(e))
+            except CalcError as e:
+                result = (False, str(e))
+            except RecursionError:
+                result = (False, "expression trop imbriquée")
+            except OverflowError:
+                result = (False, "nombre trop grand")
+            self._remember(key, result)
+        ok, text = result
+        if not ok:
+            raise CalcError(text)
+        return text
+
+    def shutdown(self):
+        self._worker.kill()
+
+    def stats(self) -> dict:
+        return {
+            "memo": len(self._memo),
+            "hits": self.hits,
+            "inline": self.inline,
+            "offloaded": self.offloaded,
+            "timeouts": self.timeouts,
+        }
+
+
+# Instance unique
+calculator = Calculator()
@@ -0,0 +1,152 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 schema.py — Registre des tables et projections de colonnes
+# Objectif : Déclarer une seule fois les colonnes (et leur type) de chaque table,
+#            pour que chaque lecture ne demande que les colonnes dont elle a besoin
+#            au lieu de select("*") (moins d’octets transférés, blobs JSON évités)
+# Version : lignes typées légères (__slots__) générées par projection
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Tables connues
+# ────────────────────────────────────────────────────────────────────────────────
+# type : "text", "int", "float", "bool" ou "json" ; (type, défaut) si la colonne a une valeur par défaut.
+# Chaque table a aussi une colonne `updated_at` (filigrane du flux de changements).
+TABLES = {
+    "reiatsu": {
+        "pk": "user_id",
+        "columns": {
+            "user_id": "text", "username": "text", "points": ("int", 0), "classe": "text",
+            "bonus5": ("int", 0), "steal_cd": "int", "last_steal_attempt": "text",
+            "vol_garanti": ("bool", False), "last_skill": "text", "skill_cd": "int",
+            "prochain_reiatsu": "int", "active_skill": "json", "faux_block_user": "text",
+        },
+    },
+    "reiatsu_config": {
+        "pk": "guild_id",
+        "columns": {
+            "guild_id": "text", "channel_id": "text", "last_spawn_at": "text", "spawn_delay": "int",
+            "spawn_speed": "text", "en_attente": ("bool", False), "spawn_message_id": "text",
+            "faux_en_attente": ("bool", False),
+        },
+    },
+    "bot_settings": {"pk": "key", "columns": {"key": "text", "value": "text"}},
+    "bot_lock": {"pk": "id", "columns": {"id": "text", "instance_id": "text"}},
+    "cooldowns": {
+        "pk": "id",
+        "columns": {"id": "text", "scope": "text", "key": "text", "expires_at": "float"},
+    },
+    "game_sessions": {
+        "pk": "id",
+        "columns": {"id": "text", "kind": "text", "payload": "json", "expires_at": "float"},
+    },
+    "steam_keys": {
+        "pk": "id",
+        "columns": {
+            "id": "int", "game_name": "text", "steam_url": "text", "steam_key": "text",
+            "won": ("bool", False), "winner": "text",
+        },
+    },
+    "gardens": {
+        "pk": "user_id",
+        "columns": {
+            "user_id": "int", "username": "text", "garden_grid": "json", "inventory": "json",
+            "argent": ("int", 0), "armee": "text", "last_fertilize": "text", "potions": "json",
+        },
+    },
+}
+WATERMARK_COLUMN = "updated_at"
+
+def column_spec(table: str, column: str) -> tuple:
+    """(type, défaut) d’une colonne déclarée ; KeyError si la table ou la colonne est inconnue."""
+    if column == WATERMARK_COLUMN:
+        return "text", None
+    spec = TABLES[table]["columns"][column]
+    return spec if isinstance(spec, tuple) else (spec, None)
+
+def columns(table: str) -> tuple:
+    """Toutes les colonnes déclarées d’une table (sans `updated_at`)."""
+    return tuple(TABLES[table]["columns"])
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧾 Lignes typées
+# ────────────────────────────────────────────────────────────────────────────────
+_CASTS = {"text": str, "int": int, "float": float, "bool": bool}
+
+class Row:
+    """
+    Ligne d’une projection : un attribut par colonne demandée, converti selon le schéma
+    (user_id toujours en str si déclaré "text", points en int…). get() et to_dict()
+    permettent de garder les habitudes des dict renvoyés par Supabase.
+    """
+    __slots__ = ()
+    _table = None
+    _specs = {}               # colonne → (type, défaut)
+
+    def __init__(self, data: dict):
+        for name, (kind, default) in self._specs.items():
+            value = data.get(name)
+            if value is None:
+                value = default
+            elif kind in _CASTS and not isinstance(value, _CASTS[kind]):
+                value = _CASTS[kind](value)
+            setattr(self, name, value)
+
+    def get(self, name: str, default=None):
+        return getattr(self, name, default) if name in self._specs else default
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({values})"
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔎 Projections
+# ────────────────────────────────────────────────────────────────────────────────
+class Projection:
+    """
+    Colonnes lues par un appel précis, validées au chargement du module :
+        SPAWN_SCAN = projection("reiatsu", "user_id", "active_skill")
+        rows = SPAWN_SCAN.rows(SPAWN_SCAN.select(supabase).execute().data)
+    """
+    __slots__ = ("table", "columns", "row_class")
+
+    def __init__(self, table: str, names: tuple):
+        unknown = [name for name in names if name != WATERMARK_COLUMN and name not in TABLES[table]["columns"]]
+        if unknown:
+            raise KeyError(f"{table} : colonne(s) inconnue(s) {', '.join(unknown)}")
+        self.table = table
+        self.columns = names
+        specs = {name: column_spec(table, name) for name in names}
+        class_name = "".join(part.title() for part in table.split("_")) + "Row"
+        self.row_class = type(class_name, (Row,), {"__slots__": names, "_table": table, "_specs": specs})
+
+    def select(self, client, **kwargs):
+        """client.table(table).select(colonnes) — à compléter par les filtres puis execute()."""
+        return client.table(self.table).select(*self.columns, **kwargs)
+
+    def rows(self, data) -> list:
+        return [self.row_class(row) for row in data or []]
+
+    def row(self, data):
+        """Une ligne (résultat de single()/maybe_single() ou data[0]) ; None si absente."""
+        if isinstance(data, list):
+            data = data[0] if data else None
+        return self.row_class(data) if data else None
+
+    def __repr__(self):
+        return f"Projection({self.table}: {', '.join(self.columns)})"
+
+_projections = {}
+
+def projection(table: str, *names) -> Projection:
+    """Projection (mise en cache) ; sans colonne = toutes les colonnes déclarées."""
+    names = tuple(dict.fromkeys(names)) or columns(table)
+    key = (table, names)
+    if key not in _projections:
+        _projections[key] = Projection(table, names)
+    return _projections[key]
@@ -0,0 +1,368 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 sqlite_store.py — Stockage embarqué SQLite derrière l’API `supabase.table()`
+# Objectif : Faire tourner le bot sans Supabase (instance unique, tests hors ligne)
+#            avec le sous-ensemble PostgREST utilisé par les cogs :
+#            table().select/insert/upsert/update/delete + filtres + execute()
+# Version : WAL, index sur user_id/guild_id/updated_at, colonnes ajoutées à la volée
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from utils.schema import TABLES, WATERMARK_COLUMN
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Schéma des tables connues (utils/schema)
+# ────────────────────────────────────────────────────────────────────────────────
+# Toute colonne inconnue rencontrée (lecture ou écriture) est ajoutée en "json".
+INDEXED_COLUMNS = ("user_id", "guild_id", WATERMARK_COLUMN)
+SQL_TYPES = {"text": "TEXT", "int": "INTEGER", "float": "REAL", "bool": "INTEGER", "json": "TEXT"}
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚠️ Erreurs et réponses
+# ────────────────────────────────────────────────────────────────────────────────
+class StorageError(Exception):
+    """Équivalent local de postgrest.APIError."""
+
+class StorageResponse:
+    __slots__ = ("data", "count")
+
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+def _split_columns(columns) -> list:
+    """select("a", "b") et select("a, b") sont équivalents ; "*" = toutes les colonnes."""
+    names = [c.strip() for part in columns for c in str(part).split(",") if c.strip()]
+    return [] if not names or "*" in names else names
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔎 Requête (constructeur chaînable)
+# ────────────────────────────────────────────────────────────────────────────────
+class SQLiteQuery:
+    """Même enchaînement que postgrest : table(...).select(...).eq(...).execute()."""
+    def __init__(self, client: "SQLiteClient", table: str):
+        self.client = client
+        self.table_name = table
+        self.action = None
+        self.columns = []
+        self.values = None
+        self.on_conflict = None
+        self.ignore_duplicates = False
+        self.filters = []          # (sql, colonne, paramètres, convertir selon le type ?)
+        self.negate_next = False   # .not_ : inverse le filtre suivant
+        self.order_by = []
+        self.limit_count = None
+        self.offset = None
+        self.single_mode = None    # "single" ou "maybe"
+        self.count_mode = None
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Actions
+    # ────────────────────────────────────────────────────────────────────────
+    def select(self, *columns, count=None):
+        self.action, self.columns, self.count_mode = "select", _split_columns(columns or ("*",)), count
+        return self
+
+    def insert(self, values, upsert: bool = False, **_):
+        self.action, self.values = ("upsert" if upsert else "insert"), values
+        return self
+
+    def upsert(self, values, on_conflict: str = "", ignore_duplicates: bool = False, **_):
+        self.action, self.values = "upsert", values
+        self.on_conflict, self.ignore_duplicates = on_conflict or None, ignore_duplicates
+        return self
+
+    def update(self, values: dict, **_):
+        self.action, self.values = "update", values
+        return self
+
+    def delete(self, **_):
+        self.action = "delete"
+        return self
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Filtres et modificateurs
+    # ────────────────────────────────────────────────────────────────────────
+    def _filter(self, sql: str, column: str, *params, encode: bool = True):
+        if self.negate_next:
+            sql, self.negate_next = f"NOT ({sql})", False
+        self.filters.append((sql, column, params, encode))
+        return self
+
+    @property
+    def not_(self):
+        """query.not_.is_("colonne", "null") comme avec postgrest."""
+        self.negate_next = True
+        return self
+
+    def eq(self, column, value):
+        return self._filter(f'"{column}" = ?', column, value)
+
+    def neq(self, column, value):
+        return self._filter(f'"{column}" IS NOT ?', column, value)
+
+    def gt(self, column, value):
+        return self._filter(f'"{column}" > ?', column, value)
+
+    def gte(self, column, value):
+        return self._filter(f'"{column}" >= ?', column, value)
+
+    def lt(self, column, value):
+        return self._filter(f'"{column}" < ?', column, value)
+
+    def lte(self, column, value):
+        return self._filter(f'"{column}" <= ?', column, value)
+
+    def like(self, column, pattern):
+        return self._filter(f'"{column}" LIKE ?', column, pattern, encode=False)
+
+    def ilike(self, column, pattern):
+        return self._filter(f'lower("{column}") LIKE lower(?)', column, pattern, encode=False)
+
+    def in_(self, column, values):
+        values = list(values)
+        if not values:
+            return self._filter("0", column)
+        return self._filter(f'"{column}" IN ({", ".join("?" * len(values))})', column, *values)
+
+    def is_(self, column, value):
+        keyword = {"null": "NULL", None: "NULL", "true": "1", True: "1", "false": "0", False: "0"}[value]
+        return self._filter(f'"{column}" IS {keyword}', column)
+
+    def match(self, query: dict):
+        for column, value in query.items():
+            self.eq(column, value)
+        return self
+
+    def order(self, column, desc: bool = False, **_):
+        self.order_by.append((column, desc))
+        return self
+
+    def limit(self, count: int, **_):
+        self.limit_count = count
+        return self
+
+    def range(self, start: int, end: int, **_):
+        self.offset, self.limit_count = start, end - start + 1
+        return self
+
+    def single(self):
+        self.single_mode = "single"
+        return self
+
+    def maybe_single(self):
+        self.single_mode = "maybe"
+        return self
+
+    def execute(self) -> StorageResponse:
+        rows = self.client.run(self)
+        if self.single_mode:
+            if len(rows) > 1 or (not rows and self.single_mode == "single"):
+                raise StorageError(f"{self.table_name} : {len(rows)} ligne(s) au lieu d’une seule")
+            return StorageResponse(rows[0] if rows else None, len(rows))
+        return StorageResponse(rows, len(rows) if self.count_mode else None)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🗄️ Client SQLite
+# ────────────────────────────────────────────────────────────────────────────────
+class SQLiteClient:
+    """
+    Remplaçant local du client Supabase : `client.table(nom)` renvoie une SQLiteQuery.
+    Une seule connexion (WAL) protégée par un verrou : utilisable depuis la boucle
+    et depuis asyncio.to_thread.
+    """
+    def __init__(self, path: str = "data/kisuke.db"):
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.RLock()
+        self._columns = {}         # table → {colonne: type}
+        self._pks = {}             # table → clé primaire
+        self.queries = 0
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA case_sensitive_like=ON")
+            for table, spec in TABLES.items():
+                self._create_table(table, spec["pk"], spec["columns"])
+
+    def table(self, name: str) -> SQLiteQuery:
+        return SQLiteQuery(self, name)
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Schéma
+    # ────────────────────────────────────────────────────────────────────────
+    def _create_table(self, table: str, pk, columns: dict):
+        columns = {**columns, WATERMARK_COLUMN: "text"}
+        definitions = []
+        for name, spec in columns.items():
+            kind, default = spec if isinstance(spec, tuple) else (spec, None)
+            sql = f'"{name}" {SQL_TYPES[kind]}'
+            if name == pk:
+                sql += " PRIMARY KEY NOT NULL"
+            elif default is not None:
+                sql += f" DEFAULT {int(default) if kind == 'bool' else repr(default)}"
+            definitions.append(sql)
+        self._conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({", ".join(definitions)})')
+        existing = {row[1] for row in self._conn.execute(f'PRAGMA table_info("{table}")')}
+        for name, spec in columns.items():
+            if name not in existing:
+                kind = spec[0] if isinstance(spec, tuple) else spec
+                self._conn.execute(f'ALTER TABLE "{table}" ADD COLUMN "{name}" {SQL_TYPES[kind]}')
+        self._columns[table] = {name: (spec[0] if isinstance(spec, tuple) else spec) for name, spec in columns.items()}
+        for row in self._conn.execute(f'PRAGMA table_info("{table}")'):
+            self._columns[table].setdefault(row[1], "json")
+        self._pks[table] = pk
+        for name in INDEXED_COLUMNS:
+            if name in self._columns[table] and name != pk:
+                self._conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{table}_{name}" ON "{table}" ("{name}")')
+
+    def _ensure(self, table: str, names) -> dict:
+        """Crée la table (inconnue) ou les colonnes manquantes ; renvoie {colonne: type}."""
+        if table not in self._columns:
+            self._create_table(table, None, {})
+        columns = self._columns[table]
+        for name in names:
+            if name not in columns:
+                self._conn.execute(f'ALTER TABLE "{table}" ADD COLUMN "{name}" TEXT')
+                columns[name] = "json"
+        return columns
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Conversions Python ↔ SQLite
+    # ────────────────────────────────────────────────────────────────────────
+    @staticmethod
+    def _encode(kind: str, value):
+        if value is None:
+            return None
+        if kind == "json":
+            return json.dumps(value, ensure_ascii=False)
+        if kind == "bool":
+            return int(bool(value))
+        return value
+
+    @staticmethod
+    def _decode(kind: str, value):
+        if value is None:
+            return None
+        if kind == "json":
+            try:
+                return json.loads(value)
+            except (TypeError, ValueError):
+                return value
+        if kind == "bool":
+            return bool(value)
+        return value
+
+    def _row(self, table: str, cursor, row) -> dict:
+        columns = self._columns[table]
+        return {d[0]: self._decode(columns.get(d[0], "text"), v) for d, v in zip(cursor.description, row)}
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Exécution
+    # ────────────────────────────────────────────────────────────────────────
+    def run(self, query: SQLiteQuery) -> list:
+        table = query.table_name
+        with self._lock:
+            self.queries += 1
+            try:
+                handler = getattr(self, f"_run_{query.action}")
+                return handler(table, query)
+            except sqlite3.Error as e:
+                raise StorageError(f"{table} : {e}") from e
+
+    def _where(self, table: str, query: SQLiteQuery):
+        columns = self._ensure(table, [f[1] for f in query.filters])
+        clauses, params = [], []
+        for sql, column, values, encode in query.filters:
+            clauses.append(sql)
+            params.extend(self._encode(columns[column], v) if encode else v for v in values)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _run_select(self, table: str, query: SQLiteQuery) -> list:
+        self._ensure(table, query.columns + [column for column, _ in query.order_by])
+        projection = ", ".join(f'"{c}"' for c in query.columns) or "*"
+        where, params = self._where(table, query)
+        sql = f'SELECT {projection} FROM "{table}"{where}'
+        if query.order_by:
+            sql += " ORDER BY " + ", ".join(f'"{c}" {"DESC" if desc else "ASC"}' for c, desc in query.order_by)
+        if query.limit_count is not None:
+            sql += f" LIMIT {int(query.limit_count)}"
+            if query.offset:
+                sql += f" OFFSET {int(query.offset)}"
+        cursor = self._conn.execute(sql, params)
+        return [self._row(table, cursor, row) for row in cursor.fetchall()]
+
+    def _prepare_rows(self, table: str, values) -> list:
+        rows = [values] if isinstance(values, dict) else list(values)
+        stamp = _now_iso()
+        rows = [{**row, WATERMARK_COLUMN: row.get(WATERMARK_COLUMN) or stamp} for row in rows]
+        self._ensure(table, {name for row in rows for name in row})
+        return rows
+
+    def _write_rows(self, table: str, rows: list, conflict: str = "") -> list:
+        columns = self._columns[table]
+        result = []
+        self._conn.execute("BEGIN")
+        try:
+            for row in rows:
+                names = list(row)
+                quoted = ", ".join(f'"{n}"' for n in names)
+                sql = f'INSERT INTO "{table}" ({quoted}) VALUES ({", ".join("?" * len(names))}){conflict} RETURNING *'
+                cursor = self._conn.execute(sql, [self._encode(columns[n], row[n]) for n in names])
+                fetched = cursor.fetchone()
+                if fetched is not None:
+                    result.append(self._row(table, cursor, fetched))
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return result
+
+    def _run_insert(self, table: str, query: SQLiteQuery) -> list:
+        return self._write_rows(table, self._prepare_rows(table, query.values))
+
+    def _run_upsert(self, table: str, query: SQLiteQuery) -> list:
+        rows = self._prepare_rows(table, query.values)
+        target = query.on_conflict or self._pks.get(table)
+        if not target:
+            return self._write_rows(table, rows)
+        keys = [k.strip() for k in target.split(",")]
+        if query.ignore_duplicates:
+            return self._write_rows(table, rows, f' ON CONFLICT ({", ".join(keys)}) DO NOTHING')
+        result = []
+        for row in rows:
+            updates = [n for n in row if n not in keys]
+            action = ("DO UPDATE SET " + ", ".join(f'"{n}" = excluded."{n}"' for n in updates)) if updates else "DO NOTHING"
+            result += self._write_rows(table, [row], f' ON CONFLICT ({", ".join(keys)}) {action}')
+        return result
+
+    def _run_update(self, table: str, query: SQLiteQuery) -> list:
+        values = {**query.values, WATERMARK_COLUMN: query.values.get(WATERMARK_COLUMN) or _now_iso()}
+        columns = self._ensure(table, values)
+        where, params = self._where(table, query)
+        assignments = ", ".join(f'"{n}" = ?' for n in values)
+        cursor = self._conn.execute(
+            f'UPDATE "{table}" SET {assignments}{where} RETURNING *',
+            [self._encode(columns[n], v) for n, v in values.items()] + params,
+        )
+        return [self._row(table, cursor, row) for row in cursor.fetchall()]
+
+    def _run_delete(self, table: str, query: SQLiteQuery) -> list:
+        where, params = self._where(table, query)
+        cursor = self._conn.execute(f'DELETE FROM "{table}"{where} RETURNING *', params)
+        return [self._row(table, cursor, row) for row in cursor.fetchall()]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
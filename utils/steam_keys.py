@@ -0,0 +1,274 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 steam_keys.py — Inventaire partagé des clés Steam
+# Objectif : Compter/lister les clés depuis un cache et les attribuer sans doublon
+# Version : réservation atomique (compare-and-set sur `won`) → confirmation/libération
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import time
+import uuid
+import asyncio
+from utils.supabase_client import supabase
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+CATALOG_TTL = 60           # secondes avant de relire la table steam_keys
+RESERVATION_TTL = 180      # durée max d’une réservation non confirmée
+RESERVED_PREFIX = "__reserved__"
+
+def _reservation_tag(token: str, expires_at: float) -> str:
+    return f"{RESERVED_PREFIX}:{token}:{int(expires_at)}"
+
+def _parse_reservation_tag(winner):
+    """Renvoie (token, expires_at) si `winner` est un marqueur de réservation."""
+    if not winner or not str(winner).startswith(RESERVED_PREFIX + ":"):
+        return None
+    try:
+        _, token, expires_at = str(winner).split(":", 2)
+        return token, int(expires_at)
+    except ValueError:
+        return None
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🗄️ Stockages
+# ────────────────────────────────────────────────────────────────────────────────
+class SupabaseKeyStore:
+    """
+    Table `steam_keys` (id, game_name, steam_url, steam_key, won, winner).
+    La réservation passe `won` à True uniquement si la ligne est encore libre :
+    deux instances qui visent la même clé ne peuvent pas gagner toutes les deux.
+    """
+    def __init__(self, client=None):
+        self.client = client
+
+    @property
+    def table(self):
+        return (self.client or supabase).table("steam_keys")
+
+    def list_available(self):
+        resp = self.table.select("id", "game_name", "steam_url").eq("won", False).execute()
+        return resp.data or []
+
+    def list_reserved(self):
+        resp = self.table.select("id", "winner").like("winner", f"{RESERVED_PREFIX}:%").execute()
+        return resp.data or []
+
+    def claim(self, key_id, tag: str):
+        resp = self.table.update({"won": True, "winner": tag}).eq("id", key_id).eq("won", False).execute()
+        return resp.data[0] if resp.data else None
+
+    def confirm(self, key_id, tag: str, winner: str):
+        resp = self.table.update({"winner": winner}).eq("id", key_id).eq("winner", tag).execute()
+        return resp.data[0] if resp.data else None
+
+    def release(self, key_id, tag: str):
+        resp = self.table.update({"won": False, "winner": None}).eq("id", key_id).eq("winner", tag).execute()
+        return bool(resp.data)
+
+class MemoryKeyStore:
+    """Stockage local (tests, développement hors ligne) avec la même sémantique."""
+    def __init__(self, rows=None):
+        self.rows = {row["id"]: {"won": False, "winner": None, **row} for row in (rows or [])}
+
+    def list_available(self):
+        return [
+            {"id": r["id"], "game_name": r["game_name"], "steam_url": r.get("steam_url")}
+            for r in self.rows.values() if not r["won"]
+        ]
+
+    def list_reserved(self):
+        return [
+            {"id": r["id"], "winner": r["winner"]}
+            for r in self.rows.values() if _parse_reservation_tag(r["winner"])
+        ]
+
+    def claim(self, key_id, tag: str):
+        row = self.rows.get(key_id)
+        if not row or row["won"]:
+            return None
+        row.update(won=True, winner=tag)
+        return dict(row)
+
+    def confirm(self, key_id, tag: str, winner: str):
+        row = self.rows.get(key_id)
+        if not row or row["winner"] != tag:
+            return None
+        row["winner"] = winner
+        return dict(row)
+
+    def release(self, key_id, tag: str):
+        row = self.rows.get(key_id)
+        if not row or row["winner"] != tag:
+            return False
+        row.update(won=False, winner=None)
+        return True
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🎟️ Réservation
+# ────────────────────────────────────────────────────────────────────────────────
+class Reservation:
+    __slots__ = ("key", "user_id", "tag", "expires_at")
+
+    def __init__(self, key: dict, user_id: str, tag: str, expires_at: float):
+        self.key = key
+        self.user_id = user_id
+        self.tag = tag
+        self.expires_at = expires_at
+
+    @property
+    def key_id(self):
+        return self.key["id"]
+
+    @property
+    def game_name(self):
+        return self.key.get("game_name")
+
+    @property
+    def steam_url(self):
+        return self.key.get("steam_url")
+
+    @property
+    def steam_key(self):
+        return self.key.get("steam_key")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Inventaire
+# ────────────────────────────────────────────────────────────────────────────────
+class SteamKeyInventory:
+    """
+    Service partagé par les cogs steamkey :
+    - count()/games()/catalog() lus depuis un cache (rafraîchi toutes les CATALOG_TTL s)
+    - reserve() → confirm() ou release(), les réservations expirées sont rendues
+    """
+    def __init__(self, store=None, catalog_ttl: float = CATALOG_TTL, reservation_ttl: float = RESERVATION_TTL, clock=time.time):
+        self.store = store or SupabaseKeyStore()
+        self.catalog_ttl = catalog_ttl
+        self.reservation_ttl = reservation_ttl
+        self.clock = clock
+        self._available = []
+        self._loaded_at = None
+        self._reservations = {}   # key_id → Reservation
+        self._lock = asyncio.Lock()
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Catalogue (cache)
+    # ────────────────────────────────────────────────────────────────────────
+    def _stale(self) -> bool:
+        return self._loaded_at is None or self.clock() - self._loaded_at >= self.catalog_ttl
+
+    def refresh(self, force: bool = False):
+        """Recharge la liste des clés libres si le cache est expiré."""
+        if not force and not self._stale():
+            return self._available
+        self._release_expired()
+        try:
+            self._available = self.store.list_available()
+            self._loaded_at = self.clock()
+        except Exception as e:
+            print(f"[ERREUR steam_keys refresh] {e}")
+        return self._available
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    def available(self):
+        return list(self.refresh())
+
+    def count(self) -> int:
+        return len(self.refresh())
+
+    def catalog(self) -> dict:
+        """Nombre de clés libres par jeu."""
+        counts = {}
+        for key in self.refresh():
+            counts[key["game_name"]] = counts.get(key["game_name"], 0) + 1
+        return counts
+
+    def games(self):
+        return sorted(self.catalog())
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Réservation → confirmation / libération
+    # ────────────────────────────────────────────────────────────────────────
+    async def reserve(self, user_id, game_name: str = None, exclude_games=()):
+        """
+        Réserve atomiquement une clé libre (du jeu demandé si précisé).
+        Renvoie une Reservation ou None si plus aucune clé ne convient.
+        """
+        async with self._lock:
+            self._release_expired()
+            candidates = [
+                k for k in self.refresh()
+                if k["id"] not in self._reservations
+                and (game_name is None or k["game_name"] == game_name)
+                and k["game_name"] not in exclude_games
+            ]
+            expires_at = self.clock() + self.reservation_ttl
+            for key in candidates:
+                tag = _reservation_tag(uuid.uuid4().hex, expires_at)
+                try:
+                    row = self.store.claim(key["id"], tag)
+                except Exception as e:
+                    print(f"[ERREUR steam_keys claim] {e}")
+                    row = None
+                self._drop_cached(key["id"])
+                if row:
+                    reservation = Reservation({**key, **row}, str(user_id), tag, expires_at)
+                    self._reservations[key["id"]] = reservation
+                    return reservation
+            return None
+
+    async def confirm(self, reservation: Reservation, winner: str) -> bool:
+        """Attribue définitivement la clé réservée au gagnant."""
+        async with self._lock:
+            self._reservations.pop(reservation.key_id, None)
+            try:
+                return bool(self.store.confirm(reservation.key_id, reservation.tag, winner))
+            except Exception as e:
+                print(f"[ERREUR steam_keys confirm] {e}")
+                return False
+
+    async def release(self, reservation: Reservation) -> bool:
+        """Remet la clé en jeu (refus, autre jeu, timeout)."""
+        async with self._lock:
+            return self._release(reservation)
+
+    def _release(self, reservation: Reservation) -> bool:
+        self._reservations.pop(reservation.key_id, None)
+        try:
+            released = self.store.release(reservation.key_id, reservation.tag)
+        except Exception as e:
+            print(f"[ERREUR steam_keys release] {e}")
+            return False
+        if released and self._loaded_at is not None:
+            self._available.append({
+                "id": reservation.key_id,
+                "game_name": reservation.game_name,
+                "steam_url": reservation.steam_url
+            })
+        return released
+
+    def _drop_cached(self, key_id):
+        self._available = [k for k in self._available if k["id"] != key_id]
+
+    def _release_expired(self):
+        """Rend les réservations expirées (locales et orphelines d’une autre instance)."""
+        now = self.clock()
+        for reservation in [r for r in self._reservations.values() if r.expires_at <= now]:
+            self._release(reservation)
+        if self._loaded_at is not None and not self._stale():
+            return
+        try:
+            for row in self.store.list_reserved():
+                parsed = _parse_reservation_tag(row.get("winner"))
+                if parsed and parsed[1] <= now and row["id"] not in self._reservations:
+                    self.store.release(row["id"], row["winner"])
+        except Exception as e:
+            print(f"[ERREUR steam_keys expiration] {e}")
+
+
+# Instance unique partagée par les cogs
+steam_inventory = SteamKeyInventory()
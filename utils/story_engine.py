@@ -0,0 +1,178 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 story_engine.py — Moteur d’histoires interactives (Bleach Attorney)
+# Objectif : Compiler chaque histoire une seule fois en graphe indexé (id → scène),
+#            valider les liens au chargement, progression compacte par joueur
+# Version : descripteurs de boutons pré-construits, transition = un accès dict
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import json
+import os
+from collections import deque
+from dataclasses import dataclass
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+STORIES_JSON_PATH = os.path.join("data", "ace_bleach_stories.json")
+CHOICE, OBJECTION = "choice", "objection"
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧾 Structures compilées
+# ────────────────────────────────────────────────────────────────────────────────
+@dataclass(frozen=True, slots=True)
+class Action:
+    kind: str              # CHOICE ou OBJECTION
+    label: str             # texte du bouton (déjà tronqué à 80 caractères)
+    next_id: int           # scène suivante (objection ratée : scène courante)
+    valid: bool = True
+    custom_id: str = ""
+
+@dataclass(frozen=True, slots=True)
+class Scene:
+    id: int
+    character: str
+    expression: str
+    dialogue: str
+    actions: tuple         # tuple[Action, ...]
+
+    @property
+    def is_ending(self) -> bool:
+        return not self.actions
+
+@dataclass(frozen=True, slots=True)
+class Story:
+    index: int
+    title: str
+    intro: str
+    evidence: tuple
+    start_id: int
+    scenes: dict           # id → Scene
+    warnings: tuple
+
+    def scene(self, scene_id: int) -> Scene:
+        return self.scenes[scene_id]
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🛠️ Compilation et validation
+# ────────────────────────────────────────────────────────────────────────────────
+def compile_story(index: int, title: str, raw: dict) -> Story:
+    """
+    Transforme le JSON brut en graphe indexé par id.
+    - liens vers une scène inexistante : action retirée (avertissement)
+    - scènes inaccessibles depuis la première : conservées, signalées
+    """
+    warnings = []
+    raw_scenes = raw.get("scenes", [])
+    ids = set()
+    for position, scene in enumerate(raw_scenes):
+        scene_id = scene.get("id", position)
+        if scene_id in ids:
+            warnings.append(f"id de scène en double : {scene_id}")
+        ids.add(scene_id)
+
+    scenes = {}
+    for position, scene in enumerate(raw_scenes):
+        scene_id = scene.get("id", position)
+        actions = []
+        for kind, entries in ((CHOICE, scene.get("choices", [])), (OBJECTION, scene.get("objections", []))):
+            for i, entry in enumerate(entries):
+                valid = entry.get("valid", False) if kind == OBJECTION else True
+                next_id = entry.get("next_scene", scene_id) if valid else scene_id
+                if next_id not in ids:
+                    warnings.append(f"scène {scene_id} : lien vers la scène inexistante {next_id}")
+                    continue
+                label = entry["text"] if kind == CHOICE else f"Objection: {entry['text']}"
+                actions.append(Action(kind, label[:80], next_id, valid, f"ba:{kind}:{i}"))
+        scenes.setdefault(scene_id, Scene(
+            id=scene_id,
+            character=scene.get("character", "???"),
+            expression=scene.get("expression", "neutre"),
+            dialogue=scene.get("dialogue", ""),
+            actions=tuple(actions),
+        ))
+
+    start_id = raw_scenes[0].get("id", 0) if raw_scenes else 0
+    unreachable = set(scenes) - _reachable(scenes, start_id)
+    if unreachable:
+        warnings.append(f"scènes inaccessibles : {sorted(unreachable)}")
+    if not any(scene.is_ending for scene in scenes.values()):
+        warnings.append("aucune scène finale")
+
+    return Story(
+        index=index,
+        title=title,
+        intro=raw.get("intro", ""),
+        evidence=tuple(raw.get("evidence", [])),
+        start_id=start_id,
+        scenes=scenes,
+        warnings=tuple(warnings),
+    )
+
+def _reachable(scenes: dict, start_id: int) -> set:
+    seen, queue = {start_id}, deque([start_id])
+    while queue:
+        scene = scenes.get(queue.popleft())
+        if scene is None:
+            continue
+        for action in scene.actions:
+            if action.next_id not in seen:
+                seen.add(action.next_id)
+                queue.append(action.next_id)
+    return seen
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📚 Bibliothèque (compilée une fois, rechargée si le fichier change)
+# ────────────────────────────────────────────────────────────────────────────────
+class StoryLibrary:
+    def __init__(self, path: str = STORIES_JSON_PATH):
+        self.path = path
+        self.stories = {}      # titre → Story
+        self.by_index = []     # index → Story (référence compacte dans la progression)
+        self._mtime = None
+
+    def load(self) -> dict:
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError as e:
+            print(f"[ERREUR JSON] Impossible de charger {self.path} : {e}")
+            return self.stories
+        if mtime == self._mtime:
+            return self.stories
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except Exception as e:
+            print(f"[ERREUR JSON] Impossible de charger {self.path} : {e}")
+            return self.stories
+        self.by_index = [compile_story(i, title, data) for i, (title, data) in enumerate(raw.items())]
+        self.stories = {story.title: story for story in self.by_index}
+        self._mtime = mtime
+        for story in self.by_index:
+            for warning in story.warnings:
+                print(f"[HISTOIRES] {story.title} — {warning}")
+        return self.stories
+
+    def get(self, index: int):
+        self.load()
+        return self.by_index[index] if 0 <= index < len(self.by_index) else None
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 💾 Progression compacte
+# ────────────────────────────────────────────────────────────────────────────────
+def encode_progress(story: Story, scene_id: int, objections: int = 0) -> dict:
+    """Progression d’un joueur : trois entiers (histoire, scène, objections réussies)."""
+    return {"s": story.index, "c": scene_id, "o": objections}
+
+def decode_progress(library: StoryLibrary, state: dict):
+    """Renvoie (story, scene_id, objections) ou None si l’histoire/la scène n’existe plus."""
+    story = library.get(state.get("s", -1))
+    if story is None or state.get("c") not in story.scenes:
+        return None
+    return story, state["c"], state.get("o", 0)
+
+
+# Instance unique
+library = StoryLibrary()
@@ -1,12 +1,14 @@
 # ────────────────────────────────────────────────────────────────────────────────
-# 📌 supabase_client.py — Initialisation du client Supabase
+# 📌 supabase_client.py — Initialisation du client de stockage
 # Objectif : Fournir un client unique réutilisable dans tout le bot
+#            (Supabase, ou SQLite embarqué avec la même API `table()`)
 # ────────────────────────────────────────────────────────────────────────────────
 
 # ──────────────────────────────────────────────────────────────
 # 📦 IMPORTS
 # ──────────────────────────────────────────────────────────────
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
 # ──────────────────────────────────────────────────────────────
@@ -17,19 +19,57 @@ load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "auto").lower()   # auto | supabase | sqlite
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+def _sqlite_path(value: str) -> str:
+    """Chemin relatif → depuis la racine du dépôt (bot.py change de dossier après les imports)."""
+    if value == ":memory:" or Path(value).is_absolute():
+        return value
+    return str(ROOT_DIR / value)
+
+SQLITE_PATH = _sqlite_path(os.getenv("SQLITE_PATH", "data/kisuke.db"))
+
+# SQLite seulement sur demande, ou en auto sans aucun identifiant Supabase : jamais
+# en repli d’une erreur de connexion ou d’un secret manquant (base locale vide en prod)
+USE_SQLITE = STORAGE_BACKEND == "sqlite" or (
+    STORAGE_BACKEND == "auto" and not SUPABASE_URL and not SUPABASE_KEY
+)
 
 # ──────────────────────────────────────────────────────────────
 # 🔌 Initialisation du client
 # ──────────────────────────────────────────────────────────────
 supabase = None
+BACKEND = None          # "supabase", "sqlite" ou None
 
-try:
-    if not SUPABASE_URL or not SUPABASE_KEY:
-        raise ValueError("SUPABASE_URL ou SUPABASE_KEY manquant")
+if not USE_SQLITE:
+    try:
+        if not SUPABASE_URL or not SUPABASE_KEY:
+            raise ValueError("SUPABASE_URL ou SUPABASE_KEY manquant")
 
-    from supabase import create_client, Client
-    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-    print("✅ Client Supabase initialisé avec succès.")
+        from supabase import create_client, Client
+        supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+        BACKEND = "supabase"
+        print("✅ Client Supabase initialisé avec succès.")
 
-except Exception as e:
-    print(f"⚠️ Supabase désactivé : {e}")
+    except Exception as e:
+        print(f"[ERREUR supabase] Client non initialisé, aucun repli SQLite : {e}")
+
+# ──────────────────────────────────────────────────────────────
+# 💾 SQLite embarqué (instance unique, tests hors ligne)
+# ──────────────────────────────────────────────────────────────
+if supabase is None and USE_SQLITE:
+    try:
+        from utils.sqlite_store import SQLiteClient
+        supabase = SQLiteClient(SQLITE_PATH)
+        BACKEND = "sqlite"
+        print(f"✅ Stockage local SQLite : {SQLITE_PATH}")
+    except Exception as e:
+        print(f"⚠️ Stockage SQLite indisponible : {e}")
+
+# ──────────────────────────────────────────────────────────────
+# 🛡️ Passerelle commune : disjoncteurs, journal des écritures, profilage des requêtes
+# ──────────────────────────────────────────────────────────────
+if supabase is not None:
+    from utils.resilience import resilience
+    supabase = resilience.wrap(supabase)
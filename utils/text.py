@@ -0,0 +1,44 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 text.py — Outils de texte partagés
+# Objectif : Normalisation (accents, ponctuation, casse) et distance d’édition
+#            bornée, utilisées par les quiz, la recherche d’aide et l’index des
+#            membres sans charger aucun jeu de données
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import re
+import unicodedata
+from functools import lru_cache
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔤 Normalisation
+# ────────────────────────────────────────────────────────────────────────────────
+@lru_cache(maxsize=4096)
+def normalize_text(text: str) -> str:
+    """Minuscules, sans accents, ponctuation/tirets → espaces, espaces compactés."""
+    text = ''.join(
+        c for c in unicodedata.normalize('NFD', text.lower())
+        if unicodedata.category(c) != 'Mn'
+    )
+    return ' '.join(re.sub(r"[^\w]+", " ", text).split())
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📏 Distance d’édition
+# ────────────────────────────────────────────────────────────────────────────────
+def bounded_levenshtein(a: str, b: str, bound: int) -> int:
+    """Distance d’édition, abandonnée dès qu’elle dépasse `bound` (renvoie bound + 1)."""
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        row_min = current[0]
+        for j, cb in enumerate(b, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            row_min = min(row_min, current[j])
+        if row_min > bound:
+            return bound + 1
+        previous = current
+    return previous[-1]
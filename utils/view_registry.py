@@ -0,0 +1,177 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 view_registry.py — Cycle de vie des discord.ui.View
+# Objectif : Durée de vie bornée pour chaque View, plafond global (éviction des plus
+#            anciennes) et reconstruction paresseuse des vues à custom_id fixe
+# Version : index par message + tas d’échéances, une seule tâche de ménage
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import heapq
+import sys
+import time
+from collections import OrderedDict
+import discord
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Paramètres
+# ────────────────────────────────────────────────────────────────────────────────
+DEFAULT_TTL = 15 * 60     # durée de vie d’une View suivie (secondes)
+MAX_VIEWS = 500           # plafond global, au-delà on libère les plus anciennes
+SWEEP_INTERVAL = 30       # fréquence du ménage des Views expirées
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📏 Estimation mémoire
+# ────────────────────────────────────────────────────────────────────────────────
+def approx_size(view: discord.ui.View) -> int:
+    """Taille approximative : la View, ses attributs directs et ses composants."""
+    size = sys.getsizeof(view)
+    for value in vars(view).values():
+        size += sys.getsizeof(value)
+        if isinstance(value, (list, dict, set, tuple)):
+            size += sum(sys.getsizeof(v) for v in value)
+    for child in view.children:
+        size += sys.getsizeof(child) + sum(sys.getsizeof(v) for v in vars(child).values())
+    return size
+
+def _refresh_item(item, interaction: discord.Interaction):
+    """Recharge l’état d’un composant (ex. valeurs d’un Select) depuis l’interaction."""
+    refresh = getattr(item, "_refresh_state", None)
+    if refresh is None:
+        return
+    try:
+        refresh(interaction, interaction.data)
+    except TypeError:  # discord.py < 2.3 : _refresh_state(data)
+        refresh(interaction.data)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🗂️ Registre
+# ────────────────────────────────────────────────────────────────────────────────
+class ViewRegistry:
+    """
+    - track(view, message, ttl) : suit une View attachée à un message
+    - release(view) : l’arrête et la retire (libère le ViewStore de discord.py)
+    - register_persistent(bot, prefix, factory) : si un clic arrive sur un message
+      dont la View a été libérée, factory(interaction) la reconstruit à la demande
+    """
+    def __init__(self, max_views: int = MAX_VIEWS, default_ttl: float = DEFAULT_TTL):
+        self.max_views = max_views
+        self.default_ttl = default_ttl
+        self.views = OrderedDict()   # message_id → (view, expires_at), du plus ancien au plus récent
+        self.heap = []               # (expires_at, message_id)
+        self.factories = {}          # préfixe de custom_id → coroutine(interaction) → View | None
+        self.evicted = 0
+        self.expired = 0
+        self.rehydrated = 0
+        self._bot = None
+        self._task = None
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Installation
+    # ────────────────────────────────────────────────────────────────────────
+    def install(self, bot):
+        """Branche l’écoute des interactions et la tâche de ménage (une seule fois)."""
+        if self._bot is None:
+            self._bot = bot
+            bot.add_listener(self._on_interaction, "on_interaction")
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._sweep_loop())
+
+    def register_persistent(self, bot, prefix: str, factory):
+        self.factories[prefix] = factory
+        self.install(bot)
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Suivi
+    # ────────────────────────────────────────────────────────────────────────
+    def track(self, view: discord.ui.View, message, ttl: float = None):
+        if view is None or message is None:
+            return view
+        expires_at = time.time() + (ttl or self.default_ttl)
+        self.views.pop(message.id, None)      # la nouvelle View remplace l’ancienne sur ce message
+        self.views[message.id] = (view, expires_at)
+        heapq.heappush(self.heap, (expires_at, message.id))
+        while len(self.views) > self.max_views:
+            _, (oldest, _) = self.views.popitem(last=False)
+            oldest.stop()
+            self.evicted += 1
+        return view
+
+    def release(self, view: discord.ui.View):
+        for message_id, (tracked, _) in list(self.views.items()):
+            if tracked is view:
+                del self.views[message_id]
+        view.stop()
+
+    def get(self, message_id):
+        entry = self.views.get(message_id)
+        return entry[0] if entry else None
+
+    def sweep(self, now: float = None) -> int:
+        """Arrête les Views arrivées à échéance ; renvoie leur nombre."""
+        now = now or time.time()
+        count = 0
+        while self.heap and self.heap[0][0] <= now:
+            expires_at, message_id = heapq.heappop(self.heap)
+            entry = self.views.get(message_id)
+            if entry and entry[1] == expires_at:   # sinon : entrée remplacée depuis
+                del self.views[message_id]
+                entry[0].stop()
+                count += 1
+        self.expired += count
+        return count
+
+    async def _sweep_loop(self):
+        while True:
+            await asyncio.sleep(SWEEP_INTERVAL)
+            self.sweep()
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Reconstruction paresseuse
+    # ────────────────────────────────────────────────────────────────────────
+    async def _on_interaction(self, interaction: discord.Interaction):
+        if interaction.type != discord.InteractionType.component or interaction.message is None:
+            return
+        if interaction.message.id in self.views:
+            return   # View toujours vivante : discord.py s’en occupe
+        custom_id = (interaction.data or {}).get("custom_id", "")
+        factory = next((f for prefix, f in self.factories.items() if custom_id.startswith(prefix)), None)
+        if factory is None:
+            return
+        try:
+            view = await factory(interaction)
+            if view is None:
+                return
+            self._bot.add_view(view, message_id=interaction.message.id)
+            self.track(view, interaction.message)
+            self.rehydrated += 1
+            item = next((c for c in view.children if getattr(c, "custom_id", None) == custom_id), None)
+            if item is not None:
+                _refresh_item(item, interaction)
+                await item.callback(interaction)
+        except Exception as e:
+            print(f"[ERREUR views] reconstruction {custom_id} : {e}")
+
+    # ────────────────────────────────────────────────────────────────────────
+    # 🔹 Jauges
+    # ────────────────────────────────────────────────────────────────────────
+    def stats(self) -> dict:
+        """{"live", "evicted", "expired", "rehydrated", "by_class": {nom: {"count", "bytes"}}}"""
+        by_class = {}
+        for view, _ in self.views.values():
+            entry = by_class.setdefault(type(view).__name__, {"count": 0, "bytes": 0})
+            entry["count"] += 1
+            entry["bytes"] += approx_size(view)
+        return {
+            "live": len(self.views),
+            "evicted": self.evicted,
+            "expired": self.expired,
+            "rehydrated": self.rehydrated,
+            "by_class": by_class,
+        }
+
+
+# Instance unique partagée par les cogs
+view_registry = ViewRegistry()